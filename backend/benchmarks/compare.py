@@ -0,0 +1,75 @@
+import sys
+import json
+import argparse
+from typing import Dict, Any, List
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.2,
+                    min_delta: float = 0.005) -> List[Dict[str, Any]]:
+    """
+    Сравнивает медианное время сценариев с базовыми результатами.
+
+    Сценарий считается замедлившимся, если он медленнее базового больше чем на
+    tolerance (доля) и при этом разница превышает min_delta секунд (чтобы шум
+    на очень быстрых сценариях не давал ложных срабатываний).
+
+    Returns:
+        List[Dict[str, Any]]: Строки сравнения для всех сценариев
+    """
+    rows = []
+    baseline_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+
+    for name in sorted(set(baseline_results) | set(current_results)):
+        before = baseline_results.get(name)
+        after = current_results.get(name)
+        if before is None or after is None:
+            rows.append({"case": name, "status": "new" if before is None else "missing"})
+            continue
+
+        ratio = after["median"] / before["median"] if before["median"] > 0 else float("inf")
+        slower = ratio > 1 + tolerance and after["median"] - before["median"] > min_delta
+        faster = ratio < 1 / (1 + tolerance) and before["median"] - after["median"] > min_delta
+        rows.append({
+            "case": name,
+            "baseline": before["median"],
+            "current": after["median"],
+            "ratio": ratio,
+            "status": "slower" if slower else "faster" if faster else "ok"
+        })
+
+    return rows
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарков с базовыми")
+    parser.add_argument("baseline", help="Файл с базовыми результатами (JSON)")
+    parser.add_argument("current", help="Файл с текущими результатами (JSON)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Допустимое замедление (доля)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="Минимальная значимая разница (секунды)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline.get("meta", {}).get("parameters") != current.get("meta", {}).get("parameters"):
+        print("Внимание: параметры запусков различаются, сравнение может быть некорректным")
+
+    rows = compare_results(baseline, current, args.tolerance, args.min_delta)
+    for row in rows:
+        if "ratio" in row:
+            print(f"{row['case']:55s} {row['baseline']:9.4f}s -> {row['current']:9.4f}s "
+                  f"x{row['ratio']:5.2f}  {row['status']}")
+        else:
+            print(f"{row['case']:55s} {row['status']}")
+
+    regressions = [row["case"] for row in rows if row["status"] == "slower"]
+    if regressions:
+        print(f"Обнаружено замедление в {len(regressions)} сценариях: {', '.join(regressions)}")
+        return 1
+
+    print("Замедлений не обнаружено")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+def generate_dataset(rows: int = 100000, numeric_columns: int = 10, categorical_columns: int = 3,
+                     cardinality: int = 20, missing_rate: float = 0.05, datetime_columns: int = 1,
+                     seed: int = 42) -> pd.DataFrame:
+    """
+    Генерирует синтетический набор данных с воспроизводимым содержимым.
+
+    Числовые столбцы имеют разные масштабы и небольшую долю выбросов, категориальные -
+    неравномерное распределение категорий, столбцы дат идут по возрастанию (временной ряд).
+    Пропуски добавляются во все столбцы, кроме дат.
+
+    Args:
+        rows: Количество строк
+        numeric_columns: Количество числовых столбцов (ширина набора)
+        categorical_columns: Количество категориальных столбцов
+        cardinality: Количество категорий в каждом категориальном столбце
+        missing_rate: Доля пропусков в числовых и категориальных столбцах
+        datetime_columns: Количество столбцов с датами
+        seed: Начальное значение генератора
+
+    Returns:
+        pd.DataFrame: Сгенерированный набор данных
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+
+    for i in range(datetime_columns):
+        start = pd.Timestamp("2020-01-01") + pd.Timedelta(days=30 * i)
+        data[f"date_{i}"] = pd.date_range(start, periods=rows, freq="h").strftime("%Y-%m-%d %H:%M:%S")
+
+    for i in range(numeric_columns):
+        values = rng.normal(loc=rng.uniform(-100, 100), scale=rng.uniform(0.1, 50), size=rows)
+        # Около 0.5% выбросов, чтобы методы обработки выбросов удаляли строки
+        outliers = rng.random(rows) < 0.005
+        values[outliers] *= 20
+        data[f"num_{i}"] = values
+
+    if categorical_columns:
+        # Распределение Ципфа: несколько частых категорий и длинный хвост
+        weights = 1.0 / np.arange(1, cardinality + 1)
+        weights /= weights.sum()
+        labels = np.array([f"cat_{j}" for j in range(cardinality)], dtype=object)
+        for i in range(categorical_columns):
+            data[f"category_{i}"] = labels[rng.choice(cardinality, size=rows, p=weights)]
+
+    df = pd.DataFrame(data)
+
+    if missing_rate > 0:
+        for col in df.columns:
+            if col.startswith("date_"):
+                continue
+            mask = rng.random(rows) < missing_rate
+            df[col] = df[col].mask(mask)
+
+    return df
@@ -0,0 +1,273 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import warnings
+import httpx
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Добавляем директорию backend в sys.path для абсолютных импортов
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.data_generator import generate_dataset
+from benchmarks.load_test_stats import EndpointStats
+
+# Текст ошибки with_file_lock при превышении времени ожидания блокировки
+LOCK_TIMEOUT_MARKER = "Превышено время ожидания доступа"
+# Предупреждения pandas, повторяющиеся в каждом запросе приложения в том же процессе:
+# определение формата дат при анализе набора и сохранение параметров в атрибуте DataFrame
+KNOWN_WARNINGS = [
+    r"Could not infer format, so each element will be parsed individually",
+    r"Pandas doesn't allow columns to be created via a new attribute name",
+]
+
+
+# Сценарии нагрузки:
+#   full - загрузка, информация, предпросмотр, выполнение, опрос статуса, страницы данных и экспорт
+#   read - информация и предпросмотр общего набора данных
+#   execute - выполнение на общем наборе данных (конкуренция за блокировку) и чтение результата
+SCENARIOS = ["full", "read", "execute"]
+
+class VirtualUser:
+    """
+    Выполняет сценарии от имени одного пользователя и записывает задержки запросов.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, stats: EndpointStats, args: argparse.Namespace,
+                 fixture: bytes, shared_dataset_id: Optional[str], methods: List[Dict[str, Any]]):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.fixture = fixture
+        self.shared_dataset_id = shared_dataset_id
+        self.methods = methods
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """
+        Выполняет запрос и классифицирует результат (ошибка, таймаут блокировки, файл занят).
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(endpoint, time.perf_counter() - start, error=True, detail=repr(e))
+            return None
+        latency = time.perf_counter() - start
+
+        error = response.status_code >= 400
+        detail = f"HTTP {response.status_code}" if error else None
+        lock_timeout = False
+        busy = False
+        if response.headers.get("content-type", "").startswith("application/json"):
+            body = response.json()
+            if isinstance(body, dict):
+                if error:
+                    detail = f"HTTP {response.status_code}: {body.get('detail', '')}"
+                lock_timeout = error and LOCK_TIMEOUT_MARKER in str(body.get("detail", ""))
+                busy = not error and body.get("status") == "processing" and "message" in body
+        self.stats.record(endpoint, latency, error=error, lock_timeout=lock_timeout, busy=busy, detail=detail)
+        return None if error else response
+
+    async def upload(self) -> Optional[str]:
+        response = await self.request(
+            "POST /datasets/upload", "POST", "/api/datasets/upload",
+            files={"file": ("load_test.csv", self.fixture, "text/csv")}
+        )
+        return response.json().get("dataset_id") if response is not None else None
+
+    async def info_and_preview(self, dataset_id: str):
+        await self.request("GET /datasets/{id}", "GET", f"/api/datasets/{dataset_id}")
+        await self.request("POST /preprocessing/preview", "POST", "/api/preprocessing/preview",
+                           json={"dataset_id": dataset_id, "methods": self.methods})
+
+    async def execute_and_read(self, dataset_id: str):
+        response = await self.request("POST /preprocessing/execute", "POST", "/api/preprocessing/execute",
+                                      json={"dataset_id": dataset_id, "methods": self.methods})
+        result_id = response.json().get("result_id") if response is not None else None
+        if not result_id:
+            return
+
+        # Опрашиваем статус до завершения обработки
+        deadline = time.perf_counter() + self.args.poll_timeout
+        status = "processing"
+        while status == "processing" and time.perf_counter() < deadline:
+            response = await self.request("GET /preprocessing/status/{id}", "GET",
+                                          f"/api/preprocessing/status/{result_id}")
+            status = response.json().get("status") if response is not None else "error"
+            if status == "processing":
+                await asyncio.sleep(self.args.poll_interval)
+        if status != "completed":
+            return
+
+        for page in range(self.args.pages):
+            await self.request("GET /preprocessing/data/{id}", "GET", f"/api/preprocessing/data/{result_id}",
+                               params={"limit": self.args.page_size, "offset": page * self.args.page_size})
+        if self.args.export:
+            await self.request("GET /datasets/export/{id}", "GET", f"/api/datasets/export/{result_id}",
+                               params={"format": "csv"})
+
+    async def run_scenario(self, scenario: str):
+        if scenario == "full":
+            dataset_id = await self.upload()
+            if dataset_id:
+                await self.info_and_preview(dataset_id)
+                await self.execute_and_read(dataset_id)
+        elif scenario == "read":
+            await self.info_and_preview(self.shared_dataset_id)
+        elif scenario == "execute":
+            await self.execute_and_read(self.shared_dataset_id)
+
+def default_methods(df) -> List[Dict[str, Any]]:
+    """
+    Конфигурация предобработки по умолчанию для предпросмотра и выполнения.
+    """
+    categorical = [col for col in df.columns if col.startswith("category_")]
+    return [
+        {"method_id": "missing_values", "parameters": {"strategy": "mean"}},
+        {"method_id": "standardization", "parameters": {}},
+        {"method_id": "categorical_encoding", "parameters": {"strategy": "onehot", "columns": categorical}}
+    ]
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Разбирает смесь сценариев вида "full=1,read=3,execute=1".
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Неизвестный сценарий '{name}', доступны: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+async def _run_users(client: httpx.AsyncClient, stats: EndpointStats, args: argparse.Namespace,
+                     weights: Dict[str, float], fixture: bytes, methods: List[Dict[str, Any]]):
+    """
+    Выполняет сценарии одновременных пользователей до истечения времени или числа итераций.
+
+    Returns:
+        Tuple: Количество выполненных сценариев по видам и длительность нагрузки (секунды)
+    """
+    async with client:
+        shared_dataset_id = None
+        if weights.keys() & {"read", "execute"}:
+            setup = VirtualUser(client, EndpointStats(), args, fixture, None, methods)
+            shared_dataset_id = await setup.upload()
+            if not shared_dataset_id:
+                raise RuntimeError("Не удалось загрузить общий набор данных")
+
+        deadline = time.perf_counter() + args.duration
+        scenario_counts: Dict[str, int] = {}
+
+        async def user_loop(user_index: int):
+            rng = random.Random(args.seed + user_index)
+            user = VirtualUser(client, stats, args, fixture, shared_dataset_id, methods)
+            iterations = 0
+            while time.perf_counter() < deadline and (not args.iterations or iterations < args.iterations):
+                scenario = rng.choices(list(weights), weights=list(weights.values()))[0]
+                scenario_counts[scenario] = scenario_counts.get(scenario, 0) + 1
+                await user.run_scenario(scenario)
+                iterations += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user_loop(i) for i in range(args.concurrency)))
+        duration = time.perf_counter() - start
+
+    return scenario_counts, duration
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Запускает нагрузку с заданным числом одновременных пользователей и возвращает отчет.
+    """
+    weights = parse_mix(args.mix)
+
+    # Локальный набор данных для загрузки
+    df = generate_dataset(rows=args.rows, numeric_columns=args.width, categorical_columns=args.categorical,
+                          seed=args.seed)
+    methods = default_methods(df)
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            methods = json.load(f)["methods"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fixture_path = Path(temp_dir) / "load_test.csv"
+        df.to_csv(fixture_path, index=False)
+        fixture = fixture_path.read_bytes()
+
+    app = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.request_timeout)
+    else:
+        # Приложение в том же процессе: обработчики и фоновые задачи выполняются в цикле событий харнесса
+        from main import app
+        await app.router.startup()
+        client = httpx.AsyncClient(app=app, base_url="http://testserver", timeout=args.request_timeout)
+
+    stats = EndpointStats()
+    try:
+        scenario_counts, duration = await _run_users(client, stats, args, weights, fixture, methods)
+    finally:
+        # Фоновые задачи и потоки приложения останавливаются вместе с циклом событий харнесса
+        if app is not None:
+            await app.router.shutdown()
+
+    report = stats.report(duration)
+    report["scenarios"] = scenario_counts
+    report["meta"] = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "target": args.base_url or "in-process",
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"}
+    }
+    return report
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'endpoint':36s} {'req':>6s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} "
+          f"{'err%':>6s} {'lock%':>6s} {'busy%':>6s}")
+    for endpoint, row in report["endpoints"].items():
+        print(f"{endpoint:36s} {row['requests']:6d} {row['throughput_rps']:8.2f} {row['p50']:8.3f} "
+              f"{row['p95']:8.3f} {row['p99']:8.3f} {100 * row['error_rate']:6.1f} "
+              f"{100 * row['lock_timeout_rate']:6.1f} {100 * row['busy_rate']:6.1f}")
+    print(f"Всего запросов: {report['requests']} за {report['duration']} с "
+          f"({report['throughput_rps']} запросов/с), ошибок: {100 * report['error_rate']:.1f}%, "
+          f"таймаутов блокировок: {100 * report['lock_timeout_rate']:.1f}%")
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Нагрузочное тестирование API предобработки")
+    parser.add_argument("--base-url", default=None,
+                        help="Адрес запущенного сервиса (например, http://localhost:8000); по умолчанию приложение в процессе")
+    parser.add_argument("--concurrency", type=int, default=4, help="Количество одновременных пользователей")
+    parser.add_argument("--duration", type=float, default=30.0, help="Длительность нагрузки (секунды)")
+    parser.add_argument("--iterations", type=int, default=0, help="Максимум сценариев на пользователя (0 - без ограничения)")
+    parser.add_argument("--mix", default="full=1,read=3,execute=1", help="Веса сценариев: full, read, execute")
+    parser.add_argument("--rows", type=int, default=5000, help="Количество строк в загружаемом наборе")
+    parser.add_argument("--width", type=int, default=10, help="Количество числовых столбцов")
+    parser.add_argument("--categorical", type=int, default=3, help="Количество категориальных столбцов")
+    parser.add_argument("--config", default=None, help="JSON с ключом methods для предпросмотра и выполнения")
+    parser.add_argument("--pages", type=int, default=3, help="Количество запрашиваемых страниц результата")
+    parser.add_argument("--page-size", type=int, default=100, help="Размер страницы результата")
+    parser.add_argument("--no-export", dest="export", action="store_false", help="Не выполнять экспорт результата")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Интервал опроса статуса (секунды)")
+    parser.add_argument("--poll-timeout", type=float, default=120.0, help="Максимальное время ожидания результата")
+    parser.add_argument("--request-timeout", type=float, default=120.0, help="Таймаут одного запроса (секунды)")
+    parser.add_argument("--seed", type=int, default=42, help="Начальное значение генератора")
+    parser.add_argument("--output", default=None, help="Файл для отчета (JSON)")
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    # Скрываются только известные повторяющиеся предупреждения приложения, остальные выводятся
+    for message in KNOWN_WARNINGS:
+        warnings.filterwarnings("ignore", message=message, category=UserWarning)
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Отчет сохранен в {args.output}")
+
+if __name__ == "__main__":
+    main()
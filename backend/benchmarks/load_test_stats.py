@@ -0,0 +1,57 @@
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+class EndpointStats:
+    """
+    Накапливает задержки и ошибки запросов, сгруппированные по эндпоинтам.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.lock_timeouts: Dict[str, int] = {}
+        self.busy: Dict[str, int] = {}
+        self.error_samples: Dict[str, List[str]] = {}
+
+    def record(self, endpoint: str, latency: float, error: bool = False,
+               lock_timeout: bool = False, busy: bool = False, detail: Optional[str] = None):
+        self.latencies.setdefault(endpoint, []).append(latency)
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + int(error)
+        self.lock_timeouts[endpoint] = self.lock_timeouts.get(endpoint, 0) + int(lock_timeout)
+        self.busy[endpoint] = self.busy.get(endpoint, 0) + int(busy)
+        # Несколько различных текстов ошибок для диагностики
+        samples = self.error_samples.setdefault(endpoint, [])
+        if error and detail and detail not in samples and len(samples) < 3:
+            samples.append(detail)
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """
+        Возвращает перцентили задержки, пропускную способность и доли ошибок по эндпоинтам.
+        """
+        endpoints = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            values = np.array(latencies)
+            count = len(values)
+            endpoints[endpoint] = {
+                "requests": count,
+                "throughput_rps": round(count / duration, 3) if duration > 0 else None,
+                "p50": float(np.percentile(values, 50)),
+                "p90": float(np.percentile(values, 90)),
+                "p95": float(np.percentile(values, 95)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+                "error_rate": self.errors[endpoint] / count,
+                "lock_timeout_rate": self.lock_timeouts[endpoint] / count,
+                "busy_rate": self.busy[endpoint] / count,
+                "error_samples": self.error_samples[endpoint]
+            }
+
+        total = sum(len(latencies) for latencies in self.latencies.values())
+        return {
+            "duration": round(duration, 3),
+            "requests": total,
+            "throughput_rps": round(total / duration, 3) if duration > 0 else None,
+            "error_rate": sum(self.errors.values()) / total if total else 0.0,
+            "lock_timeout_rate": sum(self.lock_timeouts.values()) / total if total else 0.0,
+            "endpoints": endpoints
+        }
@@ -0,0 +1,245 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import warnings
+import itertools
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+
+# Добавляем директорию backend в sys.path для абсолютных импортов
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.data_generator import generate_dataset
+from services.dataset_service import analyze_dataset
+from services.preprocessing_service import get_preprocessing_methods, apply_preprocessing
+from utils.validation_utils import load_and_validate_dataframe
+from utils.file_utils import copy_csv_with_bom
+from utils.json_utils import convert_numpy_types
+from utils.profiling_utils import StepProfiler
+
+# Количество строк в предпросмотре (как в эндпоинте /preview)
+PREVIEW_ROWS = 100
+# Параметры с вариантами, для каждого из которых создается отдельный случай метода
+VARIANT_PARAMETERS = ("strategy", "mode")
+
+# Уже выведенные предупреждения (каждое выводится один раз за запуск)
+_shown_warnings: set = set()
+
+def _columns_for(df: pd.DataFrame, applicable_types: List[str]) -> List[str]:
+    """
+    Подбирает столбцы сгенерированного набора по типам, к которым применим метод.
+    """
+    prefixes = {"numeric": "num_", "categorical": "category_", "datetime": "date_"}
+    return [col for col in df.columns
+            if any(col.startswith(prefixes[kind]) for kind in applicable_types if kind in prefixes)]
+
+def build_method_cases(df: pd.DataFrame) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Строит конфигурации для каждого method_id из get_preprocessing_methods.
+
+    Параметры берутся из значений по умолчанию в описании метода; для параметров
+    strategy и mode создается отдельный случай на каждое сочетание вариантов
+    (значение mode по умолчанию в название случая не входит).
+    """
+    numeric = _columns_for(df, ["numeric"])
+    categorical = _columns_for(df, ["categorical"])
+    dates = _columns_for(df, ["datetime"])
+
+    cases = []
+    for method in get_preprocessing_methods():
+        method_id = method["method_id"]
+        columns = _columns_for(df, method["applicable_types"])
+        parameters = {}
+        variants: Dict[str, List[Any]] = {}
+
+        for name, spec in method["parameters"].items():
+            if name == "columns":
+                parameters[name] = columns
+            elif name == "target_column":
+                parameters[name] = numeric[0] if numeric else None
+            elif name == "exog_columns":
+                parameters[name] = numeric[1:3]
+            elif name == "group_column":
+                parameters[name] = categorical[0] if categorical else None
+            elif name == "time_column":
+                parameters[name] = dates[0] if dates else None
+            elif name in VARIANT_PARAMETERS and spec.get("options"):
+                variants[name] = spec["options"]
+            elif "default" in spec:
+                parameters[name] = spec["default"]
+
+        if method_id == "inverse_scaling":
+            # Параметры обратного преобразования берутся из прогона стандартизации
+            scaled = apply_preprocessing(df, {"methods": [
+                {"method_id": "standardization", "parameters": {"columns": numeric}}
+            ]})
+            parameters["scaling_params"] = getattr(scaled, "scaling_params", {})
+
+        for values in itertools.product(*variants.values()):
+            choice = dict(zip(variants, values))
+            case_parameters = dict(parameters, **choice)
+            labels = [f"{key}={value}" for key, value in choice.items()
+                      if key == "strategy" or value != method["parameters"][key].get("default")]
+            name = f"{method_id}[{','.join(labels)}]" if labels else method_id
+            cases.append((name, {"methods": [{"method_id": method_id, "parameters": case_parameters}]}))
+
+    return cases
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Выполняет функцию repeat раз и возвращает статистики времени и памяти.
+
+    PerformanceWarning pandas (например, фрагментация DataFrame) попадают в
+    результат сценария, остальные предупреждения выводятся один раз за запуск.
+    """
+    profiler = StepProfiler()
+    result = None
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for _ in range(repeat):
+            profiler.start("run")
+            result = func()
+            profiler.stop(result if isinstance(result, pd.DataFrame) else None)
+
+    performance_warnings = []
+    for warning in caught:
+        message = str(warning.message)
+        if issubclass(warning.category, pd.errors.PerformanceWarning):
+            if message not in performance_warnings:
+                performance_warnings.append(message)
+        elif (warning.category, message) not in _shown_warnings:
+            _shown_warnings.add((warning.category, message))
+            warnings.showwarning(warning.message, warning.category, warning.filename, warning.lineno)
+
+    wall = np.array([step["wall_time"] for step in profiler.steps])
+    cpu = np.array([step["cpu_time"] for step in profiler.steps])
+    memory = [step["process_peak_memory_delta_mb"] for step in profiler.steps
+              if step["process_peak_memory_delta_mb"] is not None]
+    last = profiler.steps[-1]
+    return {
+        "repeats": repeat,
+        "min": float(wall.min()),
+        "median": float(np.median(wall)),
+        "mean": float(wall.mean()),
+        "cpu_median": float(np.median(cpu)),
+        "peak_memory_delta_mb": max(memory) if memory else None,
+        "rows_out": last["rows_out"],
+        "columns_out": last["columns_out"],
+        "performance_warnings": performance_warnings
+    }
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Запускает все сценарии и возвращает результаты в машиночитаемом виде.
+    """
+    df = generate_dataset(
+        rows=args.rows, numeric_columns=args.width, categorical_columns=args.categorical,
+        cardinality=args.cardinality, missing_rate=args.missing_rate,
+        datetime_columns=args.datetime_columns, seed=args.seed
+    )
+    results: Dict[str, Any] = {}
+
+    def record(name: str, func: Callable[[], Any]):
+        if args.filter and args.filter not in name:
+            return
+        results[name] = measure(func, args.repeat)
+        print(f"{name:55s} median {results[name]['median']:.4f}s", flush=True)
+        for message in results[name]["performance_warnings"]:
+            print(f"  PerformanceWarning: {message}", flush=True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+
+        # Загрузка файлов
+        csv_path = temp_dir / "dataset.csv"
+        df.to_csv(csv_path, index=False)
+        record("ingest_csv", lambda: asyncio.run(load_and_validate_dataframe(csv_path, "csv")))
+        if not args.skip_excel:
+            xlsx_path = temp_dir / "dataset.xlsx"
+            df.to_excel(xlsx_path, index=False, engine="openpyxl")
+            record("ingest_xlsx", lambda: asyncio.run(load_and_validate_dataframe(xlsx_path, "xlsx")))
+
+        # Анализ при загрузке
+        record("analyze_dataset", lambda: analyze_dataset(df))
+
+        # Каждый метод предобработки
+        for name, config in build_method_cases(df):
+            record(f"method:{name}", lambda config=config: apply_preprocessing(df, config))
+
+        # Сериализация предпросмотра (столбцы дат не кодируются, иначе one-hot
+        # создает по столбцу на каждую строку)
+        preview_config = {"methods": [
+            {"method_id": "missing_values", "parameters": {"strategy": "mean"}},
+            {"method_id": "standardization", "parameters": {"columns": _columns_for(df, ["numeric"])}},
+            {"method_id": "categorical_encoding", "parameters": {"columns": _columns_for(df, ["categorical"])}}
+        ]}
+
+        def preview():
+            sample_df = df.head(PREVIEW_ROWS)
+            processed_df = apply_preprocessing(sample_df, preview_config)
+            return json.dumps(convert_numpy_types({
+                "original_sample": sample_df.to_dict(orient="records"),
+                "processed_sample": processed_df.to_dict(orient="records")
+            }))
+        record("preview_serialization", preview)
+
+        # Экспорт результата
+        processed_df = apply_preprocessing(df, preview_config)
+        result_path = temp_dir / "result.csv"
+
+        def export_csv():
+            processed_df.to_csv(result_path, index=False)
+            return copy_csv_with_bom(result_path, temp_dir / "export.csv")
+        record("export_csv", export_csv)
+        if not args.skip_excel:
+            record("export_excel", lambda: processed_df.to_excel(temp_dir / "export.xlsx", index=False, engine="openpyxl"))
+
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "parameters": {key: value for key, value in vars(args).items() if key != "output"}
+        },
+        "results": results
+    }
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарки предобработки данных")
+    parser.add_argument("--rows", type=int, default=100000, help="Количество строк")
+    parser.add_argument("--width", type=int, default=10, help="Количество числовых столбцов")
+    parser.add_argument("--categorical", type=int, default=3, help="Количество категориальных столбцов")
+    parser.add_argument("--cardinality", type=int, default=20, help="Количество категорий")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="Доля пропусков")
+    parser.add_argument("--datetime-columns", type=int, default=1, help="Количество столбцов с датами")
+    parser.add_argument("--seed", type=int, default=42, help="Начальное значение генератора")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов каждого сценария")
+    parser.add_argument("--filter", default=None, help="Запускать только сценарии, содержащие строку")
+    parser.add_argument("--skip-excel", action="store_true", help="Пропустить загрузку и экспорт Excel")
+    parser.add_argument("--output", default="benchmark_results.json", help="Файл для результатов (JSON)")
+    parser.add_argument("--fail-on-performance-warning", action="store_true",
+                        help="Завершиться с ошибкой, если сценарий вызвал PerformanceWarning pandas")
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    report = run_benchmarks(args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+    flagged = [name for name, result in report["results"].items() if result["performance_warnings"]]
+    if flagged:
+        print(f"PerformanceWarning в сценариях: {', '.join(flagged)}")
+        if args.fail_on_performance_warning:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
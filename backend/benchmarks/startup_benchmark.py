@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import numpy as np
+import httpx
+from pathlib import Path
+from typing import Dict, Any, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def measure_import_times(module: str = "main", top: int = 20) -> Dict[str, Any]:
+    """
+    Измеряет стоимость импорта модулей через python -X importtime в отдельном процессе.
+
+    Returns:
+        Dict[str, Any]: Общее время импорта, самые дорогие модули и модули приложения (секунды)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "").split("|")]
+        modules[name] = {"self": int(self_us) / 1e6, "cumulative": int(cumulative_us) / 1e6}
+
+    ranked = sorted(modules.items(), key=lambda item: -item[1]["cumulative"])
+    application_prefixes = ("main", "controllers", "services", "utils", "config", "models")
+    return {
+        "total": modules.get(module, {}).get("cumulative"),
+        "top_cumulative": dict(ranked[:top]),
+        "application": {name: times for name, times in ranked if name.split(".")[0] in application_prefixes}
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_time_to_health(workers: int = 1, timeout: float = 60.0, env: Dict[str, str] = None) -> float:
+    """
+    Запускает uvicorn и измеряет время до первого успешного ответа /health.
+
+    Returns:
+        float: Время в секундах от запуска процесса до ответа
+    """
+    port = _free_port()
+    process_env = {**os.environ, **(env or {})}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers)],
+        cwd=BACKEND_DIR, env=process_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.01)
+        raise TimeoutError(f"Сервис не ответил на /health за {timeout} с")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска воркера")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество запусков uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="Количество воркеров uvicorn")
+    parser.add_argument("--warm-up", action="store_true", help="Запускать с WARMUP_METHODS=1")
+    parser.add_argument("--top", type=int, default=20, help="Количество самых дорогих модулей в отчете")
+    parser.add_argument("--output", default=None, help="Файл для результатов (JSON)")
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+
+    imports = measure_import_times("main", args.top)
+    print(f"Импорт main: {imports['total']:.3f} с")
+    for name, times in imports["top_cumulative"].items():
+        print(f"  {name:50s} {times['cumulative']:8.3f} с (собственное {times['self']:.3f} с)")
+
+    env = {"WARMUP_METHODS": "1" if args.warm_up else "0"}
+    health_times = [measure_time_to_health(args.workers, env=env) for _ in range(args.repeat)]
+    print(f"Время до первого ответа /health: медиана {np.median(health_times):.3f} с, "
+          f"минимум {min(health_times):.3f} с")
+
+    if args.output:
+        report = {
+            "parameters": vars(args),
+            "imports": imports,
+            "time_to_health": {"runs": health_times, "median": float(np.median(health_times))}
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,67 @@
+import os
 from pathlib import Path
 
 # Директории для хранения данных
 UPLOAD_DIR = Path("./data/uploads")
 PROCESSED_DIR = Path("./data/processed")
-TEMP_DIR = Path("./data/temp")
\ No newline at end of file
+TEMP_DIR = Path("./data/temp")
+
+# Размер выборки, сохраняемой при загрузке для предпросмотра и рекомендаций
+SAMPLE_SIZE = int(os.getenv("SAMPLE_SIZE", "1000"))
+
+# Директория для снимков метрик процессов (общая для всех воркеров uvicorn)
+METRICS_DIR = Path(os.getenv("METRICS_DIR", "./data/metrics"))
+
+# Токен администратора для диагностических функций (профилирование по запросу);
+# если не задан, эти функции отключены
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Профили выборочного профилировщика: директория, количество хранимых профилей и срок хранения
+PROFILES_DIR = Path(os.getenv("PROFILES_DIR", "./data/profiles"))
+PROFILE_RETENTION = int(os.getenv("PROFILE_RETENTION", "50"))
+PROFILE_MAX_AGE_HOURS = float(os.getenv("PROFILE_MAX_AGE_HOURS", "24"))
+
+# Предварительная загрузка зависимостей методов предобработки после старта воркера
+WARMUP_METHODS = os.getenv("WARMUP_METHODS", "0") == "1"
+
+# Бюджет памяти кэша загруженных наборов данных и результатов в каждом процессе (байты)
+DATAFRAME_CACHE_BYTES = int(os.getenv("DATAFRAME_CACHE_BYTES", str(512 * 2 ** 20)))
+
+# Общая память для столбцов горячих наборов данных (одна копия на все воркеры пода)
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "1") == "1"
+SHARED_CACHE_DIR = Path(os.getenv(
+    "SHARED_CACHE_DIR", "/dev/shm/preprocessing-cache" if Path("/dev/shm").is_dir() else "./data/shared_cache"
+))
+# Бюджет общей памяти в байтах (0 - размер файловой системы SHARED_CACHE_DIR; больший бюджет урезается до него)
+SHARED_CACHE_BYTES = int(os.getenv("SHARED_CACHE_BYTES", "0"))
+
+# Контроль допуска задач предобработки: бюджет памяти всех задач пода в байтах
+# (0 - доля JOB_MEMORY_FRACTION от лимита памяти контейнера), длина очереди и время ожидания в ней
+JOB_MEMORY_BUDGET = int(os.getenv("JOB_MEMORY_BUDGET", "0"))
+JOB_MEMORY_FRACTION = float(os.getenv("JOB_MEMORY_FRACTION", "0.6"))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "16"))
+JOB_QUEUE_TIMEOUT = float(os.getenv("JOB_QUEUE_TIMEOUT", "1800"))
+# Общая для воркеров директория очереди задач и обучаемых поправок оценки ресурсов
+SCHEDULER_DIR = Path(os.getenv("SCHEDULER_DIR", "./data/scheduler"))
+# Бюджет потоков нативных библиотек (BLAS, OpenMP) всех задач пода (0 - квота процессора cgroup)
+JOB_CPU_BUDGET = float(os.getenv("JOB_CPU_BUDGET", "0"))
+# Параллельная обработка столбцов внутри шагов: auto - по размеру данных и выделенным потокам, off - последовательно
+COLUMN_PARALLELISM = os.getenv("COLUMN_PARALLELISM", "auto")
+# Лимиты времени выполнения задачи (секунды; 0 - без лимита): общий и процессорного времени
+JOB_TIME_LIMIT = float(os.getenv("JOB_TIME_LIMIT", "3600"))
+JOB_CPU_TIME_LIMIT = float(os.getenv("JOB_CPU_TIME_LIMIT", "0"))
+# Журнал задач предобработки и контрольные точки после шагов (восстановление задач после перезапуска)
+JOB_JOURNAL_DIR = Path(os.getenv("JOB_JOURNAL_DIR", "./data/jobs"))
+JOB_CHECKPOINTS = os.getenv("JOB_CHECKPOINTS", "0") == "1"
+# Минимальный интервал между контрольными точками задачи (секунды; 0 - после каждого шага)
+JOB_CHECKPOINT_INTERVAL = float(os.getenv("JOB_CHECKPOINT_INTERVAL", "60"))
+# Период обновления отметки активности задачи и время без отметки, после которого задача считается прерванной (секунды)
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+JOB_HEARTBEAT_TIMEOUT = float(os.getenv("JOB_HEARTBEAT_TIMEOUT", "60"))
+# Количество попыток выполнения задачи (прерванные задачи возобновляются, пока попытки не исчерпаны)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Срок хранения записей завершенных задач и пакетов в журнале (часы)
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "168"))
+# Пакетная предобработка: наборов данных в пакете и одновременно выполняемых задач пакета (по умолчанию)
+BATCH_MAX_DATASETS = int(os.getenv("BATCH_MAX_DATASETS", "200"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks
 from fastapi.responses import FileResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Any, Optional, Union
 import pandas as pd
 import numpy as np
@@ -12,12 +13,18 @@ import time  # Add time module import
 from pathlib import Path
 
 # Импорты из собственных модулей
-from services.dataset_service import analyze_dataset
+from services.dataset_service import analyze_upload
 from utils.file_utils import save_uploaded_file, get_file_path_by_id, get_processed_file_path
+from utils.result_reader_utils import result_exists, export_result_csv
 from utils.json_utils import convert_numpy_types
-from utils.validation_utils import load_and_validate_dataframe
 from utils.error_utils import handle_exceptions, log_error
 from utils.lock_utils import with_file_lock, is_file_processing
+from utils.inverse_utils import apply_inverse_transform
+from utils.metrics_utils import observe_io
+from utils.dataframe_cache_utils import load_dataset, load_result
+from utils.sample_utils import (
+    load_sample, column_histogram, rebuild_stratified_sample
+)
 
 # Добавляем импорт для временной директории
 from config.settings import TEMP_DIR
@@ -67,12 +74,8 @@ async def upload_dataset(
             # Сохраняем файл
             file_path = await save_uploaded_file(file, dataset_id, extension)
             
-            # Загружаем и валидируем данные
-            df = await load_and_validate_dataframe(file_path, extension)
-            
-            # Анализируем набор данных
-            analysis = analyze_dataset(df)
-            analysis["dataset_id"] = dataset_id
+            # Загружаем, валидируем и анализируем данные в пуле потоков, не блокируя цикл событий
+            analysis = await run_in_threadpool(analyze_upload, dataset_id, file_path, extension)
             
             # Сохраняем метаданные
             metadata_path = file_path.parent / f"{dataset_id}_metadata.json"
@@ -144,6 +147,13 @@ async def set_target_column(dataset_id: str, data: dict):
                 for col in metadata["columns"]:
                     col["is_target"] = col["name"] == target_column
                 
+                # Перестраиваем выборку со стратификацией по целевой переменной за один проход
+                # (чтение набора выполняется в пуле потоков и не блокирует цикл событий)
+                if any(col["name"] == target_column for col in metadata["columns"]):
+                    sample_info = await run_in_threadpool(rebuild_stratified_sample, dataset_id, target_column)
+                    if sample_info is not None:
+                        metadata["sample"] = sample_info
+                
                 # Сохраняем обновленные метаданные
                 with open(metadata_path, "w") as f:
                     json.dump(metadata, f, cls=NumpyEncoder)
@@ -154,6 +164,29 @@ async def set_target_column(dataset_id: str, data: dict):
     
     return await with_file_lock(dataset_id, update_metadata)
 
+@router.get("/{dataset_id}/histogram")
+@handle_exceptions
+async def get_column_histogram(dataset_id: str, column: str, bins: int = 20):
+    """
+    Гистограмма столбца по сохраненной выборке (без загрузки полного набора данных).
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(dataset_id):
+        return {"status": "processing", "message": "Файл в данный момент обрабатывается"}
+    
+    async def build_histogram():
+        sample_df = load_sample(dataset_id)
+        if sample_df is None:
+            raise HTTPException(status_code=404, detail="Выборка набора данных не найдена")
+        if column not in sample_df.columns:
+            raise HTTPException(status_code=400, detail=f"Столбец {column} не найден")
+        
+        histogram = column_histogram(sample_df[column], max(1, bins))
+        histogram.update({"column": column, "sample_size": len(sample_df)})
+        return convert_numpy_types(histogram)
+    
+    return await with_file_lock(dataset_id, build_histogram)
+
 @router.get("/export/{result_id}")
 @handle_exceptions
 async def export_dataset(result_id: str, format: str = "csv"):
@@ -167,19 +200,25 @@ async def export_dataset(result_id: str, format: str = "csv"):
             # Получаем путь к файлу результатов
             result_path = get_processed_file_path(result_id)
             
-            if not result_path.exists():
+            if not result_exists(result_id):
                 raise HTTPException(status_code=404, detail="Результаты не найдены")
             
-            # Загружаем данные
-            df = pd.read_csv(result_path, encoding='utf-8')
-            
             if format.lower() == "excel":
+                # Загружаем данные с учетом разреженных столбцов из метаданных
+                metadata_path = result_path.parent / f"{result_id}_metadata.json"
+                sparse_columns = []
+                if metadata_path.exists():
+                    with open(metadata_path, "r") as f:
+                        sparse_columns = json.load(f).get("sparse_columns", [])
+                df = load_result(result_id, sparse_columns)
+                
                 # Создаем временный файл Excel
                 excel_path = TEMP_DIR / f"{result_id}.xlsx"
                 
                 # Используем openpyxl явно с полной настройкой параметров Unicode
                 with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
                     df.to_excel(writer, index=False, sheet_name='Результаты')
+                observe_io("write", "xlsx", excel_path)
                 
                 return FileResponse(
                     excel_path, 
@@ -187,9 +226,9 @@ async def export_dataset(result_id: str, format: str = "csv"):
                     media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 )
             else:  # По умолчанию CSV
-                # Сохраняем с BOM (Byte Order Mark) для распознавания кодировки Excel
-                csv_path = TEMP_DIR / f"{result_id}.csv"
-                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+                # Записываем файл потоково с BOM (Byte Order Mark) для распознавания кодировки Excel
+                csv_path = export_result_csv(result_id, TEMP_DIR / f"{result_id}.csv")
+                observe_io("write", "csv", csv_path)
                 
                 return FileResponse(
                     csv_path, 
@@ -209,50 +248,6 @@ async def export_dataset(result_id: str, format: str = "csv"):
     
     return await with_file_lock(result_id, process_export)
 
-# Функция для применения обратного масштабирования
-def apply_inverse_scaling(df: pd.DataFrame, columns: List[str], scaling_params: Dict[str, Any]) -> pd.DataFrame:
-    """
-    Применяет обратное масштабирование к указанным столбцам DataFrame.
-    
-    Args:
-        df: Исходный DataFrame
-        columns: Список столбцов для обратного масштабирования
-        scaling_params: Параметры масштабирования (тип и значения)
-    
-    Returns:
-        DataFrame с обратно масштабированными столбцами
-    """
-    result_df = df.copy()
-    
-    scaling_type = scaling_params.get("type")
-    
-    for column in columns:
-        if column not in df.columns:
-            continue
-            
-        if scaling_type == "standard":
-            # Обратное масштабирование для стандартизации (z-score)
-            mean = scaling_params.get("mean", {}).get(column)
-            std = scaling_params.get("std", {}).get(column)
-            if mean is not None and std is not None:
-                result_df[column] = result_df[column] * std + mean
-                
-        elif scaling_type == "minmax":
-            # Обратное масштабирование для MinMax
-            min_val = scaling_params.get("min", {}).get(column)
-            max_val = scaling_params.get("max", {}).get(column)
-            if min_val is not None and max_val is not None:
-                result_df[column] = result_df[column] * (max_val - min_val) + min_val
-                
-        elif scaling_type == "robust":
-            # Обратное масштабирование для RobustScaler
-            median = scaling_params.get("median", {}).get(column)
-            iqr = scaling_params.get("iqr", {}).get(column)
-            if median is not None and iqr is not None:
-                result_df[column] = result_df[column] * iqr + median
-    
-    return result_df
-
 @router.post("/{dataset_id}/apply-inverse-scaling")
 @handle_exceptions
 async def apply_inverse_scaling_to_dataset(dataset_id: str, data: dict):
@@ -305,19 +300,19 @@ async def apply_inverse_scaling_to_dataset(dataset_id: str, data: dict):
         if not file_path:
             raise HTTPException(status_code=404, detail="Набор данных не найден")
         
-        # Загружаем данные
-        df = await load_and_validate_dataframe(file_path, extension)
+        # Загружаем данные (копия, так как обратное преобразование изменяет DataFrame)
+        df = (await load_dataset(dataset_id, file_path, extension)).copy()
         
         # Создаем уникальный ID для результата
         result_id = str(uuid.uuid4())
         
-        # Применяем обратное масштабирование
-        from services.preprocessing_service import apply_inverse_scaling
-        processed_df = apply_inverse_scaling(df, columns, scaling_params)
+        # Применяем обратное преобразование
+        processed_df = apply_inverse_transform(df, columns, scaling_params)
         
         # Сохраняем результат
         result_path = get_processed_file_path(result_id)
         processed_df.to_csv(result_path, index=False)
+        observe_io("write", "csv", result_path)
         
         # Сохраняем метаданные
         metadata = {
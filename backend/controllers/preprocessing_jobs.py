@@ -0,0 +1,165 @@
+from fastapi import APIRouter, HTTPException, Request
+import json
+import uuid
+from fastapi.responses import FileResponse
+
+from services.job_status_service import get_stopped_path, job_progress, is_job_active
+from services.batch_service import submit_batch, batch_status, dispatch_batches
+from utils.file_utils import get_processed_file_path
+from utils.json_utils import convert_numpy_types
+from utils.error_utils import handle_exceptions
+from utils.lock_utils import with_file_lock, is_file_processing
+from utils.result_reader_utils import result_exists, load_result_metadata
+from utils.stack_profiler_utils import get_profile_path, require_admin
+from utils.job_scheduler_utils import job_queue_status, get_job
+from utils.job_journal_utils import load_job_record
+from utils.job_control_utils import request_cancel
+from models.schemas import BatchPreprocessingConfig
+
+router = APIRouter()
+
+@router.post("/batch")
+@handle_exceptions
+async def execute_batch(batch: BatchPreprocessingConfig):
+    """
+    Пакетная предобработка: один шаблон конфигурации для нескольких наборов данных.
+    
+    Шаблон проверяется один раз, столбцы шагов - по схеме каждого набора (не прошедшие
+    проверку наборы получают состояние rejected). Задачи пакета запускаются воркерами
+    пода, одновременно выполняется не больше max_concurrency задач пакета.
+    """
+    batch_id = submit_batch(batch)
+    # Первые задачи запускаются сразу, остальные - по мере освобождения мест
+    await dispatch_batches()
+    return convert_numpy_types(batch_status(batch_id))
+
+@router.get("/batch/{batch_id}")
+@handle_exceptions
+async def get_batch_status(batch_id: str):
+    """
+    Получение состояния пакетной предобработки: по каждому набору данных и сводного.
+    """
+    return convert_numpy_types(batch_status(batch_id))
+
+@router.post("/cancel/{result_id}")
+@handle_exceptions
+async def cancel_preprocessing(result_id: str):
+    """
+    Отмена задачи предобработки в очереди или в работе.
+    
+    Задача останавливается при ближайшей проверке (между шагами или частями
+    данных), частично записанный результат удаляется, статус становится cancelled.
+    """
+    if get_job(result_id) is None and not is_job_active(result_id):
+        result_path = get_processed_file_path(result_id)
+        finished = [result_path.parent / f"{result_id}_metadata.json",
+                    result_path.parent / f"{result_id}_error.txt", get_stopped_path(result_id)]
+        if any(path.exists() for path in finished):
+            raise HTTPException(status_code=409, detail="Задача уже завершена")
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    
+    request_cancel(result_id)
+    return {"result_id": result_id, "status": "cancelling"}
+
+@router.get("/status/{result_id}")
+@handle_exceptions
+async def get_preprocessing_status(result_id: str):
+    """
+    Получение статуса выполнения предобработки.
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        # Проверяем наличие метаданных о прогрессе
+        progress_path = get_processed_file_path(result_id).parent / f"{result_id}_progress.json"
+        if progress_path.exists():
+            try:
+                with open(progress_path, "r") as f:
+                    progress_data = json.load(f)
+                return convert_numpy_types({"status": "processing", "progress": progress_data})
+            except:
+                pass
+        return {"status": "processing"}
+    
+    async def check_status():
+        result_path = get_processed_file_path(result_id)
+        error_path = result_path.parent / f"{result_id}_error.txt"
+        
+        if error_path.exists():
+            with open(error_path, "r") as f:
+                error_message = f.read()
+            return convert_numpy_types({"status": "error", "message": error_message})
+        
+        # Отмененная или остановленная по лимиту времени задача: статус и шаг
+        stopped_path = get_stopped_path(result_id)
+        if stopped_path.exists():
+            with open(stopped_path, "r") as f:
+                return json.load(f)
+        
+        metadata_path = result_path.parent / f"{result_id}_metadata.json"
+        # Метаданные записываются после файла результата: до их появления задача еще выполняется
+        if result_exists(result_id) and metadata_path.exists():
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+            return convert_numpy_types({"status": "completed", "metadata": metadata})
+        
+        # Задача ожидает допуска: возвращаем позицию и причину ожидания
+        queue_status = job_queue_status(result_id)
+        if queue_status:
+            return convert_numpy_types({"status": "processing", "progress": queue_status})
+        
+        # Выполняемая или прерванная и ожидающая возобновления задача: прогресс по журналу
+        record = load_job_record(result_id)
+        if record is not None:
+            return convert_numpy_types({"status": "processing", "progress": job_progress(record)})
+        if result_exists(result_id):
+            return {"status": "processing"}
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    
+    return await with_file_lock(result_id, check_status)
+
+@router.get("/profile/{result_id}")
+@handle_exceptions
+async def get_processing_profile(result_id: str):
+    """
+    Профиль выполнения предобработки: время, память и размеры данных по шагам.
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+    
+    async def load_profile():
+        metadata = load_result_metadata(result_id)
+        if "profile" not in metadata:
+            raise HTTPException(status_code=404, detail="Профиль выполнения не найден")
+        
+        return convert_numpy_types({
+            "result_id": result_id,
+            "row_count": metadata.get("row_count"),
+            "column_count": metadata.get("column_count"),
+            "profile": metadata["profile"]
+        })
+    
+    return await with_file_lock(result_id, load_profile)
+
+@router.get("/flamegraph/{profile_id}")
+@handle_exceptions
+async def download_sampling_profile(profile_id: str, request: Request):
+    """
+    Скачивание профиля выборочного профилировщика в формате folded stacks
+    (для flamegraph.pl или speedscope). Доступно только администратору.
+    
+    Args:
+        profile_id: Идентификатор профиля (result_id задачи или X-Profile-Id запроса)
+    """
+    require_admin(request)
+    
+    try:
+        uuid.UUID(profile_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный идентификатор профиля")
+    
+    profile_path = get_profile_path(profile_id)
+    if not profile_path.exists():
+        raise HTTPException(status_code=404, detail="Профиль не найден или удален по сроку хранения")
+    
+    return FileResponse(profile_path, filename=f"profile_{profile_id}.folded", media_type="text/plain")
@@ -0,0 +1,175 @@
+from fastapi import APIRouter, HTTPException, BackgroundTasks
+import numpy as np
+import json
+import uuid
+from fastapi.concurrency import run_in_threadpool
+
+from utils.file_utils import get_processed_file_path
+from utils.json_utils import convert_numpy_types
+from utils.error_utils import handle_exceptions, log_error
+from utils.lock_utils import with_file_lock, is_file_processing
+from utils.inverse_utils import inverse_transform_with_changes
+from utils.result_reader_utils import (
+    result_exists, read_result_rows, count_result_rows, iter_result_columns, load_result_metadata
+)
+from utils.overlay_utils import write_overlay, compact_result, MAX_OVERLAY_DEPTH
+from utils.dataframe_cache_utils import load_result, slice_rows
+from utils.column_stats_utils import compute_column_stats, compute_array_column_stats
+from controllers.datasets import NumpyEncoder
+
+router = APIRouter()
+
+@router.get("/data/{result_id}")
+@handle_exceptions
+async def get_data_preview(result_id: str, limit: int = 100, offset: int = 0):
+    """
+    Получение предпросмотра обработанных данных с поддержкой пагинации.
+    
+    Args:
+        result_id: Идентификатор результата
+        limit: Количество строк для отображения
+        offset: Смещение (для пагинации)
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+    
+    async def load_preview():
+        if not result_exists(result_id):
+            raise HTTPException(status_code=404, detail="Результаты не найдены")
+        
+        try:
+            # Определяем общее количество строк (из манифеста хранилища, если оно есть)
+            total_count = count_result_rows(result_id)
+            
+            # Строки срезаются из отображенных в память хранилищ столбцов без копирования
+            # (для наложений столбцы объединяются с родительским результатом)
+            df = slice_rows(read_result_rows(result_id, offset=offset, limit=limit))
+            
+            # Заменяем бесконечные значения и NaN на None перед сериализацией
+            df = df.replace([np.inf, -np.inf], np.nan)
+            
+            # Применяем convert_numpy_types к результату перед возвратом
+            result = {
+                "preview": df.to_dict(orient="records"),
+                "total_count": total_count
+            }
+            return convert_numpy_types(result)
+        except Exception as e:
+            log_error(e, f"Ошибка загрузки предпросмотра данных для result_id={result_id}")
+            raise HTTPException(status_code=500, detail=f"Ошибка загрузки данных: {str(e)}")
+    
+    return await with_file_lock(result_id, load_preview)
+
+@router.get("/column-stats/{result_id}")
+@handle_exceptions
+async def get_result_column_stats(result_id: str):
+    """
+    Статистики столбцов результата (мода, для числовых также количество, среднее,
+    стандартное отклонение, минимум, максимум и квартили).
+
+    Если у результата есть хранилище столбцов, статистики считаются по отображенным
+    в память массивам по одному столбцу, без загрузки результата целиком.
+    """
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+    
+    async def load_stats():
+        if not result_exists(result_id):
+            raise HTTPException(status_code=404, detail="Результаты не найдены")
+        
+        columns = iter_result_columns(result_id)
+        if columns is not None:
+            column_stats = compute_array_column_stats(columns)
+        else:
+            metadata = load_result_metadata(result_id)
+            column_stats = compute_column_stats(load_result(result_id, metadata.get("sparse_columns")))
+        return convert_numpy_types({"result_id": result_id, "column_stats": column_stats})
+    
+    return await with_file_lock(result_id, load_stats)
+
+@router.post("/apply-inverse-scaling/{result_id}")
+@handle_exceptions
+async def apply_inverse_scaling_to_result(result_id: str, data: dict, background_tasks: BackgroundTasks):
+    """
+    Применяет обратное масштабирование к столбцам результата обработки.
+    
+    Новый результат хранится как наложение: ссылка на родительский результат
+    и только замененные или добавленные столбцы.
+    """
+    # Проверка обрабатывается ли файл
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Файл в данный момент обрабатывается"}
+    
+    columns = data.get("columns", [])
+    scaling_params = data.get("scaling_params")
+    
+    if not columns or not scaling_params:
+        raise HTTPException(status_code=400, detail="Необходимо указать столбцы и параметры масштабирования")
+    
+    async def process_inverse_scaling():
+        # Проверяем существование результата
+        result_path = get_processed_file_path(result_id)
+        
+        if not result_exists(result_id):
+            raise HTTPException(status_code=404, detail="Результат не найден")
+        
+        # Создаем уникальный ID для нового результата
+        new_result_id = str(uuid.uuid4())
+        
+        # Применяем обратное преобразование потоково и сохраняем только измененные столбцы
+        # (чтение родителя выполняется в пуле потоков, чтобы не блокировать цикл событий)
+        new_result_path = get_processed_file_path(new_result_id)
+        overlay_info = await run_in_threadpool(
+            write_overlay, result_id, new_result_id,
+            lambda chunk: inverse_transform_with_changes(chunk, columns, scaling_params)
+        )
+        
+        # Получаем исходные метаданные
+        metadata_path = result_path.parent / f"{result_id}_metadata.json"
+        if metadata_path.exists():
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+        else:
+            metadata = {}
+        
+        # Обновляем метаданные
+        metadata["parent_result_id"] = result_id
+        metadata["result_id"] = new_result_id
+        metadata["row_count"] = overlay_info["row_count"]
+        metadata["column_count"] = len(overlay_info["columns"])
+        metadata["columns"] = overlay_info["columns"]
+        metadata["overlay"] = overlay_info["overlay"]
+        metadata["inverse_scaling_applied"] = {
+            "columns": columns,
+            "scaling_params": scaling_params
+        }
+        
+        # Сохраняем метаданные
+        new_metadata_path = new_result_path.parent / f"{new_result_id}_metadata.json"
+        with open(new_metadata_path, "w") as f:
+            json.dump(metadata, f, cls=NumpyEncoder)
+        
+        # Длинные цепочки наложений уплотняем в фоне в самостоятельный файл
+        if overlay_info["overlay"] and overlay_info["overlay"]["depth"] > MAX_OVERLAY_DEPTH:
+            async def compact():
+                await with_file_lock(new_result_id, run_in_threadpool, compact_overlay_chain, new_result_id)
+            background_tasks.add_task(compact)
+        
+        # Применяем convert_numpy_types к результату перед возвратом
+        return convert_numpy_types({
+            "result_id": new_result_id,
+            "status": "completed",
+            "metadata": metadata
+        })
+    
+    return await with_file_lock(result_id, process_inverse_scaling)
+
+def compact_overlay_chain(result_id: str):
+    """
+    Фоновое уплотнение цепочки наложений результата (выполняется в пуле потоков).
+    """
+    try:
+        compact_result(result_id)
+    except Exception as e:
+        log_error(e, f"Ошибка уплотнения результата result_id={result_id}")
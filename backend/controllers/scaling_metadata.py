@@ -0,0 +1,280 @@
+from fastapi import APIRouter, HTTPException, File, UploadFile, Form
+import json
+import uuid
+import time
+import os
+from fastapi.responses import FileResponse
+
+from utils.file_utils import get_processed_file_path
+from utils.error_utils import handle_exceptions, log_error
+from utils.lock_utils import with_file_lock, is_file_processing
+from utils.result_reader_utils import result_exists
+from controllers.datasets import NumpyEncoder
+
+router = APIRouter()
+
+@router.get("/export-metadata/{result_id}")
+@handle_exceptions
+async def export_metadata(result_id: str):
+    """
+    Экспорт метаданных масштабирования в отдельный файл.
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+        
+    async def process_metadata_export():
+        try:
+            # Получаем путь к метаданным
+            metadata_path = get_processed_file_path(result_id).parent / f"{result_id}_metadata.json"
+            
+            if not metadata_path.exists():
+                raise HTTPException(status_code=404, detail="Метаданные не найдены")
+            
+            # Загружаем метаданные
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            
+            # Извлекаем только параметры масштабирования
+            scaling_params = metadata.get("scaling_params", {})
+            
+            if not scaling_params:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Параметры масштабирования не найдены в метаданных"
+                )
+            
+            # Подготавливаем упрощенный объект метаданных для экспорта
+            export_metadata = {
+                "result_id": result_id,
+                "scaling_params": scaling_params,
+                "columns": metadata.get("columns", []),
+                "exported_at": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            # Сохраняем во временный файл
+            temp_dir = get_processed_file_path(result_id).parent
+            temp_path = temp_dir / f"scaling_metadata_{result_id}.json"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(export_metadata, f, ensure_ascii=False, indent=2)
+            
+            return FileResponse(
+                temp_path, 
+                filename=f"scaling_metadata_{result_id}.json",
+                media_type="application/json",
+                headers={
+                    "Content-Disposition": f'attachment; filename="scaling_metadata_{result_id}.json"'
+                }
+            )
+        
+        except HTTPException:
+            raise
+        except Exception as e:
+            log_error(e, "Ошибка экспорта метаданных")
+            raise HTTPException(status_code=500, detail=f"Ошибка сервера: {str(e)}")
+    
+    return await with_file_lock(result_id, process_metadata_export)
+
+@router.post("/import-metadata")
+@handle_exceptions
+async def import_metadata(
+    file: UploadFile = File(...),
+    result_id: str = Form(...)
+):
+    """
+    Импорт метаданных масштабирования из файла и их применение к результату.
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+    
+    async def process_metadata_import():
+        try:
+            # Проверяем существование результата
+            result_path = get_processed_file_path(result_id)
+            
+            if not result_exists(result_id):
+                raise HTTPException(status_code=404, detail="Результаты не найдены")
+            
+            # Используем директорию результата в качестве временной директории
+            temp_dir = result_path.parent
+            temp_metadata_path = temp_dir / f"temp_metadata_{str(uuid.uuid4())}.json"
+            
+            # Сохраняем загруженный файл метаданных во временную директорию
+            with open(temp_metadata_path, "wb") as buffer:
+                content = await file.read()
+                buffer.write(content)
+            
+            # Загружаем метаданные из временного файла
+            with open(temp_metadata_path, "r", encoding="utf-8") as f:
+                imported_metadata = json.load(f)
+            
+            # Проверяем наличие параметров масштабирования
+            if "scaling_params" not in imported_metadata:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Файл не содержит параметров масштабирования"
+                )
+            
+            # Загружаем существующие метаданные результата
+            metadata_path = result_path.parent / f"{result_id}_metadata.json"
+            
+            if metadata_path.exists():
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    existing_metadata = json.load(f)
+            else:
+                # Создаем базовые метаданные, если они не существуют
+                existing_metadata = {
+                    "result_id": result_id,
+                    "row_count": 0,
+                    "column_count": 0,
+                    "columns": []
+                }
+            
+            # Обновляем метаданные с импортированными параметрами масштабирования
+            existing_metadata["scaling_params"] = imported_metadata["scaling_params"]
+            existing_metadata["imported_metadata"] = True
+            existing_metadata["imported_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            
+            # Сохраняем обновленные метаданные
+            with open(metadata_path, "w", encoding="utf-8") as f:
+                json.dump(existing_metadata, f, cls=NumpyEncoder, ensure_ascii=False)
+            
+            # Удаляем временный файл
+            os.remove(temp_metadata_path)
+            
+            return {
+                "status": "success",
+                "message": "Метаданные успешно импортированы",
+                "scaling_params": imported_metadata["scaling_params"]
+            }
+        
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Некорректный формат JSON файла")
+        except HTTPException:
+            raise
+        except Exception as e:
+            log_error(e, "Ошибка импорта метаданных")
+            raise HTTPException(status_code=500, detail=f"Ошибка сервера: {str(e)}")
+    
+    return await with_file_lock(result_id, process_metadata_import)
+
+@router.post("/set-scaling-params/{result_id}")
+@handle_exceptions
+async def set_scaling_params(result_id: str, params: dict):
+    """
+    Установка параметров масштабирования вручную.
+    """
+    # Проверяем, обрабатывается ли файл в данный момент
+    if is_file_processing(result_id):
+        return {"status": "processing", "message": "Данные в данный момент обрабатываются"}
+    
+    if "method" not in params or "columns" not in params or "parameters" not in params:
+        raise HTTPException(
+            status_code=400, 
+            detail="Необходимо указать метод, столбцы и параметры масштабирования"
+        )
+    
+    async def process_manual_params():
+        try:
+            # Проверяем существование результата
+            result_path = get_processed_file_path(result_id)
+            
+            if not result_exists(result_id):
+                raise HTTPException(status_code=404, detail="Результаты не найдены")
+            
+            # Загружаем существующие метаданные результата
+            metadata_path = result_path.parent / f"{result_id}_metadata.json"
+            
+            if metadata_path.exists():
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            else:
+                # Создаем базовые метаданные, если они не существуют
+                metadata = {
+                    "result_id": result_id,
+                    "row_count": 0,
+                    "column_count": 0,
+                    "columns": []
+                }
+            
+            # Проверяем корректность параметров в зависимости от метода
+            method = params["method"]
+            columns = params["columns"]
+            parameters = params["parameters"]
+            
+            # Формируем параметры масштабирования в правильном формате
+            scaling_params = {
+                "standardization": {
+                    "method": method,
+                    "columns": columns,
+                    "params": {}
+                }
+            }
+            
+            # Проверяем и добавляем параметры для каждого столбца
+            for column, column_params in parameters.items():
+                if column not in columns:
+                    continue
+                
+                if method == "standard":
+                    # Проверяем наличие mean и std
+                    if "mean" not in column_params or "std" not in column_params:
+                        raise HTTPException(
+                            status_code=400, 
+                            detail=f"Для столбца {column} необходимо указать mean и std"
+                        )
+                    
+                    scaling_params["standardization"]["params"][column] = {
+                        "mean": float(column_params["mean"]),
+                        "std": float(column_params["std"])
+                    }
+                
+                elif method == "minmax":
+                    # Проверяем наличие min и max
+                    if "min" not in column_params or "max" not in column_params:
+                        raise HTTPException(
+                            status_code=400, 
+                            detail=f"Для столбца {column} необходимо указать min и max"
+                        )
+                    
+                    scaling_params["standardization"]["params"][column] = {
+                        "min": float(column_params["min"]),
+                        "max": float(column_params["max"])
+                    }
+                
+                elif method == "robust":
+                    # Проверяем наличие median и iqr
+                    if "median" not in column_params or "iqr" not in column_params:
+                        raise HTTPException(
+                            status_code=400, 
+                            detail=f"Для столбца {column} необходимо указать median и iqr"
+                        )
+                    
+                    scaling_params["standardization"]["params"][column] = {
+                        "median": float(column_params["median"]),
+                        "iqr": float(column_params["iqr"])
+                    }
+            
+            # Обновляем метаданные с указанными параметрами масштабирования
+            metadata["scaling_params"] = scaling_params
+            metadata["manual_params"] = True
+            metadata["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            
+            # Сохраняем обновленные метаданные
+            with open(metadata_path, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, cls=NumpyEncoder, ensure_ascii=False)
+            
+            return {
+                "status": "success",
+                "message": "Параметры масштабирования успешно установлены",
+                "scaling_params": scaling_params
+            }
+        
+        except HTTPException:
+            raise
+        except Exception as e:
+            log_error(e, "Ошибка установки параметров масштабирования")
+            raise HTTPException(status_code=500, detail=f"Ошибка сервера: {str(e)}")
+    
+    return await with_file_lock(result_id, process_manual_params)
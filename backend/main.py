@@ -5,6 +5,7 @@ import logging
 from logging.handlers import RotatingFileHandler
 import time
 import json
+import uuid
 import numpy as np
 from fastapi.encoders import jsonable_encoder
 
@@ -12,7 +13,7 @@ from fastapi.encoders import jsonable_encoder
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -66,15 +67,47 @@ app = FastAPI(
     json_encoder=NumpyJSONEncoder  # Добавляем собственный кодировщик
 )
 
+from utils.metrics_utils import inc_counter, observe, render_metrics, start_metrics_writer, stop_metrics_writer
+from utils.stack_profiler_utils import SamplingProfiler, profiling_requested, save_profile
+from utils.dataframe_cache_utils import dataframe_cache
+
 # Middleware для измерения времени выполнения запросов
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    inc_counter("http_requests_in_progress", 1)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        process_time = time.time() - start_time
+        inc_counter("http_requests_in_progress", -1)
+        # Шаблон маршрута вместо пути, чтобы идентификаторы не попадали в метки
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        observe("http_request_duration_seconds", process_time, method=request.method, route=path)
+        inc_counter("http_requests_total", method=request.method, route=path, status=status_code)
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
+# Профилирование отдельного запроса по флагу администратора (X-Profile: 1 или ?profile=1)
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    if not profiling_requested(request):
+        return await call_next(request)
+    
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+    profile_id = str(uuid.uuid4())
+    save_profile(profile_id, profiler)
+    response.headers["X-Profile-Id"] = profile_id
+    return response
+
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
@@ -112,10 +145,16 @@ async def general_exception_handler(request, exc):
 # Импорт маршрутов
 from controllers.datasets import router as datasets_router
 from controllers.preprocessing import router as preprocessing_router
+from controllers.preprocessing_jobs import router as preprocessing_jobs_router
+from controllers.preprocessing_results import router as preprocessing_results_router
+from controllers.scaling_metadata import router as scaling_metadata_router
 
 # Добавление маршрутов к приложению
 app.include_router(datasets_router, prefix="/api/datasets", tags=["datasets"])
 app.include_router(preprocessing_router, prefix="/api/preprocessing", tags=["preprocessing"])
+app.include_router(preprocessing_jobs_router, prefix="/api/preprocessing", tags=["preprocessing"])
+app.include_router(preprocessing_results_router, prefix="/api/preprocessing", tags=["preprocessing"])
+app.include_router(scaling_metadata_router, prefix="/api/preprocessing", tags=["preprocessing"])
 
 @app.get("/")
 async def read_root():
@@ -129,21 +168,54 @@ async def health_check():
     """
     return {"status": "healthy", "timestamp": time.time()}
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Метрики всех воркеров в текстовом формате Prometheus.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Создание директорий для данных
 @app.on_event("startup")
 async def startup_event():
     # Директории для хранения данных
-    from config.settings import UPLOAD_DIR, PROCESSED_DIR, TEMP_DIR
+    from config.settings import UPLOAD_DIR, PROCESSED_DIR, TEMP_DIR, METRICS_DIR, JOB_JOURNAL_DIR, WARMUP_METHODS
+    from utils.lazy_import_utils import start_warm_up
+    from utils.job_journal_utils import start_heartbeat
+    from services.job_recovery_service import start_job_recovery
+    from services.batch_service import start_batch_dispatcher
     
     # Создаем директории, если они не существуют
-    for directory in [UPLOAD_DIR, PROCESSED_DIR, TEMP_DIR]:
+    for directory in [UPLOAD_DIR, PROCESSED_DIR, TEMP_DIR, METRICS_DIR, JOB_JOURNAL_DIR]:
         directory.mkdir(parents=True, exist_ok=True)
     
+    # Задачи воркера отмечают активность в журнале; прерванные задачи других воркеров возобновляются
+    start_heartbeat()
+    start_job_recovery()
+    start_batch_dispatcher()
+    
+    # Снимки метрик воркера объединяются эндпоинтом /metrics
+    start_metrics_writer()
+    
+    # Зависимости методов загружаются лениво; при WARMUP_METHODS=1 - заранее в фоне
+    if WARMUP_METHODS:
+        start_warm_up()
+    
     logger.info("Приложение запущено, директории созданы")
 
 # Очистка временных данных при завершении
 @app.on_event("shutdown")
 async def shutdown_event():
+    from utils.job_journal_utils import stop_heartbeat
+    from services.job_recovery_service import stop_job_recovery
+    from services.batch_service import stop_batch_dispatcher
+    
+    # Незавершенные задачи и пакеты остаются в журнале и продолжаются после перезапуска
+    await stop_batch_dispatcher()
+    await stop_job_recovery()
+    stop_heartbeat()
+    stop_metrics_writer()
+    dataframe_cache.release_shared()
     try:
         # Очистка временных файлов
         TEMP_DIR = Path("./data/temp")
@@ -19,20 +19,56 @@ class PreprocessingMethodConfig(BaseModel):
     method_id: str
     parameters: Optional[Dict[str, Any]] = {}
 
-class PreprocessingConfig(BaseModel):
+UUID_PATTERN = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+
+class PreprocessingTemplate(BaseModel):
+    """Модель для шагов предобработки без привязки к набору данных"""
+    methods: List[PreprocessingMethodConfig]
+    # Лимиты задачи в секундах (не больше лимитов сервера JOB_TIME_LIMIT и JOB_CPU_TIME_LIMIT)
+    time_limit_seconds: Optional[float] = None
+    cpu_time_limit_seconds: Optional[float] = None
+    
+    @validator('methods')
+    def validate_methods(cls, v):
+        if not v:
+            raise ValueError('Необходимо указать хотя бы один метод предобработки')
+        return v
+    
+    @validator('time_limit_seconds', 'cpu_time_limit_seconds')
+    def validate_time_limits(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('Лимит времени должен быть положительным')
+        return v
+
+class PreprocessingConfig(PreprocessingTemplate):
     """Модель для конфигурации предобработки"""
     dataset_id: str
-    methods: List[PreprocessingMethodConfig]
     
     @validator('dataset_id')
     def validate_dataset_id(cls, v):
-        pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if not re.match(pattern, v):
+        if not re.match(UUID_PATTERN, v):
             raise ValueError('dataset_id должен быть валидным UUID')
         return v
+
+class BatchPreprocessingConfig(BaseModel):
+    """Модель для пакетной предобработки: один шаблон для нескольких наборов данных"""
+    template: PreprocessingTemplate
+    dataset_ids: List[str]
+    # Одновременно выполняемые задачи пакета (не больше BATCH_MAX_CONCURRENCY)
+    max_concurrency: Optional[int] = None
     
-    @validator('methods')
-    def validate_methods(cls, v):
+    @validator('dataset_ids')
+    def validate_dataset_ids(cls, v):
         if not v:
-            raise ValueError('Необходимо указать хотя бы один метод предобработки')
-        return v
\ No newline at end of file
+            raise ValueError('Необходимо указать хотя бы один набор данных')
+        if len(set(v)) != len(v):
+            raise ValueError('Наборы данных в пакете не должны повторяться')
+        if not all(re.match(UUID_PATTERN, dataset_id) for dataset_id in v):
+            raise ValueError('dataset_ids должны быть валидными UUID')
+        return v
+    
+    @validator('max_concurrency')
+    def validate_max_concurrency(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('max_concurrency должен быть положительным')
+        return v
@@ -0,0 +1,212 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+from typing import Dict, Any, List, Optional
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from config.settings import BATCH_MAX_DATASETS, BATCH_MAX_CONCURRENCY
+from services.preprocessing_service import get_preprocessing_methods
+from services.job_service import find_dataset_file, submit_preprocessing_job, start_job
+from services.job_status_service import job_progress
+from utils.batch_utils import create_batch, load_batch, save_batch, locked_batches, pending_batches
+from utils.job_journal_utils import load_job_record, ACTIVE_STATES
+from utils.job_scheduler_utils import job_queue_status, local_jobs
+from utils.validation_utils import require_valid_parameters, validate_config_columns
+from utils.error_utils import log_error
+from models.schemas import BatchPreprocessingConfig
+
+# Интервал запуска задач пакетов воркером (секунды, со случайным сдвигом между воркерами)
+DISPATCH_INTERVAL = 1.0
+# Время, в течение которого свободное место пакета могут занять только воркеры без задач (секунды)
+IDLE_WORKER_PRIORITY = 2 * DISPATCH_INTERVAL
+
+_dispatch_task: Optional[asyncio.Task] = None
+
+def _load_dataset_metadata(dataset_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        file_path, _ = find_dataset_file(dataset_id)
+    except HTTPException:
+        return None
+    metadata_path = file_path.parent / f"{dataset_id}_metadata.json"
+    if not metadata_path.exists():
+        return {}
+    with open(metadata_path, "r") as f:
+        return json.load(f)
+
+def submit_batch(request: BatchPreprocessingConfig) -> str:
+    """
+    Проверяет шаблон и создает пакет задач предобработки.
+
+    Шаблон проверяется по каталогу методов один раз, столбцы шагов - по сохраненной
+    схеме каждого набора. Наборы, не прошедшие проверку, получают состояние rejected,
+    остальные запускаются воркерами по мере освобождения мест пакета (dispatch_batches).
+
+    Returns:
+        str: Идентификатор пакета
+
+    Raises:
+        HTTPException: 413, если наборов больше BATCH_MAX_DATASETS; 422, если шаблон
+        некорректен или ни один набор не прошел проверку
+    """
+    if len(request.dataset_ids) > BATCH_MAX_DATASETS:
+        raise HTTPException(status_code=413,
+                            detail=f"В пакете не больше {BATCH_MAX_DATASETS} наборов данных")
+    template = request.template.dict()
+    catalogue = get_preprocessing_methods()
+    require_valid_parameters(template["methods"], catalogue)
+
+    items = []
+    for dataset_id in request.dataset_ids:
+        item = {"dataset_id": dataset_id, "state": "pending", "result_id": None, "message": None}
+        dataset_metadata = _load_dataset_metadata(dataset_id)
+        if dataset_metadata is None:
+            errors = ["Набор данных не найден"]
+        else:
+            errors = validate_config_columns(template["methods"], catalogue, dataset_metadata)
+        if errors:
+            item.update(state="rejected", message="; ".join(errors))
+        items.append(item)
+    if all(item["state"] == "rejected" for item in items):
+        raise HTTPException(
+            status_code=422,
+            detail="Ни один набор данных не прошел проверку: " +
+                   "; ".join(f"{item['dataset_id']}: {item['message']}" for item in items)
+        )
+
+    max_concurrency = min(request.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    batch_id = str(uuid.uuid4())
+    create_batch(batch_id, template, items, max_concurrency)
+    return batch_id
+
+def _item_state(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Состояние набора данных пакета: до запуска - из пакета, после - из журнала задач.
+    """
+    state = {"dataset_id": item["dataset_id"], "result_id": item["result_id"],
+             "state": item["state"], "percent": 0, "message": item["message"]}
+    if item["state"] != "submitted":
+        return state
+    record = load_job_record(item["result_id"])
+    if record is None:
+        state.update(state="failed", message="Задача не найдена в журнале")
+        return state
+    state["state"] = record["state"]
+    if record["state"] == "completed":
+        state["percent"] = 100
+    elif record["state"] == "running":
+        progress = job_progress(record)
+        state.update(percent=progress["percent"], step=progress["step"])
+    elif record["state"] == "queued":
+        queue_status = job_queue_status(item["result_id"])
+        if queue_status:
+            state["message"] = queue_status["message"]
+    else:
+        state["message"] = record.get("message")
+    return state
+
+def batch_status(batch_id: str) -> Dict[str, Any]:
+    """
+    Возвращает состояние наборов данных пакета и сводку по пакету.
+
+    Raises:
+        HTTPException: 404, если пакет не найден
+    """
+    record = load_batch(batch_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Пакет не найден")
+    datasets = [_item_state(item) for item in record["items"]]
+    summary: Dict[str, int] = {"total": len(datasets)}
+    for dataset in datasets:
+        summary[dataset["state"]] = summary.get(dataset["state"], 0) + 1
+    unfinished = sum(1 for dataset in datasets if dataset["state"] in ("pending", *ACTIVE_STATES))
+    # Процент по принятым наборам: завершенные (в том числе с ошибкой) учитываются полностью, выполняемые - по шагам
+    accepted = [dataset for dataset in datasets if dataset["state"] != "rejected"]
+    done = sum(dataset["percent"] if dataset["state"] in ("pending", *ACTIVE_STATES) else 100
+               for dataset in accepted)
+    return {
+        "batch_id": batch_id,
+        "status": "processing" if unfinished else "completed",
+        "max_concurrency": record["max_concurrency"],
+        "created_at": record["created_at"],
+        "summary": summary,
+        "percent": round(done / len(accepted)) if accepted else 100,
+        "datasets": datasets
+    }
+
+def _claim_batch_items() -> List[str]:
+    """
+    Запускает в текущем воркере по одной ожидающей задаче каждого пакета, у которого
+    есть свободные места (max_concurrency задач в очереди и в работе на всех воркерах).
+
+    Returns:
+        List[str]: Идентификаторы запущенных задач
+    """
+    started = []
+    with locked_batches():
+        busy = local_jobs() > 0
+        for record in pending_batches():
+            jobs = [load_job_record(item["result_id"]) for item in record["items"] if item["state"] == "submitted"]
+            in_flight = sum(1 for job in jobs if job is not None and job["state"] in ACTIVE_STATES)
+            if in_flight >= record["max_concurrency"]:
+                if record.pop("free_since", None) is not None:
+                    save_batch(record)
+                continue
+            # Свободное место сначала достается воркерам без задач, затем любому воркеру
+            if "free_since" not in record:
+                record["free_since"] = time.time()
+                save_batch(record)
+            if busy and time.time() - record["free_since"] < IDLE_WORKER_PRIORITY:
+                continue
+            del record["free_since"]
+            item = next(item for item in record["items"] if item["state"] == "pending")
+            config = dict(record["template"], dataset_id=item["dataset_id"])
+            try:
+                item["result_id"] = submit_preprocessing_job(config)
+                item["state"] = "submitted"
+            except HTTPException as e:
+                if e.status_code == 503:
+                    # Очередь заполнена: набор запускается при следующей попытке
+                    break
+                item.update(state="failed", message=e.detail)
+            save_batch(record)
+            if item["state"] == "submitted":
+                started.append(item["result_id"])
+    return started
+
+async def dispatch_batches():
+    """
+    Запускает задачи пакетов, для которых освободились места.
+    """
+    for result_id in await run_in_threadpool(_claim_batch_items):
+        start_job(result_id)
+
+async def _dispatch_loop():
+    while True:
+        try:
+            await dispatch_batches()
+        except Exception as e:
+            log_error(e, "Ошибка при запуске задач пакетов")
+        # Случайный сдвиг распределяет задачи пакета между воркерами
+        await asyncio.sleep(DISPATCH_INTERVAL * random.uniform(0.5, 1.5))
+
+def start_batch_dispatcher():
+    """
+    Запускает периодический запуск задач пакетов в воркере.
+    """
+    global _dispatch_task
+    if _dispatch_task is None:
+        _dispatch_task = asyncio.get_running_loop().create_task(_dispatch_loop())
+
+async def stop_batch_dispatcher():
+    global _dispatch_task
+    if _dispatch_task is None:
+        return
+    _dispatch_task.cancel()
+    try:
+        await _dispatch_task
+    except asyncio.CancelledError:
+        pass
+    _dispatch_task = None
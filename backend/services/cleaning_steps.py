@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Optional
+
+from utils.outlier_utils import handle_outliers
+from utils.encoding_utils import onehot_encode, hash_encode, label_encode
+from utils.pca_utils import apply_pca
+from utils.scaling_utils import scale_columns, SCALING_METHODS
+from utils.inverse_utils import apply_inverse_transform
+from utils.column_parallel_utils import map_columns
+from utils.column_stats_utils import fill_value_from_stats, outlier_bounds_from_stats, scaling_stats_from_cache
+
+def _fill_missing(series: pd.Series, strategy: str, cached_fill: Any) -> Optional[pd.Series]:
+    """
+    Заполняет пропуски одного столбца; None, если столбец не изменяется.
+    """
+    if not series.isna().any():
+        return None
+    if strategy == "mean" and pd.api.types.is_numeric_dtype(series):
+        return series.fillna(cached_fill if cached_fill is not None else series.mean())
+    if strategy == "median" and pd.api.types.is_numeric_dtype(series):
+        return series.fillna(cached_fill if cached_fill is not None else series.median())
+    if strategy == "mode":
+        # Для категориальных переменных используем моду
+        return series.fillna(cached_fill if cached_fill is not None else series.mode()[0])
+    return None
+
+def missing_values_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                        step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Заполнение или удаление пропущенных значений.
+    """
+    strategy = parameters.get("strategy", "mean")
+    columns = parameters.get("columns", [])
+    
+    # Если столбцы не указаны, применяем ко всем числовым
+    if not columns:
+        columns = processed_df.select_dtypes(include=np.number).columns.tolist()
+    
+    columns = [col for col in columns if col in processed_df.columns]
+    if strategy == "drop_rows":
+        for col in columns:
+            if processed_df[col].isna().any():
+                processed_df = processed_df.dropna(subset=[col])
+        return processed_df
+    
+    # Столбцы заполняются независимо друг от друга, поэтому обрабатываются параллельно
+    filled = map_columns(
+        lambda col, series: _fill_missing(series, strategy, fill_value_from_stats(step_stats, col, strategy)),
+        processed_df, columns
+    )
+    for col, series in zip(columns, filled):
+        if series is not None:
+            processed_df[col] = series
+    return processed_df
+
+def outliers_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                  step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Обработка выбросов: удаление строк, совместная обработка или ограничение значений.
+    """
+    strategy = parameters.get("strategy", "zscore")
+    threshold = parameters.get("threshold", 3.0)
+    mode = parameters.get("mode", "sequential")
+    columns = parameters.get("columns", [])
+    
+    # Если столбцы не указаны, применяем ко всем числовым
+    if not columns:
+        columns = processed_df.select_dtypes(include=np.number).columns.tolist()
+    
+    # Логические столбцы не содержат выбросов и не обрабатываются ни в одном режиме
+    columns = [col for col in columns if col in processed_df.columns
+               and pd.api.types.is_numeric_dtype(processed_df[col])
+               and not pd.api.types.is_bool_dtype(processed_df[col])]
+    
+    if mode in ("joint", "clip"):
+        # Векторизованная обработка всех столбцов за один проход
+        valid_columns = columns
+        if not valid_columns:
+            return processed_df
+        
+        bounds = parameters.get("bounds") or outlier_bounds_from_stats(
+            step_stats, valid_columns, strategy, threshold)
+        processed_df, outlier_params = handle_outliers(
+            processed_df, valid_columns, strategy, threshold,
+            mode=mode, bounds=bounds
+        )
+        fitted_params["outliers"] = outlier_params
+        return processed_df
+    
+    # До удаления строк по первому столбцу подходят статистики полного набора
+    cached_bounds = outlier_bounds_from_stats(step_stats, columns[:1], strategy, threshold) or {}
+    for col in columns:
+        if col in processed_df.columns and pd.api.types.is_numeric_dtype(processed_df[col]):
+            if col in cached_bounds:
+                lower, upper = cached_bounds[col]["lower"], cached_bounds[col]["upper"]
+                if strategy == "zscore":
+                    keep = (processed_df[col] > lower) & (processed_df[col] < upper)
+                else:
+                    keep = (processed_df[col] >= lower) & (processed_df[col] <= upper)
+                processed_df = processed_df[keep]
+            elif strategy == "zscore":
+                # Z-оценка для обнаружения выбросов
+                z_scores = np.abs((processed_df[col] - processed_df[col].mean()) / processed_df[col].std())
+                processed_df = processed_df[z_scores < threshold]
+            elif strategy == "iqr":
+                # Межквартильный размах для обнаружения выбросов
+                Q1 = processed_df[col].quantile(0.25)
+                Q3 = processed_df[col].quantile(0.75)
+                IQR = Q3 - Q1
+                lower_bound = Q1 - threshold * IQR
+                upper_bound = Q3 + threshold * IQR
+                processed_df = processed_df[(processed_df[col] >= lower_bound) & 
+                                           (processed_df[col] <= upper_bound)]
+    return processed_df
+
+def standardization_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                         step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Масштабирование числовых столбцов.
+    """
+    strategy = parameters.get("strategy", "standard")
+    columns = parameters.get("columns", [])
+    # Если столбцы не указаны, применяем ко всем числовым
+    if not columns:
+        columns = processed_df.select_dtypes(include=np.number).columns.tolist()
+    
+    if not columns:
+        # Пропускаем, если нет числовых столбцов
+        return processed_df
+    
+    # Проверяем наличие столбцов в DataFrame
+    valid_columns = [col for col in columns if col in processed_df.columns]
+    if not valid_columns or strategy not in SCALING_METHODS:
+        return processed_df
+    
+    # Статистики и масштабирование всех столбцов за один векторизованный проход
+    processed_df, scaling_params = scale_columns(
+        processed_df, valid_columns, strategy, dtype=parameters.get("dtype", "float64"),
+        stats=scaling_stats_from_cache(step_stats, valid_columns, strategy)
+    )
+    
+    fitted_params["standardization"] = scaling_params
+    return processed_df
+
+def categorical_encoding_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                              step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Кодирование категориальных столбцов.
+    """
+    strategy = parameters.get("strategy", "onehot")
+    columns = parameters.get("columns", [])
+    
+    # Если столбцы не указаны, применяем ко всем категориальным
+    if not columns:
+        columns = processed_df.select_dtypes(include=['object', 'category']).columns.tolist()
+    
+    valid_columns = [col for col in columns if col in processed_df.columns]
+    if not valid_columns:
+        return processed_df
+    
+    if strategy == "onehot":
+        # One-hot кодирование всех столбцов одной операцией
+        processed_df, encoding_params = onehot_encode(
+            processed_df, valid_columns,
+            max_categories=parameters.get("max_categories"),
+            min_frequency=parameters.get("min_frequency"),
+            sparse=parameters.get("output", "dense") == "sparse"
+        )
+    elif strategy == "hashing":
+        # Хеширование признаков для столбцов с большим числом категорий
+        processed_df, encoding_params = hash_encode(
+            processed_df, valid_columns,
+            n_features=int(parameters.get("n_features", 32)),
+            sparse=parameters.get("output", "dense") == "sparse"
+        )
+    elif strategy == "label":
+        # Label кодирование
+        processed_df, encoding_params = label_encode(processed_df, valid_columns)
+    else:
+        return processed_df
+    
+    fitted_params["categorical_encoding"] = encoding_params
+    return processed_df
+
+def pca_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+             step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Снижение размерности методом главных компонент.
+    """
+    columns = parameters.get("columns", [])
+    
+    # Если столбцы не указаны, применяем ко всем числовым
+    if not columns:
+        columns = processed_df.select_dtypes(include=np.number).columns.tolist()
+    
+    if len(columns) > 1:
+        # Проверяем наличие столбцов в DataFrame
+        valid_columns = [col for col in columns if col in processed_df.columns]
+        if len(valid_columns) < 2:
+            return processed_df
+        
+        # Обучаем PCA (или используем сохраненные параметры) и заменяем столбцы компонентами
+        processed_df, pca_params = apply_pca(processed_df, valid_columns, parameters)
+        if pca_params:
+            fitted_params["pca"] = pca_params
+    return processed_df
+
+def inverse_scaling_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                         step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Обратное преобразование (PCA, масштабирование, метки).
+    """
+    scaling_params = parameters.get("scaling_params", {})
+    if not scaling_params:
+        return processed_df
+    
+    # Обратное преобразование единым движком (PCA, масштабирование, метки)
+    processed_df = apply_inverse_transform(processed_df, parameters.get("columns") or None, scaling_params)
+    return processed_df
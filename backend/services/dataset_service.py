@@ -1,12 +1,24 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 import logging
 
-def analyze_dataset(df: pd.DataFrame) -> Dict[str, Any]:
+from config.settings import SAMPLE_SIZE
+from utils.column_stats_utils import compute_column_stats
+from utils.dataframe_cache_utils import load_dataset_sync
+from utils.sample_utils import reservoir_sample, iter_frame_chunks, get_sample_path
+
+def analyze_dataset(df: pd.DataFrame, sample_df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Анализ загруженного набора данных.
+    
+    Количества и числовые характеристики считаются по полному набору, а распознавание
+    дат и временных рядов для рекомендаций - по выборке (если она передана).
     """
+    if sample_df is None:
+        sample_df = df
+    
     analysis = {
         "row_count": len(df),
         "column_count": len(df.columns),
@@ -18,16 +30,15 @@ def analyze_dataset(df: pd.DataFrame) -> Dict[str, Any]:
     # Анализ столбцов
     for col in df.columns:
         col_data = df[col]
+        sample_data = sample_df[col]
         is_numeric = pd.api.types.is_numeric_dtype(col_data)
         is_datetime = pd.api.types.is_datetime64_dtype(col_data)
         
-        # Пытаемся автоматически определить даты, если они не распознаны как даты
+        # Пытаемся автоматически определить даты по выборке, если они не распознаны как даты
         if not is_datetime and not is_numeric:
             try:
-                converted_dates = pd.to_datetime(col_data, errors='raise')
+                sample_data = pd.to_datetime(sample_data, errors='raise')
                 is_datetime = True
-                # Обновляем DataFrame с конвертированными значениями дат
-                df[col] = converted_dates
             except:
                 pass
         
@@ -48,10 +59,10 @@ def analyze_dataset(df: pd.DataFrame) -> Dict[str, Any]:
             })
         
         # Проверка на временной ряд
-        if is_datetime and len(df) > 10:
-            # Проверяем, отсортированы ли данные по времени
-            sorted_dates = col_data.sort_values()
-            if sorted_dates.equals(col_data) or sorted_dates.equals(col_data.iloc[::-1]):
+        if is_datetime and len(sample_data) > 10:
+            # Проверяем, отсортированы ли данные по времени (выборка сохраняет порядок строк)
+            sorted_dates = sample_data.sort_values()
+            if sorted_dates.equals(sample_data) or sorted_dates.equals(sample_data.iloc[::-1]):
                 col_info["is_time_series"] = True
         
         analysis["columns"].append(col_info)
@@ -83,4 +94,26 @@ def analyze_dataset(df: pd.DataFrame) -> Dict[str, Any]:
         analysis["recommended_methods"].append("lagging")
         analysis["recommended_methods"].append("rolling_statistics")
     
-    return analysis
\ No newline at end of file
+    return analysis
+
+def analyze_upload(dataset_id: str, file_path: Path, extension: str) -> Dict[str, Any]:
+    """
+    Загружает сохраненный файл и готовит метаданные загрузки (синхронно, для выполнения в пуле потоков).
+    
+    Набор остается в кэше для предпросмотра и выполнения. Рассчитываются статистики
+    полного набора, равномерная выборка (сохраняется рядом с файлом) и анализ столбцов.
+    """
+    df = load_dataset_sync(dataset_id, file_path, extension)
+    
+    # Статистики полного набора для согласованного с полной обработкой предпросмотра
+    column_stats = compute_column_stats(df)
+    
+    # Равномерная выборка для предпросмотра, рекомендаций и гистограмм
+    sample_df, sample_info = reservoir_sample(iter_frame_chunks(df), SAMPLE_SIZE)
+    sample_df.to_csv(get_sample_path(dataset_id), index=False, encoding='utf-8')
+    
+    analysis = analyze_dataset(df, sample_df)
+    analysis["dataset_id"] = dataset_id
+    analysis["column_stats"] = column_stats
+    analysis["sample"] = sample_info
+    return analysis
@@ -0,0 +1,162 @@
+import pandas as pd
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.lag_utils import build_lag_block
+from utils.rolling_utils import build_rolling_features
+from utils.column_parallel_utils import map_columns
+
+def _is_datetime_column(series: pd.Series) -> bool:
+    """
+    Проверяет, является ли столбец датой или преобразуется ли в дату.
+    """
+    if pd.api.types.is_datetime64_dtype(series):
+        return True
+    # Пробуем конвертировать в дату
+    try:
+        pd.to_datetime(series, errors='raise')
+        return True
+    except:
+        return False
+
+def _date_components(col: str, series: pd.Series,
+                     components: List[str]) -> Optional[Tuple[Optional[pd.Series], Dict[str, pd.Series]]]:
+    """
+    Извлекает компоненты даты одного столбца.
+    
+    Returns:
+        Optional[Tuple]: Преобразованный в дату столбец (None, если он уже был датой) и
+        новые столбцы компонентов; None, если столбец не удалось преобразовать в дату
+    """
+    converted = None
+    # Конвертируем в datetime, если еще не datetime
+    if not pd.api.types.is_datetime64_dtype(series):
+        try:
+            series = converted = pd.to_datetime(series)
+        except Exception as e:
+            logging.warning(f"Не удалось преобразовать столбец {col} в дату: {str(e)}")
+            return None
+    
+    # Извлекаем компоненты даты
+    values = {}
+    for component in components:
+        if component == "year":
+            values[f'{col}_year'] = series.dt.year
+        elif component == "month":
+            values[f'{col}_month'] = series.dt.month
+        elif component == "quarter":
+            values[f'{col}_quarter'] = series.dt.quarter
+        elif component == "day_of_week":
+            values[f'{col}_day_of_week'] = series.dt.dayofweek + 1  # +1 для 1-7 вместо 0-6
+        elif component == "day_of_month":
+            values[f'{col}_day_of_month'] = series.dt.day
+        elif component == "day_of_year":
+            values[f'{col}_day_of_year'] = series.dt.dayofyear
+        elif component == "week_of_year":
+            values[f'{col}_week_of_year'] = series.dt.isocalendar().week
+    return converted, values
+
+def lagging_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                 step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Добавление лагов целевой и экзогенных переменных.
+    """
+    target_column = parameters.get("target_column")
+    lag_periods = parameters.get("lag_periods", [1, 2, 3])
+    exog_columns = parameters.get("exog_columns", [])
+    group_column = parameters.get("group_column")
+    
+    # Лагируем целевую и экзогенные переменные одним блоком
+    lag_columns = [target_column] if target_column else []
+    lag_columns += exog_columns or []
+    lag_columns = [col for col in dict.fromkeys(lag_columns) if col in processed_df.columns]
+    if not lag_columns or not lag_periods:
+        return processed_df
+    
+    if group_column not in processed_df.columns:
+        group_column = None
+    
+    lag_block = build_lag_block(processed_df, lag_columns, lag_periods, group_column)
+    
+    # Присоединяем блок один раз, заменяя ранее созданные столбцы с теми же именами
+    processed_df = pd.concat(
+        [processed_df.drop(columns=lag_block.columns, errors="ignore"), lag_block], axis=1
+    )
+    return processed_df
+
+def rolling_statistics_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                            step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Скользящие статистики одного столбца.
+    """
+    target_column = parameters.get("target_column")
+    window_size = parameters.get("window_size", 3)
+    statistics = parameters.get("statistics", ["mean", "std"])
+    
+    statistics = [stat for stat in statistics if stat in ("mean", "std", "min", "max")]
+    
+    if target_column and target_column in processed_df.columns and statistics:
+        # Расчет скользящих статистик общим движком скользящих признаков
+        rolling_block = build_rolling_features(
+            processed_df, [target_column], [window_size], statistics
+        )
+        processed_df = pd.concat(
+            [processed_df.drop(columns=rolling_block.columns, errors="ignore"), rolling_block], axis=1
+        )
+    return processed_df
+
+def rolling_features_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                          step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Банк скользящих признаков по нескольким столбцам.
+    """
+    columns = parameters.get("columns", [])
+    group_column = parameters.get("group_column")
+    time_column = parameters.get("time_column")
+    
+    columns = [col for col in columns if col in processed_df.columns 
+               and pd.api.types.is_numeric_dtype(processed_df[col])]
+    if not columns:
+        return processed_df
+    
+    # Все окна, статистики и варианты рассчитываются одним вызовом
+    rolling_block = build_rolling_features(
+        processed_df, columns,
+        windows=parameters.get("windows") or [3],
+        statistics=parameters.get("statistics") or ["mean", "std"],
+        variants=parameters.get("variants") or ["rolling"],
+        ewm_spans=parameters.get("ewm_spans") or [],
+        group_column=group_column if group_column in processed_df.columns else None,
+        time_column=time_column if time_column in processed_df.columns else None
+    )
+    processed_df = pd.concat(
+        [processed_df.drop(columns=rolling_block.columns, errors="ignore"), rolling_block], axis=1
+    )
+    return processed_df
+
+def date_components_step(processed_df: pd.DataFrame, parameters: Dict[str, Any],
+                         step_stats: Dict[str, Dict[str, Any]], fitted_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Извлечение компонентов дат.
+    """
+    columns = parameters.get("columns", [])
+    components = parameters.get("components", ["year", "month", "quarter", "day_of_week"])
+    
+    # Если столбцы не указаны, ищем столбцы с датами
+    if not columns:
+        all_columns = processed_df.columns.tolist()
+        detected = map_columns(lambda col, series: _is_datetime_column(series), processed_df, all_columns)
+        columns = [col for col, is_date in zip(all_columns, detected) if is_date]
+    
+    # Компоненты каждого столбца извлекаются параллельно и добавляются в порядке столбцов
+    columns = [col for col in columns if col in processed_df.columns]
+    extracted = map_columns(lambda col, series: _date_components(col, series, components), processed_df, columns)
+    for col, result in zip(columns, extracted):
+        if result is None:
+            continue
+        converted, component_columns = result
+        if converted is not None:
+            processed_df[col] = converted
+        for name, values in component_columns.items():
+            processed_df[name] = values
+    return processed_df
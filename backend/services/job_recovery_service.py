@@ -0,0 +1,122 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from config.settings import JOB_QUEUE_TIMEOUT
+from services.job_service import start_job
+from services.job_status_service import write_job_error
+from utils.error_utils import log_error
+from utils.metrics_utils import inc_counter
+from utils.overlay_utils import remove_result_outputs
+from utils.job_scheduler_utils import submit_job, memory_budget
+from utils.job_journal_utils import update_job_record, claim_interrupted_jobs, release_job, prune_job_records
+from utils.batch_utils import prune_batches
+
+# Интервал поиска прерванных задач других воркеров (секунды)
+RECOVERY_INTERVAL = 30
+# Интервал удаления записей завершенных задач и пакетов с истекшим сроком хранения (секунды)
+PRUNE_INTERVAL = 3600
+
+_recovery_task: Optional[asyncio.Task] = None
+
+async def recover_jobs():
+    """
+    Возобновляет задачи, прерванные перезапуском или падением воркера.
+
+    Задача снова ставится в очередь и продолжается с последней контрольной точки.
+    Задачи, исчерпавшие попытки, завершаются с ошибкой; задачи, не принятые в очередь,
+    откладываются до следующего поиска (см. defer_resumed_job).
+    """
+    # Блокировки журнала и очереди и файловые операции выполняются в пуле потоков
+    resumed, exhausted = await run_in_threadpool(claim_interrupted_jobs)
+    for record in exhausted:
+        job_id = record["job_id"]
+        logging.warning(f"Задача {job_id} не возобновлена: {record['message']}")
+        await run_in_threadpool(fail_interrupted_job, job_id, record["message"])
+        inc_counter("preprocessing_jobs_total", status="error")
+    for record in resumed:
+        job_id = record["job_id"]
+        try:
+            admission = await run_in_threadpool(submit_job, job_id, record["estimate"])
+        except HTTPException as e:
+            if await run_in_threadpool(defer_resumed_job, record, e):
+                logging.info(f"Задача {job_id} отложена до следующего поиска прерванных задач: {e.detail}")
+            continue
+        await run_in_threadpool(update_job_record, job_id, budget_bytes=admission["budget_bytes"], deferred_at=None)
+        logging.info(f"Задача {job_id} возобновлена (попытка {record['attempts']})")
+        inc_counter("preprocessing_jobs", 1, state="queued")
+        start_job(job_id)
+
+def fail_interrupted_job(job_id: str, message: str):
+    """
+    Удаляет частичный результат задачи, исчерпавшей попытки, и сохраняет ошибку.
+    """
+    remove_result_outputs(job_id)
+    write_job_error(job_id, message)
+
+def defer_resumed_job(record: Dict[str, Any], error: HTTPException) -> bool:
+    """
+    Возвращает в журнал возобновляемую задачу, не принятую в очередь, или завершает ее с ошибкой.
+
+    Заполненная очередь (503) - временный отказ. Превышение бюджета (413) повторяется, только
+    если бюджет изменился с приема задачи (например, под перезапущен с другим лимитом памяти):
+    с прежним бюджетом отказ не может быть временным. Задача, отложенная дольше
+    JOB_QUEUE_TIMEOUT, завершается с ошибкой.
+
+    Returns:
+        bool: True, если задача отложена до следующего поиска прерванных задач
+    """
+    job_id = record["job_id"]
+    now = time.time()
+    deferred_at = record.get("deferred_at") or now
+    budget_changed = record.get("budget_bytes") not in (None, memory_budget())
+    retry = error.status_code == 503 or (error.status_code == 413 and budget_changed)
+    if retry and now - deferred_at < JOB_QUEUE_TIMEOUT:
+        release_job(job_id, deferred_at=deferred_at, message=error.detail)
+        return True
+    write_job_error(job_id, error.detail)
+    update_job_record(job_id, state="failed", message=error.detail)
+    return False
+
+def prune_journal():
+    """
+    Удаляет записи завершенных задач и пакетов с истекшим сроком хранения.
+    """
+    removed_jobs = prune_job_records()
+    removed_batches = prune_batches()
+    if removed_jobs or removed_batches:
+        logging.info(f"Из журнала удалено задач: {removed_jobs}, пакетов: {removed_batches}")
+
+async def _recovery_loop():
+    last_prune = 0.0
+    while True:
+        try:
+            await recover_jobs()
+            if time.time() - last_prune >= PRUNE_INTERVAL:
+                last_prune = time.time()
+                await run_in_threadpool(prune_journal)
+        except Exception as e:
+            log_error(e, "Ошибка при возобновлении прерванных задач")
+        await asyncio.sleep(RECOVERY_INTERVAL)
+
+def start_job_recovery():
+    """
+    Запускает периодический поиск прерванных задач (при запуске воркера и затем каждые RECOVERY_INTERVAL секунд).
+    """
+    global _recovery_task
+    if _recovery_task is None:
+        _recovery_task = asyncio.get_running_loop().create_task(_recovery_loop())
+
+async def stop_job_recovery():
+    global _recovery_task
+    if _recovery_task is None:
+        return
+    _recovery_task.cancel()
+    try:
+        await _recovery_task
+    except asyncio.CancelledError:
+        pass
+    _recovery_task = None
@@ -0,0 +1,274 @@
+import json
+import time
+import uuid
+import asyncio
+import logging
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Set, Tuple
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from config.settings import JOB_CHECKPOINTS, JOB_CHECKPOINT_INTERVAL
+from services.preprocessing_service import apply_preprocessing
+from services.job_status_service import write_job_error, write_job_stopped
+from utils.file_utils import get_file_path_by_id, get_processed_file_path
+from utils.error_utils import log_error
+from utils.result_reader_utils import write_dataframe_csv
+from utils.profiling_utils import StepProfiler, RssSampler, release_free_memory, PROFILING_ENABLED
+from utils.metrics_utils import inc_counter, observe_io
+from utils.dataframe_cache_utils import load_dataset_sync, cache_result
+from utils.result_store_utils import write_result_store
+from utils.overlay_utils import remove_result_outputs
+from utils.stack_profiler_utils import SamplingProfiler, save_profile
+from utils.job_estimator_utils import estimate_job
+from utils.job_scheduler_utils import (
+    submit_job, wait_for_admission, finish_job, record_job_usage, load_model, local_running_jobs
+)
+from utils.job_journal_utils import (
+    create_job_record, update_job_record, load_job_record, save_checkpoint, load_checkpoint
+)
+from utils.thread_budget_utils import ThreadBudget
+from utils.job_control_utils import JobControl, JobStopped, check_job
+from utils.json_utils import convert_numpy_types
+
+# Интервал опроса памяти выполняемой задачи (секунды)
+JOB_MEMORY_SAMPLE_INTERVAL = 0.05
+# Задачи, запущенные вне запроса (возобновленные и задачи пакетов): цикл событий хранит только слабые ссылки
+_job_tasks: Set[asyncio.Task] = set()
+
+def find_dataset_file(dataset_id: str) -> Tuple[Path, str]:
+    """
+    Ищет загруженный файл набора данных.
+
+    Raises:
+        HTTPException: 404, если набор данных не найден
+    """
+    for ext in ["csv", "xlsx", "xls"]:
+        file_path = get_file_path_by_id(dataset_id, ext)
+        if file_path.exists():
+            return file_path, ext
+    raise HTTPException(status_code=404, detail="Набор данных не найден")
+
+def submit_preprocessing_job(config: Dict[str, Any], profile: bool = False) -> str:
+    """
+    Оценивает ресурсы задачи, ставит ее в очередь и записывает в журнал.
+
+    Returns:
+        str: Идентификатор результата (задачи)
+
+    Raises:
+        HTTPException: 404, если набор данных не найден; 413/503 от очереди задач
+    """
+    dataset_id = config["dataset_id"]
+    file_path, _ = find_dataset_file(dataset_id)
+    result_id = str(uuid.uuid4())
+
+    # Оцениваем ресурсы задачи и ставим ее в очередь (413/503, если бюджет или очередь исчерпаны)
+    metadata_path = file_path.parent / f"{dataset_id}_metadata.json"
+    dataset_metadata = {}
+    if metadata_path.exists():
+        with open(metadata_path, "r") as f:
+            dataset_metadata = json.load(f)
+    estimate = estimate_job(dataset_metadata, config, load_model())
+    admission = submit_job(result_id, estimate)
+    create_job_record(result_id, config, estimate, profile, budget_bytes=admission["budget_bytes"])
+    inc_counter("preprocessing_jobs", 1, state="queued")
+    return result_id
+
+def run_job(job_id: str, queue_seconds: float) -> str:
+    """
+    Выполняет задачу предобработки из журнала (в пуле потоков).
+
+    Если у задачи есть контрольная точка, выполнение продолжается со следующего
+    за ней шага. Если контрольные точки включены (JOB_CHECKPOINTS), после шага, кроме
+    последнего, сохраняется новая, когда с предыдущей прошло не меньше JOB_CHECKPOINT_INTERVAL секунд.
+
+    Returns:
+        str: Итоговый статус задачи для метрик (completed, cancelled, timed_out, error)
+    """
+    record = load_job_record(job_id)
+    config = record["config"]
+    dataset_id = config["dataset_id"]
+    methods = config["methods"]
+    estimate = record["estimate"]
+    # Профиль загрузки, каждого шага и сохранения результата
+    profiler = StepProfiler() if PROFILING_ENABLED else None
+    # Профилировщик выборок опрашивает поток, в котором запущен
+    sampling_profiler = SamplingProfiler() if record.get("profile") else None
+    if sampling_profiler:
+        sampling_profiler.start()
+    memory = RssSampler(JOB_MEMORY_SAMPLE_INTERVAL)
+    # Потоки BLAS и OpenMP по доле процессора пода
+    thread_budget = ThreadBudget()
+    # Отмена и лимиты времени проверяются между шагами и частями данных
+    control = JobControl(job_id, config.get("time_limit_seconds"), config.get("cpu_time_limit_seconds"))
+    control.activate()
+    job_status = "error"
+    # Контрольная точка копирует все данные, поэтому записывается не чаще JOB_CHECKPOINT_INTERVAL
+    last_checkpoint = time.monotonic()
+
+    def on_step(method_idx: int, processed_df: pd.DataFrame, fitted_params: Dict[str, Any]):
+        nonlocal last_checkpoint
+        next_step = methods[method_idx + 1]["method_id"] if method_idx + 1 < len(methods) else "save_result"
+        fields = {"completed_steps": method_idx + 1, "current_step": next_step}
+        if JOB_CHECKPOINTS and method_idx + 1 < len(methods) \
+                and time.monotonic() - last_checkpoint >= JOB_CHECKPOINT_INTERVAL:
+            if save_checkpoint(job_id, method_idx, processed_df, fitted_params):
+                fields["checkpoint_step"] = method_idx
+            last_checkpoint = time.monotonic()
+        update_job_record(job_id, **fields)
+
+    try:
+        # Результат предыдущей попытки мог быть записан частично
+        if record["attempts"] > 1:
+            remove_result_outputs(job_id)
+        checkpoint = load_checkpoint(job_id)
+        start_step = 0
+        fitted_params = None
+        if checkpoint:
+            checkpoint_step, df, fitted_params = checkpoint
+            start_step = checkpoint_step + 1
+            logging.info(f"Задача {job_id} продолжается с шага {start_step + 1} из {len(methods)}")
+        else:
+            # Загружаем и валидируем данные
+            update_job_record(job_id, state="running", current_step="load_dataset")
+            check_job("load_dataset")
+            file_path, extension = find_dataset_file(dataset_id)
+            if profiler:
+                profiler.start("load_dataset")
+            df = load_dataset_sync(dataset_id, file_path, extension)
+            if profiler:
+                profiler.stop(df)
+        update_job_record(job_id, state="running", completed_steps=start_step,
+                          current_step=methods[start_step]["method_id"] if start_step < len(methods) else "save_result")
+        release_free_memory()
+        loaded_rss = memory.start()
+        processing_start = time.perf_counter()
+
+        # Применяем предобработку
+        processed_df = apply_preprocessing(df, config, profiler=profiler, thread_budget=thread_budget,
+                                           start_step=start_step, fitted_params=fitted_params,
+                                           step_callback=on_step)
+        del df
+
+        # Сохраняем результаты
+        check_job("save_result")
+        result_path = get_processed_file_path(job_id)
+        if profiler:
+            profiler.start("save_result", processed_df)
+        write_dataframe_csv(processed_df, result_path)
+        # Хранилище столбцов для листания и обратных преобразований без разбора CSV
+        write_result_store(job_id, processed_df)
+        if profiler:
+            profiler.stop(processed_df)
+        observe_io("write", "csv", result_path)
+        processing_seconds = time.perf_counter() - processing_start
+        memory.stop()
+        working_bytes = memory.peak - loaded_rss if loaded_rss is not None else None
+
+        # Сохраняем метаданные
+        metadata = {
+            "dataset_id": dataset_id,
+            "result_id": job_id,
+            "row_count": len(processed_df),
+            "column_count": len(processed_df.columns),
+            "columns": processed_df.columns.tolist(),
+            "config": config,
+            "resources": {
+                "estimate": estimate,
+                "queue_seconds": round(queue_seconds, 3),
+                "processing_seconds": round(processing_seconds, 3),
+                "working_memory_bytes": working_bytes,
+                "threads": thread_budget.summary(),
+                "attempts": record["attempts"],
+                "resumed_from_step": start_step if checkpoint else None
+            }
+        }
+
+        # Добавляем параметры масштабирования в метаданные, если они есть
+        if hasattr(processed_df, 'scaling_params'):
+            metadata["scaling_params"] = processed_df.scaling_params
+
+        # Запоминаем разреженные столбцы для чтения при экспорте
+        sparse_columns = [col for col, dtype in processed_df.dtypes.items()
+                          if isinstance(dtype, pd.SparseDtype)]
+        if sparse_columns:
+            metadata["sparse_columns"] = sparse_columns
+
+        if profiler:
+            metadata["profile"] = profiler.summary()
+
+        if sampling_profiler:
+            sampling_profiler.stop()
+            metadata["sampling_profile"] = save_profile(job_id, sampling_profiler)
+
+        metadata_path = result_path.parent / f"{job_id}_metadata.json"
+        with open(metadata_path, "w") as f:
+            json.dump(convert_numpy_types(metadata), f)
+        # Результат остается в кэше для листания и экспорта
+        cache_result(job_id, processed_df)
+        # Измерения другой задачи этого же процесса и возобновленной задачи искажают прирост памяти
+        if local_running_jobs() == 1 and not checkpoint:
+            record_job_usage(estimate, working_bytes, processing_seconds)
+        job_status = "completed"
+        update_job_record(job_id, state="completed", completed_steps=len(methods), current_step=None)
+
+    except JobStopped as e:
+        if profiler:
+            profiler.close(str(e))
+        logging.info(f"Задача {job_id} остановлена на шаге {e.step}: {str(e)}")
+        # Частично записанный результат удаляется
+        remove_result_outputs(job_id)
+        write_job_stopped(job_id, e)
+        job_status = e.status
+        update_job_record(job_id, state=e.status, message=str(e))
+    except Exception as e:
+        if profiler:
+            profiler.close(str(e))
+        log_error(e, f"Ошибка при обработке данных для result_id={job_id}")
+        write_job_error(job_id, str(e))
+        update_job_record(job_id, state="failed", message=str(e))
+    finally:
+        control.deactivate()
+        memory.stop()
+        if sampling_profiler and job_status != "completed":
+            # Профиль неудачного выполнения тоже сохраняется
+            sampling_profiler.stop()
+            save_profile(job_id, sampling_profiler)
+    return job_status
+
+async def process_job(job_id: str):
+    """
+    Ожидает допуска задачи из очереди и выполняет ее (фоновая задача).
+    """
+    job_status = "error"
+    try:
+        queue_seconds = await wait_for_admission(job_id)
+    except (TimeoutError, JobStopped) as e:
+        if isinstance(e, JobStopped):
+            write_job_stopped(job_id, e)
+            job_status = e.status
+        else:
+            write_job_error(job_id, str(e))
+        update_job_record(job_id, state="failed" if job_status == "error" else job_status, message=str(e))
+        inc_counter("preprocessing_jobs", -1, state="queued")
+        inc_counter("preprocessing_jobs_total", status=job_status)
+        return
+    inc_counter("preprocessing_jobs", -1, state="queued")
+    inc_counter("preprocessing_jobs", 1, state="running")
+    try:
+        # Задача выполняется в пуле потоков и не блокирует цикл событий
+        job_status = await run_in_threadpool(run_job, job_id, queue_seconds)
+    finally:
+        finish_job(job_id)
+        inc_counter("preprocessing_jobs", -1, state="running")
+        inc_counter("preprocessing_jobs_total", status=job_status)
+
+def start_job(job_id: str):
+    """
+    Запускает выполнение задачи из журнала в фоне текущего воркера.
+    """
+    task = asyncio.get_running_loop().create_task(process_job(job_id))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+from typing import Dict, Any
+
+from services.preprocessing_service import getMethodName
+from utils.file_utils import get_processed_file_path
+from utils.job_control_utils import JobStopped
+from utils.job_journal_utils import load_job_record, FINAL_STATES
+
+def write_job_error(result_id: str, message: str):
+    """
+    Сохраняет сообщение об ошибке задачи для эндпоинта статуса.
+    """
+    error_path = get_processed_file_path(result_id).parent / f"{result_id}_error.txt"
+    with open(error_path, "w") as f:
+        f.write(message)
+
+def get_stopped_path(result_id: str) -> Path:
+    return get_processed_file_path(result_id).parent / f"{result_id}_stopped.json"
+
+def write_job_stopped(result_id: str, stopped: JobStopped):
+    """
+    Сохраняет статус отмененной или остановленной по лимиту задачи и шаг, на котором она остановлена.
+    """
+    with open(get_stopped_path(result_id), "w") as f:
+        json.dump(stopped.to_dict(), f)
+
+def job_progress(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Возвращает прогресс выполняемой задачи из журнала для эндпоинта статуса.
+    """
+    total = len(record["config"]["methods"])
+    completed = record.get("completed_steps", 0)
+    step = record.get("current_step")
+    method_ids = [method["method_id"] for method in record["config"]["methods"]]
+    progress = {
+        "stage": "running",
+        "step": step,
+        "method_name": getMethodName(step) if step in method_ids else None,
+        "completed_steps": completed,
+        "total_steps": total,
+        "percent": round(100 * completed / total) if total else 0,
+        "attempt": record["attempts"]
+    }
+    if record["attempts"] > 1:
+        progress["message"] = f"Задача возобновлена после перезапуска (попытка {record['attempts']})"
+    return progress
+
+def is_job_active(job_id: str) -> bool:
+    """
+    Проверяет, что задача есть в журнале и еще не завершена.
+    """
+    record = load_job_record(job_id)
+    return record is not None and record["state"] not in FINAL_STATES
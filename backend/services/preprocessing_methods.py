@@ -0,0 +1,284 @@
+from typing import Dict, Any, List
+
+def get_preprocessing_methods() -> List[Dict[str, Any]]:
+    """
+    Получение списка доступных методов предобработки.
+    """
+    methods = [
+        {
+            "method_id": "missing_values",
+            "name": "Обработка пропущенных значений",
+            "description": "Заполнение или удаление пропущенных значений в данных",
+            "applicable_types": ["numeric", "categorical"],
+            "parameters": {
+                "strategy": {
+                    "type": "select",
+                    "options": ["mean", "median", "mode", "drop_rows"],
+                    "default": "mean",
+                    "description": "Способ обработки пропусков"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        },
+        {
+            "method_id": "outliers",
+            "name": "Обработка выбросов",
+            "description": "Обнаружение и обработка аномальных значений",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "strategy": {
+                    "type": "select",
+                    "options": ["zscore", "iqr"],
+                    "default": "zscore",
+                    "description": "Метод обнаружения выбросов"
+                },
+                "threshold": {
+                    "type": "number",
+                    "default": 3.0,
+                    "description": "Порог для определения выбросов"
+                },
+                "mode": {
+                    "type": "select",
+                    "options": ["sequential", "joint", "clip"],
+                    "default": "sequential",
+                    "description": "Режим: последовательное удаление, общая маска строк или ограничение значений"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        },
+        {
+            "method_id": "standardization",
+            "name": "Стандартизация числовых данных",
+            "description": "Приведение числовых признаков к стандартному масштабу",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "strategy": {
+                    "type": "select",
+                    "options": ["standard", "minmax", "robust"],
+                    "default": "standard",
+                    "description": "Метод стандартизации"
+                },
+                "dtype": {
+                    "type": "select",
+                    "options": ["float64", "float32"],
+                    "default": "float64",
+                    "description": "Тип данных результата"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        },
+        {
+            "method_id": "categorical_encoding",
+            "name": "Кодирование категориальных переменных",
+            "description": "Преобразование категориальных данных в числовой формат",
+            "applicable_types": ["categorical"],
+            "parameters": {
+                "strategy": {
+                    "type": "select",
+                    "options": ["onehot", "label", "hashing"],
+                    "default": "onehot",
+                    "description": "Метод кодирования"
+                },
+                "max_categories": {
+                    "type": "number",
+                    "min": 1,
+                    "description": "Максимальное количество категорий (остальные объединяются в other)"
+                },
+                "min_frequency": {
+                    "type": "number",
+                    "description": "Минимальная частота категории (доля или количество строк)"
+                },
+                "n_features": {
+                    "type": "number",
+                    "default": 32,
+                    "min": 1,
+                    "max": 4096,
+                    "description": "Количество корзин для хеширования признаков"
+                },
+                "output": {
+                    "type": "select",
+                    "options": ["dense", "sparse"],
+                    "default": "dense",
+                    "description": "Формат хранения индикаторных столбцов"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        },
+        {
+            "method_id": "pca",
+            "name": "Снижение размерности (PCA)",
+            "description": "Уменьшение количества признаков при сохранении информативности",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "n_components": {
+                    "type": "number",
+                    "default": 2,
+                    "description": "Количество компонент"
+                },
+                "variance_threshold": {
+                    "type": "number",
+                    "min": 0.05,
+                    "max": 1,
+                    "step": 0.05,
+                    "description": "Доля объясненной дисперсии (если указана, число компонент подбирается автоматически)"
+                },
+                "solver": {
+                    "type": "select",
+                    "options": ["auto", "full", "randomized", "incremental"],
+                    "default": "auto",
+                    "description": "Алгоритм: полный, рандомизированный SVD или инкрементальный по частям"
+                },
+                "dtype": {
+                    "type": "select",
+                    "options": ["float64", "float32"],
+                    "default": "float64",
+                    "description": "Точность вычислений"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        },
+        {
+            "method_id": "lagging",
+            "name": "Лагирование переменных",
+            "description": "Создание лагированных версий переменных для временных рядов",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "target_column": {
+                    "type": "select",
+                    "description": "Целевая переменная"
+                },
+                "lag_periods": {
+                    "type": "multiselect",
+                    "options": [1, 2, 3, 4, 5, 6, 7, 14, 30],
+                    "default": [1, 2, 3],
+                    "description": "Периоды лагирования"
+                },
+                "exog_columns": {
+                    "type": "multiselect",
+                    "description": "Экзогенные переменные для лагирования"
+                },
+                "group_column": {
+                    "type": "select",
+                    "description": "Идентификатор сущности для панельных данных (необязательно)"
+                }
+            }
+        },
+        {
+            "method_id": "rolling_statistics",
+            "name": "Скользящие статистики",
+            "description": "Расчет статистик в скользящем окне для временных рядов",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "target_column": {
+                    "type": "select",
+                    "description": "Целевая переменная"
+                },
+                "window_size": {
+                    "type": "number",
+                    "default": 3,
+                    "description": "Размер окна"
+                },
+                "statistics": {
+                    "type": "multiselect",
+                    "options": ["mean", "std", "min", "max"],
+                    "default": ["mean", "std"],
+                    "description": "Статистики для расчета"
+                }
+            }
+        },
+        {
+            "method_id": "rolling_features",
+            "name": "Банк скользящих признаков",
+            "description": "Скользящие, расширяющиеся и экспоненциальные статистики для нескольких столбцов и окон",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для расчета"
+                },
+                "windows": {
+                    "type": "multiselect",
+                    "options": [3, 7, 14, 30, 90, "7D", "30D", "90D"],
+                    "default": [7, 30],
+                    "description": "Размеры окон (строки или временной интервал)"
+                },
+                "statistics": {
+                    "type": "multiselect",
+                    "options": ["mean", "std", "var", "sum", "min", "max"],
+                    "default": ["mean", "std"],
+                    "description": "Статистики для расчета"
+                },
+                "variants": {
+                    "type": "multiselect",
+                    "options": ["rolling", "expanding", "ewm"],
+                    "default": ["rolling"],
+                    "description": "Варианты окон"
+                },
+                "ewm_spans": {
+                    "type": "multiselect",
+                    "options": [7, 30, 90],
+                    "default": [],
+                    "description": "Периоды экспоненциального сглаживания"
+                },
+                "group_column": {
+                    "type": "select",
+                    "description": "Столбец группировки (необязательно)"
+                },
+                "time_column": {
+                    "type": "select",
+                    "description": "Столбец времени для временных окон (необязательно)"
+                }
+            }
+        },
+        {
+            "method_id": "date_components",
+            "name": "Извлечение компонентов даты",
+            "description": "Извлечение года, месяца, квартала, дня недели из столбцов с датами",
+            "applicable_types": ["datetime"],
+            "parameters": {
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы с датами для обработки"
+                },
+                "components": {
+                    "type": "multiselect",
+                    "options": ["year", "month", "quarter", "day_of_week", "day_of_month", "day_of_year", "week_of_year"],
+                    "default": ["year", "month", "quarter", "day_of_week"],
+                    "description": "Компоненты даты для извлечения"
+                }
+            }
+        },
+        {
+            "method_id": "inverse_scaling",
+            "name": "Обратное масштабирование",
+            "description": "Отмена стандартизации или нормализации данных, восстановление столбцов из PCA и декодирование меток",
+            "applicable_types": ["numeric"],
+            "parameters": {
+                "scaling_params": {
+                    "type": "object",
+                    "description": "Параметры масштабирования для обратного преобразования"
+                },
+                "columns": {
+                    "type": "multiselect",
+                    "description": "Столбцы для обработки"
+                }
+            }
+        }
+    ]
+    
+    return methods
@@ -0,0 +1,70 @@
+import os
+import asyncio
+import sys
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Настройки читаются при импорте модулей: общая память отключена, бюджет памяти задач фиксирован
+os.environ.setdefault("SHARED_CACHE_ENABLED", "0")
+os.environ.setdefault("JOB_MEMORY_BUDGET", str(2 ** 30))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import file_utils
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """
+    Данные каждого теста (журнал, очередь, загрузки и результаты) - во временной директории.
+    """
+    monkeypatch.chdir(tmp_path)
+    for name, directory_name in (("UPLOAD_DIR", "uploads"), ("PROCESSED_DIR", "processed"), ("TEMP_DIR", "temp")):
+        directory = tmp_path / "data" / directory_name
+        directory.mkdir(parents=True)
+        monkeypatch.setattr(file_utils, name, directory)
+    return tmp_path / "data"
+
+@pytest.fixture(scope="session")
+def dead_pid() -> int:
+    """
+    Идентификатор завершившегося процесса (владелец прерванных задач).
+    """
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+@pytest.fixture
+def make_dataset():
+    """
+    Создает загруженный набор данных (CSV) и возвращает его идентификатор.
+    """
+    def create(dataset_id: str, rows: int = 300, seed: int = 0) -> str:
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame({
+            "value": rng.normal(10, 3, rows),
+            "amount": rng.exponential(100, rows),
+            "category": rng.choice(["a", "b", "c", "d"], rows)
+        })
+        df.loc[rng.choice(rows, rows // 10, replace=False), "value"] = np.nan
+        df.to_csv(file_utils.get_file_path_by_id(dataset_id, "csv"), index=False)
+        return dataset_id
+    return create
+
+@pytest.fixture
+def make_result(make_dataset):
+    """
+    Выполняет задачу предобработки над новым набором данных и возвращает идентификатор результата.
+    """
+    from services import job_service
+    from utils.job_journal_utils import load_job_record
+
+    def run(methods: list, dataset_id: str = "6b0c7a34-5d55-4c7e-9a57-3f1f0b5d2e11", **kwargs) -> str:
+        make_dataset(dataset_id, **kwargs)
+        result_id = job_service.submit_preprocessing_job({"dataset_id": dataset_id, "methods": methods})
+        asyncio.run(job_service.process_job(result_id))
+        assert load_job_record(result_id)["state"] == "completed"
+        return result_id
+    return run
@@ -0,0 +1,92 @@
+import os
+import time
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from models.schemas import BatchPreprocessingConfig
+from services import batch_service
+from utils.batch_utils import BATCH_DIR, create_batch, load_batch, locked_batches, pending_batches, prune_batches
+from utils.job_journal_utils import update_job_record
+
+DATASET_IDS = [f"00000000-0000-4000-8000-00000000000{i}" for i in range(4)]
+MISSING_ID = "00000000-0000-4000-8000-0000000000ff"
+TEMPLATE = {"methods": [{"method_id": "missing_values", "parameters": {"strategy": "median"}}]}
+
+@pytest.fixture
+def batch_id(make_dataset, monkeypatch):
+    # Места пакета сразу доступны воркеру, у которого уже есть задачи
+    monkeypatch.setattr(batch_service, "IDLE_WORKER_PRIORITY", 0)
+    for seed, dataset_id in enumerate(DATASET_IDS[:3]):
+        make_dataset(dataset_id, seed=seed)
+    request = BatchPreprocessingConfig(template=TEMPLATE, dataset_ids=DATASET_IDS[:3] + [MISSING_ID],
+                                       max_concurrency=2)
+    return batch_service.submit_batch(request)
+
+def test_invalid_batches_are_rejected(make_dataset):
+    make_dataset(DATASET_IDS[0])
+    bad_template = {"methods": [{"method_id": "outliers", "parameters": {"strategy": "unknown"}}]}
+    with pytest.raises(HTTPException) as error:
+        batch_service.submit_batch(BatchPreprocessingConfig(template=bad_template, dataset_ids=[DATASET_IDS[0]]))
+    assert error.value.status_code == 422
+
+    with pytest.raises(HTTPException) as error:
+        batch_service.submit_batch(BatchPreprocessingConfig(template=TEMPLATE, dataset_ids=[MISSING_ID]))
+    assert error.value.status_code == 422
+
+def test_batch_respects_max_concurrency(batch_id):
+    status = batch_service.batch_status(batch_id)
+    assert status["summary"] == {"total": 4, "pending": 3, "rejected": 1}
+
+    first = batch_service._claim_batch_items()
+    second = batch_service._claim_batch_items()
+    assert len(first) == 1 and len(second) == 1
+    # Два набора в очереди: третий ждет освобождения места
+    assert batch_service._claim_batch_items() == []
+
+    update_job_record(first[0], state="completed")
+    third = batch_service._claim_batch_items()
+    assert len(third) == 1
+
+    status = batch_service.batch_status(batch_id)
+    assert status["summary"] == {"total": 4, "completed": 1, "queued": 2, "rejected": 1}
+    assert status["status"] == "processing"
+    # Все наборы запущены: пакет больше не ожидает запуска
+    with locked_batches():
+        assert pending_batches() == []
+
+    for job_id in second + third:
+        update_job_record(job_id, state="completed")
+    status = batch_service.batch_status(batch_id)
+    assert status["status"] == "completed"
+    assert status["percent"] == 100
+
+def test_dispatch_starts_claimed_jobs(batch_id, monkeypatch):
+    started = []
+    monkeypatch.setattr(batch_service, "start_job", started.append)
+
+    asyncio.run(batch_service.dispatch_batches())
+
+    items = load_batch(batch_id)["items"]
+    assert started == [item["result_id"] for item in items if item["state"] == "submitted"]
+    assert len(started) == 1
+
+def test_unknown_batch_is_not_found():
+    with pytest.raises(HTTPException) as error:
+        batch_service.batch_status(MISSING_ID)
+    assert error.value.status_code == 404
+
+def test_prune_keeps_pending_batches():
+    create_batch("pending", TEMPLATE, [{"dataset_id": DATASET_IDS[0], "state": "pending"}], 1)
+    create_batch("finished", TEMPLATE, [{"dataset_id": DATASET_IDS[0], "state": "rejected"}], 1)
+    with locked_batches():
+        assert [record["batch_id"] for record in pending_batches()] == ["pending"]
+
+    old = time.time() - 1000 * 3600
+    for name in ("pending", "finished"):
+        os.utime(BATCH_DIR / f"{name}.json", (old, old))
+
+    assert prune_batches() == 1
+    assert load_batch("finished") is None
+    assert load_batch("pending") is not None
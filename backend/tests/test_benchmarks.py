@@ -0,0 +1,73 @@
+import json
+import warnings
+
+import pandas as pd
+import pytest
+
+from benchmarks import compare, run_benchmarks
+from benchmarks.data_generator import generate_dataset
+from services.preprocessing_service import get_preprocessing_methods
+
+def test_generated_dataset_is_reproducible():
+    df = generate_dataset(rows=2000, numeric_columns=3, categorical_columns=2, cardinality=5,
+                          missing_rate=0.1, datetime_columns=1, seed=7)
+
+    pd.testing.assert_frame_equal(df, generate_dataset(rows=2000, numeric_columns=3, categorical_columns=2,
+                                                       cardinality=5, missing_rate=0.1, datetime_columns=1, seed=7))
+    assert df.columns.tolist() == ["date_0", "num_0", "num_1", "num_2", "category_0", "category_1"]
+    assert pd.to_datetime(df["date_0"]).is_monotonic_increasing and df["date_0"].notna().all()
+    assert df.drop(columns="date_0").isna().mean().between(0.07, 0.13).all()
+    assert set(df["category_0"].dropna()) <= {f"cat_{i}" for i in range(5)}
+    # Распределение категорий неравномерное: первая категория самая частая
+    assert df["category_0"].value_counts().index[0] == "cat_0"
+
+def test_method_cases_cover_every_method_and_strategy():
+    df = generate_dataset(rows=100)
+    cases = dict(run_benchmarks.build_method_cases(df))
+
+    methods = {config["methods"][0]["method_id"] for config in cases.values()}
+    assert methods == {method["method_id"] for method in get_preprocessing_methods()}
+    assert {"missing_values[strategy=mean]", "missing_values[strategy=drop_rows]"} <= set(cases)
+    assert cases["inverse_scaling"]["methods"][0]["parameters"]["scaling_params"]
+
+def test_compare_flags_only_significant_changes():
+    baseline = {"results": {"same": {"median": 1.0}, "slow": {"median": 1.0}, "tiny": {"median": 0.001},
+                            "fast": {"median": 1.0}, "gone": {"median": 1.0}}}
+    current = {"results": {"same": {"median": 1.1}, "slow": {"median": 1.5}, "tiny": {"median": 0.003},
+                           "fast": {"median": 0.5}, "added": {"median": 1.0}}}
+
+    statuses = {row["case"]: row["status"] for row in compare.compare_results(baseline, current)}
+    assert statuses == {"same": "ok", "slow": "slower", "tiny": "ok", "fast": "faster",
+                        "gone": "missing", "added": "new"}
+
+def test_compare_exit_code(tmp_path):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps({"results": {"case": {"median": 1.0}}}))
+
+    current.write_text(json.dumps({"results": {"case": {"median": 1.05}}}))
+    assert compare.main([str(baseline), str(current)]) == 0
+    current.write_text(json.dumps({"results": {"case": {"median": 2.0}}}))
+    assert compare.main([str(baseline), str(current)]) == 1
+
+def test_benchmark_run_covers_all_scenarios(tmp_path):
+    output = tmp_path / "results.json"
+    run_benchmarks.main(["--rows", "300", "--repeat", "1", "--skip-excel", "--output", str(output)])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    cases = run_benchmarks.build_method_cases(generate_dataset(rows=300))
+    expected = {"ingest_csv", "analyze_dataset", "preview_serialization", "export_csv"}
+    assert set(report["results"]) == expected | {f"method:{name}" for name, _ in cases}
+    for result in report["results"].values():
+        assert result["repeats"] == 1 and result["median"] >= 0
+    assert report["meta"]["parameters"]["rows"] == 300
+
+@pytest.mark.parametrize("warn", [False, True])
+def test_performance_warnings_are_reported(warn):
+    def scenario():
+        if warn:
+            warnings.warn("fragmented", pd.errors.PerformanceWarning)
+        return pd.DataFrame({"a": [1, 2]})
+
+    result = run_benchmarks.measure(scenario, repeat=2)
+    assert result["performance_warnings"] == (["fragmented"] if warn else [])
+    assert (result["rows_out"], result["columns_out"]) == (2, 1)
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.preprocessing_service import apply_preprocessing
+from utils import column_parallel_utils as parallel
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    Пул потоков, считающий переданные ему блоки.
+    """
+    def __init__(self):
+        super().__init__(max_workers=4, thread_name_prefix="columns")
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+@pytest.fixture
+def pool(monkeypatch):
+    """
+    Параллельная обработка даже небольших данных: 4 потока на шаг.
+    """
+    executor = CountingExecutor()
+    monkeypatch.setattr(parallel, "_executor", executor)
+    monkeypatch.setattr(parallel, "MIN_CELLS_PER_WORKER", 1)
+    monkeypatch.setattr(parallel, "current_threads", lambda: 4)
+    yield executor
+    executor.shutdown()
+
+def test_workers_adapt_to_columns_rows_and_threads(monkeypatch):
+    monkeypatch.setattr(parallel, "current_threads", lambda: 4)
+    rows = parallel.MIN_CELLS_PER_WORKER
+
+    assert parallel.plan_workers(1, 10 * rows) == 1
+    assert parallel.plan_workers(3, 10 * rows) == 3
+    assert parallel.plan_workers(10, 10 * rows) == 4
+    # Узкие данные не делятся: ячеек меньше, чем нужно на два потока
+    assert parallel.plan_workers(10, rows // 10) == 1
+    assert parallel.plan_workers(10, rows // 5) == 2
+    monkeypatch.setattr(parallel, "COLUMN_PARALLELISM", "off")
+    assert parallel.plan_workers(10, 10 * rows) == 1
+
+def test_split_covers_range_in_order():
+    assert parallel._split(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert parallel._split(2, 4) == [(0, 1), (1, 2)]
+
+def test_blocks_are_merged_in_column_order(pool):
+    values = np.arange(40, dtype=float).reshape(4, 10)
+
+    def block_sums(start, stop):
+        # Первые блоки завершаются последними
+        time.sleep(0.01 * (10 - start))
+        return values[:, start:stop].sum(axis=0)
+
+    blocks = parallel.map_blocks(block_sums, 10, 4)
+    assert len(blocks) == 4 and pool.submitted == 4
+    np.testing.assert_array_equal(np.concatenate(blocks), values.sum(axis=0))
+
+def test_object_columns_stay_in_calling_thread(pool):
+    df = pd.DataFrame({"a": [1.0, 2.0], "text": ["x", "y"], "b": [3, 4], "c": [5.0, 6.0]})
+    threads = {}
+
+    def record(col, series):
+        threads[col] = threading.current_thread().name
+        time.sleep(0.02 if col == "a" else 0)
+        return series.iloc[0]
+
+    assert parallel.map_columns(record, df, ["c", "text", "a", "b"]) == [5.0, "x", 1.0, 3]
+    assert threads["text"] == threading.current_thread().name
+    assert all(threads[col].startswith("columns") for col in ("a", "b", "c"))
+
+def frame(rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"x{i}": rng.normal(size=rows) for i in range(6)})
+    df.iloc[::7, :3] = np.nan
+    df.iloc[5, 4] = 40.0
+    df["city"] = rng.choice(["a", "b", "c"], rows)
+    df["kind"] = rng.choice(["p", "q"], rows)
+    df["date"] = pd.date_range("2024-01-01", periods=rows, freq="D").astype(str)
+    df["shipped"] = pd.date_range("2023-06-01", periods=rows, freq="H").astype(str)
+    return df
+
+METHODS = [
+    {"method_id": "missing_values", "parameters": {"strategy": "median"}},
+    {"method_id": "outliers", "parameters": {"strategy": "iqr", "threshold": 1.5, "mode": "clip"}},
+    {"method_id": "date_components", "parameters": {"components": ["year", "month", "day_of_week"]}},
+    {"method_id": "categorical_encoding", "parameters": {"strategy": "label", "columns": ["city", "kind"]}}
+]
+
+def test_parallel_steps_match_serial(pool, monkeypatch):
+    parallel_df = apply_preprocessing(frame(), {"methods": METHODS})
+    assert pool.submitted > 0
+
+    monkeypatch.setattr(parallel, "COLUMN_PARALLELISM", "off")
+    submitted = pool.submitted
+    serial_df = apply_preprocessing(frame(), {"methods": METHODS})
+    assert pool.submitted == submitted
+
+    pd.testing.assert_frame_equal(parallel_df, serial_df)
+    assert {"date_year", "shipped_month"} <= set(serial_df.columns)
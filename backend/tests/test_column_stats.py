@@ -0,0 +1,117 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils.column_stats_utils import compute_array_column_stats, compute_column_stats, stats_after_step
+from utils.result_reader_utils import read_result_dataframe
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "value": rng.normal(10, 3, 1000),
+        "amount": rng.exponential(100, 1000),
+        "count": rng.integers(0, 5, 1000),
+        "category": rng.choice(["a", "b", "c"], 1000)
+    })
+    df.loc[rng.choice(1000, 100, replace=False), "value"] = np.nan
+    return df
+
+def test_stats_match_pandas(frame):
+    stats = compute_column_stats(frame)
+
+    for col in ("value", "amount", "count"):
+        series = frame[col]
+        assert stats[col]["count"] == series.count()
+        assert stats[col]["missing"] == series.isna().sum()
+        for key, expected in (("mean", series.mean()), ("std", series.std()), ("min", series.min()),
+                              ("max", series.max()), ("q1", series.quantile(0.25)), ("q3", series.quantile(0.75))):
+            assert stats[col][key] == pytest.approx(expected)
+    assert stats["category"] == {"mode": frame["category"].mode()[0], "missing": 0}
+
+def test_array_stats_match_frame_stats(frame):
+    codes, categories = pd.factorize(frame["category"], sort=True)
+    arrays = [(col, frame[col].to_numpy(), None) for col in ("value", "amount", "count")]
+    arrays.append(("category", codes, list(categories)))
+
+    array_stats, frame_stats = compute_array_column_stats(arrays), compute_column_stats(frame)
+    assert array_stats.keys() == frame_stats.keys()
+    for col, values in frame_stats.items():
+        assert array_stats[col] == pytest.approx(values)
+
+def test_steps_without_columns_keep_untouched_stats(frame):
+    stats = compute_column_stats(frame)
+
+    scaled = stats_after_step(stats, "standardization", {"strategy": "standard"}, frame)
+    assert set(scaled) == {"category"}
+    encoded = stats_after_step(stats, "categorical_encoding", {"strategy": "onehot"}, frame)
+    assert set(encoded) == {"value", "amount", "count"}
+    assert stats_after_step(stats, "lagging", {"target_column": "value"}, frame) is stats
+
+def test_missing_values_keeps_columns_without_missing(frame):
+    stats = compute_column_stats(frame)
+    after = stats_after_step(stats, "missing_values", {"strategy": "mean"}, frame)
+
+    for col in ("amount", "count", "category"):
+        assert after[col] is stats[col]
+    # Статистики заполненного столбца пересчитываются точно, кроме квартилей
+    expected = compute_column_stats(frame.fillna({"value": stats["value"]["mean"]}))["value"]
+    assert set(after["value"]) == {"missing", "count", "mean", "std", "min", "max"}
+    assert after["value"] == pytest.approx({key: expected[key] for key in after["value"]})
+
+    dropped = stats_after_step(stats, "missing_values", {"strategy": "drop_rows"}, frame)
+    assert dropped == {}
+    assert stats_after_step(stats, "missing_values", {"strategy": "drop_rows", "columns": ["amount"]},
+                            frame) is stats
+
+def test_outlier_steps(frame):
+    stats = compute_column_stats(frame)
+
+    assert stats_after_step(stats, "outliers", {"strategy": "zscore"}, frame) == {}
+    wide = stats_after_step(stats, "outliers", {"mode": "clip", "threshold": 100.0}, frame)
+    assert wide == stats
+    narrow = stats_after_step(stats, "outliers", {"mode": "clip", "threshold": 1.0}, frame)
+    assert set(narrow) == {"category"}
+
+def upload(client: TestClient, df: pd.DataFrame) -> str:
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    response = client.post("/api/datasets/upload", files={"file": ("data.csv", buffer.getvalue(), "text/csv")})
+    assert response.status_code == 200, response.text
+    return response.json()["dataset_id"]
+
+@pytest.mark.parametrize("methods", [
+    [{"method_id": "missing_values", "parameters": {"strategy": "mean"}},
+     {"method_id": "standardization", "parameters": {"strategy": "minmax"}}],
+    [{"method_id": "lagging", "parameters": {"target_column": "amount", "lag_periods": [1]}},
+     {"method_id": "missing_values", "parameters": {"strategy": "median"}},
+     {"method_id": "standardization", "parameters": {"strategy": "standard"}}],
+    [{"method_id": "outliers", "parameters": {"strategy": "iqr", "threshold": 3.0, "mode": "clip",
+                                              "columns": ["value", "count"]}},
+     {"method_id": "categorical_encoding", "parameters": {"strategy": "label"}},
+     {"method_id": "standardization", "parameters": {"strategy": "robust", "columns": ["amount", "count"]}}]
+])
+def test_preview_matches_execute(frame, methods):
+    client = TestClient(main.app)
+    dataset_id = upload(client, frame)
+    config = {"dataset_id": dataset_id, "methods": methods}
+
+    preview = client.post("/api/preprocessing/preview", json=config).json()
+    result_id = client.post("/api/preprocessing/execute", json=config).json()["result_id"]
+    executed = read_result_dataframe(result_id)
+
+    # Строки предпросмотра находятся в полном наборе по уникальному значению amount
+    # (разбор CSV может отличаться от исходного числа в последнем знаке)
+    order = np.argsort(frame["amount"].to_numpy())
+    sample_amounts = pd.DataFrame(preview["original_sample"])["amount"]
+    positions = order[pd.Index(frame["amount"].to_numpy()[order]).get_indexer(sample_amounts, method="nearest")]
+    np.testing.assert_allclose(frame["amount"].to_numpy()[positions], sample_amounts, rtol=1e-12)
+    processed = pd.DataFrame(preview["processed_sample"])
+    # Лаговые столбцы добавляются шагом и не имеют статистик полного набора
+    columns = [col for col in processed.columns if "_lag_" not in col]
+    pd.testing.assert_frame_equal(processed[columns], executed.iloc[positions][columns].reset_index(drop=True),
+                                  check_dtype=False, rtol=1e-9)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.column_store_utils import ColumnStoreWriter, write_column_store, estimate_store_nbytes
+from utils.column_store_reader_utils import open_column_store, private_nbytes, store_nbytes
+from utils.dataframe_cache_utils import slice_rows
+from utils.result_reader_utils import iter_result_columns, read_result_rows
+from utils.result_store_utils import write_result_store
+
+def frame(rows: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "value": rng.normal(size=rows),
+        "count": rng.integers(0, 10, rows),
+        "city": rng.choice(["a", "b", None], rows),
+        "date": pd.date_range("2024-01-01", periods=rows, freq="D")
+    })
+
+def test_round_trip_without_copy(tmp_path):
+    df = frame()
+    manifest = write_column_store(df, tmp_path / "store")
+
+    assert manifest["rows"] == 100
+    assert [column["kind"] for column in manifest["columns"]] == ["array", "array", "dictionary", "array"]
+    stored = open_column_store(tmp_path / "store")
+    pd.testing.assert_frame_equal(stored, df)
+    assert not stored["value"].to_numpy().flags.writeable
+    assert store_nbytes(tmp_path / "store") <= estimate_store_nbytes(df)
+
+def test_rows_and_columns_are_selected(tmp_path):
+    df = frame()
+    write_column_store(df, tmp_path / "store")
+
+    part = open_column_store(tmp_path / "store", columns=["city", "value"], rows=slice(10, 20))
+    pd.testing.assert_frame_equal(part, df[["city", "value"]].iloc[10:20].reset_index(drop=True))
+    with pytest.raises(KeyError):
+        open_column_store(tmp_path / "store", columns=["missing"])
+
+def test_strings_share_one_dictionary_across_chunks(tmp_path):
+    writer = ColumnStoreWriter(tmp_path / "store", rows=4, parse_dates=True)
+    writer.append(pd.DataFrame({"city": ["a", None], "day": ["2024-01-01", "2024-01-02"]}))
+    writer.append(pd.DataFrame({"city": ["b", "a"], "day": [None, "2024-01-04"]}))
+    writer.close()
+
+    stored = open_column_store(tmp_path / "store", categorical=True)
+    assert stored["city"].cat.categories.tolist() == ["a", "b"]
+    assert stored["city"].cat.codes.tolist() == [0, -1, 1, 0]
+    assert stored["day"].dtype.kind == "M"
+    # Даты возвращаются в предпросмотр тем же текстом, что и при чтении из CSV
+    assert slice_rows(stored)["day"].tolist() == ["2024-01-01", "2024-01-02", None, "2024-01-04"]
+    # Общими являются отображенные коды, в процессе - только словарь
+    assert private_nbytes(stored) < stored.memory_usage(deep=True).sum()
+
+def test_invalid_chunks_are_rejected(tmp_path):
+    writer = ColumnStoreWriter(tmp_path / "store", rows=3)
+    writer.append(pd.DataFrame({"value": [1.0, 2.0]}))
+    with pytest.raises(ValueError):
+        writer.append(pd.DataFrame({"value": ["x"]}))
+    with pytest.raises(ValueError):
+        writer.append(pd.DataFrame({"other": [1.0]}))
+    with pytest.raises(ValueError):
+        writer.close()
+    with pytest.raises(ValueError):
+        write_column_store(pd.DataFrame({"mixed": [1, "a"]}), tmp_path / "mixed")
+
+def test_result_is_read_from_store(make_result):
+    result_id = make_result([{"method_id": "standardization",
+                              "parameters": {"strategy": "standard", "columns": ["value"]}}])
+
+    rows = read_result_rows(result_id, offset=5, limit=3)
+    assert len(rows) == 3 and not rows["value"].to_numpy().flags.writeable
+    columns = {name: (values, categories) for name, values, categories in iter_result_columns(result_id)}
+    assert set(columns) == set(rows.columns)
+    assert isinstance(columns["value"][0], np.memmap) and columns["value"][1] is None
+    assert columns["category"][1] is not None
+
+def test_sparse_columns_are_densified():
+    df = pd.DataFrame({"flag": pd.arrays.SparseArray([0, 1, 0, 0], fill_value=0)})
+    assert write_result_store("sparse", df)
+    assert read_result_rows("sparse")["flag"].tolist() == [0, 1, 0, 0]
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import dataframe_cache_utils
+from utils.dataframe_cache_utils import DataFrameCache, load_dataset_sync, slice_rows
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"value": np.arange(rows, dtype=float)})
+
+@pytest.fixture
+def source(tmp_path):
+    def create(name: str):
+        path = tmp_path / f"{name}.csv"
+        path.write_text(name)
+        return path
+    return create
+
+def test_hits_return_the_cached_frame(source):
+    cache = DataFrameCache(max_bytes=10 ** 6)
+    path = source("a")
+    df = frame(10)
+
+    assert cache.get("dataset", "a", path) is None
+    assert cache.put("dataset", "a", path, df) is df
+    assert cache.get("dataset", "a", path) is df
+    assert cache.get("result", "a", path) is None
+    assert cache.stats() == {"entries": 1, "bytes": int(df.memory_usage(deep=True).sum()), "max_bytes": 10 ** 6,
+                             "hits": 1, "shared_hits": 0, "misses": 2, "evictions": 0}
+
+def test_least_recently_used_entry_is_evicted(source):
+    size = int(frame(100).memory_usage(deep=True).sum())
+    cache = DataFrameCache(max_bytes=2 * size + 10)
+    paths = {name: source(name) for name in "abc"}
+    for name in ("a", "b"):
+        cache.put("dataset", name, paths[name], frame(100))
+
+    # Обращение к a делает b самой давно использованной записью
+    assert cache.get("dataset", "a", paths["a"]) is not None
+    cache.put("dataset", "c", paths["c"], frame(100))
+
+    assert cache.get("dataset", "b", paths["b"]) is None
+    assert cache.get("dataset", "a", paths["a"]) is not None and cache.get("dataset", "c", paths["c"]) is not None
+    assert cache.stats()["bytes"] == 2 * size and cache.stats()["evictions"] == 1
+
+def test_changed_or_removed_source_invalidates_entry(source):
+    cache = DataFrameCache(max_bytes=10 ** 6)
+    path = source("a")
+    cache.put("dataset", "a", path, frame(10))
+
+    path.write_text("rewritten")
+    assert cache.get("dataset", "a", path) is None
+    assert cache.stats()["entries"] == 0
+
+    cache.put("dataset", "a", path, frame(10))
+    path.unlink()
+    assert cache.get("dataset", "a", path) is None
+    # Без файла-источника запись не сохраняется
+    assert cache.put("dataset", "a", path, frame(10)) is not None and cache.stats()["entries"] == 0
+
+def test_large_frames_and_invalidation(source):
+    size = int(frame(100).memory_usage(deep=True).sum())
+    cache = DataFrameCache(max_bytes=size)
+    cache.put("dataset", "large", source("large"), frame(100))
+    assert cache.stats()["entries"] == 0
+
+    small = source("small")
+    cache.put("dataset", "small", small, frame(10))
+    assert cache.stats()["entries"] == 1
+    cache.invalidate("dataset", "small")
+    assert cache.get("dataset", "small", small) is None
+
+def test_dataset_file_is_read_once(monkeypatch, source):
+    reads = []
+    monkeypatch.setattr(dataframe_cache_utils, "dataframe_cache", DataFrameCache(max_bytes=10 ** 6))
+    monkeypatch.setattr(dataframe_cache_utils, "read_and_validate_dataframe",
+                        lambda path, extension: reads.append(path) or frame(10))
+    path = source("a")
+
+    first = load_dataset_sync("a", path, "csv")
+    assert load_dataset_sync("a", path, "csv") is first
+    assert len(reads) == 1
+
+def test_slice_rows_matches_csv_representation():
+    df = pd.DataFrame({
+        "sparse": pd.arrays.SparseArray([0.0, 1.0, 0.0, 2.0]),
+        "date": pd.to_datetime(["2024-01-01", None, "2024-01-03", "2024-01-04"]),
+        "value": [1, 2, 3, 4]
+    })
+
+    part = slice_rows(df, offset=1, limit=2)
+    assert part["sparse"].dtype == np.float64 and part["sparse"].tolist() == [1.0, 0.0]
+    assert part["date"].tolist() == [None, "2024-01-03"]
+    assert part.index.tolist() == [0, 1]
+    assert slice_rows(df, offset=3)["value"].tolist() == [4]
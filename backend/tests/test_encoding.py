@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from services.preprocessing_service import get_preprocessing_methods
+from utils.encoding_utils import onehot_encode, hash_encode, label_encode
+from utils.validation_utils import require_valid_parameters
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "city": ["a", "a", "a", "b", "b", "c", "d", None],
+        "value": np.arange(8, dtype=float)
+    })
+
+def test_onehot_matches_get_dummies(frame):
+    encoded, params = onehot_encode(frame.copy(), ["city"])
+    expected = pd.get_dummies(frame, columns=["city"])
+
+    pd.testing.assert_frame_equal(encoded, expected)
+    assert params["columns"]["city"]["categories"] == ["a", "b", "c", "d"]
+    assert not params["columns"]["city"]["other"]
+
+def test_onehot_caps_rare_categories(frame):
+    capped, params = onehot_encode(frame.copy(), ["city"], max_categories=2)
+    assert capped.columns.tolist() == ["value", "city_a", "city_b", "city_other"]
+    assert capped["city_other"].tolist() == [False] * 5 + [True, True, False]
+    # Строка с пропуском не попадает ни в одну категорию
+    assert not capped.iloc[7, 1:].any()
+
+    frequent, _ = onehot_encode(frame.copy(), ["city"], min_frequency=0.3)
+    assert frequent.columns.tolist() == ["value", "city_a", "city_other"]
+    assert params["columns"]["city"]["other_label"] == "other"
+
+def test_other_label_does_not_collide_with_category():
+    df = pd.DataFrame({"kind": ["other", "other", "x", "y"]})
+    encoded, params = onehot_encode(df, ["kind"], max_categories=1)
+
+    assert encoded.columns.tolist() == ["kind_other", "kind_other_1"]
+    assert params["columns"]["kind"]["other_label"] == "other_1"
+
+def test_sparse_output_matches_dense(frame):
+    dense, _ = onehot_encode(frame.copy(), ["city"], max_categories=3)
+    sparse, params = onehot_encode(frame.copy(), ["city"], max_categories=3, sparse=True)
+
+    assert params["sparse"]
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in sparse.dtypes[1:])
+    np.testing.assert_array_equal(sparse.iloc[:, 1:].sparse.to_dense().to_numpy(dtype=bool),
+                                  dense.iloc[:, 1:].to_numpy())
+
+def test_hashing_is_deterministic_one_hot(frame):
+    first, params = hash_encode(frame.copy(), ["city"], n_features=4)
+    second, _ = hash_encode(frame.copy(), ["city"], n_features=4)
+    sparse, _ = hash_encode(frame.copy(), ["city"], n_features=4, sparse=True)
+
+    indicators = first.filter(like="city_hash_")
+    assert indicators.shape[1] == 4
+    # Одна корзина на значение, у пропуска - ни одной
+    assert indicators.sum(axis=1).tolist() == [1] * 7 + [0]
+    pd.testing.assert_frame_equal(first, second)
+    np.testing.assert_array_equal(sparse.filter(like="city_hash_").sparse.to_dense().to_numpy(dtype=bool),
+                                  indicators.to_numpy())
+    assert params["n_features"] == 4
+
+def test_hashing_requires_at_least_one_bucket(frame):
+    with pytest.raises(ValueError):
+        hash_encode(frame, ["city"], n_features=0)
+
+    methods = [{"method_id": "categorical_encoding", "parameters": {"strategy": "hashing", "n_features": 0}}]
+    with pytest.raises(HTTPException) as error:
+        require_valid_parameters(methods, get_preprocessing_methods())
+    assert error.value.status_code == 422
+    assert "n_features" in error.value.detail
+
+    methods[0]["parameters"]["n_features"] = 16
+    require_valid_parameters(methods, get_preprocessing_methods())
+
+def test_label_encoding_keeps_categories(frame):
+    encoded, params = label_encode(frame.copy(), ["city"])
+    assert encoded["city"].tolist()[:7] == [0, 0, 0, 1, 1, 2, 3]
+    assert params["columns"]["city"]["categories"] == ["a", "b", "c", "d"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.preprocessing_service import apply_preprocessing
+from utils.inverse_utils import (apply_inverse_transform, inverse_transform_with_changes,
+                                 normalize_scaling_params)
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "value": rng.normal(50, 5, 100),
+        "amount": rng.uniform(0, 1000, 100),
+        "city": rng.choice(["a", "b", "c"], 100)
+    })
+
+def fitted(df: pd.DataFrame, methods: list) -> tuple:
+    result = apply_preprocessing(df, {"methods": methods})
+    return result, result.scaling_params
+
+@pytest.mark.parametrize("strategy", ["standard", "minmax", "robust"])
+def test_scaling_round_trip(frame, strategy):
+    scaled, params = fitted(frame, [{"method_id": "standardization", "parameters": {"strategy": strategy}}])
+    restored = apply_inverse_transform(scaled.copy(), None, params)
+
+    pd.testing.assert_frame_equal(restored, frame)
+
+def test_parameter_formats_are_equivalent():
+    params = {"value": {"mean": 10.0, "std": 2.0}}
+    formats = [
+        {"standardization": {"method": "standard", "columns": ["value"], "params": params}},
+        {"method": "standard", "parameters": params},
+        {"params": params, "method": None},
+        {"type": "standard", "mean": {"value": 10.0}, "std": {"value": 2.0}}
+    ]
+
+    for scaling_params in formats:
+        assert normalize_scaling_params(scaling_params) == ("standard", params)
+        restored = apply_inverse_transform(pd.DataFrame({"value": [0.0, 1.0]}), None, scaling_params)
+        assert restored["value"].tolist() == [10.0, 12.0]
+
+def test_only_requested_columns_are_restored(frame):
+    scaled, params = fitted(frame, [{"method_id": "standardization", "parameters": {"strategy": "minmax"}}])
+    restored, changed = inverse_transform_with_changes(scaled.copy(), ["amount"], params)
+
+    assert changed == ["amount"]
+    np.testing.assert_allclose(restored["amount"], frame["amount"])
+    pd.testing.assert_series_equal(restored["value"], scaled["value"])
+
+def test_pca_scaling_and_labels_are_undone(frame):
+    methods = [
+        {"method_id": "categorical_encoding", "parameters": {"strategy": "label", "columns": ["city"]}},
+        {"method_id": "standardization", "parameters": {"strategy": "standard", "columns": ["value", "amount"]}},
+        {"method_id": "pca", "parameters": {"columns": ["value", "amount"], "n_components": 2}}
+    ]
+    processed, params = fitted(frame, methods)
+    assert "PCA_1" in processed.columns
+
+    restored, changed = inverse_transform_with_changes(processed.copy(), None, params)
+
+    assert set(changed) == {"value", "amount", "city"}
+    assert restored["city"].tolist() == frame["city"].tolist()
+    np.testing.assert_allclose(restored[["value", "amount"]], frame[["value", "amount"]])
+
+def test_inverse_scaling_step(frame):
+    scaled, params = fitted(frame, [{"method_id": "standardization", "parameters": {"strategy": "robust"}}])
+    config = {"methods": [{"method_id": "inverse_scaling", "parameters": {"scaling_params": params}}]}
+
+    pd.testing.assert_frame_equal(apply_preprocessing(scaled, config)[frame.columns], frame)
+
+def test_unknown_params_leave_data_unchanged(frame):
+    restored, changed = inverse_transform_with_changes(frame.copy(), None, {"something": 1})
+    assert changed == []
+    pd.testing.assert_frame_equal(restored, frame)
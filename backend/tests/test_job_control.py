@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services import job_service, preprocessing_service
+from utils.file_utils import get_processed_file_path
+from utils import job_scheduler_utils as scheduler
+from utils.job_control_utils import JobControl, JobStopped, check_job, effective_limit, request_cancel
+from utils.job_journal_utils import load_job_record
+from utils.result_reader_utils import get_result_metadata_path
+from utils.result_store_utils import get_result_store_path
+
+DATASET_ID = "6b0c7a34-5d55-4c7e-9a57-3f1f0b5d2e11"
+METHODS = [
+    {"method_id": "missing_values", "parameters": {"strategy": "mean"}},
+    {"method_id": "standardization", "parameters": {"strategy": "standard", "columns": ["value", "amount"]}}
+]
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def submit(make_dataset):
+    def run(**config) -> str:
+        make_dataset(DATASET_ID)
+        return job_service.submit_preprocessing_job({"dataset_id": DATASET_ID, "methods": METHODS, **config})
+    return run
+
+def run_job(result_id: str):
+    asyncio.run(job_service.process_job(result_id))
+
+def assert_no_outputs(result_id: str):
+    assert not get_processed_file_path(result_id).exists()
+    assert not get_result_store_path(result_id).exists()
+    assert not get_result_metadata_path(result_id).exists()
+
+def test_effective_limit():
+    assert effective_limit(None, 0) is None
+    assert effective_limit(10, 0) == 10
+    assert effective_limit(None, 60) == 60
+    assert effective_limit(120, 60) == 60
+
+def test_checks_stop_cancelled_and_overdue_jobs():
+    # Вне задачи проверка ничего не делает
+    request_cancel("job")
+    check_job("step")
+
+    control = JobControl("job")
+    control.activate()
+    try:
+        with pytest.raises(JobStopped) as stopped:
+            check_job("pca")
+        assert stopped.value.to_dict() == {"status": "cancelled", "step": "pca", "message": "Задача отменена пользователем"}
+    finally:
+        control.deactivate()
+    check_job("pca")
+
+    control = JobControl("other", time_limit=0.01)
+    time.sleep(0.02)
+    with pytest.raises(JobStopped) as stopped:
+        control.check("standardization")
+    assert stopped.value.status == "timed_out" and stopped.value.step == "standardization"
+
+    control = JobControl("other", cpu_time_limit=0.01)
+    deadline = time.thread_time() + 0.05
+    while time.thread_time() < deadline:
+        pass
+    with pytest.raises(JobStopped) as stopped:
+        control.check()
+    assert stopped.value.status == "timed_out" and "процессорного" in str(stopped.value)
+
+def test_job_cancelled_in_queue(client, submit):
+    # Бюджет памяти занят другой задачей, поэтому задача ожидает в очереди
+    scheduler.submit_job("running", {"peak_bytes": scheduler.memory_budget(), "runtime_seconds": 1.0})
+    assert scheduler._try_admit("running")
+    result_id = submit()
+    assert client.post(f"/api/preprocessing/cancel/{result_id}").json() == {"result_id": result_id,
+                                                                           "status": "cancelling"}
+    run_job(result_id)
+
+    status = client.get(f"/api/preprocessing/status/{result_id}").json()
+    assert status["status"] == "cancelled" and status["step"] == "queued"
+    assert load_job_record(result_id)["state"] == "cancelled"
+    assert client.post(f"/api/preprocessing/cancel/{result_id}").status_code == 409
+
+def test_running_job_stops_at_next_step(client, submit, monkeypatch):
+    result_id = submit()
+    missing_values = preprocessing_service.STEP_HANDLERS["missing_values"]
+
+    def cancel_during_step(*args):
+        request_cancel(result_id)
+        return missing_values(*args)
+
+    monkeypatch.setitem(preprocessing_service.STEP_HANDLERS, "missing_values", cancel_during_step)
+    run_job(result_id)
+
+    status = client.get(f"/api/preprocessing/status/{result_id}").json()
+    assert status["status"] == "cancelled" and status["step"] == "standardization"
+    assert_no_outputs(result_id)
+
+def test_partial_result_is_removed(client, submit, monkeypatch):
+    result_id = submit()
+    write_result_store = job_service.write_result_store
+
+    def cancel_while_saving(job_id, df):
+        written = write_result_store(job_id, df)
+        # CSV и хранилище уже записаны, метаданные еще нет
+        request_cancel(job_id)
+        check_job()
+        return written
+
+    monkeypatch.setattr(job_service, "write_result_store", cancel_while_saving)
+    run_job(result_id)
+
+    assert client.get(f"/api/preprocessing/status/{result_id}").json()["status"] == "cancelled"
+    assert_no_outputs(result_id)
+
+def test_job_time_limit(client, submit, monkeypatch):
+    result_id = submit(time_limit_seconds=1)
+    missing_values = preprocessing_service.STEP_HANDLERS["missing_values"]
+
+    def slow_step(*args):
+        time.sleep(1.1)
+        return missing_values(*args)
+
+    monkeypatch.setitem(preprocessing_service.STEP_HANDLERS, "missing_values", slow_step)
+    run_job(result_id)
+
+    status = client.get(f"/api/preprocessing/status/{result_id}").json()
+    assert status == {"status": "timed_out", "step": "standardization",
+                      "message": "Превышен лимит времени выполнения (1 с)"}
+
+def test_cancel_unknown_job(client):
+    assert client.post("/api/preprocessing/cancel/missing").status_code == 404
@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+from utils.job_estimator_utils import (
+    estimate_job, update_model, LEARNING_RATE, MAX_RATIO, MIN_MEMORY_FACTOR, NUMERIC_BYTES, STRING_BYTES
+)
+
+def metadata(rows: int = 100000, categories: int = 50):
+    return {
+        "row_count": rows,
+        "columns": [
+            {"name": "value", "type": "numeric"},
+            {"name": "amount", "type": "numeric"},
+            {"name": "category", "type": "categorical", "unique_count": categories}
+        ]
+    }
+
+def config(*methods):
+    return {"dataset_id": "dataset", "methods": [{"method_id": method_id, "parameters": parameters}
+                                                 for method_id, parameters in methods]}
+
+def test_estimate_scales_with_rows():
+    steps = config(("missing_values", {"strategy": "mean"}), ("standardization", {"method": "standard"}))
+    small = estimate_job(metadata(rows=10000), steps)
+    large = estimate_job(metadata(rows=100000), steps)
+
+    assert small["dataset_bytes"] == 10000 * (2 * NUMERIC_BYTES + STRING_BYTES)
+    assert large["peak_bytes"] > 5 * small["peak_bytes"]
+    assert large["runtime_seconds"] > 5 * small["runtime_seconds"]
+    # Загруженный набор и копия для шагов
+    assert large["peak_bytes"] >= 2 * large["dataset_bytes"]
+
+def test_onehot_width_depends_on_categories_and_output():
+    dense = estimate_job(metadata(categories=500), config(("categorical_encoding", {"strategy": "onehot"})))
+    limited = estimate_job(metadata(categories=500),
+                           config(("categorical_encoding", {"strategy": "onehot", "max_categories": 10})))
+    sparse = estimate_job(metadata(categories=500),
+                          config(("categorical_encoding", {"strategy": "onehot", "output": "sparse"})))
+
+    # Исходный столбец заменяется индикаторами категорий
+    assert dense["output_columns"] == 2 + 500
+    assert limited["output_columns"] == 2 + 11
+    assert limited["peak_bytes"] < dense["peak_bytes"]
+    assert sparse["peak_bytes"] < dense["peak_bytes"]
+
+def test_pca_replaces_numeric_columns():
+    estimate = estimate_job(metadata(), config(("pca", {"n_components": 1})))
+    assert estimate["output_columns"] == 2
+
+def test_model_factors_scale_work_after_load():
+    steps = config(("outliers", {"strategy": "iqr"}))
+    base = estimate_job(metadata(), steps)
+    corrected = estimate_job(metadata(), steps, {"memory_factor": 2.0, "runtime_factor": 3.0})
+    floored = estimate_job(metadata(), steps, {"memory_factor": 0.01})
+
+    # Поправка не относится к загрузке набора
+    assert corrected["peak_bytes"] == base["dataset_bytes"] + 2 * base["base_working_bytes"]
+    assert corrected["runtime_seconds"] > base["runtime_seconds"]
+    assert floored["peak_bytes"] == int(base["dataset_bytes"] + MIN_MEMORY_FACTOR * base["base_working_bytes"])
+
+def test_update_model_moves_towards_measurements():
+    estimate = {"base_working_bytes": 1000, "base_processing_seconds": 2.0}
+
+    model = update_model({}, estimate, working_bytes=2000, processing_seconds=2.0)
+    assert model["memory_factor"] == pytest.approx(2 ** LEARNING_RATE, abs=1e-4)
+    assert model["runtime_factor"] == pytest.approx(1.0)
+    assert model["samples"] == 1
+
+    # Выброс измерения ограничивается MAX_RATIO
+    outlier = update_model({}, estimate, working_bytes=10 ** 9, processing_seconds=2.0)
+    assert outlier["memory_factor"] == pytest.approx(math.exp(LEARNING_RATE * math.log(MAX_RATIO)), abs=1e-4)
+
+    # Без измерения памяти поправка памяти не меняется
+    unchanged = update_model(model, estimate, working_bytes=None, processing_seconds=4.0)
+    assert unchanged["memory_factor"] == model["memory_factor"]
+    assert unchanged["runtime_factor"] > 1.0
+    assert unchanged["samples"] == 2
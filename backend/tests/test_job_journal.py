@@ -0,0 +1,133 @@
+import os
+import json
+import time
+
+import pandas as pd
+
+from config.settings import JOB_JOURNAL_DIR, JOB_MAX_ATTEMPTS
+from utils.journal_index_utils import ACTIVE_INDEX, active_keys
+from utils.job_journal_utils import (
+    create_job_record, update_job_record, load_job_record, save_checkpoint, load_checkpoint,
+    get_checkpoint_path, claim_interrupted_jobs, release_job, prune_job_records, _disown
+)
+
+CONFIG = {"dataset_id": "dataset", "methods": [{"method_id": "missing_values", "parameters": {}}]}
+ESTIMATE = {"peak_bytes": 1000, "runtime_seconds": 1.0}
+
+def create_orphan(job_id: str, dead_pid: int, **fields):
+    """
+    Задача, владелец которой завершился (падение воркера).
+    """
+    create_job_record(job_id, CONFIG, ESTIMATE)
+    _disown(job_id)
+    update_job_record(job_id, owner={"pid": dead_pid, "pid_start": None}, **fields)
+
+def set_mtime(job_id: str, hours_ago: float):
+    timestamp = time.time() - hours_ago * 3600
+    os.utime(JOB_JOURNAL_DIR / f"{job_id}.json", (timestamp, timestamp))
+
+def test_active_index_follows_state():
+    create_job_record("job", CONFIG, ESTIMATE)
+    assert active_keys(JOB_JOURNAL_DIR) == ["job"]
+
+    update_job_record("job", state="running")
+    assert active_keys(JOB_JOURNAL_DIR) == ["job"]
+
+    update_job_record("job", state="completed")
+    assert active_keys(JOB_JOURNAL_DIR) == []
+    assert load_job_record("job")["state"] == "completed"
+
+def test_final_state_removes_checkpoint():
+    create_job_record("job", CONFIG, ESTIMATE)
+    df = pd.DataFrame({"x": [1.0, 2.0]})
+    assert save_checkpoint("job", 0, df, {"standardization": {"method": "standard"}})
+
+    step, saved, params = load_checkpoint("job")
+    assert step == 0
+    pd.testing.assert_frame_equal(saved, df)
+    assert params == {"standardization": {"method": "standard"}}
+
+    update_job_record("job", state="failed", message="ошибка")
+    assert not get_checkpoint_path("job").exists()
+    assert load_checkpoint("job") is None
+
+def test_claim_takes_only_interrupted_jobs(dead_pid):
+    create_job_record("alive", CONFIG, ESTIMATE)
+    create_orphan("orphan", dead_pid, state="running", checkpoint_step=0)
+    create_orphan("finished", dead_pid, state="completed")
+
+    resumed, exhausted = claim_interrupted_jobs()
+
+    assert [record["job_id"] for record in resumed] == ["orphan"]
+    assert exhausted == []
+    record = load_job_record("orphan")
+    assert record["state"] == "queued"
+    assert record["attempts"] == 2
+    assert record["owner"]["pid"] == os.getpid()
+    assert record["checkpoint_step"] == 0
+    # Захваченная задача принадлежит живому процессу и повторно не захватывается
+    assert claim_interrupted_jobs() == ([], [])
+
+def test_claim_takes_job_without_heartbeat():
+    create_job_record("stale", CONFIG, ESTIMATE)
+    _disown("stale")
+    record = load_job_record("stale")
+    record["heartbeat_at"] = 0
+    with open(JOB_JOURNAL_DIR / "stale.json", "w", encoding="utf-8") as f:
+        json.dump(record, f)
+
+    resumed, _ = claim_interrupted_jobs()
+    assert [record["job_id"] for record in resumed] == ["stale"]
+
+def test_claim_fails_job_without_attempts(dead_pid):
+    create_orphan("job", dead_pid, state="running", attempts=JOB_MAX_ATTEMPTS)
+    save_checkpoint("job", 0, pd.DataFrame({"x": [1]}), {})
+
+    resumed, exhausted = claim_interrupted_jobs()
+
+    assert resumed == []
+    assert [record["job_id"] for record in exhausted] == ["job"]
+    assert load_job_record("job")["state"] == "failed"
+    assert not get_checkpoint_path("job").exists()
+    assert active_keys(JOB_JOURNAL_DIR) == []
+
+def test_released_job_is_claimed_again(dead_pid):
+    create_orphan("job", dead_pid, state="running")
+    resumed, _ = claim_interrupted_jobs()
+    assert resumed[0]["attempts"] == 2
+
+    release_job("job", message="Очередь заполнена")
+    record = load_job_record("job")
+    assert record["owner"] is None
+    # Не начатая попытка не учитывается
+    assert record["attempts"] == 1
+
+    resumed, _ = claim_interrupted_jobs()
+    assert [record["job_id"] for record in resumed] == ["job"]
+    assert resumed[0]["attempts"] == 2
+
+def test_index_is_rebuilt_for_journal_without_index(dead_pid):
+    JOB_JOURNAL_DIR.mkdir(parents=True)
+    for job_id, state in (("queued", "queued"), ("done", "completed")):
+        record = {"job_id": job_id, "state": state, "attempts": 1, "heartbeat_at": 0,
+                  "owner": {"pid": dead_pid, "pid_start": None}}
+        with open(JOB_JOURNAL_DIR / f"{job_id}.json", "w", encoding="utf-8") as f:
+            json.dump(record, f)
+
+    resumed, _ = claim_interrupted_jobs()
+
+    assert [record["job_id"] for record in resumed] == ["queued"]
+    assert sorted(os.listdir(JOB_JOURNAL_DIR / ACTIVE_INDEX)) == ["queued"]
+
+def test_prune_removes_only_old_finished_records():
+    for job_id in ("old_done", "recent_done", "old_active"):
+        create_job_record(job_id, CONFIG, ESTIMATE)
+    update_job_record("old_done", state="completed")
+    update_job_record("recent_done", state="cancelled")
+    set_mtime("old_done", 1000)
+    set_mtime("old_active", 1000)
+
+    assert prune_job_records() == 1
+    assert load_job_record("old_done") is None
+    assert load_job_record("recent_done") is not None
+    assert load_job_record("old_active") is not None
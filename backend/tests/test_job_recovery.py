@@ -0,0 +1,178 @@
+import json
+import asyncio
+
+import pytest
+
+from services import job_service, job_recovery_service
+from services.preprocessing_service import apply_preprocessing
+from utils import job_scheduler_utils as scheduler
+from utils.file_utils import get_processed_file_path
+from utils.job_journal_utils import create_job_record, update_job_record, load_job_record, _disown
+
+DATASET_ID = "6b0c7a34-5d55-4c7e-9a57-3f1f0b5d2e11"
+METHODS = [
+    {"method_id": "missing_values", "parameters": {"strategy": "mean"}},
+    {"method_id": "outliers", "parameters": {"strategy": "iqr", "mode": "clip"}},
+    {"method_id": "categorical_encoding", "parameters": {"strategy": "onehot"}},
+    {"method_id": "standardization", "parameters": {"method": "standard"}}
+]
+
+class WorkerCrash(BaseException):
+    """
+    Падение воркера: не перехватывается обработкой ошибок задачи.
+    """
+
+@pytest.fixture(autouse=True)
+def checkpoints(monkeypatch):
+    """
+    Контрольная точка после каждого шага.
+    """
+    monkeypatch.setattr(job_service, "JOB_CHECKPOINTS", True)
+    monkeypatch.setattr(job_service, "JOB_CHECKPOINT_INTERVAL", 0)
+
+@pytest.fixture
+def started(monkeypatch):
+    """
+    Задачи, запущенные recover_jobs (вместо фонового выполнения).
+    """
+    job_ids = []
+    monkeypatch.setattr(job_recovery_service, "start_job", job_ids.append)
+    return job_ids
+
+def run_to_completion(job_id: str):
+    assert asyncio.run(job_service.process_job(job_id)) is None
+    assert load_job_record(job_id)["state"] == "completed"
+
+def read_result(job_id: str):
+    result_path = get_processed_file_path(job_id)
+    with open(result_path.parent / f"{job_id}_metadata.json", "r") as f:
+        metadata = json.load(f)
+    return result_path.read_bytes(), metadata
+
+def orphan(job_id: str, dead_pid: int):
+    """
+    Передает задачу завершившемуся процессу и освобождает ее место в очереди.
+    """
+    _disown(job_id)
+    update_job_record(job_id, owner={"pid": dead_pid, "pid_start": None})
+    scheduler.finish_job(job_id)
+
+@pytest.mark.parametrize("crash_after", [0, 2])
+def test_resumed_job_matches_uninterrupted(make_dataset, started, dead_pid, monkeypatch, crash_after):
+    make_dataset(DATASET_ID)
+    config = {"dataset_id": DATASET_ID, "methods": METHODS}
+    expected_id = job_service.submit_preprocessing_job(config)
+    run_to_completion(expected_id)
+
+    def crashing(df, config, step_callback=None, **kwargs):
+        def callback(method_idx, processed_df, fitted_params):
+            step_callback(method_idx, processed_df, fitted_params)
+            if method_idx == crash_after:
+                raise WorkerCrash()
+        return apply_preprocessing(df, config, step_callback=callback, **kwargs)
+
+    job_id = job_service.submit_preprocessing_job(config)
+    monkeypatch.setattr(job_service, "apply_preprocessing", crashing)
+    with pytest.raises(WorkerCrash):
+        asyncio.run(job_service.process_job(job_id))
+    monkeypatch.setattr(job_service, "apply_preprocessing", apply_preprocessing)
+    assert load_job_record(job_id)["checkpoint_step"] == crash_after
+    orphan(job_id, dead_pid)
+
+    asyncio.run(job_recovery_service.recover_jobs())
+    assert started == [job_id]
+    run_to_completion(job_id)
+
+    expected_data, expected_metadata = read_result(expected_id)
+    data, metadata = read_result(job_id)
+    assert data == expected_data
+    assert metadata["columns"] == expected_metadata["columns"]
+    assert metadata["scaling_params"] == expected_metadata["scaling_params"]
+    assert metadata["resources"]["attempts"] == 2
+    assert metadata["resources"]["resumed_from_step"] == crash_after + 1
+
+def test_checkpoints_are_opt_in_and_spaced(make_dataset, monkeypatch):
+    make_dataset(DATASET_ID)
+    saved = []
+    monkeypatch.setattr(job_service, "save_checkpoint", lambda job_id, step, df, params: saved.append(step) or True)
+
+    def run(**settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(job_service, name, value)
+        saved.clear()
+        run_to_completion(job_service.submit_preprocessing_job({"dataset_id": DATASET_ID, "methods": METHODS}))
+        return list(saved)
+
+    assert run(JOB_CHECKPOINTS=False) == []
+    # Шаги короче интервала не записывают контрольных точек
+    assert run(JOB_CHECKPOINTS=True, JOB_CHECKPOINT_INTERVAL=3600) == []
+    # После последнего шага контрольная точка не нужна
+    assert run(JOB_CHECKPOINT_INTERVAL=0) == [0, 1, 2]
+
+def interrupted_job(job_id: str, dead_pid: int, peak_bytes: int, budget_bytes: int):
+    create_job_record(job_id, {"dataset_id": DATASET_ID, "methods": METHODS},
+                      {"peak_bytes": peak_bytes, "runtime_seconds": 1.0}, budget_bytes=budget_bytes)
+    orphan(job_id, dead_pid)
+
+def test_full_queue_defers_recovery(started, dead_pid, monkeypatch):
+    interrupted_job("job", dead_pid, 100, scheduler.memory_budget())
+    monkeypatch.setattr(scheduler, "JOB_QUEUE_LIMIT", 1)
+    scheduler.submit_job("other", {"peak_bytes": 100, "runtime_seconds": 1.0})
+
+    asyncio.run(job_recovery_service.recover_jobs())
+
+    assert started == []
+    record = load_job_record("job")
+    assert record["state"] == "queued"
+    assert record["owner"] is None
+    assert record["attempts"] == 1
+    assert record["deferred_at"] is not None
+
+    # Место в очереди освободилось: задача возобновляется при следующем поиске
+    scheduler.finish_job("other")
+    asyncio.run(job_recovery_service.recover_jobs())
+
+    assert started == ["job"]
+    record = load_job_record("job")
+    assert record["attempts"] == 2
+    assert record["deferred_at"] is None
+    assert scheduler.get_job("job")["state"] == "queued"
+
+def test_job_over_unchanged_budget_fails(started, dead_pid):
+    budget = scheduler.memory_budget()
+    interrupted_job("job", dead_pid, budget + 1, budget)
+
+    asyncio.run(job_recovery_service.recover_jobs())
+
+    assert started == []
+    assert load_job_record("job")["state"] == "failed"
+    assert (get_processed_file_path("job").parent / "job_error.txt").exists()
+
+def test_job_over_changed_budget_is_deferred(started, dead_pid, monkeypatch):
+    budget = scheduler.memory_budget()
+    interrupted_job("job", dead_pid, budget + 1, 2 * budget)
+
+    asyncio.run(job_recovery_service.recover_jobs())
+
+    assert started == []
+    record = load_job_record("job")
+    assert record["state"] == "queued"
+    assert record["owner"] is None
+
+    # Бюджет вернулся: задача принимается в очередь
+    monkeypatch.setattr(scheduler, "JOB_MEMORY_BUDGET", 2 * budget)
+    asyncio.run(job_recovery_service.recover_jobs())
+    assert started == ["job"]
+    assert load_job_record("job")["budget_bytes"] == 2 * budget
+
+def test_deferred_job_fails_after_queue_timeout(started, dead_pid, monkeypatch):
+    budget = scheduler.memory_budget()
+    interrupted_job("job", dead_pid, budget + 1, 2 * budget)
+    asyncio.run(job_recovery_service.recover_jobs())
+    assert load_job_record("job")["state"] == "queued"
+
+    monkeypatch.setattr(job_recovery_service, "JOB_QUEUE_TIMEOUT", 0)
+    asyncio.run(job_recovery_service.recover_jobs())
+
+    assert started == []
+    assert load_job_record("job")["state"] == "failed"
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from utils import job_scheduler_utils as scheduler
+from utils.job_control_utils import JobStopped, request_cancel
+
+def estimate(peak_bytes: int):
+    return {"peak_bytes": peak_bytes, "runtime_seconds": 1.0}
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(scheduler, "JOB_MEMORY_BUDGET", 100)
+    return 100
+
+def test_job_larger_than_budget_is_rejected(budget):
+    with pytest.raises(HTTPException) as error:
+        scheduler.submit_job("job", estimate(budget + 1))
+    assert error.value.status_code == 413
+    assert scheduler.get_job("job") is None
+
+def test_full_queue_is_rejected(budget, monkeypatch):
+    monkeypatch.setattr(scheduler, "JOB_QUEUE_LIMIT", 2)
+    assert scheduler.submit_job("first", estimate(10)) == {"position": 1, "budget_bytes": budget}
+    assert scheduler.submit_job("second", estimate(10))["position"] == 2
+
+    with pytest.raises(HTTPException) as error:
+        scheduler.submit_job("third", estimate(10))
+    assert error.value.status_code == 503
+
+def test_admission_keeps_queue_order_and_budget(budget):
+    for job_id, peak_bytes in (("a", 60), ("b", 60), ("c", 10)):
+        scheduler.submit_job(job_id, estimate(peak_bytes))
+
+    # Задача допускается только первой в очереди и только в свободный бюджет
+    assert not scheduler._try_admit("b")
+    assert scheduler._try_admit("a")
+    assert not scheduler._try_admit("b")
+    assert not scheduler._try_admit("c")
+    assert scheduler.running_jobs() == 1
+    assert scheduler.job_queue_status("c")["position"] == 2
+    assert "ожидает освобождения памяти" in scheduler.job_queue_status("b")["message"]
+
+    scheduler.finish_job("a")
+    assert scheduler._try_admit("b")
+    assert scheduler._try_admit("c")
+    assert scheduler.local_running_jobs() == 2
+
+def test_queue_status_reports_memory_wait_only_when_budget_is_short(budget):
+    scheduler.submit_job("a", estimate(60))
+    # Первая задача помещается в свободный бюджет и просто ждет проверки очереди
+    status = scheduler.job_queue_status("a")
+    assert status["position"] == 1
+    assert "памяти" not in status["message"] and "ожидает запуска" in status["message"]
+
+    assert scheduler._try_admit("a")
+    assert scheduler.job_queue_status("a") is None
+    scheduler.submit_job("b", estimate(30))
+    assert "памяти" not in scheduler.job_queue_status("b")["message"]
+    scheduler.submit_job("c", estimate(10))
+    assert "перед ней в очереди задач: 1" in scheduler.job_queue_status("c")["message"]
+
+def test_jobs_of_exited_worker_release_budget(budget, dead_pid):
+    scheduler.submit_job("job", estimate(90))
+    assert scheduler._try_admit("job")
+    with scheduler._locked_state() as state:
+        state["jobs"]["job"]["pid"] = dead_pid
+
+    assert scheduler.get_job("job") is None
+    scheduler.submit_job("next", estimate(90))
+    assert scheduler._try_admit("next")
+
+def test_wait_for_admission_times_out(budget):
+    scheduler.submit_job("running", estimate(90))
+    assert scheduler._try_admit("running")
+    scheduler.submit_job("waiting", estimate(90))
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(scheduler.wait_for_admission("waiting", timeout=0))
+    assert scheduler.get_job("waiting") is None
+
+def test_wait_for_admission_stops_cancelled_job(budget):
+    scheduler.submit_job("running", estimate(90))
+    assert scheduler._try_admit("running")
+    scheduler.submit_job("waiting", estimate(90))
+    request_cancel("waiting")
+
+    with pytest.raises(JobStopped) as stopped:
+        asyncio.run(scheduler.wait_for_admission("waiting"))
+    assert stopped.value.status == "cancelled"
+    assert scheduler.get_job("waiting") is None
+
+def test_usage_updates_model():
+    scheduler.record_job_usage({"base_working_bytes": 1000, "base_processing_seconds": 1.0}, 2000, 1.0)
+    model = scheduler.load_model()
+    assert model["samples"] == 1
+    assert model["memory_factor"] > 1.0
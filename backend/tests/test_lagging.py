@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.preprocessing_service import apply_preprocessing
+from utils.lag_utils import build_lag_block
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    n = 60
+    return pd.DataFrame({
+        "sales": rng.normal(100, 10, n),
+        "price": rng.integers(1, 50, n),
+        "store": rng.choice(["a", "b", "c"], n),
+        "label": rng.choice(["x", "y"], n)
+    }, index=pd.RangeIndex(100, 100 + n))
+
+@pytest.mark.parametrize("lags", [[1, 2, 3], [0, 5], [-1, 2], [70]])
+def test_lags_match_shift(panel, lags):
+    block = build_lag_block(panel, ["sales", "price", "label"], lags)
+
+    assert block.columns.tolist() == [f"{col}_lag_{lag}" for col in ("sales", "price", "label") for lag in lags]
+    pd.testing.assert_index_equal(block.index, panel.index)
+    for col in ("sales", "price"):
+        for lag in lags:
+            expected = panel[col].shift(lag).astype(np.float64)
+            pd.testing.assert_series_equal(block[f"{col}_lag_{lag}"], expected, check_names=False)
+    for lag in lags:
+        # Пропуски строковых лагов - NaN, у shift - None
+        expected = panel["label"].shift(lag)
+        pd.testing.assert_series_equal(block[f"label_lag_{lag}"].fillna("-"), expected.fillna("-"),
+                                       check_names=False)
+
+def test_group_lags_match_groupby_shift(panel):
+    block = build_lag_block(panel, ["sales"], [1, 3], group_column="store")
+
+    for lag in (1, 3):
+        expected = panel.groupby("store")["sales"].shift(lag)
+        pd.testing.assert_series_equal(block[f"sales_lag_{lag}"], expected, check_names=False)
+
+def test_rows_without_group_get_no_lags(panel):
+    panel.loc[[101, 102], "store"] = None
+    block = build_lag_block(panel, ["sales"], [1], group_column="store")
+
+    assert block.loc[[101, 102], "sales_lag_1"].isna().all()
+    expected = panel.groupby("store")["sales"].shift(1)
+    pd.testing.assert_series_equal(block["sales_lag_1"], expected, check_names=False)
+
+def test_lagging_step_replaces_existing_lag_columns(panel):
+    config = {"methods": [{"method_id": "lagging", "parameters": {
+        "target_column": "sales", "exog_columns": ["price", "sales"], "lag_periods": [1, 2]}}]}
+    once = apply_preprocessing(panel, config)
+    twice = apply_preprocessing(once, config)
+
+    assert once.columns.tolist() == panel.columns.tolist() + ["sales_lag_1", "sales_lag_2",
+                                                             "price_lag_1", "price_lag_2"]
+    pd.testing.assert_frame_equal(twice, once)
+
+def test_empty_frame_gives_empty_block():
+    block = build_lag_block(pd.DataFrame({"x": []}, dtype=float), ["x"], [1])
+    assert block.columns.tolist() == ["x_lag_1"] and block.empty
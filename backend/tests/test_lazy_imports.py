@@ -0,0 +1,65 @@
+import json
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.startup_benchmark import measure_import_times
+from utils import lazy_import_utils
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["sklearn", "scipy", "statsmodels"]
+
+def run_python(code: str) -> dict:
+    completed = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True,
+                               check=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(lazy_import_utils, "_loaded", {})
+    monkeypatch.setattr(lazy_import_utils, "METHOD_DEPENDENCIES", {"fast": ["json.tool"], "broken": ["no_such_module"]})
+
+def test_worker_starts_without_heavy_libraries():
+    loaded = run_python(f"import sys, json, main; print(json.dumps([m for m in {HEAVY_MODULES} if m in sys.modules]))")
+    assert loaded == []
+
+def test_method_loads_its_dependencies_on_first_use():
+    loaded = run_python(
+        "import sys, json\n"
+        "import pandas as pd\n"
+        "from services.preprocessing_service import apply_preprocessing\n"
+        "df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [3.0, 1.0, 2.0]})\n"
+        "before = 'sklearn' in sys.modules\n"
+        "apply_preprocessing(df, {'methods': [{'method_id': 'pca', 'parameters': {'n_components': 1}}]})\n"
+        "print(json.dumps([before, 'sklearn.decomposition' in sys.modules]))"
+    )
+    assert loaded == [False, True]
+
+def test_dependencies_are_imported_once(fresh_state):
+    first = lazy_import_utils.ensure_method_dependencies("fast")
+    assert list(first) == ["json.tool"]
+    assert lazy_import_utils.ensure_method_dependencies("fast") == {}
+    assert lazy_import_utils.ensure_method_dependencies("standardization") == {}
+    assert lazy_import_utils.loaded_modules() == first
+
+def test_warm_up_skips_missing_modules(fresh_state, caplog):
+    with caplog.at_level(logging.WARNING):
+        loaded = lazy_import_utils.warm_up_methods()
+
+    assert list(loaded) == ["json.tool"]
+    assert "broken" in caplog.text
+    with pytest.raises(ImportError):
+        lazy_import_utils.ensure_method_dependencies("broken")
+
+def test_background_warm_up(fresh_state):
+    lazy_import_utils.start_warm_up().join(timeout=10)
+    assert "json.tool" in lazy_import_utils.loaded_modules()
+
+def test_import_times_are_measured():
+    times = measure_import_times("utils.json_utils", top=3)
+    assert times["total"] > 0
+    assert len(times["top_cumulative"]) == 3
+    assert {"utils", "utils.json_utils"} <= set(times["application"])
@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks import load_test
+from services import job_recovery_service
+from utils import job_journal_utils, metrics_utils
+
+def test_parse_mix():
+    assert load_test.parse_mix("full=1,read=3,execute") == {"full": 1.0, "read": 3.0, "execute": 1.0}
+    with pytest.raises(ValueError):
+        load_test.parse_mix("full=1,write=2")
+
+def test_report_percentiles_and_rates():
+    stats = load_test.EndpointStats()
+    for latency in range(1, 101):
+        stats.record("GET /a", latency / 100, error=latency <= 10, lock_timeout=latency <= 5,
+                     detail=f"HTTP 500: {latency % 4}")
+    stats.record("GET /b", 0.5, busy=True)
+
+    report = stats.report(duration=2.0)
+    endpoint = report["endpoints"]["GET /a"]
+    assert endpoint["requests"] == 100 and endpoint["throughput_rps"] == 50
+    assert endpoint["p50"] == pytest.approx(0.505) and endpoint["max"] == 1.0
+    assert (endpoint["error_rate"], endpoint["lock_timeout_rate"]) == (0.1, 0.05)
+    # Сохраняются только несколько различных текстов ошибок
+    assert len(endpoint["error_samples"]) == 3
+    assert report["endpoints"]["GET /b"]["busy_rate"] == 1.0
+    assert report["requests"] == 101 and report["error_rate"] == pytest.approx(10 / 101)
+
+def test_responses_are_classified():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/lock":
+            return httpx.Response(408, json={"detail": f"{load_test.LOCK_TIMEOUT_MARKER} к файлу"})
+        if request.url.path == "/busy":
+            return httpx.Response(200, json={"status": "processing", "message": "Файл обрабатывается"})
+        if request.url.path == "/down":
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, json={"status": "processing"})
+
+    async def run():
+        stats = load_test.EndpointStats()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            user = load_test.VirtualUser(client, stats, None, b"", None, [])
+            responses = [await user.request(path, "GET", path) for path in ("/lock", "/busy", "/down", "/ok")]
+        return stats, responses
+
+    stats, responses = asyncio.run(run())
+    assert [response is not None for response in responses] == [False, True, False, True]
+    assert (stats.errors, stats.lock_timeouts, stats.busy) == (
+        {"/lock": 1, "/busy": 0, "/down": 1, "/ok": 0},
+        {"/lock": 1, "/busy": 0, "/down": 0, "/ok": 0},
+        {"/lock": 0, "/busy": 1, "/down": 0, "/ok": 0}
+    )
+
+def test_in_process_run_completes_all_scenarios():
+    args = load_test.parse_args(["--concurrency", "2", "--iterations", "2", "--duration", "60", "--rows", "200",
+                                 "--width", "2", "--categorical", "1", "--pages", "1", "--poll-interval", "0.01",
+                                 "--mix", "full=1,read=1,execute=1"])
+    report = asyncio.run(load_test.run_load_test(args))
+
+    assert sum(report["scenarios"].values()) == 4
+    assert report["error_rate"] == 0, report["endpoints"]
+    assert report["meta"]["target"] == "in-process"
+    executed = report["endpoints"].get("POST /preprocessing/execute")
+    if executed:
+        assert report["endpoints"]["GET /preprocessing/data/{id}"]["requests"] == executed["requests"]
+    # Фоновые задачи и потоки приложения остановлены после нагрузки
+    assert job_recovery_service._recovery_task is None
+    assert job_journal_utils._heartbeat_thread is None and metrics_utils._writer is None
@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+import subprocess
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils import metrics_utils
+from utils.process_utils import process_start_time
+
+@pytest.fixture(autouse=True)
+def metrics_dir(tmp_path, monkeypatch):
+    """
+    Снимки метрик во временной директории, значения процесса начинаются с нуля.
+    """
+    directory = tmp_path / "metrics"
+    monkeypatch.setattr(metrics_utils, "METRICS_DIR", directory)
+    monkeypatch.setattr(metrics_utils, "_values", {name: {} for name in metrics_utils.METRICS})
+    return directory
+
+@pytest.fixture
+def live_pid():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+def write_snapshot(directory, pid, snapshot):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{pid}.json"
+    path.write_text(json.dumps({name: [[labels, value] for labels, value in samples]
+                                for name, samples in snapshot.items()}))
+    return path
+
+OTHER_WORKER = {
+    "http_requests_total": [({"route": "/health"}, 3)],
+    "preprocessing_jobs": [({"state": "queued"}, 2)],
+    "process_resident_memory_bytes": [({}, 1000)],
+    "preprocessing_step_duration_seconds": [({"method": "pca"}, [0] * len(metrics_utils.LATENCY_BUCKETS) + [60.0, 1])]
+}
+
+def test_histogram_buckets_are_cumulative():
+    metrics_utils.observe("preprocessing_step_duration_seconds", 0.03, method="pca")
+    metrics_utils.observe("preprocessing_step_duration_seconds", 2.0, method="pca")
+
+    text = metrics_utils.render_metrics()
+    prefix = 'preprocessing_step_duration_seconds_bucket{method="pca",le='
+    assert f'{prefix}"0.025"}} 0' in text and f'{prefix}"0.05"}} 1' in text
+    assert f'{prefix}"2.5"}} 2' in text and f'{prefix}"+Inf"}} 2' in text
+    assert 'preprocessing_step_duration_seconds_sum{method="pca"} 2.03' in text
+    assert 'preprocessing_step_duration_seconds_count{method="pca"} 2' in text
+
+def test_live_workers_are_aggregated(metrics_dir, live_pid):
+    write_snapshot(metrics_dir, live_pid, OTHER_WORKER)
+    metrics_utils.inc_counter("http_requests_total", 2, route="/health")
+    metrics_utils.inc_counter("preprocessing_jobs", 1, state="queued")
+    metrics_utils.observe("preprocessing_step_duration_seconds", 1.0, method="pca")
+
+    merged = metrics_utils.collect_metrics()
+    assert merged["http_requests_total"][(("route", "/health"),)] == 5
+    assert merged["preprocessing_jobs"][(("state", "queued"),)] == 3
+    # Память - отдельное значение для каждого процесса
+    memory = merged["process_resident_memory_bytes"]
+    assert memory[(("pid", str(live_pid)),)] == 1000 and (("pid", str(os.getpid())),) in memory
+    histogram = merged["preprocessing_step_duration_seconds"][(("method", "pca"),)]
+    assert histogram[-2:] == [61.0, 2]
+
+def test_exited_worker_keeps_counters_without_gauges(metrics_dir, dead_pid):
+    path = write_snapshot(metrics_dir, dead_pid, OTHER_WORKER)
+
+    for _ in range(2):
+        merged = metrics_utils.collect_metrics()
+        # Счетчики завершившегося воркера учитываются один раз, gauge отбрасываются
+        assert merged["http_requests_total"] == {(("route", "/health"),): 3}
+        assert merged["preprocessing_jobs"] == {}
+        assert not any(dict(key).get("pid") == str(dead_pid) for key in merged["process_resident_memory_bytes"])
+    assert not path.exists()
+    assert (metrics_dir / metrics_utils.ACCUMULATED_SNAPSHOT).exists()
+
+def test_snapshot_of_reused_pid_is_folded(metrics_dir, live_pid):
+    path = write_snapshot(metrics_dir, live_pid, OTHER_WORKER)
+    # Снимок записан завершившимся процессом, pid которого занял новый процесс
+    snapshot = json.loads(path.read_text())
+    snapshot["process"] = {"pid": live_pid, "pid_start": process_start_time(live_pid) + 1}
+    path.write_text(json.dumps(snapshot))
+
+    merged = metrics_utils.collect_metrics()
+    assert merged["http_requests_total"] == {(("route", "/health"),): 3}
+    assert merged["preprocessing_jobs"] == {}
+    assert not path.exists()
+
+def test_stale_snapshot_drops_gauges(metrics_dir, live_pid):
+    path = write_snapshot(metrics_dir, live_pid, OTHER_WORKER)
+    old = time.time() - metrics_utils.STALE_AFTER - 1
+    os.utime(path, (old, old))
+
+    merged = metrics_utils.collect_metrics()
+    assert merged["http_requests_total"][(("route", "/health"),)] == 3
+    assert merged["preprocessing_jobs"] == {}
+    assert path.exists()
+
+def test_writer_stop_folds_process_counters(metrics_dir, monkeypatch):
+    monkeypatch.setattr(metrics_utils, "FLUSH_INTERVAL", 0.01)
+    metrics_utils.start_metrics_writer()
+    metrics_utils.inc_counter("http_requests_total", route="/health")
+    metrics_utils.stop_metrics_writer()
+
+    assert not (metrics_dir / f"{os.getpid()}.json").exists()
+    # Счетчики процесса сохраняются в накопленном снимке; после сброса значений процесса
+    # они не учитываются повторно
+    monkeypatch.setattr(metrics_utils, "_values", {name: {} for name in metrics_utils.METRICS})
+    assert metrics_utils.collect_metrics()["http_requests_total"] == {(("route", "/health"),): 1}
+
+def test_metrics_endpoint_labels_route_templates():
+    client = TestClient(main.app)
+    client.get("/api/preprocessing/status/00000000-0000-0000-0000-000000000000")
+    client.get("/health")
+
+    text = client.get("/metrics").text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_requests_total{method="GET",route="/api/preprocessing/status/{result_id}",status="404"} 1' in text
+    assert 'http_requests_total{method="GET",route="/health",status="200"} 1' in text
+    assert "http_requests_in_progress 1" in text
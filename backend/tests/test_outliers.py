@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.preprocessing_service import apply_preprocessing
+from utils.outlier_utils import handle_outliers
+
+def outliers(df: pd.DataFrame, **parameters) -> pd.DataFrame:
+    return apply_preprocessing(df, {"methods": [{"method_id": "outliers", "parameters": parameters}]})
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"value": rng.normal(0, 1, 500), "count": rng.integers(0, 10, 500),
+                       "flag": rng.random(500) > 0.5})
+    df.loc[[3, 70], "value"] = [15.0, -12.0]
+    df.loc[10, "value"] = np.nan
+    return df
+
+@pytest.mark.parametrize("strategy,threshold", [("zscore", 3.0), ("iqr", 1.5)])
+def test_joint_matches_sequential_for_one_column(frame, strategy, threshold):
+    parameters = {"strategy": strategy, "threshold": threshold, "columns": ["value"]}
+    sequential = outliers(frame, mode="sequential", **parameters)
+    joint = outliers(frame, mode="joint", **parameters)
+
+    pd.testing.assert_frame_equal(joint, sequential)
+    # Выбросы и строка с пропуском удалены в обоих режимах
+    assert not {3, 10, 70} & set(joint.index)
+
+def test_joint_removes_rows_outside_any_column():
+    df = pd.DataFrame({"a": [0.0, 5.0, 10.0, 11.0, np.nan], "b": [1.0, 1.0, 1.0, 1.0, 1.0]})
+    bounds = {"a": {"lower": 0.0, "upper": 10.0}, "b": {"lower": 0.0, "upper": 2.0}}
+
+    # Границы Z-оценки строгие, межквартильного размаха - включительные
+    zscore, _ = handle_outliers(df.copy(), ["a", "b"], "zscore", 3.0, mode="joint", bounds=bounds)
+    iqr, params = handle_outliers(df.copy(), ["a", "b"], "iqr", 1.5, mode="joint", bounds=bounds)
+
+    assert zscore.index.tolist() == [1]
+    assert iqr.index.tolist() == [0, 1, 2]
+    assert params["bounds"]["a"] == {"lower": 0.0, "upper": 10.0}
+
+def test_clip_keeps_rows_missing_values_and_types(frame):
+    clipped = outliers(frame, strategy="iqr", threshold=0.5, mode="clip", columns=["value", "count", "flag"])
+
+    assert len(clipped) == len(frame)
+    assert np.isnan(clipped.loc[10, "value"])
+    assert clipped["value"].max() < 15.0
+    assert clipped["count"].dtype == frame["count"].dtype
+    # Логические столбцы не обрабатываются
+    pd.testing.assert_series_equal(clipped["flag"], frame["flag"])
+
+def test_clip_rounds_integer_bounds_inwards():
+    df = pd.DataFrame({"count": np.array([1, 2, 3, 100], dtype=np.int32)})
+    clipped, _ = handle_outliers(df, ["count"], "iqr", 1.5, mode="clip",
+                                 bounds={"count": {"lower": 1.5, "upper": 4.5}})
+
+    assert clipped["count"].dtype == np.int32
+    assert clipped["count"].tolist() == [2, 2, 3, 4]
+
+def test_saved_bounds_are_reused(frame):
+    _, params = handle_outliers(frame.copy(), ["value"], "zscore", 3.0, mode="joint")
+    shifted = frame.copy()
+    shifted["value"] += 100
+    result, reused = handle_outliers(shifted, ["value"], "zscore", 3.0, mode="joint", bounds=params["bounds"])
+
+    assert reused["bounds"] == params["bounds"]
+    assert result.empty
@@ -0,0 +1,114 @@
+import shutil
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from controllers import preprocessing_results
+from utils.file_utils import get_processed_file_path
+from utils.overlay_utils import MAX_OVERLAY_DEPTH, get_overlay_depth, remove_result_outputs, write_overlay
+from utils.result_reader_utils import load_result_metadata, read_result_dataframe, read_result_rows
+from utils.result_store_utils import get_result_store_path, read_result_manifest
+
+METHODS = [{"method_id": "standardization", "parameters": {"strategy": "standard", "columns": ["value", "amount"]}}]
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def scaled(make_result):
+    return make_result(METHODS)
+
+def inverse(client: TestClient, result_id: str, columns: list) -> str:
+    scaling_params = load_result_metadata(result_id)["scaling_params"]
+    response = client.post(f"/api/preprocessing/apply-inverse-scaling/{result_id}",
+                           json={"columns": columns, "scaling_params": scaling_params})
+    assert response.status_code == 200, response.text
+    return response.json()["result_id"]
+
+def test_overlay_stores_only_changed_columns(client, scaled):
+    parent = read_result_dataframe(scaled)
+    child_id = inverse(client, scaled, ["amount"])
+
+    metadata = load_result_metadata(child_id)
+    assert metadata["overlay"] == {"parent_result_id": scaled, "columns": ["amount"], "depth": 1}
+    manifest = read_result_manifest(child_id)
+    assert [column["name"] for column in manifest["columns"]] == ["amount"]
+    assert manifest["overlay"]["parent_result_id"] == scaled
+    assert not get_processed_file_path(child_id).exists()
+
+    child = read_result_dataframe(child_id)
+    assert child.columns.tolist() == parent.columns.tolist()
+    pd.testing.assert_series_equal(child["value"], parent["value"])
+    params = metadata["scaling_params"]["standardization"]["params"]["amount"]
+    np.testing.assert_allclose(child["amount"], parent["amount"] * params["std"] + params["mean"])
+
+def test_overlay_over_csv_parent(client, scaled):
+    child_id = inverse(client, scaled, ["value", "amount"])
+    stored = read_result_rows(child_id, offset=10, limit=20)
+    assert not stored["amount"].to_numpy().flags.writeable
+
+    preview = client.get(f"/api/preprocessing/data/{child_id}", params={"offset": 10, "limit": 20}).json()
+    assert preview["total_count"] == 300
+    assert len(preview["preview"]) == 20
+
+    # Без хранилища родителя неизмененные столбцы читаются из его CSV файла
+    shutil.rmtree(get_result_store_path(scaled))
+    mixed = read_result_rows(child_id, offset=10, limit=20)
+    pd.testing.assert_frame_equal(mixed, stored, check_dtype=False)
+    assert client.get(f"/api/preprocessing/data/{child_id}", params={"offset": 10, "limit": 20}).json() == preview
+
+def test_long_chain_is_compacted(client, scaled):
+    result_id = scaled
+    for _ in range(MAX_OVERLAY_DEPTH + 1):
+        expected = read_result_dataframe(result_id)
+        result_id = inverse(client, result_id, ["value"])
+
+    # Уплотнение выполняется фоновой задачей после ответа
+    assert get_processed_file_path(result_id).exists()
+    assert "overlay" not in read_result_manifest(result_id)
+    assert get_overlay_depth(result_id) == 0
+    assert load_result_metadata(result_id)["compacted_from"]
+    assert read_result_dataframe(result_id).columns.tolist() == expected.columns.tolist()
+
+def test_removing_parent_keeps_children_readable(client, scaled):
+    child_id = inverse(client, scaled, ["amount"])
+    expected = read_result_dataframe(child_id)
+
+    remove_result_outputs(scaled)
+
+    assert get_overlay_depth(child_id) == 0
+    pd.testing.assert_frame_equal(read_result_dataframe(child_id), expected)
+
+def test_overlay_is_written_outside_event_loop(client, scaled, monkeypatch):
+    threads = []
+
+    def recording(*args):
+        try:
+            asyncio.get_running_loop()
+            threads.append("event loop")
+        except RuntimeError:
+            threads.append("worker")
+        return write_overlay(*args)
+
+    monkeypatch.setattr(preprocessing_results, "write_overlay", recording)
+    inverse(client, scaled, ["amount"])
+    assert threads == ["worker"]
+
+def test_inverse_scaling_of_missing_result_is_not_found(client):
+    response = client.post("/api/preprocessing/apply-inverse-scaling/missing",
+                           json={"columns": ["value"], "scaling_params": {"method": "standard", "params": {}}})
+    assert response.status_code == 404
+
+def test_unsupported_overlay_is_written_standalone(scaled):
+    # Столбцы смешанного типа не поддерживаются хранилищем
+    info = write_overlay(scaled, "mixed", lambda chunk: (chunk.assign(mixed=[1, "a"] * (len(chunk) // 2)), []))
+
+    assert info["overlay"] is None and info["row_count"] == 300
+    assert get_processed_file_path("mixed").exists() and read_result_manifest("mixed") is None
+    assert get_overlay_depth("mixed") == 0
+    assert read_result_rows("mixed", limit=2)["mixed"].tolist() == ["1", "a"]
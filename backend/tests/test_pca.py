@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.decomposition import PCA
+
+from utils.pca_utils import apply_pca, choose_solver, fit_pca, transform_pca
+
+COLUMNS = ["a", "b", "c", "d"]
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(2000, 2))
+    mixing = np.array([[3.0, 1.0, 0.5, 0.0], [0.0, 1.0, -1.0, 2.0]])
+    df = pd.DataFrame(latent @ mixing + rng.normal(0, 0.1, (2000, 4)), columns=COLUMNS)
+    df["label"] = "x"
+    return df
+
+def aligned(result: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """
+    Приводит знаки компонент к эталону: знак собственного вектора не определен.
+    """
+    signs = np.sign(np.sum(result * expected, axis=0))
+    return result * signs
+
+def test_choose_solver():
+    assert choose_solver(300000, 10, 2, False) == "incremental"
+    assert choose_solver(1000, 600, 5, False) == "randomized"
+    assert choose_solver(1000, 600, 5, True) == "full"
+    assert choose_solver(100, 10, 2, False) == "full"
+
+@pytest.mark.parametrize("solver", ["full", "randomized", "incremental"])
+def test_solvers_match_sklearn(frame, solver):
+    params = fit_pca(frame, COLUMNS, n_components=2, solver=solver, batch_size=300)
+    expected = PCA(n_components=2).fit_transform(frame[COLUMNS].to_numpy())
+
+    assert params["solver"] == solver
+    np.testing.assert_allclose(aligned(transform_pca(frame, params, batch_size=700), expected),
+                               expected, atol=1e-6 if solver != "incremental" else 1e-2)
+
+def test_float32_is_close_to_float64(frame):
+    params64 = fit_pca(frame, COLUMNS, solver="full")
+    params32 = fit_pca(frame, COLUMNS, solver="full", dtype="float32")
+    result32 = transform_pca(frame, params32)
+
+    assert result32.dtype == np.float32
+    np.testing.assert_allclose(aligned(result32, transform_pca(frame, params64)),
+                               transform_pca(frame, params64), atol=1e-3)
+
+def test_variance_threshold_selects_components(frame):
+    two = fit_pca(frame, COLUMNS, variance_threshold=0.95)
+    everything = fit_pca(frame, COLUMNS, variance_threshold=1.0, solver="randomized")
+
+    assert two["n_components"] == 2
+    assert two["solver"] == "full"
+    assert everything["n_components"] == 4
+    assert sum(everything["explained_variance_ratio"]) == pytest.approx(1.0)
+
+def test_apply_replaces_columns_and_reuses_params(frame):
+    frame.loc[[5, 6], "a"] = np.nan
+    result, params = apply_pca(frame, COLUMNS, {"n_components": 2})
+
+    assert result.columns.tolist() == ["label", "PCA_1", "PCA_2"]
+    assert not result[["PCA_1", "PCA_2"]].isna().any().any()
+    # Пропуск заполняется средним столбца
+    filled = frame.loc[[5], COLUMNS].fillna({"a": params["fill_values"][0]})
+    np.testing.assert_allclose(result.loc[5, ["PCA_1", "PCA_2"]].to_numpy(dtype=float),
+                               transform_pca(filled, params)[0])
+
+    reused, same = apply_pca(frame.iloc[:10], COLUMNS, {"pca_params": params})
+    assert same is params
+    pd.testing.assert_frame_equal(reused, result.iloc[:10])
+
+def test_empty_frame_is_not_fitted(frame):
+    result, params = apply_pca(frame.iloc[:0], COLUMNS, {"n_components": 2})
+    assert params == {}
+    assert result.columns.tolist() == frame.columns.tolist()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.preprocessing_service import apply_preprocessing
+from utils.profiling_utils import StepProfiler
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "value": [1.0, np.nan, 3.0, 4.0, np.nan, 6.0],
+        "city": ["a", "b", "a", "c", "b", "a"]
+    })
+
+def test_steps_record_row_and_column_deltas(frame):
+    profiler = StepProfiler()
+    methods = [
+        {"method_id": "missing_values", "parameters": {"strategy": "drop_rows"}},
+        {"method_id": "categorical_encoding", "parameters": {"strategy": "onehot", "columns": ["city"]}}
+    ]
+    apply_preprocessing(frame, {"methods": methods}, profiler=profiler)
+
+    dropped, encoded = profiler.steps
+    # После удаления строк остаются категории a и c
+    assert (dropped["step"], dropped["rows_in"], dropped["rows_out"]) == ("missing_values", 6, 4)
+    assert (encoded["step"], encoded["columns_in"], encoded["columns_out"]) == ("categorical_encoding", 2, 3)
+    for step in profiler.steps:
+        assert step["wall_time"] >= 0 and step["cpu_time"] >= 0
+        assert step["process_rss_mb"] > 0
+
+    summary = profiler.summary()
+    assert summary["total_wall_time"] == pytest.approx(sum(step["wall_time"] for step in summary["steps"]))
+    assert summary["process_peak_rss_mb"] > 0
+
+def test_peak_memory_includes_freed_allocations():
+    profiler = StepProfiler(sample_interval=0.001)
+    profiler.start("allocate")
+    # Массив освобождается до конца шага: пик виден только фоновому опросу памяти
+    block = np.ones(64 * 2 ** 20 // 8)
+    block.sum()
+    del block
+    step = profiler.stop()
+
+    assert step["process_peak_memory_delta_mb"] >= 60
+    assert step["rows_in"] is None and step["rows_out"] is None
+
+def test_failed_step_is_recorded(frame):
+    profiler = StepProfiler()
+    methods = [{"method_id": "rolling_features",
+                "parameters": {"columns": ["value"], "windows": ["1d"], "time_column": "city"}}]
+
+    with pytest.raises(Exception) as error:
+        apply_preprocessing(frame, {"methods": methods}, profiler=profiler)
+
+    step, = profiler.steps
+    assert step["step"] == "rolling_features" and step["error"] == str(error.value)
+    assert step["rows_out"] is None
+
+def test_job_profile_is_stored_and_served(make_result):
+    result_id = make_result([{"method_id": "standardization", "parameters": {"strategy": "standard"}}])
+
+    response = TestClient(main.app).get(f"/api/preprocessing/profile/{result_id}")
+    assert response.status_code == 200, response.text
+    profile = response.json()["profile"]
+    assert [step["step"] for step in profile["steps"]] == ["load_dataset", "standardization", "save_result"]
+    assert profile["steps"][1]["rows_in"] == profile["steps"][1]["rows_out"] == 300
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.preprocessing_service import apply_preprocessing
+from utils.rolling_utils import build_rolling_features
+
+STATISTICS = ["mean", "sum", "std", "var", "min", "max"]
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame({
+        "sales": rng.normal(100, 10, n),
+        "store": rng.choice(["a", "b", "c"], n),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 400, n), unit="D")
+    }, index=pd.RangeIndex(10, 10 + n))
+    df.loc[[15, 40, 41], "sales"] = np.nan
+    return df
+
+def test_long_trending_series_matches_pandas():
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    df = pd.DataFrame({"x": np.linspace(1000, 50000, n) + rng.normal(0, 0.01, n)})
+    block = build_rolling_features(df, ["x"], [7], ["mean", "std", "var"])
+    rolling = df["x"].rolling(7)
+
+    # Разброс внутри окна (~0.01) на пять порядков меньше уровня ряда
+    np.testing.assert_allclose(block["x_rolling_std_7"], rolling.std(), rtol=1e-6)
+    np.testing.assert_allclose(block["x_rolling_var_7"], rolling.var(), rtol=1e-6)
+    np.testing.assert_allclose(block["x_rolling_mean_7"], rolling.mean(), rtol=1e-9)
+
+def test_constant_series_has_zero_variance():
+    df = pd.DataFrame({"x": np.full(1000, 12345.678)})
+    block = build_rolling_features(df, ["x"], [5], ["std"], variants=["rolling", "expanding"])
+
+    assert block["x_rolling_std_5"].iloc[4:].eq(0).all()
+    assert block["x_expanding_std"].iloc[1:].eq(0).all()
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_row_windows_match_pandas(panel, window):
+    block = build_rolling_features(panel, ["sales"], [window], STATISTICS)
+    rolling = panel["sales"].rolling(window)
+
+    for stat in STATISTICS:
+        pd.testing.assert_series_equal(block[f"sales_rolling_{stat}_{window}"], getattr(rolling, stat)(),
+                                       check_names=False)
+
+def test_group_windows_match_groupby_rolling(panel):
+    block = build_rolling_features(panel, ["sales"], [4], STATISTICS, variants=["rolling", "expanding"],
+                                   group_column="store")
+    grouped = panel.groupby("store")["sales"]
+
+    for stat in STATISTICS:
+        for label, window in (("rolling_{}_4", grouped.rolling(4)), ("expanding_{}", grouped.expanding())):
+            expected = getattr(window, stat)().reset_index(level=0, drop=True).sort_index()
+            pd.testing.assert_series_equal(block[f"sales_{label.format(stat)}"], expected, check_names=False)
+
+def test_time_windows_match_pandas(panel):
+    block = build_rolling_features(panel, ["sales"], ["30D"], STATISTICS, group_column="store",
+                                   time_column="date")
+    ordered = panel.sort_values(["store", "date"], kind="stable")
+
+    for stat in STATISTICS:
+        parts = []
+        for _, group in ordered.groupby("store"):
+            series = pd.Series(group["sales"].to_numpy(), index=group["date"])
+            parts.append(pd.Series(getattr(series.rolling("30D"), stat)().to_numpy(), index=group.index))
+        expected = pd.concat(parts).sort_index()
+        pd.testing.assert_series_equal(block[f"sales_rolling_{stat}_30D"], expected, check_names=False)
+
+def test_ewm_matches_pandas(panel):
+    block = build_rolling_features(panel, ["sales"], [], ["mean", "std"], variants=["ewm"], ewm_spans=[5])
+    ewm = panel["sales"].ewm(span=5)
+
+    pd.testing.assert_series_equal(block["sales_ewm_mean_5"], ewm.mean(), check_names=False)
+    pd.testing.assert_series_equal(block["sales_ewm_std_5"], ewm.std(), check_names=False)
+
+def test_time_window_requires_time_column(panel):
+    with pytest.raises(ValueError):
+        build_rolling_features(panel, ["sales"], ["7D"], ["mean"])
+
+def test_rolling_statistics_step_uses_engine(panel):
+    config = {"methods": [{"method_id": "rolling_statistics", "parameters": {
+        "target_column": "sales", "window_size": 5, "statistics": ["mean", "std"]}}]}
+    result = apply_preprocessing(panel, config)
+    rolling = panel["sales"].rolling(5)
+
+    new_columns = [col for col in result.columns if col not in panel.columns]
+    assert len(new_columns) == 2
+    mean_column, std_column = sorted(new_columns, key=lambda col: "std" in col)
+    pd.testing.assert_series_equal(result[mean_column], rolling.mean(), check_names=False)
+    pd.testing.assert_series_equal(result[std_column], rolling.std(), check_names=False)
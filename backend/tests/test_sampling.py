@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.sample_utils import (MAX_STRATA, column_histogram, get_sample_path, iter_frame_chunks, load_sample,
+                                reservoir_sample)
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    labels = np.array(["common"] * 900 + ["medium"] * 95 + ["rare"] * 5)
+    return pd.DataFrame({"row": np.arange(1000), "label": labels[rng.permutation(1000)]})
+
+def test_sample_is_ordered_subset(frame):
+    sample, info = reservoir_sample(iter_frame_chunks(frame, 128), 100)
+
+    assert info == {"method": "uniform", "total_rows": 1000, "size": 100}
+    assert sample["row"].is_monotonic_increasing and sample["row"].is_unique
+    pd.testing.assert_frame_equal(sample, frame.iloc[sample["row"]].reset_index(drop=True))
+
+def test_sample_does_not_depend_on_chunking(frame):
+    small, _ = reservoir_sample(iter_frame_chunks(frame, 7), 50)
+    large, _ = reservoir_sample(iter_frame_chunks(frame), 50)
+    other_seed, _ = reservoir_sample(iter_frame_chunks(frame), 50, random_state=1)
+
+    pd.testing.assert_frame_equal(small, large)
+    assert not small.equals(other_seed)
+
+def test_every_row_is_equally_likely(frame):
+    counts = np.zeros(len(frame))
+    for seed in range(200):
+        sample, _ = reservoir_sample(iter_frame_chunks(frame, 100), 100, random_state=seed)
+        counts[sample["row"]] += 1
+
+    # Ожидаемое число попаданий каждой строки - 20; начало и конец набора выбираются одинаково часто
+    assert counts.mean() == pytest.approx(20)
+    assert counts[:500].sum() == pytest.approx(counts[500:].sum(), rel=0.05)
+    assert counts.max() < 45
+
+def test_small_data_is_returned_whole(frame):
+    sample, info = reservoir_sample(iter_frame_chunks(frame.head(30), 8), 100)
+    pd.testing.assert_frame_equal(sample, frame.head(30))
+    assert info["size"] == 30
+
+    empty, info = reservoir_sample([], 100)
+    assert empty.empty and info["total_rows"] == 0
+
+def test_stratified_sample_keeps_proportions_and_rare_strata(frame):
+    sample, info = reservoir_sample(iter_frame_chunks(frame, 64), 100, strata_column="label")
+
+    assert info["method"] == "stratified" and info["strata_column"] == "label"
+    assert sample["label"].value_counts().to_dict() == {"common": 90, "medium": 10, "rare": 1}
+    assert sample["row"].is_monotonic_increasing
+
+def test_too_many_strata_fall_back_to_uniform(frame):
+    frame["label"] = frame["row"] % (MAX_STRATA + 1)
+    sample, info = reservoir_sample(iter_frame_chunks(frame, 64), 100, strata_column="label")
+    uniform, _ = reservoir_sample(iter_frame_chunks(frame, 64), 100)
+
+    assert info["method"] == "uniform"
+    pd.testing.assert_frame_equal(sample, uniform)
+
+def test_load_sample_spreads_rows(frame):
+    assert load_sample("dataset") is None
+    frame.to_csv(get_sample_path("dataset"), index=False)
+
+    subset = load_sample("dataset", 11)
+    # Строки берутся равномерно по всей выборке, включая первую и последнюю
+    assert len(subset) == 11
+    assert subset["row"].iloc[0] == 0 and subset["row"].iloc[-1] == 999
+    assert set(np.diff(subset["row"])) <= {99, 100, 101}
+    assert len(load_sample("dataset")) == 1000
+
+def test_column_histogram():
+    numeric = column_histogram(pd.Series([1.0, 2.0, 2.0, np.nan, 4.0]), bins=3)
+    assert numeric["type"] == "numeric" and numeric["missing_count"] == 1
+    assert numeric["counts"] == [1, 2, 1]
+
+    categorical = column_histogram(pd.Series(["a", "b", "a", None]), bins=1)
+    assert categorical == {"missing_count": 1, "type": "categorical", "values": ["a"], "counts": [2]}
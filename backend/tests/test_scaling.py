@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from services.preprocessing_service import apply_preprocessing
+from utils.scaling_utils import fit_transform_block, scale_columns
+
+SCALERS = {"standard": StandardScaler, "minmax": MinMaxScaler, "robust": RobustScaler}
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "value": rng.normal(50, 5, 300),
+        "count": rng.integers(0, 100, 300),
+        "constant": np.full(300, 7.0),
+        "category": rng.choice(["a", "b"], 300)
+    })
+    df.loc[[3, 4], "value"] = np.nan
+    return df
+
+@pytest.mark.parametrize("strategy", list(SCALERS))
+def test_scaling_matches_sklearn(frame, strategy):
+    columns = ["value", "count", "constant"]
+    scaled, params = scale_columns(frame.copy(), columns, strategy)
+    # Масштабировщики sklearn пропускают NaN при обучении и сохраняют их в результате
+    expected = SCALERS[strategy]().fit_transform(frame[columns].to_numpy(dtype=float))
+
+    np.testing.assert_allclose(scaled[columns].to_numpy(), expected, atol=1e-12)
+    assert params["method"] == strategy and params["columns"] == columns
+    assert scaled["category"].equals(frame["category"])
+
+def test_params_reproduce_transform(frame):
+    scaled, params = scale_columns(frame.copy(), ["value", "count"], "standard")
+
+    for col in ("value", "count"):
+        col_params = params["params"][col]
+        expected = (frame[col] - col_params["mean"]) / col_params["std"]
+        np.testing.assert_allclose(scaled[col], expected, atol=1e-12)
+
+def test_given_stats_are_used_as_is():
+    block = np.array([[1.0, 10.0], [3.0, 30.0]])
+    stats = fit_transform_block(block, "minmax", {"min": [0.0, 0.0], "max": [4.0, 0.0]})
+
+    # Нулевой размах заменяется единицей
+    np.testing.assert_array_equal(block, [[0.25, 10.0], [0.75, 30.0]])
+    np.testing.assert_array_equal(stats["max"], [4.0, 0.0])
+
+def test_float32_output(frame):
+    scaled, params = scale_columns(frame.copy(), ["value", "count"], "robust", dtype="float32")
+    reference, _ = scale_columns(frame.copy(), ["value", "count"], "robust")
+
+    assert params["dtype"] == "float32"
+    assert (scaled[["value", "count"]].dtypes == np.float32).all()
+    np.testing.assert_allclose(scaled[["value", "count"]], reference[["value", "count"]], atol=1e-5)
+
+def test_unknown_strategy_fails():
+    with pytest.raises(ValueError):
+        fit_transform_block(np.ones((2, 2)), "unknown")
+
+def test_standardization_step_scales_numeric_columns(frame):
+    config = {"methods": [{"method_id": "standardization", "parameters": {"strategy": "minmax"}}]}
+    result = apply_preprocessing(frame, config)
+
+    for col in ("value", "count"):
+        assert result[col].min() == pytest.approx(0.0) and result[col].max() == pytest.approx(1.0)
+    assert (result["constant"] == 0).all()
+    assert result["category"].equals(frame["category"])
@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.column_store_utils import estimate_store_nbytes
+from utils.dataframe_cache_utils import DataFrameCache
+from utils.process_utils import current_process, process_alive, process_start_time
+from utils.shared_cache_utils import LEASES_DIR, SharedDataFrameStore
+
+SIGNATURE = (1, 100)
+
+def frame(seed: int = 0, rows: int = 1000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "value": rng.normal(size=rows),
+        "count": rng.integers(0, 10, rows),
+        "city": rng.choice(["a", "b", None], rows)
+    })
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedDataFrameStore(root=tmp_path / "shm", max_bytes=10 * 2 ** 20)
+
+def lease_path(store: SharedDataFrameStore, entry_id: str, pid: int):
+    return store.root / f"dataset-{entry_id}" / LEASES_DIR / str(pid)
+
+def wait_for_exit(pid: int):
+    """
+    Ждет, пока дочерний процесс завершится и станет zombie (родитель еще не вызвал wait).
+    """
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            if f.read().rsplit(")", 1)[1].split()[0] == "Z":
+                return
+        time.sleep(0.01)
+
+def test_process_liveness(dead_pid):
+    me = current_process()
+    assert me["pid"] == os.getpid() and me["pid_start"] == process_start_time(os.getpid())
+    assert process_alive(os.getpid()) and process_alive(os.getpid(), me["pid_start"])
+    # Тот же pid с другим временем запуска - новый процесс после переиспользования pid
+    assert not process_alive(os.getpid(), me["pid_start"] + 1)
+    assert not process_alive(dead_pid)
+
+    zombie = subprocess.Popen([sys.executable, "-c", "pass"])
+    try:
+        wait_for_exit(zombie.pid)
+        assert not process_alive(zombie.pid)
+    finally:
+        zombie.wait()
+
+def test_published_frame_is_shared_without_copy(store):
+    df = frame()
+    assert store.publish("dataset", "a", df, SIGNATURE)
+
+    shared = store.attach("dataset", "a", SIGNATURE)
+    pd.testing.assert_frame_equal(shared.astype({"city": object}), df)
+    assert isinstance(shared["city"].dtype, pd.CategoricalDtype)
+    assert not shared["value"].to_numpy().flags.writeable
+    assert lease_path(store, "a", os.getpid()).read_text() == str(process_start_time(os.getpid()))
+
+    store.release("dataset", "a")
+    assert not lease_path(store, "a", os.getpid()).exists()
+
+def test_changed_source_removes_entry(store):
+    store.publish("dataset", "a", frame(), SIGNATURE)
+    assert store.attach("dataset", "a", (2, 100)) is None
+    assert store.stats()["entries"] == 0
+
+def test_leased_entries_are_not_evicted(tmp_path):
+    budget = estimate_store_nbytes(frame()) * 3 // 2
+    store = SharedDataFrameStore(root=tmp_path / "shm", max_bytes=budget)
+
+    store.publish("dataset", "a", frame(0), SIGNATURE)
+    assert store.attach("dataset", "a", SIGNATURE) is not None
+    assert not store.publish("dataset", "b", frame(1), SIGNATURE)
+
+    # Без аренды давно не использованная запись вытесняется
+    store.release_all()
+    assert store.publish("dataset", "b", frame(1), SIGNATURE)
+    assert store.attach("dataset", "a", SIGNATURE) is None
+    assert store.stats()["entries"] == 1
+
+def test_leases_of_exited_or_replaced_processes_are_dropped(tmp_path, dead_pid):
+    budget = estimate_store_nbytes(frame()) * 3 // 2
+    store = SharedDataFrameStore(root=tmp_path / "shm", max_bytes=budget)
+    store.publish("dataset", "a", frame(0), SIGNATURE)
+    leases = store.root / "dataset-a" / LEASES_DIR
+    leases.mkdir()
+    (leases / str(dead_pid)).write_text("")
+    # pid текущего процесса с чужим временем запуска: аренда процесса, pid которого переиспользован
+    (leases / str(os.getpid())).write_text(str(process_start_time(os.getpid()) + 1))
+
+    assert store.publish("dataset", "b", frame(1), SIGNATURE)
+    assert not (store.root / "dataset-a").exists()
+
+def test_entry_too_large_for_budget_is_not_published(tmp_path):
+    store = SharedDataFrameStore(root=tmp_path / "shm", max_bytes=1024)
+    assert not store.publish("dataset", "a", frame(), SIGNATURE)
+    assert store.stats() == {"entries": 0, "bytes": 0, "reserved_bytes": 0, "max_bytes": 1024}
+
+def test_workers_share_one_copy(store, tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_text("data")
+    first = DataFrameCache(max_bytes=2 ** 20, shared_store=store)
+    second = DataFrameCache(max_bytes=2 ** 20, shared_store=store)
+
+    published = first.put("dataset", "a", source, frame())
+    attached = second.get("dataset", "a", source)
+
+    pd.testing.assert_frame_equal(attached, published)
+    assert second.stats()["shared_hits"] == 1
+    # В бюджете процесса учитываются только словари категорий, а не общие массивы
+    assert second.stats()["bytes"] < frame().memory_usage(deep=True).sum() // 10
@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils import stack_profiler_utils
+from utils.stack_profiler_utils import SamplingProfiler, get_profile_path, prune_profiles, save_profile
+
+TOKEN = "secret"
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(stack_profiler_utils, "ADMIN_TOKEN", TOKEN)
+    return TestClient(main.app)
+
+def busy_work(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+def profile(seconds: float = 0.2, **kwargs) -> SamplingProfiler:
+    profiler = SamplingProfiler(**kwargs)
+    profiler.start()
+    busy_work(seconds)
+    profiler.stop()
+    return profiler
+
+def test_folded_stacks_contain_profiled_code():
+    profiler = profile()
+
+    assert profiler.samples > 5
+    assert sum(profiler.stacks.values()) == profiler.samples
+    lines = profiler.folded().splitlines()
+    assert any("busy_work (tests/test_stack_profiler.py" in line for line in lines)
+    # Стеки упорядочены от корня к листу и отсортированы по убыванию количества
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.index("profile (") < stack.index("busy_work (")
+    assert int(count) == max(profiler.stacks.values())
+
+def test_interval_grows_when_sampling_is_too_expensive():
+    profiler = profile(max_overhead=1e-9)
+
+    assert profiler.interval > profiler.initial_interval
+    assert profiler.interval <= stack_profiler_utils.MAX_SAMPLE_INTERVAL
+    assert profiler.summary()["final_interval"] == profiler.interval
+
+def test_sampling_stops_after_max_seconds():
+    profiler = profile(seconds=0.3, max_seconds=0.05)
+    assert profiler.samples < 20
+    assert profiler.summary()["duration"] >= 0.3
+
+def test_retention_keeps_newest_profiles(monkeypatch):
+    monkeypatch.setattr(stack_profiler_utils, "PROFILE_RETENTION", 2)
+    profiler = profile(seconds=0.01)
+    for i in range(3):
+        save_profile(f"profile-{i}", profiler)
+        mtime = time.time() - 10 + i
+        os.utime(get_profile_path(f"profile-{i}"), (mtime, mtime))
+    prune_profiles()
+    assert [get_profile_path(f"profile-{i}").exists() for i in range(3)] == [False, True, True]
+
+    monkeypatch.setattr(stack_profiler_utils, "PROFILE_MAX_AGE_HOURS", 1 / 3600)
+    prune_profiles()
+    assert not get_profile_path("profile-2").exists()
+
+def test_request_profiling_requires_admin(client):
+    assert "X-Profile-Id" not in client.get("/health", params={"profile": 1}).headers
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "1", "X-Admin-Token": "wrong"}).headers
+
+    response = client.get("/health", headers={"X-Profile": "1", "X-Admin-Token": TOKEN})
+    profile_id = response.headers["X-Profile-Id"]
+    assert get_profile_path(profile_id).exists()
+
+    url = f"/api/preprocessing/flamegraph/{profile_id}"
+    assert client.get(url).status_code == 403
+    assert client.get(url, headers={"X-Admin-Token": TOKEN}).status_code == 200
+    assert client.get("/api/preprocessing/flamegraph/not-a-uuid", headers={"X-Admin-Token": TOKEN}).status_code == 400
+    missing = "/api/preprocessing/flamegraph/00000000-0000-0000-0000-000000000000"
+    assert client.get(missing, headers={"X-Admin-Token": TOKEN}).status_code == 404
+
+def test_profiled_job_saves_profile_under_result_id(client, make_dataset):
+    dataset_id = make_dataset("6b0c7a34-5d55-4c7e-9a57-3f1f0b5d2e11", rows=2000)
+    config = {"dataset_id": dataset_id,
+              "methods": [{"method_id": "standardization", "parameters": {"strategy": "standard"}}]}
+
+    response = client.post("/api/preprocessing/execute", json=config,
+                           headers={"X-Profile": "1", "X-Admin-Token": TOKEN})
+    result_id = response.json()["result_id"]
+
+    metadata = client.get(f"/api/preprocessing/status/{result_id}").json()["metadata"]
+    assert metadata["sampling_profile"]["profile_id"] == result_id
+    flamegraph = client.get(f"/api/preprocessing/flamegraph/{result_id}", headers={"X-Admin-Token": TOKEN})
+    assert flamegraph.status_code == 200
+    lines = flamegraph.text.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == metadata["sampling_profile"]["samples"]
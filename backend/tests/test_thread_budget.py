@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+
+from utils import cgroup_utils
+from utils import thread_budget_utils as budget_utils
+from utils.result_reader_utils import load_result_metadata
+
+class FakeLimits:
+    """
+    Замена threadpool_limits: запоминает примененные ограничения и их снятие.
+    """
+    applied = []
+    restored = 0
+
+    def __init__(self, limits):
+        FakeLimits.applied.append(limits)
+
+    def restore_original_limits(self):
+        FakeLimits.restored += 1
+
+@pytest.fixture
+def pools(monkeypatch):
+    FakeLimits.applied, FakeLimits.restored = [], 0
+    monkeypatch.setattr(budget_utils, "threadpool_info", lambda: [
+        {"user_api": "blas", "num_threads": 8},
+        {"user_api": "blas", "num_threads": 6},
+        {"user_api": "openmp", "num_threads": 4}
+    ])
+    monkeypatch.setattr(budget_utils, "threadpool_limits", FakeLimits)
+    monkeypatch.setattr(budget_utils, "JOB_CPU_BUDGET", 8)
+    return FakeLimits
+
+def running(monkeypatch, jobs: int):
+    monkeypatch.setattr(budget_utils, "running_jobs", lambda: jobs)
+
+def test_cpu_budget_follows_cgroup_quota(tmp_path, monkeypatch):
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(cgroup_utils, "CGROUP_CPU_MAX", cpu_max)
+    monkeypatch.setattr(cgroup_utils, "available_cpus", lambda: 8)
+    monkeypatch.setattr(budget_utils, "JOB_CPU_BUDGET", 0)
+
+    cpu_max.write_text("250000 100000\n")
+    assert budget_utils.cpu_budget() == 2.5
+    cpu_max.write_text("max 100000\n")
+    assert budget_utils.cpu_budget() == 8
+    # Явно заданный бюджет имеет приоритет над квотой
+    monkeypatch.setattr(budget_utils, "JOB_CPU_BUDGET", 3)
+    assert budget_utils.cpu_budget() == 3
+
+def test_budget_is_split_between_jobs(pools):
+    assert [budget_utils.threads_per_job(jobs) for jobs in (0, 1, 3, 4, 16)] == [8, 8, 2, 2, 1]
+
+def test_step_limits_native_pools_and_restores_them(pools, monkeypatch):
+    running(monkeypatch, 4)
+    budget = budget_utils.ThreadBudget()
+
+    with budget.step("pca") as threads:
+        assert threads == budget_utils.current_threads() == 2
+        assert pools.applied == [{"blas": 2, "openmp": 2}]
+        assert pools.restored == 0
+    assert pools.restored == 1
+    assert budget_utils.current_threads() == 8
+    assert budget.summary() == {
+        "cpu_budget": 8, "max_threads": 2,
+        "steps": [{"method_id": "pca", "threads": 2, "concurrent_jobs": 4, "limits": {"blas": 2, "openmp": 2}}]
+    }
+
+def test_limits_never_exceed_library_defaults(pools, monkeypatch):
+    running(monkeypatch, 1)
+    with budget_utils.ThreadBudget().step("standardization"):
+        # Меньшее из значений библиотек одного типа, OpenMP не поднимается выше 4 потоков
+        assert pools.applied == [{"blas": 6, "openmp": 4}]
+
+def test_original_limits_are_restored_after_last_step(pools, monkeypatch):
+    running(monkeypatch, 2)
+    first, second = budget_utils.ThreadBudget(), budget_utils.ThreadBudget()
+
+    with first.step("pca"):
+        running(monkeypatch, 4)
+        with second.step("pca"):
+            assert pools.applied[-1] == {"blas": 2, "openmp": 2}
+        assert pools.restored == 0
+    assert pools.restored == 1
+    assert budget_utils._active_steps == 0
+
+def test_step_runs_when_limits_cannot_be_applied(pools, monkeypatch, caplog):
+    def broken(limits):
+        raise RuntimeError("threadpoolctl недоступен")
+    monkeypatch.setattr(budget_utils, "threadpool_limits", broken)
+    running(monkeypatch, 1)
+
+    with caplog.at_level(logging.WARNING):
+        with budget_utils.ThreadBudget().step("pca") as threads:
+            assert threads == 8
+    assert "pca" in caplog.text
+    assert budget_utils._active_steps == 0
+
+def test_job_metadata_records_thread_allocation(make_result):
+    result_id = make_result([{"method_id": "pca", "parameters": {"n_components": 1, "columns": ["amount", "value"]}}])
+
+    threads = load_result_metadata(result_id)["resources"]["threads"]
+    assert threads["cpu_budget"] == round(budget_utils.cpu_budget(), 2)
+    assert [step["method_id"] for step in threads["steps"]] == ["pca"]
+    assert threads["steps"][0]["concurrent_jobs"] == 1
+    assert threads["max_threads"] == threads["steps"][0]["threads"] >= 1
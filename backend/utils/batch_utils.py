@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import fcntl
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+from config.settings import JOB_JOURNAL_DIR, JOB_RETENTION_HOURS
+from utils.json_utils import convert_numpy_types
+from utils.journal_index_utils import set_active, ensure_active_index, active_keys, prune_finished
+
+# Пакеты хранятся рядом с журналом задач, поэтому переживают перезапуск воркеров
+BATCH_DIR = JOB_JOURNAL_DIR / "batches"
+
+def _batch_path(batch_id: str) -> Path:
+    return BATCH_DIR / f"{batch_id}.json"
+
+def _has_pending(record: Dict[str, Any]) -> bool:
+    return any(item["state"] == "pending" for item in record["items"])
+
+@contextmanager
+def locked_batches():
+    """
+    Межпроцессная блокировка пакетов: запуск задач пакета и изменение записей.
+    """
+    BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BATCH_DIR / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            ensure_active_index(BATCH_DIR, _has_pending)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def save_batch(record: Dict[str, Any]):
+    """
+    Записывает пакет атомарно (вызывается под locked_batches).
+
+    Пакет с ожидающими наборами данных находится в индексе активных.
+    """
+    record["updated_at"] = time.time()
+    pending = _has_pending(record)
+    if pending:
+        set_active(BATCH_DIR, record["batch_id"], True)
+    path = _batch_path(record["batch_id"])
+    temp_path = path.with_suffix(f".tmp-{os.getpid()}")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(convert_numpy_types(record), f)
+    os.replace(temp_path, path)
+    if not pending:
+        set_active(BATCH_DIR, record["batch_id"], False)
+
+def load_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает пакет (None, если пакета нет).
+    """
+    try:
+        with open(_batch_path(batch_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def create_batch(batch_id: str, template: Dict[str, Any], items: List[Dict[str, Any]],
+                 max_concurrency: int) -> Dict[str, Any]:
+    """
+    Создает пакет: шаблон конфигурации и наборы данных в состоянии pending (или rejected).
+    """
+    record = {
+        "batch_id": batch_id,
+        "template": template,
+        "max_concurrency": max_concurrency,
+        "created_at": time.time(),
+        "items": items
+    }
+    with locked_batches():
+        save_batch(record)
+    return record
+
+def pending_batches() -> List[Dict[str, Any]]:
+    """
+    Возвращает пакеты с еще не запущенными наборами данных (вызывается под locked_batches).
+    """
+    batches = []
+    for batch_id in active_keys(BATCH_DIR):
+        record = load_batch(batch_id)
+        if record is None or not _has_pending(record):
+            set_active(BATCH_DIR, batch_id, False)
+            continue
+        batches.append(record)
+    return sorted(batches, key=lambda record: record["created_at"])
+
+def prune_batches() -> int:
+    """
+    Удаляет пакеты без ожидающих наборов данных, не изменявшиеся дольше JOB_RETENTION_HOURS часов.
+
+    Returns:
+        int: Количество удаленных пакетов
+    """
+    if not BATCH_DIR.exists():
+        return 0
+    return len(prune_finished(BATCH_DIR, JOB_RETENTION_HOURS))
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+# Файлы лимита памяти контейнера (cgroup v2 и v1)
+CGROUP_MEMORY_FILES = [Path("/sys/fs/cgroup/memory.max"), Path("/sys/fs/cgroup/memory/memory.limit_in_bytes")]
+# Значения cgroup v1 выше этого порога означают отсутствие лимита
+UNLIMITED_THRESHOLD = 2 ** 60
+
+def _read_first_line(path: Path) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+def total_memory_bytes() -> Optional[int]:
+    """
+    Возвращает объем оперативной памяти узла по /proc/meminfo.
+    """
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def memory_limit_bytes() -> Optional[int]:
+    """
+    Возвращает лимит памяти контейнера (cgroup), а без лимита - объем памяти узла.
+    """
+    for path in CGROUP_MEMORY_FILES:
+        value = _read_first_line(path)
+        if value and value != "max" and value.isdigit() and int(value) < UNLIMITED_THRESHOLD:
+            return int(value)
+    return total_memory_bytes()
+
+# Файлы квоты процессорного времени контейнера (cgroup v2 и v1)
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+def available_cpus() -> int:
+    """
+    Возвращает количество процессоров, доступных процессу (с учетом привязки к ядрам).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+def cpu_quota() -> float:
+    """
+    Возвращает квоту процессорного времени контейнера в ядрах, а без квоты - число доступных процессоров.
+    """
+    quota, period = None, None
+    value = _read_first_line(CGROUP_CPU_MAX)
+    if value:
+        parts = value.split()
+        if len(parts) == 2 and parts[0] != "max":
+            quota, period = parts
+    else:
+        quota, period = _read_first_line(CGROUP_CPU_QUOTA), _read_first_line(CGROUP_CPU_PERIOD)
+    try:
+        if quota is not None and period is not None and int(quota) > 0 and int(period) > 0:
+            return min(int(quota) / int(period), available_cpus())
+    except ValueError:
+        pass
+    return available_cpus()
@@ -0,0 +1,93 @@
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from config.settings import COLUMN_PARALLELISM
+from utils.cgroup_utils import available_cpus
+from utils.thread_budget_utils import current_threads
+
+T = TypeVar("T")
+
+# Минимум ячеек на поток: меньшие части не окупают передачу в пул
+MIN_CELLS_PER_WORKER = 250000
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Пул общий для задач процесса, каждая задача использует не больше выделенных ей потоков
+            _executor = ThreadPoolExecutor(max_workers=available_cpus(), thread_name_prefix="columns")
+        return _executor
+
+def plan_workers(items: int, rows: int) -> int:
+    """
+    Выбирает количество потоков для обработки items столбцов по rows строк.
+
+    Учитываются число столбцов, объем данных (не меньше MIN_CELLS_PER_WORKER
+    ячеек на поток) и потоки, выделенные текущему шагу (utils/thread_budget_utils.py).
+    """
+    if COLUMN_PARALLELISM == "off" or items < 2:
+        return 1
+    return max(1, min(items, current_threads(), rows * items // MIN_CELLS_PER_WORKER))
+
+def _split(items: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Делит диапазон [0, items) на parts последовательных частей близкого размера.
+    """
+    bounds = [items * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+def map_blocks(func: Callable[[int, int], T], items: int, rows: int) -> List[T]:
+    """
+    Применяет func(start, stop) к последовательным блокам столбцов в пуле потоков.
+
+    Returns:
+        List[T]: Результаты блоков в порядке столбцов (один результат при последовательной обработке)
+    """
+    workers = plan_workers(items, rows)
+    if workers <= 1:
+        return [func(0, items)]
+    futures = [_get_executor().submit(func, start, stop) for start, stop in _split(items, workers)]
+    return [future.result() for future in futures]
+
+def _releases_gil(series: pd.Series) -> bool:
+    # Операции над строками и объектами Python выполняются под GIL и не ускоряются потоками
+    return not pd.api.types.is_object_dtype(series.dtype) and not pd.api.types.is_string_dtype(series.dtype)
+
+def map_columns(func: Callable[[str, pd.Series], T], df: pd.DataFrame, columns: List[str]) -> List[T]:
+    """
+    Применяет func(столбец, Series) к столбцам DataFrame, распределяя их по пулу потоков.
+
+    Столбцы извлекаются из DataFrame в вызывающем потоке, поэтому func получает
+    только свой Series и не должна обращаться к DataFrame. Числовые столбцы и
+    даты обрабатываются в пуле (ядра NumPy и pandas освобождают GIL), столбцы
+    объектов - в вызывающем потоке параллельно с пулом. Результаты возвращаются
+    в порядке columns, поэтому слияние не зависит от порядка завершения.
+
+    Returns:
+        List[T]: Результаты func для каждого столбца
+    """
+    series = [df[col] for col in columns]
+    pooled = [i for i, item in enumerate(series) if _releases_gil(item)]
+    workers = plan_workers(len(pooled), len(df))
+    if workers <= 1:
+        return [func(col, item) for col, item in zip(columns, series)]
+
+    def run_block(indices: List[int]) -> List[T]:
+        return [func(columns[i], series[i]) for i in indices]
+
+    results: List[Any] = [None] * len(columns)
+    blocks = [pooled[start:stop] for start, stop in _split(len(pooled), workers)]
+    futures = [(block, _get_executor().submit(run_block, block)) for block in blocks]
+    pooled_set = set(pooled)
+    for i in range(len(columns)):
+        if i not in pooled_set:
+            results[i] = func(columns[i], series[i])
+    for block, future in futures:
+        for i, value in zip(block, future.result()):
+            results[i] = value
+    return results
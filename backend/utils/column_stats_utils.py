@@ -0,0 +1,288 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+# Методы, которые удаляют строки и делают все сохраненные статистики недействительными
+ROW_FILTER_METHODS = {
+    "missing_values": lambda parameters: parameters.get("strategy", "mean") == "drop_rows",
+    "outliers": lambda parameters: parameters.get("mode", "sequential") != "clip"
+}
+# Методы, которые только добавляют новые столбцы и не меняют существующие
+COLUMN_PRESERVING_METHODS = {"lagging", "rolling_statistics", "rolling_features"}
+# Типы столбцов, которые шаг обрабатывает, если столбцы не указаны (как в _apply_method);
+# шаги, которых здесь нет, могут изменить любой столбец
+DEFAULT_STEP_DTYPES = {
+    "missing_values": [np.number],
+    "outliers": [np.number],
+    "standardization": [np.number],
+    "pca": [np.number],
+    "categorical_encoding": ["object", "category"],
+    "date_components": ["object", "category", "datetime"]
+}
+# Статистики, которые пересчитываются точно после заполнения пропусков одним значением
+FILLED_STATS_KEYS = ("count", "mean", "std", "min", "max")
+# Статистики, необходимые для границ выбросов и масштабирования каждым методом
+OUTLIER_STATS_KEYS = {"zscore": ("mean", "std"), "iqr": ("q1", "q3")}
+SCALING_STATS_KEYS = {"standard": ("count", "mean", "std"), "minmax": ("min", "max"), "robust": ("median", "q1", "q3")}
+
+def _python_scalar(value: Any) -> Any:
+    """
+    Приводит значение к типу, который можно сохранить в JSON (иначе None).
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value if isinstance(value, (str, int, float, bool)) else None
+
+def compute_column_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Рассчитывает статистики полного набора данных для подбора параметров предобработки.
+
+    Числовые статистики считаются одним проходом по блоку всех числовых столбцов.
+
+    Args:
+        df: Полный DataFrame
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Для каждого столбца мода и число пропусков, для числовых
+        также количество значений, среднее, стандартное отклонение (ddof=1), минимум,
+        максимум и квартили
+    """
+    stats = {}
+    missing = df.isna().sum()
+    for col in df.columns:
+        mode = df[col].mode()
+        stats[col] = {"mode": _python_scalar(mode.iloc[0]) if len(mode) else None,
+                      "missing": int(missing[col])}
+
+    numeric_columns = df.select_dtypes(include=np.number).columns.tolist()
+    if not numeric_columns or len(df) == 0:
+        return stats
+
+    block = df[numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    for col, values in zip(numeric_columns, _numeric_block_stats(block)):
+        stats[col].update(values)
+
+    return stats
+
+def _numeric_block_stats(block: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Рассчитывает числовые статистики для каждого столбца двумерного блока float64.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        count = np.sum(~np.isnan(block), axis=0)
+        mean = np.nanmean(block, axis=0)
+        std = np.nanstd(block, axis=0, ddof=1)
+        min_val = np.nanmin(block, axis=0)
+        max_val = np.nanmax(block, axis=0)
+        q1, median, q3 = np.nanquantile(block, [0.25, 0.5, 0.75], axis=0)
+
+    return [{
+        "count": int(count[i]),
+        "mean": float(mean[i]),
+        "std": float(std[i]),
+        "min": float(min_val[i]),
+        "max": float(max_val[i]),
+        "q1": float(q1[i]),
+        "median": float(median[i]),
+        "q3": float(q3[i])
+    } for i in range(block.shape[1])]
+
+def compute_array_column_stats(columns: Iterable[Tuple[str, np.ndarray, Optional[np.ndarray]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Рассчитывает те же статистики, что compute_column_stats, по столбцам-массивам.
+
+    Столбцы обрабатываются по одному, поэтому для отображенных в память массивов
+    в куче находится не больше одного столбца. Мода строковых столбцов считается
+    по кодам словаря без восстановления строк.
+
+    Args:
+        columns: Тройки (столбец, массив, словарь строкового столбца или None)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Статистики в формате compute_column_stats
+    """
+    stats = {}
+    for col, values, categories in columns:
+        if categories is not None:
+            counts = np.bincount(values[values >= 0], minlength=len(categories))
+            # При равенстве частот выбирается наименьшее значение, как в pd.Series.mode
+            modes = [categories[i] for i in np.flatnonzero(counts == counts.max())] if counts.any() else []
+            stats[col] = {"mode": str(min(modes)) if modes else None, "missing": int(np.sum(values < 0))}
+            continue
+
+        series = pd.Series(values, copy=False)
+        mode = series.mode()
+        if values.dtype.kind == "M":
+            # Даты хранятся как datetime64, а в CSV записаны текстом
+            mode = mode.astype(str)
+        stats[col] = {"mode": _python_scalar(mode.iloc[0]) if len(mode) else None,
+                      "missing": int(series.isna().sum())}
+        if values.dtype.kind in "iuf" and len(values):
+            stats[col].update(_numeric_block_stats(values.astype(np.float64).reshape(-1, 1))[0])
+
+    return stats
+
+def _step_columns(df: pd.DataFrame, method_id: str, parameters: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    Столбцы входа, которые шаг может изменить (None - любые столбцы).
+
+    Если столбцы не указаны, они выбираются по типу так же, как при выполнении шага.
+    """
+    dtypes = DEFAULT_STEP_DTYPES.get(method_id)
+    if dtypes is None:
+        return None
+    columns = [col for col in parameters.get("columns") or [] if col in df.columns]
+    if not parameters.get("columns"):
+        columns = df.select_dtypes(include=dtypes).columns.tolist()
+    if method_id == "outliers":
+        # Логические и нечисловые столбцы шаг выбросов не обрабатывает
+        columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])
+                   and not pd.api.types.is_bool_dtype(df[col])]
+    return columns
+
+def _filled_stats(values: Dict[str, Any], fill_value: Any) -> Optional[Dict[str, Any]]:
+    """
+    Пересчитывает статистики столбца после заполнения всех пропусков одним числом.
+
+    Количество, среднее, стандартное отклонение, минимум и максимум объединяются
+    с группой одинаковых значений точно; квартили и мода не сохраняются.
+    """
+    if any(key not in values for key in FILLED_STATS_KEYS) or not isinstance(fill_value, (int, float)) \
+            or isinstance(fill_value, bool):
+        return None
+    count, missing, mean = values["count"], values["missing"], values["mean"]
+    total = count + missing
+    if count < 1:
+        return None
+    squares = values["std"] ** 2 * (count - 1) if count > 1 else 0.0
+    squares += (fill_value - mean) ** 2 * count * missing / total
+    return {
+        "missing": 0,
+        "count": total,
+        "mean": mean + (fill_value - mean) * missing / total,
+        "std": float(np.sqrt(squares / (total - 1))) if total > 1 else float("nan"),
+        "min": min(values["min"], fill_value),
+        "max": max(values["max"], fill_value)
+    }
+
+def stats_after_step(stats: Dict[str, Dict[str, Any]], method_id: str,
+                     parameters: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Возвращает статистики, которые остаются верными после выполнения шага.
+
+    Сбрасываются только статистики столбцов, которые шаг изменяет на полном наборе:
+    столбец без пропусков не меняется при заполнении пропусков, столбец в границах
+    выбросов - при их ограничении. После заполнения пропусков числом среднее,
+    стандартное отклонение, минимум и максимум пересчитываются. Шаги, удаляющие
+    строки, сбрасывают все статистики.
+
+    Args:
+        stats: Статистики полного набора, верные для входа шага
+        method_id: Идентификатор метода
+        parameters: Параметры шага
+        df: Данные на входе шага (для выбора столбцов по типу)
+    """
+    if not stats or method_id in COLUMN_PRESERVING_METHODS:
+        return stats
+
+    columns = _step_columns(df, method_id, parameters)
+    if columns is None:
+        return {}
+    changed = [col for col in columns if stats.get(col, {}).get("missing") != 0] \
+        if method_id == "missing_values" else columns
+
+    row_filter = ROW_FILTER_METHODS.get(method_id)
+    if row_filter and row_filter(parameters):
+        return stats if method_id == "missing_values" and not changed else {}
+
+    result = {col: values for col, values in stats.items() if col not in set(changed)}
+    if method_id == "missing_values":
+        strategy = parameters.get("strategy", "mean")
+        for col in changed:
+            if strategy in ("mean", "median") and not pd.api.types.is_numeric_dtype(df[col]):
+                result[col] = stats[col]
+            elif col in stats:
+                filled = _filled_stats(stats[col], fill_value_from_stats(stats, col, strategy))
+                if filled is not None:
+                    result[col] = filled
+    elif method_id == "outliers" and parameters.get("mode") == "clip":
+        bounds = parameters.get("bounds") or outlier_bounds_from_stats(
+            stats, columns, parameters.get("strategy", "zscore"), parameters.get("threshold", 3.0)) or {}
+        for col in columns:
+            values = stats.get(col, {})
+            if col in bounds and "min" in values and "max" in values \
+                    and bounds[col]["lower"] <= values["min"] and values["max"] <= bounds[col]["upper"]:
+                result[col] = values
+    return result
+
+def _numeric_stats(stats: Dict[str, Dict[str, Any]], columns: List[str],
+                   keys: Iterable[str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Возвращает статистики столбцов или None, если хотя бы для одного нет нужных значений.
+    """
+    selected = [stats.get(col) for col in columns]
+    if not columns or any(values is None or any(key not in values for key in keys) for values in selected):
+        return None
+    return selected
+
+def fill_value_from_stats(stats: Dict[str, Dict[str, Any]], column: str, strategy: str) -> Optional[Any]:
+    """
+    Возвращает значение для заполнения пропусков по сохраненным статистикам.
+    """
+    values = stats.get(column)
+    if values is None:
+        return None
+    key = {"mean": "mean", "median": "median", "mode": "mode"}.get(strategy)
+    return values.get(key) if key else None
+
+def outlier_bounds_from_stats(stats: Dict[str, Dict[str, Any]], columns: List[str], strategy: str,
+                              threshold: float) -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Рассчитывает границы выбросов по сохраненным статистикам в формате handle_outliers.
+    """
+    if strategy not in OUTLIER_STATS_KEYS:
+        return None
+    selected = _numeric_stats(stats, columns, OUTLIER_STATS_KEYS[strategy])
+    if selected is None:
+        return None
+
+    bounds = {}
+    for col, values in zip(columns, selected):
+        if strategy == "zscore":
+            center, spread = values["mean"], values["std"]
+            bounds[col] = {"lower": center - threshold * spread, "upper": center + threshold * spread}
+        else:
+            iqr = values["q3"] - values["q1"]
+            bounds[col] = {"lower": values["q1"] - threshold * iqr, "upper": values["q3"] + threshold * iqr}
+    return bounds
+
+def scaling_stats_from_cache(stats: Dict[str, Dict[str, Any]], columns: List[str],
+                             strategy: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Собирает статистики масштабирования по сохраненным значениям в формате fit_transform_block.
+
+    Для столбцов без сохраненных статистик (например, добавленных предыдущими шагами)
+    возвращается NaN: они рассчитываются по данным. Для метода standard используется
+    стандартное отклонение генеральной совокупности (ddof=0).
+    """
+    if strategy not in SCALING_STATS_KEYS:
+        return None
+    keys = SCALING_STATS_KEYS[strategy]
+    selected = [values if _numeric_stats(stats, [col], keys) else None
+                for col, values in ((col, stats.get(col)) for col in columns)]
+    if all(values is None for values in selected):
+        return None
+
+    def column(key):
+        return np.array([values[key] if values is not None else np.nan for values in selected], dtype=np.float64)
+
+    if strategy == "standard":
+        count = column("count")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = column("std") * np.sqrt(np.where(count > 1, (count - 1) / count, 0))
+        return {"mean": column("mean"), "std": std}
+    if strategy == "minmax":
+        return {"min": column("min"), "max": column("max")}
+    if strategy == "robust":
+        return {"median": column("median"), "iqr": column("q3") - column("q1")}
+    return None
@@ -0,0 +1,122 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.column_store_utils import MANIFEST_NAME
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    """
+    Читает манифест хранилища.
+    """
+    with open(directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def store_nbytes(directory: Path) -> int:
+    """
+    Возвращает размер файлов хранилища в байтах.
+    """
+    return sum(path.stat().st_size for path in directory.iterdir() if path.is_file())
+
+def load_categories(directory: Path, column: Dict[str, Any]) -> np.ndarray:
+    """
+    Отображает в память словарь строкового столбца (массив строк фиксированной длины).
+    """
+    return np.load(directory / column["categories_file"], mmap_mode="r")
+
+def decode_dictionary(codes: np.ndarray, categories: np.ndarray) -> np.ndarray:
+    """
+    Восстанавливает строки по кодам словаря; код -1 соответствует пропуску.
+    """
+    values = np.full(len(codes), np.nan, dtype=object)
+    present = codes >= 0
+    values[present] = categories[codes[present]].astype(object)
+    return values
+
+def categorical_from_store(codes: np.ndarray, categories: np.ndarray) -> pd.Categorical:
+    """
+    Строит категориальный столбец поверх кодов словаря без их копирования (код -1 - пропуск).
+    """
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories.astype(object)))
+
+def decode_categorical_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Заменяет категориальные столбцы, открытые из хранилища, строками (object) в
+    собственной копии DataFrame, которую шаги обработки будут изменять.
+    """
+    categorical = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    for col in categorical:
+        df[col] = df[col].astype(object)
+    return df
+
+def _is_mapped(values: np.ndarray) -> bool:
+    base = values
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+def private_nbytes(df: pd.DataFrame) -> int:
+    """
+    Оценивает память DataFrame, открытого из хранилища, которая принадлежит процессу:
+    отображенные массивы и коды категориальных столбцов общие и не учитываются,
+    словари категорий и остальные столбцы считаются с deep=True.
+    """
+    nbytes = int(df.index.memory_usage(deep=True))
+    for _, series in df.items():
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            nbytes += int(series.cat.categories.memory_usage(deep=True))
+            if not _is_mapped(codes):
+                nbytes += codes.nbytes
+        elif not _is_mapped(series.to_numpy()):
+            nbytes += int(series.memory_usage(deep=True, index=False))
+    return nbytes
+
+def open_column_store(directory: Path, columns: Optional[List[str]] = None,
+                      rows: Optional[slice] = None, manifest: Optional[Dict[str, Any]] = None,
+                      categorical: bool = False) -> pd.DataFrame:
+    """
+    Открывает хранилище как DataFrame без копирования числовых данных.
+
+    Числовые столбцы отображаются в память (mmap) только для чтения, поэтому
+    процессы, открывшие одно хранилище, разделяют одни и те же страницы памяти,
+    а попытка изменить такой DataFrame завершается ошибкой. Строковые столбцы
+    восстанавливаются из кодов словаря, а при categorical=True открываются как
+    pd.Categorical поверх отображенных кодов (в процесс копируется только словарь).
+
+    Args:
+        directory: Директория хранилища
+        columns: Столбцы для чтения (None - все)
+        rows: Диапазон строк (None - все)
+        manifest: Уже прочитанный манифест
+        categorical: Открывать строковые столбцы как категориальные
+
+    Returns:
+        pd.DataFrame: Данные хранилища
+    """
+    manifest = manifest or read_manifest(directory)
+    selected = manifest["columns"]
+    if columns is not None:
+        by_name = {column["name"]: column for column in selected}
+        missing = [name for name in columns if name not in by_name]
+        if missing:
+            raise KeyError(f"Столбцы не найдены в хранилище: {', '.join(missing)}")
+        selected = [by_name[name] for name in columns]
+
+    data = {}
+    for column in selected:
+        values = np.asarray(np.load(directory / column["file"], mmap_mode="r"))
+        if rows is not None:
+            values = values[rows]
+        if column["kind"] == "dictionary" and categorical:
+            values = categorical_from_store(values, load_categories(directory, column))
+        elif column["kind"] == "dictionary":
+            values = decode_dictionary(values, load_categories(directory, column))
+        data[column["name"]] = values
+
+    n_rows = len(range(manifest["rows"])[rows]) if rows is not None else manifest["rows"]
+    return pd.DataFrame(data, index=pd.RangeIndex(n_rows), columns=[column["name"] for column in selected],
+                        copy=False)
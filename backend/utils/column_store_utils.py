@@ -0,0 +1,212 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Имя файла с описанием столбцов хранилища
+MANIFEST_NAME = "manifest.json"
+# Типы numpy, которые хранятся как есть (целые, вещественные, логические, даты и интервалы)
+ARRAY_KINDS = "biufmM"
+
+def _parse_dates(series: pd.Series) -> Optional[np.ndarray]:
+    """
+    Преобразует строки дат ISO 8601 в datetime64, если текст восстанавливается без изменений.
+
+    Returns:
+        Optional[np.ndarray]: Массив datetime64 или None, если столбец не является датами
+    """
+    present = series.dropna()
+    if len(present) == 0 or not isinstance(present.iloc[0], str):
+        return None
+    try:
+        pd.to_datetime(present.iloc[:1], format="ISO8601")
+        parsed = pd.to_datetime(series, format="ISO8601")
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if getattr(parsed.dtype, "tz", None) is not None or not parsed[series.notna()].astype(str).equals(present):
+        return None
+    return parsed.to_numpy()
+
+def _array_values(series: pd.Series, densify_sparse: bool, parse_dates: bool = False) -> Optional[np.ndarray]:
+    """
+    Возвращает значения столбца, которые хранятся как есть, или None для строковых.
+
+    Raises:
+        ValueError: Если тип столбца не поддерживается хранилищем
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.SparseDtype) and densify_sparse:
+        series = series.sparse.to_dense()
+        dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in ARRAY_KINDS:
+        return series.to_numpy()
+    if dtype == object:
+        return _parse_dates(series) if parse_dates else None
+    raise ValueError(f"Тип {dtype} столбца {series.name} не поддерживается хранилищем столбцов")
+
+class ColumnStoreWriter:
+    """
+    Потоковая запись хранилища столбцов частями строк.
+
+    Числовые столбцы и даты дописываются в файлы .npy обычной записью (нехватка
+    места на диске или в tmpfs дает OSError ENOSPC, а не SIGBUS, как запись через
+    отображение в память), поэтому в памяти находится только текущая часть.
+    Строковые столбцы кодируются словарем, общим для всех частей; коды хранятся
+    в наименьшем подходящем целочисленном типе, пропуски кодируются значением -1,
+    словарь сохраняется отдельным файлом .npy строк фиксированной длины.
+    Индекс не сохраняется (как в CSV).
+    """
+
+    def __init__(self, directory: Path, rows: int, densify_sparse: bool = False, parse_dates: bool = False):
+        """
+        Args:
+            directory: Пустая или несуществующая директория хранилища
+            rows: Общее количество строк
+            densify_sparse: Записывать разреженные столбцы в плотном виде (иначе ValueError)
+            parse_dates: Хранить строковые столбцы дат ISO 8601 как datetime64
+        """
+        self.directory = directory
+        self.rows = rows
+        self.densify_sparse = densify_sparse
+        self.parse_dates = parse_dates
+        self.written = 0
+        self._columns: List[Dict[str, Any]] = []
+        self._files: Dict[str, Any] = {}
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._dictionaries: Dict[str, Dict[str, int]] = {}
+        self._codes: Dict[str, List[np.ndarray]] = {}
+
+    def _start(self, df: pd.DataFrame):
+        if not all(isinstance(col, str) for col in df.columns) or df.columns.has_duplicates:
+            raise ValueError("Имена столбцов должны быть уникальными строками")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for i, (name, series) in enumerate(df.items()):
+            file_name = f"{i}.npy"
+            values = _array_values(series, self.densify_sparse, self.parse_dates)
+            if values is None:
+                self._dictionaries[name] = {}
+                self._codes[name] = []
+                self._columns.append({"name": name, "file": file_name, "kind": "dictionary"})
+            else:
+                f = open(self.directory / file_name, "wb")
+                self._files[name] = f
+                self._dtypes[name] = values.dtype
+                np.lib.format.write_array_header_1_0(f, {
+                    "descr": np.lib.format.dtype_to_descr(values.dtype),
+                    "fortran_order": False,
+                    "shape": (self.rows,)
+                })
+                self._columns.append({"name": name, "file": file_name, "kind": "array",
+                                      "parsed_dates": series.dtype == object})
+
+    def append(self, df: pd.DataFrame):
+        """
+        Дописывает часть строк; столбцы и их типы должны совпадать с первой частью.
+
+        Raises:
+            ValueError: Если столбцы или типы не поддерживаются или не совпадают
+        """
+        if not self._columns:
+            self._start(df)
+        if df.columns.tolist() != [column["name"] for column in self._columns]:
+            raise ValueError("Столбцы части не совпадают со столбцами хранилища")
+        end = self.written + len(df)
+        if end > self.rows:
+            raise ValueError("Количество строк превышает заявленное")
+
+        for name, series in df.items():
+            if name in self._files:
+                dtype = self._dtypes[name]
+                values = _array_values(series, self.densify_sparse, self.parse_dates)
+                if values is None and dtype.kind == "M" and series.isna().all():
+                    values = np.full(len(series), np.datetime64("NaT"), dtype=dtype)
+                if values is None or not np.can_cast(values.dtype, dtype, "same_kind"):
+                    raise ValueError(f"Тип столбца {name} изменился между частями")
+                self._files[name].write(np.ascontiguousarray(values, dtype=dtype).view(np.uint8).data)
+                continue
+
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            if not all(isinstance(value, str) for value in uniques):
+                raise ValueError(f"Столбец {name} содержит значения, отличные от строк")
+            # Коды части переводятся в коды общего словаря
+            dictionary = self._dictionaries[name]
+            mapping = np.array([dictionary.setdefault(value, len(dictionary)) for value in uniques] + [-1],
+                               dtype=np.int32)
+            self._codes[name].append(mapping[codes])
+        self.written = end
+
+    def close(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Завершает запись: сохраняет коды строковых столбцов и manifest.json.
+
+        Returns:
+            Dict[str, Any]: Манифест
+        """
+        if self.written != self.rows:
+            raise ValueError(f"Записано {self.written} строк из {self.rows}")
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+        for column in self._columns:
+            if column["kind"] != "dictionary":
+                continue
+            categories = list(self._dictionaries[column["name"]])
+            code_dtype = _code_dtype(len(categories))
+            parts = self._codes.pop(column["name"])
+            codes = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+            np.save(self.directory / column["file"], codes.astype(code_dtype), allow_pickle=False)
+            column["categories_file"] = f"{Path(column['file']).stem}.categories.npy"
+            np.save(self.directory / column["categories_file"], np.array(categories, dtype=str), allow_pickle=False)
+
+        manifest = {"rows": self.rows, "columns": self._columns, **(extra or {})}
+        with open(self.directory / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return manifest
+
+def write_column_store(df: pd.DataFrame, directory: Path, extra: Optional[Dict[str, Any]] = None,
+                       densify_sparse: bool = False) -> Dict[str, Any]:
+    """
+    Записывает DataFrame по столбцам: файл .npy на столбец и manifest.json.
+
+    Args:
+        df: DataFrame для записи
+        directory: Пустая или несуществующая директория хранилища
+        extra: Дополнительные поля манифеста
+        densify_sparse: Записывать разреженные столбцы в плотном виде
+
+    Returns:
+        Dict[str, Any]: Манифест
+
+    Raises:
+        ValueError: Если имена или типы столбцов не поддерживаются
+    """
+    writer = ColumnStoreWriter(directory, len(df), densify_sparse)
+    writer.append(df)
+    return writer.close(extra)
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    return np.dtype(np.int8 if n_categories < 2 ** 7 else np.int16 if n_categories < 2 ** 15 else np.int32)
+
+def estimate_store_nbytes(df: pd.DataFrame, densify_sparse: bool = False) -> int:
+    """
+    Оценивает размер хранилища до записи (с небольшим запасом на заголовки и манифест).
+
+    Raises:
+        ValueError: Если тип столбца не поддерживается хранилищем
+    """
+    nbytes = 4096
+    for _, series in df.items():
+        values = _array_values(series, densify_sparse)
+        nbytes += 256
+        if values is not None:
+            nbytes += values.nbytes
+            continue
+        uniques = series.dropna().unique()
+        if not all(isinstance(value, str) for value in uniques):
+            raise ValueError(f"Столбец {series.name} содержит значения, отличные от строк")
+        # Словарь хранится строками фиксированной длины (4 байта на символ)
+        max_length = max((len(value) for value in uniques), default=1)
+        nbytes += len(series) * _code_dtype(len(uniques)).itemsize + len(uniques) * 4 * max(max_length, 1)
+    return nbytes
@@ -0,0 +1,232 @@
+import logging
+import threading
+import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.settings import DATAFRAME_CACHE_BYTES, SHARED_CACHE_ENABLED
+from utils.metrics_utils import inc_counter, set_gauge
+from utils.validation_utils import read_and_validate_dataframe
+from utils.result_reader_utils import get_result_metadata_path, read_result_dataframe
+from utils.shared_cache_utils import SharedDataFrameStore
+from utils.column_store_reader_utils import private_nbytes
+
+CacheKey = Tuple[str, str]
+Signature = Tuple[int, int]
+
+def _file_signature(path: Path) -> Optional[Signature]:
+    """
+    Подпись файла-источника (время изменения и размер); None, если файла нет.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class DataFrameCache:
+    """
+    Кэш загруженных DataFrame в памяти процесса с бюджетом в байтах и вытеснением LRU.
+
+    Запись привязана к файлу-источнику: если файл перезаписан (изменились время
+    изменения или размер) или удален, запись считается недействительной.
+    Возвращаемые DataFrame общие для всех запросов и не должны изменяться.
+
+    Если передано общее хранилище (SharedDataFrameStore), DataFrame публикуются
+    в общую память и открываются из нее без копирования, поэтому все воркеры
+    используют одну копию данных; в память процесса попадают только DataFrame,
+    которые нельзя поместить в общее хранилище (например, с разреженными столбцами).
+    Строковые столбцы таких DataFrame категориальные (коды общие, словарь - в процессе),
+    в бюджете процесса учитывается только его собственная часть (private_nbytes).
+    """
+
+    def __init__(self, max_bytes: int = DATAFRAME_CACHE_BYTES, shared_store: Optional[SharedDataFrameStore] = None):
+        self.max_bytes = max_bytes
+        self.shared_store = shared_store
+        self._entries: "OrderedDict[CacheKey, Tuple[pd.DataFrame, Signature, int, bool]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key: CacheKey, reason: str):
+        _, _, nbytes, shared = self._entries.pop(key)
+        self._bytes -= nbytes
+        self.evictions += 1
+        if shared:
+            # Без аренды запись общей памяти может быть вытеснена другими воркерами
+            self.shared_store.release(*key)
+        inc_counter("dataframe_cache_evictions_total", reason=reason)
+
+    def _store(self, key: CacheKey, df: pd.DataFrame, signature: Signature, nbytes: int, shared: bool):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key, "replaced")
+            while self._entries and self._bytes + nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)), "evicted")
+            self._entries[key] = (df, signature, nbytes, shared)
+            self._bytes += nbytes
+            total = self._bytes
+        set_gauge("dataframe_cache_bytes", total)
+
+    def get(self, kind: str, entry_id: str, source: Path) -> Optional[pd.DataFrame]:
+        """
+        Возвращает DataFrame из кэша, если запись есть и источник не изменился.
+
+        При отсутствии записи в процессе она открывается из общей памяти, если
+        ее опубликовал другой воркер.
+
+        Args:
+            kind: Тип записи (dataset, result, sample)
+            entry_id: Идентификатор набора данных или результата
+            source: Файл, из которого был загружен DataFrame
+        """
+        key = (kind, entry_id)
+        signature = _file_signature(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] != signature:
+                self._drop(key, "stale")
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            inc_counter("dataframe_cache_requests_total", kind=kind, result="hit")
+            return entry[0]
+
+        df = None
+        if self.shared_store is not None and signature is not None:
+            df = self.shared_store.attach(kind, entry_id, signature)
+        if df is None:
+            with self._lock:
+                self.misses += 1
+            inc_counter("dataframe_cache_requests_total", kind=kind, result="miss")
+            return None
+
+        self._store(key, df, signature, private_nbytes(df), True)
+        with self._lock:
+            self.shared_hits += 1
+        inc_counter("dataframe_cache_requests_total", kind=kind, result="shared_hit")
+        return df
+
+    def put(self, kind: str, entry_id: str, source: Path, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Сохраняет DataFrame в кэш, вытесняя давно не использованные записи.
+
+        Returns:
+            pd.DataFrame: DataFrame для дальнейшей работы - открытый из общей памяти
+            (только для чтения), если его удалось туда поместить, иначе исходный
+        """
+        signature = _file_signature(source)
+        if signature is None:
+            return df
+
+        key = (kind, entry_id)
+        if self.shared_store is not None and self.shared_store.publish(kind, entry_id, df, signature):
+            shared_df = self.shared_store.attach(kind, entry_id, signature)
+            if shared_df is not None:
+                self._store(key, shared_df, signature, private_nbytes(shared_df), True)
+                return shared_df
+
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes // 2:
+            logging.info(f"DataFrame {kind}/{entry_id} ({nbytes} байт) слишком велик для кэша")
+            return df
+        self._store(key, df, signature, nbytes, False)
+        return df
+
+    def invalidate(self, kind: str, entry_id: str):
+        """
+        Удаляет запись (при перезаписи или удалении набора данных или результата).
+        """
+        with self._lock:
+            if (kind, entry_id) in self._entries:
+                self._drop((kind, entry_id), "invalidated")
+            total = self._bytes
+        if self.shared_store is not None:
+            self.shared_store.invalidate(kind, entry_id)
+        set_gauge("dataframe_cache_bytes", total)
+
+    def release_shared(self):
+        """
+        Снимает аренды общей памяти текущего процесса (при остановке воркера).
+        """
+        if self.shared_store is not None:
+            self.shared_store.release_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+        if self.shared_store is not None:
+            stats["shared"] = self.shared_store.stats()
+        return stats
+
+# Кэш процесса, общий для всех запросов воркера
+dataframe_cache = DataFrameCache(shared_store=SharedDataFrameStore() if SHARED_CACHE_ENABLED else None)
+
+async def load_dataset(dataset_id: str, file_path: Path, extension: str) -> pd.DataFrame:
+    """
+    Загружает исходный набор данных через кэш (чтение файла выполняется в пуле потоков).
+    """
+    return await run_in_threadpool(load_dataset_sync, dataset_id, file_path, extension)
+
+def load_dataset_sync(dataset_id: str, file_path: Path, extension: str) -> pd.DataFrame:
+    """
+    Загружает исходный набор данных через кэш (синхронно, для выполнения в пуле потоков).
+    """
+    df = dataframe_cache.get("dataset", dataset_id, file_path)
+    if df is None:
+        df = read_and_validate_dataframe(file_path, extension)
+        df = dataframe_cache.put("dataset", dataset_id, file_path, df)
+    return df
+
+def get_cached_result(result_id: str) -> Optional[pd.DataFrame]:
+    """
+    Возвращает результат, только если он уже есть в кэше.
+    """
+    return dataframe_cache.get("result", result_id, get_result_metadata_path(result_id))
+
+def load_result(result_id: str, sparse_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Загружает результат целиком (с учетом наложений) через кэш.
+
+    Источником записи служат метаданные результата: они перезаписываются при
+    сохранении, уплотнении и изменении параметров результата.
+    """
+    df = get_cached_result(result_id)
+    if df is None:
+        df = read_result_dataframe(result_id, sparse_columns)
+        df = dataframe_cache.put("result", result_id, get_result_metadata_path(result_id), df)
+    return df
+
+def cache_result(result_id: str, df: pd.DataFrame):
+    """
+    Кэширует только что сохраненный результат (после записи его метаданных).
+    """
+    dataframe_cache.put("result", result_id, get_result_metadata_path(result_id), df)
+
+def slice_rows(df: pd.DataFrame, offset: int = 0, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Возвращает диапазон строк с плотными столбцами и датами в виде текста (как при чтении из CSV).
+    """
+    part = df.iloc[offset:offset + limit if limit is not None else None].reset_index(drop=True)
+    sparse = [col for col, dtype in part.dtypes.items() if isinstance(dtype, pd.SparseDtype)]
+    if sparse:
+        part = part.astype({col: part[col].dtype.subtype for col in sparse})
+    dates = part.select_dtypes(include=["datetime", "datetimetz"]).columns
+    if len(dates):
+        part = part.assign(**{col: part[col].astype(str).where(part[col].notna(), None) for col in dates})
+    return part
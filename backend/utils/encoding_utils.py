@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.column_parallel_utils import map_columns
+from utils.job_control_utils import check_job
+
+def _json_safe(values: List[Any]) -> List[Any]:
+    """
+    Приводит значения категорий к типам, которые можно сохранить в JSON.
+    """
+    return [value if isinstance(value, (str, int, float, bool)) else str(value) for value in values]
+
+def _cap_categories(counts: np.ndarray, n_rows: int, max_categories: Optional[int],
+                    min_frequency: Optional[float]) -> np.ndarray:
+    """
+    Определяет, какие категории сохраняются как отдельные столбцы.
+
+    Args:
+        counts: Частоты категорий
+        n_rows: Количество строк
+        max_categories: Максимальное количество отдельных категорий
+        min_frequency: Минимальная частота (доля, если меньше 1, иначе количество)
+
+    Returns:
+        np.ndarray: Булева маска сохраняемых категорий
+    """
+    keep = np.ones(len(counts), dtype=bool)
+
+    if min_frequency:
+        min_count = min_frequency * n_rows if min_frequency < 1 else min_frequency
+        keep &= counts >= min_count
+
+    if max_categories and keep.sum() > max_categories:
+        # Оставляем самые частые категории, при равенстве - в порядке сортировки
+        order = np.argsort(-np.where(keep, counts, -1), kind="stable")
+        keep = np.zeros(len(counts), dtype=bool)
+        keep[order[:max_categories]] = True
+
+    return keep
+
+def _unique_label(label: str, categories: set) -> str:
+    """
+    Возвращает название для редких категорий, не совпадающее с сохраненными категориями
+    (при совпадении добавляется числовой суффикс: other_1, other_2, ...).
+    """
+    candidate, suffix = label, 0
+    while candidate in categories:
+        suffix += 1
+        candidate = f"{label}_{suffix}"
+    return candidate
+
+def _build_indicator_frame(index: pd.Index, row_blocks: List[np.ndarray], col_blocks: List[np.ndarray],
+                           names: List[str], sparse: bool) -> pd.DataFrame:
+    """
+    Собирает индикаторные столбцы всех кодируемых признаков в одну матрицу.
+    """
+    n_rows = len(index)
+    rows = np.concatenate(row_blocks) if row_blocks else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(col_blocks) if col_blocks else np.empty(0, dtype=np.int64)
+
+    if sparse:
+        from scipy import sparse as sp
+
+        matrix = sp.csc_matrix(
+            (np.ones(len(rows), dtype=np.uint8), (rows, cols)),
+            shape=(n_rows, len(names))
+        )
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=index, columns=names)
+
+    # Одно выделение памяти под все индикаторы (тип bool, как у pd.get_dummies)
+    block = np.zeros((n_rows, len(names)), dtype=bool)
+    block[rows, cols] = True
+    return pd.DataFrame(block, index=index, columns=names)
+
+def onehot_encode(df: pd.DataFrame, columns: List[str], max_categories: Optional[int] = None,
+                  min_frequency: Optional[float] = None, sparse: bool = False,
+                  other_label: str = "other") -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    One-hot кодирование всех указанных столбцов за один проход.
+
+    Редкие категории (по max_categories или min_frequency) объединяются в столбец "other"
+    (если такая категория есть среди сохраненных, название получает суффикс).
+    Исходные столбцы заменяются индикаторами одной операцией конкатенации.
+
+    Args:
+        df: DataFrame для обработки
+        columns: Категориальные столбцы для кодирования
+        max_categories: Максимальное количество отдельных категорий на столбец
+        min_frequency: Минимальная частота категории (доля или количество)
+        sparse: Возвращать индикаторы в разреженном формате
+        other_label: Название категории для редких значений
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Закодированный DataFrame и параметры кодирования
+    """
+    n_rows = len(df)
+    row_positions = np.arange(n_rows)
+    row_blocks, col_blocks, names = [], [], []
+    params = {"strategy": "onehot", "sparse": sparse, "columns": {}}
+
+    for col in columns:
+        check_job()
+        categorical = pd.Categorical(df[col])
+        codes = categorical.codes.astype(np.int64)
+        present = codes >= 0
+        counts = np.bincount(codes[present], minlength=len(categorical.categories))
+
+        keep = _cap_categories(counts, n_rows, max_categories, min_frequency)
+        kept_categories = categorical.categories[keep]
+
+        # Перенумеровываем категории: сохраненные - по порядку, остальные - в "other"
+        has_other = not keep.all() and counts[~keep].sum() > 0
+        remap = np.full(len(keep), len(kept_categories), dtype=np.int64)
+        remap[keep] = np.arange(len(kept_categories))
+        new_codes = remap[codes[present]]
+
+        offset = len(names)
+        names.extend(f"{col}_{category}" for category in kept_categories)
+        column_other = _unique_label(other_label, {str(category) for category in kept_categories})
+        if has_other:
+            names.append(f"{col}_{column_other}")
+
+        row_blocks.append(row_positions[present])
+        col_blocks.append(offset + new_codes)
+        params["columns"][col] = {
+            "categories": _json_safe(kept_categories.tolist()),
+            "other": bool(has_other),
+            "other_label": column_other
+        }
+
+    check_job()
+    dummies = _build_indicator_frame(df.index, row_blocks, col_blocks, names, sparse)
+    return pd.concat([df.drop(columns=columns), dummies], axis=1), params
+
+def hash_encode(df: pd.DataFrame, columns: List[str], n_features: int = 32,
+                sparse: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Кодирование хешированием признаков для столбцов с очень большим числом категорий.
+
+    Каждое значение попадает в одну из n_features корзин по детерминированному хешу pandas.
+
+    Args:
+        df: DataFrame для обработки
+        columns: Категориальные столбцы для кодирования
+        n_features: Количество корзин на столбец
+        sparse: Возвращать индикаторы в разреженном формате
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Закодированный DataFrame и параметры кодирования
+    """
+    if n_features < 1:
+        raise ValueError(f"Количество корзин хеширования должно быть не меньше 1 (получено {n_features})")
+    row_positions = np.arange(len(df))
+    row_blocks, col_blocks, names = [], [], []
+
+    for col in columns:
+        check_job()
+        series = df[col]
+        present = series.notna().to_numpy()
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        buckets = (hashes[present] % np.uint64(n_features)).astype(np.int64)
+
+        offset = len(names)
+        names.extend(f"{col}_hash_{i}" for i in range(n_features))
+        row_blocks.append(row_positions[present])
+        col_blocks.append(offset + buckets)
+
+    check_job()
+    dummies = _build_indicator_frame(df.index, row_blocks, col_blocks, names, sparse)
+    params = {"strategy": "hashing", "sparse": sparse, "n_features": n_features, "columns": columns}
+    return pd.concat([df.drop(columns=columns), dummies], axis=1), params
+
+def label_encode(df: pd.DataFrame, columns: List[str]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Label кодирование с сохранением словаря категорий для обратного преобразования.
+    """
+    params = {"strategy": "label", "columns": {}}
+
+    def encode(col: str, series: pd.Series):
+        categorical = series.astype('category')
+        return categorical.cat.codes, categorical.cat.categories
+
+    # Столбцы кодируются независимо и параллельно, результаты записываются в порядке столбцов
+    for col, (codes, categories) in zip(columns, map_columns(encode, df, columns)):
+        df[col] = codes
+        params["columns"][col] = {"categories": _json_safe(categories.tolist())}
+
+    return df, params
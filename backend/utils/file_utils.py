@@ -1,10 +1,13 @@
 from fastapi import UploadFile, HTTPException
 import os
 import shutil
+import codecs
 import logging
 from pathlib import Path
 from typing import Union
 
+from utils.metrics_utils import observe_io
+
 # Получаем абсолютный путь к текущему файлу
 CURRENT_DIR = Path(__file__).resolve().parent
 
@@ -40,6 +43,7 @@ async def save_uploaded_file(file: UploadFile, file_id: str, extension: str) ->
         
         # Перемещаем файл в директорию загрузок
         shutil.move(temp_path, file_path)
+        observe_io("write", extension, file_path)
         
         return file_path
     
@@ -74,4 +78,21 @@ def get_processed_file_path(result_id: str) -> Path:
     Returns:
         Path: Путь к обработанному файлу
     """
-    return PROCESSED_DIR / f"{result_id}.csv"
\ No newline at end of file
+    return PROCESSED_DIR / f"{result_id}.csv"
+
+def copy_csv_with_bom(source_path: Path, target_path: Path) -> Path:
+    """
+    Копирует CSV файл потоково, добавляя BOM для корректного открытия в Excel.
+    
+    Args:
+        source_path: Исходный CSV файл в кодировке utf-8
+        target_path: Путь к создаваемому файлу
+    
+    Returns:
+        Path: Путь к созданному файлу
+    """
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        target.write(codecs.BOM_UTF8)
+        shutil.copyfileobj(source, target)
+    
+    return target_path
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+# Ключи статистик для каждого метода масштабирования: (центр, масштаб)
+CENTER_SCALE_KEYS = {
+    "standard": ("mean", "std"),
+    "minmax": ("min", "max"),
+    "robust": ("median", "iqr")
+}
+
+def _infer_method(params: Dict[str, Dict[str, float]]) -> Optional[str]:
+    """
+    Определяет метод масштабирования по набору сохраненных статистик.
+    """
+    for col_params in params.values():
+        for method, keys in CENTER_SCALE_KEYS.items():
+            if all(key in col_params for key in keys):
+                return method
+    return None
+
+def normalize_scaling_params(scaling_params: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Dict[str, float]]]:
+    """
+    Приводит параметры масштабирования любого поддерживаемого формата к виду (метод, {столбец: статистики}).
+
+    Поддерживаемые форматы:
+        1. {"standardization": {"method", "columns", "params"}} - метаданные результата
+        2. {"method", "columns", "params" | "parameters"} - ручная установка параметров
+        3. {"type", "mean": {...}, "std": {...}, ...} - статистики, сгруппированные по названию
+    """
+    if not scaling_params:
+        return None, {}
+
+    if "standardization" in scaling_params:
+        standardization = scaling_params.get("standardization") or {}
+        method, params = standardization.get("method"), standardization.get("params") or {}
+    elif "method" in scaling_params:
+        method = scaling_params.get("method")
+        params = scaling_params.get("params") or scaling_params.get("parameters") or {}
+    elif "type" in scaling_params:
+        method = scaling_params.get("type")
+        params = {}
+        for key in CENTER_SCALE_KEYS.get(method, ()):
+            for col, value in (scaling_params.get(key) or {}).items():
+                params.setdefault(col, {})[key] = value
+        keys = CENTER_SCALE_KEYS.get(method, ())
+        params = {col: values for col, values in params.items() if all(key in values for key in keys)}
+    else:
+        return None, {}
+
+    return method or _infer_method(params), params
+
+def scaling_arrays(method: str, params: Dict[str, Dict[str, float]],
+                   columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Собирает векторы центра и масштаба для столбцов: x_original = x_scaled * scale + center.
+    """
+    center_key, scale_key = CENTER_SCALE_KEYS[method]
+    center = np.array([float(params[col].get(center_key, 0)) for col in columns], dtype=np.float64)
+    scale = np.array([float(params[col].get(scale_key, 1)) for col in columns], dtype=np.float64)
+
+    if method == "minmax":
+        # Для minmax масштаб - это размах (max - min)
+        scale = scale - center
+
+    scale[scale == 0] = 1.0  # Избегаем вырожденного масштаба
+    return center, scale
+
+def inverse_scale(df: pd.DataFrame, columns: Optional[List[str]],
+                  scaling_params: Dict[str, Any]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Отменяет масштабирование одной операцией над блоком выбранных столбцов.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: DataFrame и список измененных столбцов
+    """
+    method, params = normalize_scaling_params(scaling_params)
+    if method not in CENTER_SCALE_KEYS:
+        return df, []
+
+    selected = columns if columns else list(params)
+    valid_columns = [col for col in selected if col in params and col in df.columns]
+    if not valid_columns:
+        return df, []
+
+    center, scale = scaling_arrays(method, params, valid_columns)
+    block = df[valid_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    block *= scale
+    block += center
+    df[valid_columns] = block
+    return df, valid_columns
+
+def inverse_pca(df: pd.DataFrame, pca_params: Dict[str, Any]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Восстанавливает исходные столбцы из компонент PCA: X = Z @ components + mean.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: DataFrame и список восстановленных столбцов
+    """
+    components = np.asarray(pca_params.get("components") or [], dtype=np.float64)
+    names = [f"PCA_{i + 1}" for i in range(components.shape[0])]
+    if not names or not all(name in df.columns for name in names):
+        return df, []
+
+    scores = df[names].to_numpy(dtype=np.float64, na_value=np.nan)
+    restored = scores @ components + np.asarray(pca_params["mean"], dtype=np.float64)
+    restored_df = pd.DataFrame(restored, index=df.index, columns=pca_params["columns"])
+
+    return pd.concat([df.drop(columns=names), restored_df], axis=1), list(pca_params["columns"])
+
+def decode_labels(df: pd.DataFrame, columns: Optional[List[str]],
+                  encoding_params: Dict[str, Any]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Восстанавливает исходные категории из кодов label-кодирования.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: DataFrame и список декодированных столбцов
+    """
+    if encoding_params.get("strategy") != "label":
+        return df, []
+
+    decoded = []
+    for col, col_params in (encoding_params.get("columns") or {}).items():
+        if col not in df.columns or (columns and col not in columns):
+            continue
+        # Последний элемент соответствует коду -1 (пропуск)
+        categories = np.array(list(col_params.get("categories", [])) + [np.nan], dtype=object)
+        codes = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(codes) & (codes >= 0) & (codes < len(categories) - 1)
+        df[col] = categories[np.where(valid, codes, -1).astype(np.int64)]
+        decoded.append(col)
+
+    return df, decoded
+
+def apply_inverse_transform(df: pd.DataFrame, columns: Optional[List[str]],
+                            scaling_params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Единый движок обратного преобразования.
+
+    Порядок обратен прямой обработке: восстановление столбцов из PCA, отмена
+    масштабирования, декодирование меток. PCA и декодирование выполняются, только
+    если затронутые столбцы запрошены (или список столбцов не указан).
+
+    Args:
+        df: DataFrame для обработки (изменяется)
+        columns: Столбцы для обратного преобразования (None - все из параметров)
+        scaling_params: Параметры в любом поддерживаемом формате; могут содержать ключи pca и categorical_encoding
+
+    Returns:
+        pd.DataFrame: DataFrame после обратного преобразования
+    """
+    return inverse_transform_with_changes(df, columns, scaling_params)[0]
+
+def inverse_transform_with_changes(df: pd.DataFrame, columns: Optional[List[str]],
+                                   scaling_params: Dict[str, Any]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Выполняет обратное преобразование и возвращает список измененных или добавленных столбцов.
+
+    Набор измененных столбцов зависит только от столбцов DataFrame и параметров,
+    поэтому совпадает для всех частей одного файла.
+    """
+    scaling_params = scaling_params or {}
+    changed: List[str] = []
+
+    pca_params = scaling_params.get("pca")
+    if pca_params and (not columns or set(columns) & set(pca_params.get("columns", []))):
+        df, restored = inverse_pca(df, pca_params)
+        changed += restored
+
+    df, unscaled = inverse_scale(df, columns, scaling_params)
+    changed += unscaled
+
+    encoding_params = scaling_params.get("categorical_encoding")
+    if encoding_params:
+        df, decoded = decode_labels(df, columns, encoding_params)
+        changed += decoded
+
+    return df, list(dict.fromkeys(changed))
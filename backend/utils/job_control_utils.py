@@ -0,0 +1,95 @@
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from config.settings import JOB_TIME_LIMIT, JOB_CPU_TIME_LIMIT, SCHEDULER_DIR
+
+# Директория отметок отмены: задачу может отменить запрос к любому воркеру пода
+CANCEL_DIR = SCHEDULER_DIR / "cancel"
+
+_current_job = threading.local()
+
+class JobStopped(Exception):
+    """
+    Задача остановлена: отменена пользователем (cancelled) или превысила лимит времени (timed_out).
+    """
+
+    def __init__(self, status: str, step: Optional[str], message: str):
+        super().__init__(message)
+        self.status = status
+        self.step = step
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": self.status, "step": self.step, "message": str(self)}
+
+def _cancel_marker(job_id: str) -> Path:
+    return CANCEL_DIR / job_id
+
+def request_cancel(job_id: str):
+    """
+    Отмечает задачу для отмены; задача останавливается при ближайшей проверке.
+    """
+    CANCEL_DIR.mkdir(parents=True, exist_ok=True)
+    _cancel_marker(job_id).touch()
+
+def cancel_requested(job_id: str) -> bool:
+    return _cancel_marker(job_id).exists()
+
+def clear_cancel(job_id: str):
+    _cancel_marker(job_id).unlink(missing_ok=True)
+
+def effective_limit(requested: Optional[float], server_limit: float) -> Optional[float]:
+    """
+    Лимит задачи: запрошенный в конфигурации, но не больше лимита сервера (0 - без лимита).
+    """
+    limits = [limit for limit in (requested, server_limit) if limit]
+    return min(limits) if limits else None
+
+class JobControl:
+    """
+    Кооперативная отмена и лимиты времени задачи.
+
+    Задача регистрирует объект в своем потоке (activate), после чего проверки
+    check_job между шагами и в циклах по частям данных останавливают ее
+    исключением JobStopped. Процессорное время считается по потоку задачи
+    (без пулов потоков нативных библиотек и параллельной обработки столбцов).
+    """
+
+    def __init__(self, job_id: str, time_limit: Optional[float] = None, cpu_time_limit: Optional[float] = None):
+        self.job_id = job_id
+        self.time_limit = effective_limit(time_limit, JOB_TIME_LIMIT)
+        self.cpu_time_limit = effective_limit(cpu_time_limit, JOB_CPU_TIME_LIMIT)
+        self.step: Optional[str] = None
+        self._started = time.monotonic()
+        self._cpu_started = time.thread_time()
+
+    def activate(self):
+        self._started = time.monotonic()
+        self._cpu_started = time.thread_time()
+        _current_job.control = self
+
+    def deactivate(self):
+        _current_job.control = None
+
+    def check(self, step: Optional[str] = None):
+        if step is not None:
+            self.step = step
+        if cancel_requested(self.job_id):
+            raise JobStopped("cancelled", self.step, "Задача отменена пользователем")
+        if self.time_limit and time.monotonic() - self._started > self.time_limit:
+            raise JobStopped("timed_out", self.step, f"Превышен лимит времени выполнения ({self.time_limit:g} с)")
+        if self.cpu_time_limit and time.thread_time() - self._cpu_started > self.cpu_time_limit:
+            raise JobStopped("timed_out", self.step,
+                             f"Превышен лимит процессорного времени ({self.cpu_time_limit:g} с)")
+
+def check_job(step: Optional[str] = None):
+    """
+    Проверяет отмену и лимиты задачи текущего потока (вне задачи ничего не делает).
+
+    Args:
+        step: Название выполняемого шага для статуса остановленной задачи
+    """
+    control = getattr(_current_job, "control", None)
+    if control is not None:
+        control.check(step)
@@ -0,0 +1,212 @@
+import math
+from typing import Dict, Any, List, Optional
+
+# Байт на значение в памяти: числа и даты - 8, строки - указатель и объект str
+NUMERIC_BYTES = 8
+STRING_BYTES = 65
+# Время разбора одной ячейки CSV и записи одной ячейки результата (CSV и хранилище столбцов), секунды
+LOAD_SECONDS_PER_CELL = 1.5e-7
+SAVE_SECONDS_PER_CELL = 4e-7
+# Ячеек в одной части текста при записи CSV (как в pandas.DataFrame.to_csv) и байт на ячейку текста
+SAVE_CHUNK_CELLS = 100000
+TEXT_BYTES = 30
+# Время обработки одной ячейки затронутых столбцов по методам, секунды
+METHOD_SECONDS_PER_CELL = {
+    "missing_values": 1e-8,
+    "outliers": 3e-8,
+    "standardization": 2e-8,
+    "categorical_encoding": 6e-8,
+    "pca": 8e-8,
+    "lagging": 1e-8,
+    "rolling_statistics": 4e-8,
+    "rolling_features": 4e-8,
+    "date_components": 3e-7,
+    "inverse_scaling": 2e-8
+}
+DEFAULT_SECONDS_PER_CELL = 5e-8
+# Границы поправочного коэффициента за одно измерение и вес нового измерения
+MIN_RATIO, MAX_RATIO = 0.2, 5.0
+LEARNING_RATE = 0.3
+# Нижняя граница поправки памяти, чтобы недооценка не приводила к перегрузке
+MIN_MEMORY_FACTOR = 0.5
+
+def _column_bytes(column: Dict[str, Any]) -> float:
+    if "bytes" in column:
+        return column["bytes"]
+    return NUMERIC_BYTES if column.get("type") == "numeric" else STRING_BYTES
+
+def _new_columns(count: int, value_bytes: float = NUMERIC_BYTES) -> List[Dict[str, Any]]:
+    return [{"type": "numeric", "bytes": value_bytes} for _ in range(count)]
+
+def _step_effect(method_id: str, parameters: Dict[str, Any], columns: Dict[str, Dict[str, Any]],
+                 rows: int) -> Dict[str, Any]:
+    """
+    Оценивает для шага прирост постоянной памяти, временную память и количество обработанных ячеек.
+
+    Список столбцов columns изменяется: добавляются новые и удаляются замененные столбцы.
+    """
+    numeric = [name for name, column in columns.items() if column.get("type") == "numeric"]
+    selected = [name for name in (parameters.get("columns") or []) if name in columns]
+    frame_bytes = rows * sum(_column_bytes(column) for column in columns.values())
+    added_columns: List[Dict[str, Any]] = []
+    removed: List[str] = []
+    temporary = 0
+
+    if method_id == "missing_values":
+        targets = selected or list(columns)
+        temporary = frame_bytes if parameters.get("strategy") == "drop_rows" else \
+            rows * sum(_column_bytes(columns[name]) for name in targets)
+    elif method_id in ("outliers", "standardization", "inverse_scaling"):
+        targets = selected or numeric
+        temporary = rows * len(targets) * NUMERIC_BYTES * 3
+        if method_id == "outliers" and parameters.get("mode", "sequential") != "clip":
+            temporary += frame_bytes
+    elif method_id == "categorical_encoding":
+        targets = selected or [name for name in columns if name not in numeric]
+        strategy = parameters.get("strategy", "onehot")
+        sparse = parameters.get("output", "dense") == "sparse"
+        removed = targets if strategy != "label" else []
+        for name in targets:
+            if strategy == "onehot":
+                categories = columns[name].get("unique_count") or 1
+                if parameters.get("max_categories"):
+                    categories = min(categories, int(parameters["max_categories"]) + 1)
+                width = categories
+            else:
+                width = int(parameters.get("n_features") or 32) if strategy == "hashing" else 1
+            # Индикаторы занимают байт на ячейку, в разреженном виде - индекс и значение на строку
+            value_bytes = NUMERIC_BYTES if strategy == "label" else 5 / width if sparse else 1
+            added_columns += _new_columns(width, value_bytes)
+            if strategy == "onehot" and not sparse:
+                # Плотные индикаторы логические и не попадают в числовые столбцы следующих шагов
+                for column in added_columns[-width:]:
+                    column["type"] = "boolean"
+        temporary = rows * len(targets) * NUMERIC_BYTES * 2
+    elif method_id == "pca":
+        targets = selected or numeric
+        components = int(parameters.get("n_components") or 2)
+        if parameters.get("variance_threshold"):
+            components = len(targets)
+        removed = targets
+        added_columns = _new_columns(min(components, len(targets)))
+        temporary = rows * len(targets) * NUMERIC_BYTES * 3
+    elif method_id == "lagging":
+        sources = 1 + len(parameters.get("exog_columns") or [])
+        targets = [parameters.get("target_column")] * sources
+        count = sources * len(parameters.get("lag_periods") or [1, 2, 3])
+        added_columns = _new_columns(count)
+    elif method_id == "rolling_statistics":
+        targets = [parameters.get("target_column")]
+        statistics = parameters.get("statistics") or ["mean", "std"]
+        added_columns = _new_columns(len(statistics))
+        temporary = rows * NUMERIC_BYTES * 2
+    elif method_id == "rolling_features":
+        targets = selected or numeric
+        statistics = len(parameters.get("statistics") or ["mean", "std"])
+        variants = parameters.get("variants") or ["rolling"]
+        per_column = statistics * (
+            ("rolling" in variants) * len(parameters.get("windows") or [7, 30]) +
+            ("expanding" in variants) + ("ewm" in variants) * len(parameters.get("ewm_spans") or [])
+        )
+        added_columns = _new_columns(len(targets) * per_column)
+        temporary = rows * NUMERIC_BYTES * 2
+    elif method_id == "date_components":
+        targets = selected
+        components = len(parameters.get("components") or ["year", "month", "quarter", "day_of_week"])
+        added_columns = _new_columns(len(targets) * components)
+        temporary = rows * len(targets) * NUMERIC_BYTES
+    else:
+        targets = selected or list(columns)
+
+    removed_bytes = rows * sum(_column_bytes(columns.pop(name)) for name in removed if name in columns)
+    for column in added_columns:
+        # Имена новых столбцов не важны для оценки, нужны только уникальные ключи
+        columns[f"{method_id}#{len(columns)}"] = column
+
+    new_bytes = rows * sum(_column_bytes(column) for column in added_columns)
+    temporary += new_bytes
+    cells = rows * (len(targets) + len(added_columns))
+    return {"added": new_bytes - removed_bytes, "temporary": temporary, "cells": cells}
+
+def estimate_job(dataset_metadata: Dict[str, Any], config: Dict[str, Any],
+                 model: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Оценивает пиковую память и время выполнения задачи предобработки.
+
+    Оценка строится по метаданным набора данных (строки, типы столбцов и количество
+    уникальных значений) и шагам конфигурации: учитываются загрузка набора, копия
+    для обработки, столбцы, добавленные предыдущими шагами, и временные массивы
+    текущего шага. Поправочные коэффициенты model обучаются на выполненных задачах.
+
+    Args:
+        dataset_metadata: Метаданные набора данных (результат analyze_dataset)
+        config: Конфигурация предобработки
+        model: Поправочные коэффициенты memory_factor и runtime_factor
+
+    Returns:
+        Dict[str, Any]: peak_bytes, runtime_seconds, объем набора и базовые (без поправок)
+        оценки работы после загрузки
+    """
+    model = model or {}
+    rows = int(dataset_metadata.get("row_count") or 0)
+    columns = {column["name"]: dict(column) for column in dataset_metadata.get("columns", [])}
+    dataset_bytes = rows * sum(_column_bytes(column) for column in columns.values())
+
+    # Загруженный набор и его копия, которую изменяют шаги
+    persistent = 2 * dataset_bytes
+    peak = persistent
+    load_seconds = rows * len(columns) * LOAD_SECONDS_PER_CELL
+    runtime = 0.0
+    for method in config.get("methods", []):
+        method_id = method["method_id"]
+        effect = _step_effect(method_id, method.get("parameters") or {}, columns, rows)
+        peak = max(peak, persistent + effect["temporary"])
+        persistent += effect["added"]
+        runtime += effect["cells"] * METHOD_SECONDS_PER_CELL.get(method_id, DEFAULT_SECONDS_PER_CELL)
+
+    # Сохранение: текст одной части CSV и плотная копия столбца для хранилища столбцов
+    peak = max(peak, persistent + SAVE_CHUNK_CELLS * TEXT_BYTES + rows * NUMERIC_BYTES)
+    runtime += rows * len(columns) * SAVE_SECONDS_PER_CELL
+
+    # Поправки относятся к работе после загрузки: набор может оказаться в кэше
+    working = peak - dataset_bytes
+    memory_factor = max(model.get("memory_factor", 1.0), MIN_MEMORY_FACTOR)
+    runtime_factor = model.get("runtime_factor", 1.0)
+    return {
+        "peak_bytes": int(dataset_bytes + working * memory_factor),
+        "runtime_seconds": round(load_seconds + runtime * runtime_factor, 3),
+        "dataset_bytes": int(dataset_bytes),
+        "base_working_bytes": int(working),
+        "base_processing_seconds": round(runtime, 3),
+        "rows": rows,
+        "output_columns": len(columns)
+    }
+
+def update_model(model: Dict[str, Any], estimate: Dict[str, Any], working_bytes: Optional[int],
+                 processing_seconds: float) -> Dict[str, Any]:
+    """
+    Уточняет поправочные коэффициенты по измерениям выполненной задачи.
+
+    Args:
+        model: Текущие коэффициенты
+        estimate: Оценка задачи (estimate_job)
+        working_bytes: Пиковый прирост памяти после загрузки набора (None, если не измерен)
+        processing_seconds: Время выполнения после загрузки набора
+
+    Коэффициенты сглаживаются экспоненциально в логарифмической шкале, отношение
+    измерения к базовой оценке ограничивается диапазоном [MIN_RATIO, MAX_RATIO].
+    """
+    def blend(current: float, measured: float, base: float) -> float:
+        if base <= 0 or measured <= 0:
+            return current
+        ratio = min(max(measured / base, MIN_RATIO), MAX_RATIO)
+        return math.exp((1 - LEARNING_RATE) * math.log(current) + LEARNING_RATE * math.log(ratio))
+
+    updated = dict(model)
+    if working_bytes is not None:
+        updated["memory_factor"] = round(blend(model.get("memory_factor", 1.0), working_bytes,
+                                               estimate["base_working_bytes"]), 4)
+    updated["runtime_factor"] = round(blend(model.get("runtime_factor", 1.0), processing_seconds,
+                                            estimate["base_processing_seconds"]), 4)
+    updated["samples"] = model.get("samples", 0) + 1
+    return updated
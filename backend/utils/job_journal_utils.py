@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+import pandas as pd
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.settings import (
+    JOB_JOURNAL_DIR, JOB_HEARTBEAT_INTERVAL, JOB_HEARTBEAT_TIMEOUT, JOB_MAX_ATTEMPTS, JOB_RETENTION_HOURS
+)
+from utils.json_utils import convert_numpy_types
+from utils.journal_index_utils import set_active, ensure_active_index, active_keys, prune_finished
+from utils.process_utils import current_process, process_alive
+
+# Состояния задачи: в работе (queued, running) и завершенные
+ACTIVE_STATES = ("queued", "running")
+FINAL_STATES = ("completed", "failed", "cancelled", "timed_out")
+
+# Задачи текущего процесса, для которых обновляется отметка активности
+_owned_jobs: set = set()
+_owned_lock = threading.Lock()
+_heartbeat_stop = threading.Event()
+_heartbeat_thread: Optional[threading.Thread] = None
+
+def _record_path(job_id: str) -> Path:
+    return JOB_JOURNAL_DIR / f"{job_id}.json"
+
+def get_checkpoint_path(job_id: str) -> Path:
+    return JOB_JOURNAL_DIR / f"{job_id}_checkpoint.pkl"
+
+@contextmanager
+def _locked_journal():
+    """
+    Межпроцессная блокировка изменений журнала (обновление записей и захват прерванных задач).
+    """
+    JOB_JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(JOB_JOURNAL_DIR / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            ensure_active_index(JOB_JOURNAL_DIR, lambda record: record.get("state") in ACTIVE_STATES)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _write_record(record: Dict[str, Any]):
+    # Активная задача попадает в индекс до записи, завершенная удаляется из него после
+    active = record["state"] in ACTIVE_STATES
+    if active:
+        set_active(JOB_JOURNAL_DIR, record["job_id"], True)
+    path = _record_path(record["job_id"])
+    temp_path = path.with_suffix(f".tmp-{os.getpid()}")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(convert_numpy_types(record), f)
+    os.replace(temp_path, path)
+    if not active:
+        set_active(JOB_JOURNAL_DIR, record["job_id"], False)
+
+def load_job_record(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает запись задачи из журнала (None, если задачи нет в журнале).
+    """
+    try:
+        with open(_record_path(job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def create_job_record(job_id: str, config: Dict[str, Any], estimate: Dict[str, Any],
+                      profile: bool = False, budget_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Добавляет в журнал новую задачу в состоянии queued, принадлежащую текущему процессу.
+
+    budget_bytes - бюджет памяти, с которым задача принята в очередь.
+    """
+    now = time.time()
+    record = {
+        "job_id": job_id,
+        "dataset_id": config["dataset_id"],
+        "config": config,
+        "estimate": estimate,
+        "budget_bytes": budget_bytes,
+        "profile": profile,
+        "state": "queued",
+        "attempts": 1,
+        "owner": current_process(),
+        "created_at": now,
+        "updated_at": now,
+        "heartbeat_at": now,
+        "current_step": None,
+        "completed_steps": 0,
+        "checkpoint_step": None
+    }
+    with _locked_journal():
+        _write_record(record)
+    _own(job_id)
+    return record
+
+def update_job_record(job_id: str, **fields) -> Optional[Dict[str, Any]]:
+    """
+    Обновляет поля записи задачи; при переходе в завершенное состояние удаляет контрольную точку.
+    """
+    with _locked_journal():
+        record = load_job_record(job_id)
+        if record is None:
+            return None
+        record.update(fields)
+        record["updated_at"] = record["heartbeat_at"] = time.time()
+        _write_record(record)
+    if record["state"] in FINAL_STATES:
+        _disown(job_id)
+        get_checkpoint_path(job_id).unlink(missing_ok=True)
+    return record
+
+def save_checkpoint(job_id: str, step_index: int, df: pd.DataFrame, fitted_params: Dict[str, Any]) -> bool:
+    """
+    Сохраняет данные и подобранные параметры после выполненного шага.
+
+    Контрольная точка записывается атомарно, заменяет предыдущую и хранит номер
+    своего шага: запись в журнале может отстать от файла при падении между ними.
+    """
+    path = get_checkpoint_path(job_id)
+    temp_path = path.with_suffix(f".tmp-{os.getpid()}")
+    try:
+        pd.to_pickle((step_index, df, fitted_params), temp_path)
+        os.replace(temp_path, path)
+    except Exception as e:
+        temp_path.unlink(missing_ok=True)
+        logging.warning(f"Контрольная точка задачи {job_id} не сохранена: {str(e)}")
+        return False
+    return True
+
+def load_checkpoint(job_id: str) -> Optional[Tuple[int, pd.DataFrame, Dict[str, Any]]]:
+    """
+    Возвращает номер последнего сохраненного шага, данные после него и подобранные параметры.
+    """
+    path = get_checkpoint_path(job_id)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logging.warning(f"Контрольная точка задачи {job_id} не прочитана: {str(e)}")
+        return None
+
+def _interrupted(record: Dict[str, Any], now: float) -> bool:
+    """
+    Задача прервана, если процесс-владелец завершился или давно не обновлял отметку активности.
+    """
+    owner = record.get("owner")
+    if not owner:
+        # Задача возвращена в журнал без владельца (release_job)
+        return True
+    if not process_alive(owner.get("pid", 0), owner.get("pid_start")):
+        return True
+    return now - record.get("heartbeat_at", 0) > JOB_HEARTBEAT_TIMEOUT
+
+def claim_interrupted_jobs() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Передает текущему процессу прерванные задачи (после перезапуска или падения воркера).
+
+    Returns:
+        Tuple[List, List]: Задачи для возобновления и задачи, исчерпавшие попытки
+        (они переводятся в состояние failed)
+    """
+    if not JOB_JOURNAL_DIR.exists():
+        return [], []
+    resumed, exhausted = [], []
+    now = time.time()
+    with _locked_journal():
+        # Перебираются только задачи из индекса активных
+        for job_id in active_keys(JOB_JOURNAL_DIR):
+            record = load_job_record(job_id)
+            if record is None or record.get("state") not in ACTIVE_STATES:
+                set_active(JOB_JOURNAL_DIR, job_id, False)
+                continue
+            if not _interrupted(record, now):
+                continue
+            record["updated_at"] = record["heartbeat_at"] = now
+            if record["attempts"] >= JOB_MAX_ATTEMPTS:
+                record["state"] = "failed"
+                record["message"] = f"Задача прервана и не завершена за {record['attempts']} попыток"
+                exhausted.append(record)
+            else:
+                record.update(state="queued", attempts=record["attempts"] + 1, owner=current_process())
+                resumed.append(record)
+            _write_record(record)
+    for record in exhausted:
+        get_checkpoint_path(record["job_id"]).unlink(missing_ok=True)
+    for record in resumed:
+        _own(record["job_id"])
+    return resumed, exhausted
+
+def release_job(job_id: str, **fields) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает захваченную задачу в журнал без владельца: ее снова захватит следующий
+    поиск прерванных задач, а не начатая попытка не учитывается.
+    """
+    with _locked_journal():
+        record = load_job_record(job_id)
+        if record is None or record["state"] not in ACTIVE_STATES:
+            return record
+        record.update(fields, owner=None, attempts=max(record["attempts"] - 1, 1))
+        record["updated_at"] = time.time()
+        _write_record(record)
+    _disown(job_id)
+    return record
+
+def prune_job_records() -> int:
+    """
+    Удаляет записи задач, завершенных раньше JOB_RETENTION_HOURS часов назад.
+
+    Returns:
+        int: Количество удаленных записей
+    """
+    if not JOB_JOURNAL_DIR.exists():
+        return 0
+    removed = prune_finished(JOB_JOURNAL_DIR, JOB_RETENTION_HOURS)
+    for job_id in removed:
+        # Контрольная точка могла остаться после падения между записью состояния и ее удалением
+        get_checkpoint_path(job_id).unlink(missing_ok=True)
+    return len(removed)
+
+def _own(job_id: str):
+    with _owned_lock:
+        _owned_jobs.add(job_id)
+
+def _disown(job_id: str):
+    with _owned_lock:
+        _owned_jobs.discard(job_id)
+
+def _heartbeat_loop():
+    while not _heartbeat_stop.wait(JOB_HEARTBEAT_INTERVAL):
+        with _owned_lock:
+            job_ids = list(_owned_jobs)
+        if not job_ids:
+            continue
+        try:
+            with _locked_journal():
+                for job_id in job_ids:
+                    record = load_job_record(job_id)
+                    if record is not None and record["state"] in ACTIVE_STATES:
+                        record["heartbeat_at"] = time.time()
+                        _write_record(record)
+        except OSError as e:
+            logging.warning(f"Не удалось обновить отметки активности задач: {str(e)}")
+
+def start_heartbeat():
+    """
+    Запускает фоновое обновление отметок активности задач процесса.
+    """
+    global _heartbeat_thread
+    if _heartbeat_thread is not None:
+        return
+    _heartbeat_stop.clear()
+    _heartbeat_thread = threading.Thread(target=_heartbeat_loop, daemon=True)
+    _heartbeat_thread.start()
+
+def stop_heartbeat():
+    global _heartbeat_thread
+    if _heartbeat_thread is None:
+        return
+    _heartbeat_stop.set()
+    _heartbeat_thread.join()
+    _heartbeat_thread = None
@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import fcntl
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from config.settings import (
+    JOB_MEMORY_BUDGET, JOB_MEMORY_FRACTION, JOB_QUEUE_LIMIT, JOB_QUEUE_TIMEOUT, SCHEDULER_DIR
+)
+from utils.cgroup_utils import memory_limit_bytes
+from utils.job_estimator_utils import update_model
+from utils.job_control_utils import JobStopped, cancel_requested, clear_cancel
+from utils.process_utils import current_process, process_alive
+
+# Интервал проверки очереди ожидающей задачей (секунды)
+POLL_INTERVAL = 0.25
+# Бюджет по умолчанию, если лимит памяти определить не удалось
+FALLBACK_BUDGET = 4 * 2 ** 30
+
+STATE_FILE = "state.json"
+
+def memory_budget() -> int:
+    """
+    Возвращает бюджет памяти для одновременно выполняемых задач пода (байты).
+    """
+    if JOB_MEMORY_BUDGET > 0:
+        return JOB_MEMORY_BUDGET
+    limit = memory_limit_bytes()
+    return int(limit * JOB_MEMORY_FRACTION) if limit else FALLBACK_BUDGET
+
+def format_bytes(value: float) -> str:
+    """
+    Форматирует объем памяти для сообщений пользователю.
+    """
+    for unit in ("Б", "КБ", "МБ"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} ГБ"
+
+@contextmanager
+def _locked_state():
+    """
+    Межпроцессная блокировка состояния очереди; изменения записываются атомарно.
+
+    Состояние: jobs - задачи в очереди и в работе всех воркеров, model - поправки оценки.
+    """
+    SCHEDULER_DIR.mkdir(parents=True, exist_ok=True)
+    state_path = SCHEDULER_DIR / STATE_FILE
+    with open(SCHEDULER_DIR / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            state.setdefault("jobs", {})
+            state.setdefault("model", {})
+            # Задачи завершившихся (в том числе упавших) воркеров освобождают бюджет
+            state["jobs"] = {job_id: job for job_id, job in state["jobs"].items()
+                             if process_alive(job["pid"], job.get("pid_start"))}
+            before = json.dumps(state, sort_keys=True)
+            yield state
+            if json.dumps(state, sort_keys=True) != before:
+                temp_path = state_path.with_suffix(f".tmp-{os.getpid()}")
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(temp_path, state_path)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _queued(jobs: Dict[str, Dict[str, Any]]) -> List[str]:
+    return sorted((job_id for job_id, job in jobs.items() if job["state"] == "queued"),
+                  key=lambda job_id: jobs[job_id]["enqueued_at"])
+
+def _reserved(jobs: Dict[str, Dict[str, Any]]) -> int:
+    return sum(job["peak_bytes"] for job in jobs.values() if job["state"] == "running")
+
+def load_model() -> Dict[str, Any]:
+    """
+    Возвращает обученные поправки оценки ресурсов.
+    """
+    with _locked_state() as state:
+        return dict(state["model"])
+
+def submit_job(job_id: str, estimate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ставит задачу в очередь или отклоняет ее.
+
+    Raises:
+        HTTPException: 413, если оценка памяти превышает весь бюджет; 503, если очередь заполнена
+    """
+    budget = memory_budget()
+    if estimate["peak_bytes"] > budget:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Задача не может быть выполнена: оценка пиковой памяти {format_bytes(estimate['peak_bytes'])} "
+                   f"превышает бюджет {format_bytes(budget)}. Уменьшите набор данных или число создаваемых столбцов "
+                   f"(например, max_categories или разреженный формат для кодирования)"
+        )
+
+    with _locked_state() as state:
+        queued = _queued(state["jobs"])
+        if len(queued) >= JOB_QUEUE_LIMIT:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Очередь задач заполнена ({len(queued)} из {JOB_QUEUE_LIMIT}), повторите попытку позже"
+            )
+        state["jobs"][job_id] = {
+            **current_process(),
+            "state": "queued",
+            "peak_bytes": estimate["peak_bytes"],
+            "runtime_seconds": estimate["runtime_seconds"],
+            "enqueued_at": time.time()
+        }
+        return {"position": len(queued) + 1, "budget_bytes": budget}
+
+def _try_admit(job_id: str) -> bool:
+    """
+    Допускает задачу, если она первая в очереди и помещается в свободный бюджет.
+    """
+    budget = memory_budget()
+    with _locked_state() as state:
+        jobs = state["jobs"]
+        job = jobs.get(job_id)
+        if job is None:
+            raise RuntimeError(f"Задача {job_id} отсутствует в очереди")
+        queued = _queued(jobs)
+        if queued[0] != job_id or _reserved(jobs) + job["peak_bytes"] > budget:
+            return False
+        job["state"] = "running"
+        job["started_at"] = time.time()
+        return True
+
+async def wait_for_admission(job_id: str, timeout: float = JOB_QUEUE_TIMEOUT) -> float:
+    """
+    Ожидает допуска задачи к выполнению (порядок очереди сохраняется).
+
+    Returns:
+        float: Время ожидания в очереди (секунды)
+
+    Raises:
+        TimeoutError: Если задача не была допущена за timeout секунд
+        JobStopped: Если задача отменена в очереди
+    """
+    start = time.time()
+    # Блокировка очереди и файловые операции выполняются в пуле потоков, а не в цикле событий
+    while not await run_in_threadpool(_try_admit, job_id):
+        if cancel_requested(job_id):
+            await run_in_threadpool(finish_job, job_id)
+            raise JobStopped("cancelled", "queued", "Задача отменена в очереди")
+        if time.time() - start > timeout:
+            await run_in_threadpool(finish_job, job_id)
+            raise TimeoutError(f"Задача не дождалась освобождения памяти за {timeout:.0f} с")
+        await asyncio.sleep(POLL_INTERVAL)
+    return time.time() - start
+
+def finish_job(job_id: str):
+    """
+    Удаляет задачу из очереди и освобождает ее часть бюджета.
+    """
+    with _locked_state() as state:
+        state["jobs"].pop(job_id, None)
+    clear_cancel(job_id)
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает задачу из очереди (в ожидании или в работе) или None, если ее там нет.
+    """
+    with _locked_state() as state:
+        job = state["jobs"].get(job_id)
+        return dict(job) if job else None
+
+def running_jobs() -> int:
+    """
+    Возвращает количество выполняемых задач всех воркеров пода.
+    """
+    with _locked_state() as state:
+        return sum(1 for job in state["jobs"].values() if job["state"] == "running")
+
+def local_running_jobs() -> int:
+    """
+    Возвращает количество выполняемых задач текущего процесса.
+    """
+    pid = os.getpid()
+    with _locked_state() as state:
+        return sum(1 for job in state["jobs"].values() if job["pid"] == pid and job["state"] == "running")
+
+def local_jobs() -> int:
+    """
+    Возвращает количество задач текущего процесса в очереди и в работе.
+    """
+    pid = os.getpid()
+    with _locked_state() as state:
+        return sum(1 for job in state["jobs"].values() if job["pid"] == pid)
+
+def job_queue_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает состояние ожидающей задачи с сообщением для пользователя (None, если задача не в очереди).
+    """
+    budget = memory_budget()
+    with _locked_state() as state:
+        jobs = state["jobs"]
+        job = jobs.get(job_id)
+        if job is None or job["state"] != "queued":
+            return None
+        queued = _queued(jobs)
+        position = queued.index(job_id) + 1
+        reserved = _reserved(jobs)
+    if position > 1:
+        reason = f"перед ней в очереди задач: {position - 1}"
+    elif reserved + job["peak_bytes"] > budget:
+        reason = f"ожидает освобождения памяти: требуется около {format_bytes(job['peak_bytes'])}, " \
+                 f"занято {format_bytes(reserved)} из {format_bytes(budget)}"
+    else:
+        # Память свободна: задача будет допущена при ближайшей проверке очереди
+        reason = "ожидает запуска"
+    return {
+        "stage": "queued",
+        "position": position,
+        "message": f"Задача в очереди (позиция {position}), {reason}",
+        "estimated_peak_bytes": job["peak_bytes"],
+        "estimated_runtime_seconds": job["runtime_seconds"]
+    }
+
+def record_job_usage(estimate: Dict[str, Any], working_bytes: Optional[int], processing_seconds: float):
+    """
+    Уточняет поправки оценки по измерениям выполненной задачи (после загрузки набора).
+    """
+    try:
+        with _locked_state() as state:
+            state["model"] = update_model(state["model"], estimate, working_bytes, processing_seconds)
+    except OSError as e:
+        logging.warning(f"Не удалось сохранить измерения задачи: {str(e)}")
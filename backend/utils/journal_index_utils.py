@@ -0,0 +1,79 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+
+# Индекс активных записей: пустой файл с идентификатором записи в поддиректории журнала
+ACTIVE_INDEX = "active"
+
+def set_active(directory: Path, key: str, active: bool):
+    """
+    Добавляет запись в индекс активных или удаляет ее оттуда (вызывается под блокировкой журнала).
+    """
+    marker = directory / ACTIVE_INDEX / key
+    if active:
+        marker.touch()
+    else:
+        marker.unlink(missing_ok=True)
+
+def ensure_active_index(directory: Path, is_active: Callable[[Dict[str, Any]], bool]):
+    """
+    Создает индекс активных записей, если его нет (журнал, записанный до появления индекса).
+
+    Вызывается под блокировкой журнала; записи перебираются только при создании индекса.
+    """
+    index_dir = directory / ACTIVE_INDEX
+    if index_dir.exists():
+        return
+    temp_dir = directory / f"{ACTIVE_INDEX}.tmp-{os.getpid()}"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.json"):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if is_active(record):
+            (temp_dir / path.stem).touch()
+    os.replace(temp_dir, index_dir)
+
+def active_keys(directory: Path) -> List[str]:
+    """
+    Возвращает идентификаторы записей из индекса активных.
+    """
+    try:
+        return os.listdir(directory / ACTIVE_INDEX)
+    except FileNotFoundError:
+        return []
+
+def prune_finished(directory: Path, max_age_hours: float) -> List[str]:
+    """
+    Удаляет записи не из индекса активных, которые не изменялись дольше max_age_hours.
+
+    Returns:
+        List[str]: Идентификаторы удаленных записей
+    """
+    index_dir = directory / ACTIVE_INDEX
+    if not index_dir.exists():
+        return []
+    oldest_allowed = time.time() - max_age_hours * 3600
+    removed = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            key = entry.name[:-len(".json")]
+            try:
+                if entry.stat().st_mtime >= oldest_allowed or (index_dir / key).exists():
+                    continue
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                # Запись уже удалена другим воркером
+                continue
+            except OSError as e:
+                logging.warning(f"Не удалось удалить запись журнала {entry.path}: {str(e)}")
+                continue
+            removed.append(key)
+    return removed
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Optional
+
+def _lag_windows(values: np.ndarray, lags: np.ndarray, fill_value) -> np.ndarray:
+    """
+    Строит блок лагов за одно выделение памяти через скользящее представление массива.
+
+    Args:
+        values: Массив формы (строки, столбцы)
+        lags: Периоды лагирования (отрицательные значения дают опережения)
+        fill_value: Значение для позиций без данных
+
+    Returns:
+        np.ndarray: Массив формы (строки, столбцы, лаги)
+    """
+    n_rows = values.shape[0]
+    pad_before = max(int(lags.max()), 0)
+    pad_after = max(-int(lags.min()), 0)
+
+    padded = np.full((pad_before + n_rows + pad_after,) + values.shape[1:], fill_value, dtype=values.dtype)
+    padded[pad_before:pad_before + n_rows] = values
+
+    # Окно строки i начинается с позиции i в дополненном массиве, лаг k - это элемент pad_before - k
+    windows = sliding_window_view(padded, pad_before + pad_after + 1, axis=0)
+    return windows[..., pad_before - lags]
+
+def _lag_block_values(values: np.ndarray, lags: np.ndarray, codes: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Вычисляет лаги для массива значений с учетом групп (если указаны коды групп).
+
+    Returns:
+        np.ndarray: Массив формы (строки, столбцы * лаги)
+    """
+    n_rows = values.shape[0]
+
+    if codes is None:
+        return _lag_windows(values, lags, np.nan).reshape(n_rows, -1)
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+
+    block = _lag_windows(values[order], lags, np.nan)
+
+    # Лаг допустим, только если исходная строка принадлежит той же группе
+    source_codes = _lag_windows(sorted_codes, lags, -2)
+    valid = (source_codes == sorted_codes[:, None]) & (sorted_codes[:, None] >= 0)
+    block[~np.broadcast_to(valid[:, None, :], block.shape)] = np.nan
+
+    # Возвращаем строки в исходный порядок
+    unsorted = np.empty_like(block)
+    unsorted[order] = block
+    return unsorted.reshape(n_rows, -1)
+
+def build_lag_block(df: pd.DataFrame, columns: List[str], lag_periods: List[int],
+                    group_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Создает все лагированные столбцы для указанных переменных одним блоком.
+
+    Столбцы именуются {столбец}_lag_{период} в порядке: по столбцам, внутри - по периодам.
+    При указании group_column лаги считаются внутри каждой группы (панельные данные)
+    без цикла по группам: данные стабильно сортируются по ключу, а значения,
+    пришедшие из другой группы, заменяются пропусками.
+
+    Args:
+        df: Исходный DataFrame
+        columns: Столбцы для лагирования
+        lag_periods: Периоды лагирования
+        group_column: Столбец с идентификатором сущности (необязательно)
+
+    Returns:
+        pd.DataFrame: Блок лагированных столбцов с индексом исходного DataFrame
+    """
+    lags = np.array(list(dict.fromkeys(int(lag) for lag in lag_periods)), dtype=np.int64)
+    names = [f"{col}_lag_{lag}" for col in columns for lag in lags]
+
+    if len(df) == 0 or len(lags) == 0:
+        return pd.DataFrame(index=df.index, columns=names, dtype=np.float64)
+
+    codes = pd.factorize(df[group_column])[0] if group_column is not None else None
+
+    # Числовые столбцы лагируются в одном блоке float64, остальные - в блоке object
+    numeric_columns = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+    other_columns = [col for col in columns if col not in numeric_columns]
+
+    blocks = []
+    for subset, dtype in ((numeric_columns, np.float64), (other_columns, object)):
+        if not subset:
+            continue
+        values = df[subset].to_numpy(dtype=dtype, na_value=np.nan)
+        blocks.append(pd.DataFrame(
+            _lag_block_values(values, lags, codes),
+            index=df.index,
+            columns=[f"{col}_lag_{lag}" for col in subset for lag in lags]
+        ))
+
+    if len(blocks) == 1:
+        return blocks[0]
+    return pd.concat(blocks, axis=1)[names]
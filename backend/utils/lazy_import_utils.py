@@ -0,0 +1,68 @@
+import time
+import logging
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+# Тяжелые библиотеки, которые нужны только отдельным методам предобработки.
+# Они импортируются при первом использовании метода, а не при старте воркера.
+METHOD_DEPENDENCIES: Dict[str, List[str]] = {
+    "pca": ["sklearn.decomposition"],
+    "categorical_encoding": ["scipy.sparse"]
+}
+
+_loaded: Dict[str, float] = {}
+_loaded_lock = threading.Lock()
+
+def ensure_method_dependencies(method_id: str) -> Dict[str, float]:
+    """
+    Импортирует зависимости метода, если они еще не загружены.
+
+    Args:
+        method_id: Идентификатор метода предобработки
+
+    Returns:
+        Dict[str, float]: Время импорта (секунды) для модулей, загруженных этим вызовом
+    """
+    loaded = {}
+    for module_name in METHOD_DEPENDENCIES.get(method_id, []):
+        if module_name in _loaded:
+            continue
+        with _loaded_lock:
+            if module_name in _loaded:
+                continue
+            start = time.perf_counter()
+            importlib.import_module(module_name)
+            _loaded[module_name] = loaded[module_name] = time.perf_counter() - start
+        logging.info(f"Загружен модуль {module_name} для метода {method_id} за {loaded[module_name]:.3f} с")
+    return loaded
+
+def warm_up_methods(method_ids: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Заранее загружает зависимости методов (по умолчанию всех).
+
+    Returns:
+        Dict[str, float]: Время импорта загруженных модулей
+    """
+    loaded = {}
+    for method_id in method_ids or list(METHOD_DEPENDENCIES):
+        try:
+            loaded.update(ensure_method_dependencies(method_id))
+        except ImportError as e:
+            logging.warning(f"Не удалось загрузить зависимости метода {method_id}: {str(e)}")
+    return loaded
+
+def start_warm_up() -> threading.Thread:
+    """
+    Запускает загрузку зависимостей в фоновом потоке, чтобы не задерживать готовность воркера.
+    """
+    thread = threading.Thread(target=warm_up_methods, daemon=True, name="methods-warm-up")
+    thread.start()
+    return thread
+
+def loaded_modules() -> Dict[str, float]:
+    """
+    Возвращает загруженные модули и время их импорта.
+    """
+    with _loaded_lock:
+        return dict(_loaded)
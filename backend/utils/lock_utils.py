@@ -4,6 +4,11 @@ import time
 from typing import Dict, Set, Optional, Callable, Any
 import logging
 
+from utils.metrics_utils import observe
+
+# Максимальное время ожидания блокировки файла (секунды)
+LOCK_TIMEOUT = 30
+
 # Глобальный словарь для блокировок файлов
 file_locks: Dict[str, threading.Lock] = {}
 file_locks_lock = threading.Lock()
@@ -44,6 +49,7 @@ async def with_file_lock(file_id: str, func: Callable[..., Any], *args: Any, **k
     
     # Пытаемся получить блокировку с таймаутом
     acquired = False
+    wait_start = time.perf_counter()
     try:
         # Неблокирующая попытка получить блокировку
         acquired = lock.acquire(blocking=False)
@@ -51,10 +57,12 @@ async def with_file_lock(file_id: str, func: Callable[..., Any], *args: Any, **k
             # Если не удалось получить блокировку сразу, делаем блокирующий вызов
             # в другом потоке, чтобы не блокировать событийный цикл asyncio
             loop = asyncio.get_event_loop()
-            acquired = await loop.run_in_executor(None, lambda: lock.acquire(blocking=True, timeout=30))
+            acquired = await loop.run_in_executor(None, lambda: lock.acquire(blocking=True, timeout=LOCK_TIMEOUT))
         
+        observe("file_lock_wait_seconds", time.perf_counter() - wait_start,
+                outcome="acquired" if acquired else "timeout")
         if not acquired:
-            logging.warning(f"Не удалось получить блокировку для файла {file_id} в течение 30 секунд")
+            logging.warning(f"Не удалось получить блокировку для файла {file_id} в течение {LOCK_TIMEOUT} секунд")
             raise TimeoutError(f"Превышено время ожидания доступа к файлу {file_id}")
         
         # Помечаем файл как обрабатываемый
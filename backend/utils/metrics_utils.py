@@ -0,0 +1,285 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple, Optional, Union
+
+from config.settings import METRICS_DIR
+from utils.profiling_utils import current_rss
+from utils.process_utils import current_process, process_alive
+
+# Границы корзин гистограмм задержек (секунды)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Интервал записи снимка метрик процесса в файл (секунды)
+FLUSH_INTERVAL = 1.0
+# Снимок, не обновлявшийся дольше этого времени, не дает значений gauge (процесс завис или завершился)
+STALE_AFTER = 60.0
+# Файл со счетчиками и гистограммами завершившихся процессов
+ACCUMULATED_SNAPSHOT = "accumulated.json"
+# Ключ снимка с pid и временем запуска процесса-владельца
+PROCESS_KEY = "process"
+
+# Описание метрик: тип, описание, для гистограмм - корзины, для gauge - способ объединения
+# по процессам ("sum" - сумма, "pid" - отдельное значение для каждого процесса)
+METRICS: Dict[str, Dict[str, Any]] = {
+    "http_requests_total": {"type": "counter", "help": "Количество HTTP запросов"},
+    "http_request_duration_seconds": {"type": "histogram", "help": "Длительность HTTP запросов",
+                                      "buckets": LATENCY_BUCKETS},
+    "http_requests_in_progress": {"type": "gauge", "help": "Выполняющиеся HTTP запросы", "aggregate": "sum"},
+    "preprocessing_jobs": {"type": "gauge", "help": "Задачи предобработки в очереди и в работе",
+                           "aggregate": "sum"},
+    "preprocessing_jobs_total": {"type": "counter", "help": "Завершенные задачи предобработки"},
+    "preprocessing_step_duration_seconds": {"type": "histogram", "help": "Длительность шагов предобработки",
+                                            "buckets": LATENCY_BUCKETS},
+    "file_lock_wait_seconds": {"type": "histogram", "help": "Время ожидания блокировки файла",
+                               "buckets": LATENCY_BUCKETS},
+    "io_bytes_total": {"type": "counter", "help": "Прочитанные и записанные байты по форматам"},
+    "process_resident_memory_bytes": {"type": "gauge", "help": "Резидентная память процесса",
+                                      "aggregate": "pid"},
+    "dataframe_cache_requests_total": {"type": "counter", "help": "Обращения к кэшу DataFrame (hit, miss)"},
+    "dataframe_cache_evictions_total": {"type": "counter", "help": "Вытеснения и инвалидации записей кэша DataFrame"},
+    "dataframe_cache_bytes": {"type": "gauge", "help": "Объем данных в кэше DataFrame", "aggregate": "pid"}
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_values: Dict[str, Dict[LabelKey, Union[float, List[float]]]] = {name: {} for name in METRICS}
+_values_lock = threading.Lock()
+_writer: Optional[threading.Thread] = None
+_writer_stopped = threading.Event()
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def inc_counter(name: str, value: float = 1, **labels: Any):
+    """
+    Увеличивает счетчик (или изменяет gauge на value).
+    """
+    key = _label_key(labels)
+    with _values_lock:
+        _values[name][key] = _values[name].get(key, 0) + value
+
+def set_gauge(name: str, value: float, **labels: Any):
+    """
+    Устанавливает значение gauge.
+    """
+    with _values_lock:
+        _values[name][_label_key(labels)] = value
+
+def observe(name: str, value: float, **labels: Any):
+    """
+    Добавляет наблюдение в гистограмму.
+
+    Значение хранится как накопленные счетчики корзин, сумма и количество.
+    """
+    buckets = METRICS[name]["buckets"]
+    key = _label_key(labels)
+    with _values_lock:
+        state = _values[name].get(key)
+        if state is None:
+            state = _values[name][key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+
+def observe_io(direction: str, file_format: str, path: Path):
+    """
+    Учитывает размер прочитанного или записанного файла.
+
+    Args:
+        direction: read или write
+        file_format: Формат файла (csv, xlsx, xls)
+        path: Путь к файлу
+    """
+    try:
+        inc_counter("io_bytes_total", path.stat().st_size, direction=direction, format=file_format.lower())
+    except OSError:
+        pass
+
+def _snapshot_path(pid: int) -> Path:
+    return METRICS_DIR / f"{pid}.json"
+
+def _read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_snapshot(path: Path, snapshot: Dict[str, Any]):
+    temp_path = path.with_suffix(f".tmp-{os.getpid()}")
+    with open(temp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(temp_path, path)
+
+def _merge_snapshot(merged: Dict[str, Dict[LabelKey, Union[float, List[float]]]], snapshot: Dict[str, Any],
+                    pid: Optional[int] = None, gauges: bool = True):
+    """
+    Добавляет значения снимка: счетчики и гистограммы суммируются, gauge суммируются
+    или получают метку pid (gauges=False - gauge пропускаются).
+    """
+    for name, samples in snapshot.items():
+        if name not in METRICS:
+            continue
+        spec = METRICS[name]
+        if spec["type"] == "gauge" and not gauges:
+            continue
+        for labels, value in samples:
+            if spec.get("aggregate") == "pid":
+                labels = {**labels, "pid": pid}
+            key = _label_key(labels)
+            if spec["type"] == "histogram":
+                current = merged[name].get(key)
+                merged[name][key] = value if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                merged[name][key] = merged[name].get(key, 0) + value
+
+@contextmanager
+def _locked_snapshots():
+    """
+    Межпроцессная блокировка сбора снимков и переноса их в накопленный снимок.
+    """
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(METRICS_DIR / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _fold_snapshot(path: Path):
+    """
+    Переносит счетчики и гистограммы снимка завершившегося процесса в накопленный
+    снимок и удаляет его (gauge процесса отбрасываются), как multiprocess-режим
+    prometheus_client: суммарные счетчики не уменьшаются после перезапуска воркера.
+
+    Вызывается под _locked_snapshots.
+    """
+    snapshot = _read_snapshot(path)
+    if snapshot is not None:
+        accumulated_path = METRICS_DIR / ACCUMULATED_SNAPSHOT
+        merged = {name: {} for name in METRICS}
+        _merge_snapshot(merged, _read_snapshot(accumulated_path) or {}, gauges=False)
+        _merge_snapshot(merged, snapshot, gauges=False)
+        _write_snapshot(accumulated_path, {name: [[dict(key), value] for key, value in values.items()]
+                                           for name, values in merged.items() if values})
+    path.unlink(missing_ok=True)
+
+def flush_metrics():
+    """
+    Записывает снимок метрик текущего процесса в общую директорию.
+    """
+    rss = current_rss()
+    if rss is not None:
+        set_gauge("process_resident_memory_bytes", rss)
+
+    with _values_lock:
+        snapshot = {name: [[dict(key), value] for key, value in values.items()]
+                    for name, values in _values.items()}
+    snapshot[PROCESS_KEY] = current_process()
+
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    _write_snapshot(_snapshot_path(os.getpid()), snapshot)
+
+def _writer_loop():
+    while not _writer_stopped.wait(FLUSH_INTERVAL):
+        try:
+            flush_metrics()
+        except Exception as e:
+            logging.warning(f"Не удалось записать метрики процесса: {str(e)}")
+
+def start_metrics_writer():
+    """
+    Запускает фоновую запись снимков метрик процесса (вызывается при старте воркера).
+    """
+    global _writer
+    if _writer is not None:
+        return
+    # Снимок с тем же pid остался от завершившегося процесса: его счетчики сохраняются
+    with _locked_snapshots():
+        if _snapshot_path(os.getpid()).exists():
+            _fold_snapshot(_snapshot_path(os.getpid()))
+    _writer_stopped.clear()
+    _writer = threading.Thread(target=_writer_loop, daemon=True)
+    _writer.start()
+
+def stop_metrics_writer():
+    """
+    Останавливает запись снимков; счетчики процесса переносятся в накопленный снимок.
+    """
+    global _writer
+    if _writer is None:
+        return
+    _writer_stopped.set()
+    _writer.join()
+    _writer = None
+    flush_metrics()
+    with _locked_snapshots():
+        _fold_snapshot(_snapshot_path(os.getpid()))
+
+def collect_metrics() -> Dict[str, Dict[LabelKey, Union[float, List[float]]]]:
+    """
+    Объединяет снимки процессов и накопленный снимок завершившихся процессов.
+
+    Счетчики и гистограммы суммируются, gauge суммируются или получают метку pid.
+    Снимки завершившихся процессов переносятся в накопленный снимок (см. _fold_snapshot),
+    давно не обновлявшиеся снимки живых процессов не дают значений gauge.
+    """
+    flush_metrics()
+    merged: Dict[str, Dict[LabelKey, Union[float, List[float]]]] = {name: {} for name in METRICS}
+
+    # Под блокировкой снимок процесса не может быть перенесен в накопленный между чтениями
+    with _locked_snapshots():
+        for path in METRICS_DIR.glob("*.json"):
+            try:
+                pid = int(path.stem)
+            except ValueError:
+                continue
+            snapshot = _read_snapshot(path)
+            # Снимок процесса, pid которого занял новый процесс, тоже переносится в накопленный
+            owner = (snapshot or {}).get(PROCESS_KEY) or {}
+            if not process_alive(pid, owner.get("pid_start")):
+                _fold_snapshot(path)
+                continue
+            try:
+                stale = time.time() - path.stat().st_mtime > STALE_AFTER
+            except OSError:
+                continue
+            if snapshot is not None:
+                _merge_snapshot(merged, snapshot, pid, gauges=not stale)
+        _merge_snapshot(merged, _read_snapshot(METRICS_DIR / ACCUMULATED_SNAPSHOT) or {}, gauges=False)
+    return merged
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = [(name, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+               for name, value in items]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+def render_metrics() -> str:
+    """
+    Возвращает метрики всех процессов в текстовом формате Prometheus.
+    """
+    lines = []
+    for name, values in collect_metrics().items():
+        spec = METRICS[name]
+        lines.append(f"# HELP {name} {spec['help']}")
+        lines.append(f"# TYPE {name} {spec['type']}")
+        for key, value in sorted(values.items()):
+            if spec["type"] == "histogram":
+                for bound, count in zip(spec["buckets"], value):
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', repr(float(bound))))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {value[-1]}")
+                lines.append(f"{name}_sum{_format_labels(key)} {value[-2]}")
+                lines.append(f"{name}_count{_format_labels(key)} {value[-1]}")
+            else:
+                lines.append(f"{name}{_format_labels(key)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.column_parallel_utils import map_blocks
+
+def compute_outlier_bounds(values: np.ndarray, strategy: str, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисляет границы выбросов сразу для всех столбцов двумерного массива.
+
+    Args:
+        values: Массив формы (строки, столбцы) с числовыми данными
+        strategy: Метод обнаружения выбросов (zscore или iqr)
+        threshold: Порог для определения выбросов
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Нижние и верхние границы для каждого столбца
+    """
+    if strategy not in ("zscore", "iqr"):
+        raise ValueError(f"Неизвестный метод обнаружения выбросов: {strategy}")
+
+    def block_bounds(start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        block = values[:, start:stop]
+        if strategy == "zscore":
+            # Пропуски не участвуют в расчете статистик (как в pandas)
+            mean = np.nanmean(block, axis=0)
+            std = np.nanstd(block, axis=0, ddof=1)
+            return mean - threshold * std, mean + threshold * std
+        q1, q3 = np.nanquantile(block, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        return q1 - threshold * iqr, q3 + threshold * iqr
+
+    # Границы столбцов независимы: блоки столбцов считаются параллельно и объединяются по порядку
+    blocks = map_blocks(block_bounds, values.shape[1], values.shape[0])
+    return np.concatenate([lower for lower, _ in blocks]), np.concatenate([upper for _, upper in blocks])
+
+def bounds_to_dict(columns: List[str], lower: np.ndarray, upper: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """
+    Преобразует массивы границ в словарь для сохранения в метаданных.
+    """
+    return {
+        col: {"lower": float(low), "upper": float(up)}
+        for col, low, up in zip(columns, lower, upper)
+    }
+
+def bounds_from_dict(columns: List[str], bounds: Dict[str, Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Восстанавливает массивы границ из сохраненного словаря.
+    Для столбцов без сохраненных границ используются бесконечные границы.
+    """
+    lower = np.array([bounds.get(col, {}).get("lower", -np.inf) for col in columns], dtype=np.float64)
+    upper = np.array([bounds.get(col, {}).get("upper", np.inf) for col in columns], dtype=np.float64)
+    return lower, upper
+
+def handle_outliers(df: pd.DataFrame, columns: List[str], strategy: str, threshold: float,
+                    mode: str = "joint",
+                    bounds: Optional[Dict[str, Dict[str, float]]] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Обрабатывает выбросы во всех выбранных столбцах за один векторизованный проход.
+
+    Args:
+        df: DataFrame для обработки
+        columns: Числовые столбцы для обработки
+        strategy: Метод обнаружения выбросов (zscore или iqr)
+        threshold: Порог для определения выбросов
+        mode: joint - удаление строк по общей маске, clip - ограничение значений границами
+        bounds: Ранее сохраненные границы (если указаны, статистики не пересчитываются)
+
+    Строки в режиме joint отбираются так же, как в последовательном режиме: границы z-оценки
+    строгие, межквартильного размаха - включительные, строки с пропусками удаляются.
+    Отличие только в статистиках: здесь они считаются один раз по всем строкам, а
+    последовательный режим пересчитывает их после удаления строк по предыдущему столбцу.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Обработанный DataFrame и параметры для повторного применения
+    """
+    dtypes = df[columns].dtypes
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    if bounds:
+        lower, upper = bounds_from_dict(columns, bounds)
+    else:
+        lower, upper = compute_outlier_bounds(values, strategy, threshold)
+
+    params = {
+        "strategy": strategy,
+        "threshold": threshold,
+        "mode": mode,
+        "columns": columns,
+        "bounds": bounds_to_dict(columns, lower, upper)
+    }
+
+    if mode == "clip":
+        # Винзоризация: строки не удаляются, пропуски сохраняются
+        integer = np.array([pd.api.types.is_integer_dtype(dtypes[col]) or pd.api.types.is_bool_dtype(dtypes[col])
+                            for col in columns], dtype=bool)
+        if integer.any():
+            # Целочисленные и логические столбцы ограничиваются ближайшими целыми внутри границ и сохраняют свой тип
+            lower = np.where(integer, np.ceil(lower), lower)
+            upper = np.where(integer, np.floor(upper), upper)
+        np.clip(values, lower, upper, out=values)
+        df[columns] = values
+        for col, is_integer in zip(columns, integer):
+            if is_integer:
+                df[col] = df[col].astype(dtypes[col])
+        return df, params
+
+    # Сравнение с пропуском ложно: строка с пропуском удаляется, как в последовательном режиме
+    with np.errstate(invalid="ignore"):
+        if strategy == "zscore":
+            inside = (values > lower) & (values < upper)
+        else:
+            inside = (values >= lower) & (values <= upper)
+    row_mask = inside.all(axis=1)
+
+    if row_mask.all():
+        return df, params
+
+    return df[row_mask], params
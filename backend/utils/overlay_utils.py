@@ -0,0 +1,164 @@
+import os
+import json
+import logging
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Callable
+
+from utils.file_utils import get_processed_file_path
+from utils.lock_utils import get_file_lock, LOCK_TIMEOUT
+from utils.metrics_utils import observe_io
+from utils.column_store_utils import ColumnStoreWriter
+from utils.result_store_utils import (
+    publish_result_store, remove_result_store, read_result_manifest, DEFAULT_CHUNKSIZE
+)
+from utils.result_reader_utils import (
+    get_overlay_parent, get_result_metadata_path, load_result_metadata, iter_result_chunks,
+    count_result_rows, write_result_csv
+)
+
+# Длина цепочки наложений, после которой результат уплотняется в самостоятельный
+MAX_OVERLAY_DEPTH = 3
+
+def get_overlay_depth(result_id: str) -> int:
+    """
+    Возвращает количество наложений над самостоятельным результатом.
+    """
+    depth = 0
+    parent_id = get_overlay_parent(result_id)
+    while parent_id is not None:
+        depth += 1
+        parent_id = get_overlay_parent(parent_id)
+    return depth
+
+def find_child_overlays(result_id: str) -> List[str]:
+    """
+    Возвращает результаты, хранящиеся как наложения непосредственно над указанным результатом.
+    """
+    children = []
+    for metadata_path in get_processed_file_path(result_id).parent.glob("*_metadata.json"):
+        child_id = metadata_path.name[:-len("_metadata.json")]
+        if get_overlay_parent(child_id) == result_id:
+            children.append(child_id)
+    return children
+
+def _write_standalone(parent_result_id: str, result_id: str,
+                      transform: Callable[[pd.DataFrame], Tuple[pd.DataFrame, List[str]]],
+                      chunksize: int) -> Dict[str, Any]:
+    """
+    Записывает производный результат самостоятельным CSV файлом (без хранилища столбцов).
+    """
+    result_path = get_processed_file_path(result_id)
+    row_count = 0
+    result_columns: List[str] = []
+    for i, chunk in enumerate(iter_result_chunks(parent_result_id, chunksize)):
+        chunk, _ = transform(chunk)
+        result_columns = chunk.columns.tolist()
+        chunk.to_csv(result_path, mode="w" if i == 0 else "a", header=(i == 0), index=False, encoding='utf-8')
+        row_count += len(chunk)
+    observe_io("write", "csv", result_path)
+    return {"row_count": row_count, "columns": result_columns, "overlay": None}
+
+def write_overlay(parent_result_id: str, result_id: str,
+                  transform: Callable[[pd.DataFrame], Tuple[pd.DataFrame, List[str]]],
+                  chunksize: int = DEFAULT_CHUNKSIZE) -> Dict[str, Any]:
+    """
+    Создает производный результат в виде наложения на родительский.
+
+    В хранилище столбцов наложения записываются только столбцы, которые
+    преобразование заменило или добавило; остальные читаются из родительского
+    результата при обращении к данным. Если столбцы наложения не поддерживаются
+    хранилищем, результат записывается самостоятельным CSV файлом.
+
+    Args:
+        parent_result_id: Идентификатор родительского результата
+        result_id: Идентификатор нового результата
+        transform: Функция части данных, возвращающая (новая часть, измененные столбцы)
+        chunksize: Количество строк в одной части
+
+    Returns:
+        Dict[str, Any]: row_count, columns (итоговый порядок) и overlay (описание
+        наложения или None для самостоятельного результата)
+    """
+    rows = count_result_rows(parent_result_id)
+    info: Dict[str, Any] = {"row_count": 0, "columns": []}
+
+    def write(directory: Path):
+        writer = ColumnStoreWriter(directory, rows, parse_dates=True)
+        overlay_columns: List[str] = []
+        for i, chunk in enumerate(iter_result_chunks(parent_result_id, chunksize)):
+            parent_columns = set(chunk.columns)
+            chunk, changed = transform(chunk)
+            if i == 0:
+                info["columns"] = chunk.columns.tolist()
+                overlay_columns = [col for col in info["columns"] if col in set(changed) or col not in parent_columns]
+            writer.append(chunk[overlay_columns])
+            info["row_count"] += len(chunk)
+        info["overlay"] = {
+            "parent_result_id": parent_result_id,
+            "columns": overlay_columns,
+            "depth": get_overlay_depth(parent_result_id) + 1
+        }
+        writer.close({"result_columns": info["columns"], "overlay": info["overlay"]})
+
+    if not publish_result_store(result_id, write):
+        return _write_standalone(parent_result_id, result_id, transform, chunksize)
+    return info
+
+def compact_result(result_id: str, chunksize: int = DEFAULT_CHUNKSIZE) -> bool:
+    """
+    Уплотняет цепочку наложений: записывает результат в самостоятельный CSV файл
+    и самостоятельное хранилище столбцов.
+
+    Самостоятельный файл атомарно появляется до замены хранилища наложения, поэтому
+    параллельные читатели и дочерние наложения продолжают работать.
+
+    Returns:
+        bool: True, если результат был уплотнен
+    """
+    manifest = read_result_manifest(result_id)
+    if get_overlay_parent(result_id, manifest) is None:
+        return False
+
+    result_path = get_processed_file_path(result_id)
+    temp_path = result_path.parent / f"{result_id}_compact.tmp"
+    write_result_csv(result_id, temp_path, chunksize=chunksize)
+    os.replace(temp_path, result_path)
+
+    def write(directory: Path):
+        writer = ColumnStoreWriter(directory, manifest["rows"], parse_dates=True)
+        for chunk in iter_result_chunks(result_id, chunksize):
+            writer.append(chunk)
+        writer.close()
+    if not publish_result_store(result_id, write):
+        # Без хранилища результат читается из самостоятельного CSV файла
+        remove_result_store(result_id)
+
+    metadata = load_result_metadata(result_id)
+    overlay = metadata.pop("overlay", None)
+    if overlay:
+        metadata["compacted_from"] = overlay["parent_result_id"]
+    with open(get_result_metadata_path(result_id), "w") as f:
+        json.dump(metadata, f)
+
+    logging.info(f"Цепочка наложений результата {result_id} уплотнена")
+    return True
+
+def remove_result_outputs(result_id: str):
+    """
+    Удаляет файлы незавершенного результата: CSV, метаданные и хранилище столбцов.
+
+    Наложения, построенные над результатом, сначала уплотняются в самостоятельные
+    результаты, чтобы удаление родителя их не ломало.
+    """
+    for child_id in find_child_overlays(result_id):
+        lock = get_file_lock(child_id)
+        if not lock.acquire(timeout=LOCK_TIMEOUT):
+            raise TimeoutError(f"Превышено время ожидания доступа к файлу {child_id}")
+        try:
+            compact_result(child_id)
+        finally:
+            lock.release()
+    get_processed_file_path(result_id).unlink(missing_ok=True)
+    get_result_metadata_path(result_id).unlink(missing_ok=True)
+    remove_result_store(result_id)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+# Порог числа строк, начиная с которого режим auto использует инкрементальный PCA
+INCREMENTAL_ROWS_THRESHOLD = 200000
+# Размер части данных по умолчанию для инкрементального обучения и преобразования
+DEFAULT_BATCH_SIZE = 10000
+
+def _iter_chunks(df: pd.DataFrame, columns: List[str], fill_values: np.ndarray, dtype: np.dtype,
+                 batch_size: int, min_rows: int = 1) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Последовательно выдает части матрицы признаков с заполненными пропусками.
+
+    Последняя часть объединяется с предыдущей, если в ней меньше min_rows строк.
+    """
+    positions = df.columns.get_indexer(columns)
+    n_rows = len(df)
+    starts = list(range(0, n_rows, batch_size))
+    if len(starts) > 1 and n_rows - starts[-1] < min_rows:
+        starts.pop()
+
+    for i, start in enumerate(starts):
+        stop = starts[i + 1] if i + 1 < len(starts) else n_rows
+        chunk = df.iloc[start:stop, positions].to_numpy(dtype=dtype, na_value=np.nan)
+        missing = np.isnan(chunk)
+        if missing.any():
+            chunk[missing] = np.take(fill_values, np.nonzero(missing)[1])
+        yield start, chunk
+
+def choose_solver(n_rows: int, n_columns: int, n_components: int, variance_mode: bool) -> str:
+    """
+    Выбирает алгоритм PCA для режима auto.
+
+    Большие наборы обучаются инкрементально по частям, рандомизированный SVD
+    используется для небольшого числа компонент на широких данных.
+    """
+    if n_rows > INCREMENTAL_ROWS_THRESHOLD:
+        return "incremental"
+    if not variance_mode and max(n_rows, n_columns) > 500 and n_components < 0.8 * min(n_rows, n_columns):
+        return "randomized"
+    return "full"
+
+def fit_pca(df: pd.DataFrame, columns: List[str], n_components: int = 2,
+            variance_threshold: Optional[float] = None, solver: str = "auto",
+            dtype: str = "float64", batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Обучает PCA и возвращает параметры, достаточные для преобразования без переобучения.
+
+    Args:
+        df: DataFrame с исходными данными
+        columns: Числовые столбцы для PCA
+        n_components: Количество компонент
+        variance_threshold: Доля объясненной дисперсии (0-1]; если указана, число компонент подбирается
+            автоматически (1.0 - все компоненты)
+        solver: auto, full, randomized или incremental
+        dtype: Тип вычислений (float32 или float64)
+        batch_size: Размер части данных для инкрементального режима
+
+    Returns:
+        Dict[str, Any]: Средние, компоненты, доли объясненной дисперсии и значения для заполнения пропусков
+    """
+    from sklearn.decomposition import PCA, IncrementalPCA
+
+    n_rows, n_columns = len(df), len(columns)
+    variance_mode = variance_threshold is not None and 0 < variance_threshold <= 1
+    max_components = min(n_rows, n_columns)
+    n_fit = max_components if variance_mode else max(1, min(int(n_components), max_components))
+
+    if solver == "auto":
+        solver = choose_solver(n_rows, n_columns, n_fit, variance_mode)
+    if solver == "randomized" and variance_mode:
+        # Для подбора числа компонент нужна полная дисперсия, которую рандомизированный SVD не дает
+        solver = "full"
+
+    # Пропуски заполняются средними по полным данным
+    fill_values = np.array([df[col].mean() for col in columns], dtype=np.float64)
+    fill_values = np.where(np.isnan(fill_values), 0.0, fill_values)
+    np_dtype = np.dtype(dtype)
+
+    if solver == "incremental":
+        batch_size = max(int(batch_size), n_fit)
+        model = IncrementalPCA(n_components=n_fit, batch_size=batch_size)
+        for _, chunk in _iter_chunks(df, columns, fill_values, np_dtype, batch_size, min_rows=n_fit):
+            model.partial_fit(chunk)
+    else:
+        _, matrix = next(_iter_chunks(df, columns, fill_values, np_dtype, n_rows))
+        model = PCA(n_components=n_fit, svd_solver=solver, random_state=0)
+        model.fit(matrix)
+        del matrix
+
+    ratios = np.asarray(model.explained_variance_ratio_, dtype=np.float64)
+    n_keep = n_fit
+    if variance_mode and variance_threshold < 1:
+        n_keep = int(min(np.searchsorted(np.cumsum(ratios), variance_threshold) + 1, n_fit))
+
+    return {
+        "columns": columns,
+        "solver": solver,
+        "dtype": np_dtype.name,
+        "n_components": n_keep,
+        "variance_threshold": variance_threshold if variance_mode else None,
+        "mean": model.mean_.astype(np.float64).tolist(),
+        "components": model.components_[:n_keep].astype(np.float64).tolist(),
+        "explained_variance_ratio": ratios[:n_keep].tolist(),
+        "fill_values": fill_values.tolist()
+    }
+
+def transform_pca(df: pd.DataFrame, params: Dict[str, Any],
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """
+    Проецирует данные на сохраненные компоненты по частям в заранее выделенный массив.
+    """
+    np_dtype = np.dtype(params.get("dtype", "float64"))
+    mean = np.asarray(params["mean"], dtype=np_dtype)
+    components = np.asarray(params["components"], dtype=np_dtype)
+    fill_values = np.asarray(params["fill_values"], dtype=np.float64)
+
+    result = np.empty((len(df), components.shape[0]), dtype=np_dtype)
+    for start, chunk in _iter_chunks(df, params["columns"], fill_values, np_dtype, batch_size):
+        chunk -= mean
+        np.matmul(chunk, components.T, out=result[start:start + len(chunk)])
+
+    return result
+
+def apply_pca(df: pd.DataFrame, columns: List[str], parameters: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Применяет PCA: заменяет исходные столбцы компонентами PCA_1..PCA_k одной операцией.
+
+    Если в parameters передан pca_params (сохраненные параметры), обучение не выполняется.
+    PCA не обучается на пустом наборе: DataFrame возвращается без изменений с пустыми параметрами.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Преобразованный DataFrame и параметры PCA
+    """
+    batch_size = int(parameters.get("batch_size") or DEFAULT_BATCH_SIZE)
+    params = parameters.get("pca_params")
+
+    if not params:
+        if len(df) == 0:
+            return df, {}
+        params = fit_pca(
+            df, columns,
+            n_components=parameters.get("n_components", 2),
+            variance_threshold=parameters.get("variance_threshold"),
+            solver=parameters.get("solver", "auto"),
+            dtype=parameters.get("dtype", "float64"),
+            batch_size=batch_size
+        )
+
+    result = transform_pca(df, params, batch_size)
+    names = [f"PCA_{i + 1}" for i in range(result.shape[1])]
+    components_df = pd.DataFrame(result, index=df.index, columns=names)
+
+    return pd.concat([df.drop(columns=params["columns"]), components_df], axis=1), params
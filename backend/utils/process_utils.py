@@ -0,0 +1,52 @@
+import os
+from typing import Dict, Any, List, Optional
+
+def _read_stat(pid: int) -> Optional[List[str]]:
+    """
+    Поля /proc/<pid>/stat после имени процесса (начиная с состояния); None, если недоступно.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # Имя процесса в скобках может содержать пробелы
+            return f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+
+def process_start_time(pid: int) -> Optional[int]:
+    """
+    Возвращает время запуска процесса (такты с загрузки системы): вместе с pid
+    оно отличает процесс от нового процесса с тем же pid после перезапуска.
+    """
+    fields = _read_stat(pid)
+    try:
+        return int(fields[19]) if fields else None
+    except (ValueError, IndexError):
+        return None
+
+def current_process() -> Dict[str, Any]:
+    """
+    Идентификатор текущего процесса: pid и время запуска.
+    """
+    return {"pid": os.getpid(), "pid_start": process_start_time(os.getpid())}
+
+def process_alive(pid: int, start_time: Optional[int] = None) -> bool:
+    """
+    Проверяет, что процесс с указанным pid работает.
+
+    Завершившийся, но еще не обработанный родителем процесс (zombie) считается
+    завершившимся. Если передано время запуска, процесс с тем же pid, но другим
+    временем запуска (pid переиспользован) тоже считается завершившимся.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    fields = _read_stat(pid)
+    if fields is None:
+        # /proc недоступен: достаточно проверки сигналом
+        return True
+    if fields[0] == "Z":
+        return False
+    return start_time is None or process_start_time(pid) in (None, start_time)
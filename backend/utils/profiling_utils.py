@@ -0,0 +1,182 @@
+import os
+import gc
+import time
+import ctypes
+import ctypes.util
+import resource
+import threading
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+# Интервал опроса памяти процесса во время шага (секунды)
+MEMORY_SAMPLE_INTERVAL = 0.01
+# Профилирование шагов можно отключить переменной окружения PROFILE_STEPS=0
+PROFILING_ENABLED = os.getenv("PROFILE_STEPS", "1") != "0"
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def current_rss() -> Optional[int]:
+    """
+    Возвращает текущий объем резидентной памяти процесса в байтах (None, если недоступно).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+        return libc if hasattr(libc, "malloc_trim") else None
+    except OSError:
+        return None
+
+_LIBC = _load_libc()
+
+def release_free_memory():
+    """
+    Возвращает системе освобожденную память кучи (glibc malloc_trim).
+
+    Освобожденные массивы прошлых задач иначе остаются в резидентной памяти
+    процесса и скрывают прирост памяти следующей задачи.
+    """
+    gc.collect()
+    if _LIBC is not None:
+        _LIBC.malloc_trim(0)
+
+def peak_rss() -> int:
+    """
+    Возвращает максимальный объем резидентной памяти процесса за все время работы в байтах.
+    """
+    # В Linux ru_maxrss измеряется в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class RssSampler:
+    """
+    Опрашивает резидентную память процесса в фоновом потоке и запоминает максимум.
+    """
+
+    def __init__(self, sample_interval: float = MEMORY_SAMPLE_INTERVAL):
+        self.peak = 0
+        self._sample_interval = sample_interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stopped.wait(self._sample_interval):
+            rss = current_rss()
+            if rss is not None and rss > self.peak:
+                self.peak = rss
+
+    def start(self) -> Optional[int]:
+        """
+        Начинает опрос.
+
+        Returns:
+            Optional[int]: Текущий объем памяти (None, если недоступен - опрос не запускается)
+        """
+        rss = current_rss()
+        self.peak = rss or 0
+        if rss is not None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return rss
+
+    def stop(self) -> Optional[int]:
+        """
+        Останавливает опрос.
+
+        Returns:
+            Optional[int]: Объем памяти на момент остановки
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        rss = current_rss()
+        if rss is not None:
+            self.peak = max(self.peak, rss)
+        return rss
+
+class StepProfiler:
+    """
+    Измеряет для каждого шага время (реальное и процессорное), пиковый прирост
+    памяти, а также количество строк и столбцов на входе и выходе.
+
+    Процессорное время считается по потоку задачи (time.thread_time, как лимит
+    процессорного времени в job_control_utils) и не включает другие задачи воркера.
+    Память - показатель всего процесса (поля process_*): при нескольких задачах
+    в воркере она включает и их память.
+
+    Память опрашивается фоновым потоком только во время шага, поэтому
+    накладные расходы не зависят от объема данных.
+    """
+
+    def __init__(self, sample_interval: float = MEMORY_SAMPLE_INTERVAL):
+        self.steps: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._memory = RssSampler(sample_interval)
+
+    def start(self, name: str, df: Optional[pd.DataFrame] = None):
+        """
+        Начинает измерение шага.
+        """
+        rss = self._memory.start()
+        self._current = {
+            "step": name,
+            "rows_in": len(df) if df is not None else None,
+            "columns_in": len(df.columns) if df is not None else None,
+            "_wall": time.perf_counter(),
+            "_cpu": time.thread_time(),
+            "_rss": rss
+        }
+
+    def stop(self, df: Optional[pd.DataFrame] = None, error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Завершает измерение шага и сохраняет результат.
+
+        Args:
+            df: Данные на выходе шага
+            error: Текст ошибки, если шаг завершился неудачно
+        """
+        step = self._current
+        wall_time = time.perf_counter() - step.pop("_wall")
+        cpu_time = time.thread_time() - step.pop("_cpu")
+        start_rss = step.pop("_rss")
+
+        end_rss = self._memory.stop()
+
+        step.update({
+            "rows_out": len(df) if df is not None else None,
+            "columns_out": len(df.columns) if df is not None else None,
+            "wall_time": round(wall_time, 6),
+            "cpu_time": round(cpu_time, 6),
+            "process_peak_memory_delta_mb": (round((self._memory.peak - start_rss) / 2 ** 20, 3)
+                                             if start_rss is not None else None),
+            "process_rss_mb": round(end_rss / 2 ** 20, 3) if end_rss is not None else None
+        })
+        if error is not None:
+            step["error"] = error
+        self.steps.append(step)
+        self._current = None
+        return step
+
+    def close(self, error: Optional[str] = None):
+        """
+        Завершает незаконченный шаг (например, при ошибке) и останавливает опрос памяти.
+        """
+        if self._current is not None:
+            self.stop(error=error)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Возвращает профиль всех шагов и итоговые значения.
+        """
+        return {
+            "steps": self.steps,
+            "total_wall_time": round(sum(step["wall_time"] for step in self.steps), 6),
+            "total_cpu_time": round(sum(step["cpu_time"] for step in self.steps), 6),
+            "process_peak_rss_mb": round(peak_rss() / 2 ** 20, 3)
+        }
@@ -0,0 +1,230 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from utils.file_utils import get_processed_file_path, copy_csv_with_bom
+from utils.job_control_utils import check_job
+from utils.column_store_reader_utils import open_column_store, load_categories
+from utils.result_store_utils import get_result_store_path, read_result_manifest, DEFAULT_CHUNKSIZE
+
+# Источник столбцов результата: (хранилище или CSV файл, манифест хранилища или None
+# для CSV, столбцы из этого источника или None - все столбцы)
+ResultSource = Tuple[Path, Optional[Dict[str, Any]], Optional[List[str]]]
+
+def get_result_metadata_path(result_id: str) -> Path:
+    """
+    Получает путь к метаданным результата.
+    """
+    return get_processed_file_path(result_id).parent / f"{result_id}_metadata.json"
+
+def load_result_metadata(result_id: str) -> Dict[str, Any]:
+    """
+    Загружает метаданные результата (пустой словарь, если их нет).
+    """
+    metadata_path = get_result_metadata_path(result_id)
+    if not metadata_path.exists():
+        return {}
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def get_overlay_parent(result_id: str, manifest: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Возвращает родителя результата, хранящегося как наложение (None для самостоятельного).
+
+    Самостоятельный CSV файл имеет приоритет: при уплотнении он появляется
+    раньше, чем хранилище наложения заменяется самостоятельным.
+    """
+    manifest = manifest or read_result_manifest(result_id)
+    overlay = manifest.get("overlay") if manifest else None
+    if not overlay or get_processed_file_path(result_id).exists():
+        return None
+    return overlay["parent_result_id"]
+
+def result_exists(result_id: str) -> bool:
+    """
+    Проверяет, существует ли результат (самостоятельный или в виде наложения).
+    """
+    return get_processed_file_path(result_id).exists() or get_overlay_parent(result_id) is not None
+
+def get_result_sources(result_id: str) -> Tuple[Optional[List[str]], List[ResultSource]]:
+    """
+    Определяет итоговый порядок столбцов и источник, из которого читается каждый столбец.
+
+    Наложение хранит в своем хранилище только замененные и добавленные столбцы и
+    ссылку на родителя; столбец берется из самого верхнего наложения, в котором он
+    записан, остальные - из самостоятельного результата в основании цепочки (его
+    хранилища, а если хранилища нет - CSV файла).
+
+    Returns:
+        Tuple: Итоговые столбцы (None для самостоятельного результата) и источники
+    """
+    final_columns: Optional[List[str]] = None
+    remaining: Optional[List[str]] = None
+    sources: List[ResultSource] = []
+    current_id = result_id
+    while True:
+        manifest = read_result_manifest(current_id)
+        parent_id = get_overlay_parent(current_id, manifest)
+        if parent_id is None:
+            break
+        if final_columns is None:
+            final_columns = manifest["result_columns"]
+            remaining = list(final_columns)
+        stored = {column["name"] for column in manifest["columns"]}
+        taken = [col for col in remaining if col in stored]
+        if taken:
+            sources.append((get_result_store_path(current_id), manifest, taken))
+            remaining = [col for col in remaining if col not in stored]
+        current_id = parent_id
+
+    if manifest is not None and not manifest.get("overlay"):
+        base: ResultSource = (get_result_store_path(current_id), manifest, remaining)
+    elif get_processed_file_path(current_id).exists():
+        base = (get_processed_file_path(current_id), None, remaining)
+    else:
+        raise FileNotFoundError(f"Данные результата {current_id} не найдены")
+    if remaining is None or remaining:
+        sources.append(base)
+    return final_columns, sources
+
+def _combine(parts: List[pd.DataFrame], final_columns: Optional[List[str]]) -> pd.DataFrame:
+    # DataFrame собирается из массивов напрямую: выбор списка столбцов и concat копируют данные
+    if final_columns is None:
+        return parts[0]
+    data = {}
+    for part in parts:
+        data.update({col: part[col].to_numpy() for col in part.columns})
+    return pd.DataFrame(data, index=pd.RangeIndex(len(parts[0])), columns=final_columns, copy=False)
+
+def read_result_rows(result_id: str, offset: int = 0, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Читает диапазон строк результата, объединяя наложения с родительскими результатами.
+
+    Столбцы из хранилищ отображаются в память без копирования (DataFrame только
+    для чтения), из CSV файла читаются только строки диапазона.
+    """
+    final_columns, sources = get_result_sources(result_id)
+    rows = slice(offset, offset + limit if limit is not None else None)
+    parts = []
+    for path, manifest, columns in sources:
+        if manifest is not None:
+            parts.append(open_column_store(path, columns, rows, manifest))
+        else:
+            skiprows = range(1, offset + 1) if offset else None
+            parts.append(pd.read_csv(path, usecols=columns, skiprows=skiprows, nrows=limit, encoding='utf-8'))
+    return _combine(parts, final_columns)
+
+def _iter_source_chunks(source: ResultSource, chunksize: int) -> Iterator[pd.DataFrame]:
+    path, manifest, columns = source
+    if manifest is None:
+        yield from pd.read_csv(path, usecols=columns, encoding='utf-8', chunksize=chunksize)
+        return
+    for start in range(0, max(manifest["rows"], 1), chunksize):
+        # Части доступны для изменения, поэтому отображенные массивы копируются
+        yield open_column_store(path, columns, slice(start, start + chunksize), manifest).copy()
+
+def iter_result_chunks(result_id: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Потоково читает результат частями, объединяя наложения с родительскими результатами.
+
+    Все источники цепочки выровнены по строкам, поэтому части читаются синхронно
+    и только нужные столбцы каждого источника.
+    """
+    final_columns, sources = get_result_sources(result_id)
+    for parts in zip(*(_iter_source_chunks(source, chunksize) for source in sources)):
+        yield _combine(list(parts), final_columns)
+
+def count_result_rows(result_id: str) -> int:
+    """
+    Возвращает количество строк результата: из манифеста хранилища или по CSV файлу.
+    """
+    _, sources = get_result_sources(result_id)
+    path, manifest, _ = sources[0]
+    if manifest is not None:
+        return manifest["rows"]
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in f) - 1
+
+def iter_result_columns(result_id: str) -> Optional[Iterator[Tuple[str, np.ndarray, Optional[np.ndarray]]]]:
+    """
+    Перебирает столбцы результата как отображенные в память массивы.
+
+    Returns:
+        Optional[Iterator]: Тройки (столбец, массив, словарь строкового столбца или None);
+        строковые столбцы возвращаются кодами без восстановления строк. None, если
+        основание цепочки хранится только в CSV
+    """
+    final_columns, sources = get_result_sources(result_id)
+    if any(manifest is None for _, manifest, _ in sources):
+        return None
+    by_name = {}
+    for store_dir, manifest, columns in sources:
+        for entry in manifest["columns"]:
+            if columns is None or entry["name"] in columns:
+                by_name[entry["name"]] = (store_dir, entry)
+
+    def iterate():
+        for col in final_columns or list(by_name):
+            store_dir, entry = by_name[col]
+            values = np.load(store_dir / entry["file"], mmap_mode="r")
+            yield col, values, load_categories(store_dir, entry) if entry["kind"] == "dictionary" else None
+    return iterate()
+
+def read_result_dataframe(result_id: str, sparse_columns: Optional[List[str]] = None,
+                          chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """
+    Загружает результат целиком, сохраняя разреженные столбцы в разреженном формате.
+
+    Результат читается частями, поэтому индикаторные столбцы не материализуются
+    в плотном виде для всего набора данных одновременно.
+
+    Args:
+        result_id: Идентификатор результата
+        sparse_columns: Столбцы, которые хранились в разреженном формате
+        chunksize: Количество строк в одной части
+
+    Returns:
+        pd.DataFrame: Загруженный DataFrame
+    """
+    sparse_dtype = pd.SparseDtype(np.uint8, 0)
+    chunks = []
+    for chunk in iter_result_chunks(result_id, chunksize):
+        present = [col for col in (sparse_columns or []) if col in chunk.columns]
+        if present:
+            chunk[present] = chunk[present].astype(sparse_dtype)
+        chunks.append(chunk)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def write_dataframe_csv(df: pd.DataFrame, target_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Path:
+    """
+    Записывает DataFrame в CSV частями, проверяя между частями отмену задачи.
+    """
+    for i, start in enumerate(range(0, max(len(df), 1), chunksize)):
+        check_job()
+        df.iloc[start:start + chunksize].to_csv(target_path, mode="w" if i == 0 else "a",
+                                               header=(i == 0), index=False)
+    return target_path
+
+def write_result_csv(result_id: str, target_path: Path, encoding: str = 'utf-8',
+                     chunksize: int = DEFAULT_CHUNKSIZE) -> Path:
+    """
+    Потоково записывает полный результат (с учетом наложений) в CSV файл.
+    """
+    for i, chunk in enumerate(iter_result_chunks(result_id, chunksize)):
+        chunk.to_csv(target_path, mode="w" if i == 0 else "a", header=(i == 0), index=False,
+                     encoding=encoding if i == 0 else 'utf-8')
+    return target_path
+
+def export_result_csv(result_id: str, target_path: Path) -> Path:
+    """
+    Экспортирует результат в CSV с BOM (Byte Order Mark) для корректного открытия в Excel.
+
+    Самостоятельный файл копируется побайтно, наложение объединяется потоково.
+    """
+    result_path = get_processed_file_path(result_id)
+    if result_path.exists():
+        return copy_csv_with_bom(result_path, target_path)
+    return write_result_csv(result_id, target_path, encoding='utf-8-sig')
@@ -0,0 +1,91 @@
+import os
+import shutil
+import logging
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+
+from utils.file_utils import get_processed_file_path
+from utils.job_control_utils import check_job
+from utils.column_store_utils import ColumnStoreWriter
+from utils.column_store_reader_utils import read_manifest
+
+# Количество строк в одной части при потоковом чтении и записи
+DEFAULT_CHUNKSIZE = 100000
+
+def get_result_store_path(result_id: str) -> Path:
+    """
+    Получает путь к хранилищу столбцов результата (рядом с CSV файлом).
+    """
+    return get_processed_file_path(result_id).parent / f"{result_id}_columns"
+
+def read_result_manifest(result_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Читает манифест хранилища результата (None, если хранилища нет).
+    """
+    try:
+        return read_manifest(get_result_store_path(result_id))
+    except (OSError, ValueError):
+        return None
+
+def _temp_store_path(result_id: str) -> Path:
+    store_dir = get_result_store_path(result_id)
+    return store_dir.parent / f"{store_dir.name}.tmp-{os.getpid()}"
+
+def _replace_store(temp_dir: Path, store_dir: Path):
+    """
+    Заменяет хранилище только что записанным.
+    """
+    old_dir = store_dir.parent / f"{store_dir.name}.old-{os.getpid()}"
+    if store_dir.exists():
+        os.rename(store_dir, old_dir)
+    os.rename(temp_dir, store_dir)
+    # Уже отображенные в память файлы остаются доступны читателям до закрытия
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+def publish_result_store(result_id: str, write: Callable[[Path], Any]) -> bool:
+    """
+    Записывает хранилище во временную директорию и атомарно публикует его.
+
+    Args:
+        result_id: Идентификатор результата
+        write: Функция, записывающая хранилище в переданную директорию
+
+    Returns:
+        bool: True, если хранилище записано; иначе хранилище результата не изменяется
+    """
+    temp_dir = _temp_store_path(result_id)
+    try:
+        write(temp_dir)
+        _replace_store(temp_dir, get_result_store_path(result_id))
+        return True
+    except (ValueError, OSError) as e:
+        logging.info(f"Хранилище столбцов результата {result_id} не записано: {str(e)}")
+        return False
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def remove_result_store(result_id: str):
+    """
+    Удаляет хранилище результата вместе с незавершенными временными копиями.
+    """
+    store_dir = get_result_store_path(result_id)
+    for path in [store_dir, *store_dir.parent.glob(f"{store_dir.name}.tmp-*")]:
+        shutil.rmtree(path, ignore_errors=True)
+
+def write_result_store(result_id: str, df: pd.DataFrame) -> bool:
+    """
+    Записывает самостоятельный результат в хранилище столбцов.
+
+    Разреженные столбцы записываются в плотном виде: отображение в память
+    читает с диска только страницы запрошенных строк.
+    """
+    def write(directory: Path):
+        writer = ColumnStoreWriter(directory, len(df), densify_sparse=True, parse_dates=True)
+        for start in range(0, len(df), DEFAULT_CHUNKSIZE):
+            check_job()
+            writer.append(df.iloc[start:start + DEFAULT_CHUNKSIZE])
+        if len(df) == 0:
+            writer.append(df)
+        writer.close()
+    return publish_result_store(result_id, write)
@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+from typing import List, Optional, Tuple, Union
+
+# Статистики, которые считаются через накопленные суммы
+SUM_STATISTICS = {"mean", "sum"}
+# Статистики, которые считаются оконными функциями pandas (устойчивый алгоритм Уэлфорда)
+VARIANCE_STATISTICS = {"std", "var"}
+# Статистики, которые считаются через разреженную таблицу минимумов/максимумов
+EXTREME_STATISTICS = {"min", "max"}
+# Статистики, доступные для экспоненциального сглаживания
+EWM_STATISTICS = {"mean", "std", "var"}
+
+class _IntervalIndexer(BaseIndexer):
+    """
+    Окна с заранее вычисленными границами [starts, ends) для оконных функций pandas.
+    """
+
+    def get_window_bounds(self, num_values: int = 0, min_periods: Optional[int] = None,
+                          center: Optional[bool] = None, closed: Optional[str] = None,
+                          step: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self.starts, self.ends
+
+def _is_time_window(window: Union[int, str]) -> bool:
+    """
+    Проверяет, задано ли окно временным интервалом (например, "7D"), а не числом строк.
+    """
+    return isinstance(window, str) and not window.strip().isdigit()
+
+def _window_starts_by_time(times: np.ndarray, codes: np.ndarray, window_ns: int, grouped: bool) -> np.ndarray:
+    """
+    Находит начало временного окна (t - window, t] для каждой строки.
+
+    Данные должны быть отсортированы по (группа, время). Для групп используется
+    совместная сортировка строк и запросов вместо поиска внутри каждой группы.
+    """
+    if not grouped:
+        return np.searchsorted(times, times - window_ns, side="right")
+
+    n_rows = len(times)
+    all_codes = np.concatenate([codes, codes])
+    all_times = np.concatenate([times, times - window_ns])
+    is_query = np.concatenate([np.zeros(n_rows, dtype=np.int8), np.ones(n_rows, dtype=np.int8)])
+
+    # При равенстве ключей строка данных идет раньше запроса (side="right")
+    merged = np.lexsort((is_query, all_times, all_codes))
+    data_before = np.cumsum(is_query[merged] == 0)
+
+    starts = np.empty(n_rows, dtype=np.int64)
+    query_positions = merged[is_query[merged] == 1] - n_rows
+    starts[query_positions] = data_before[is_query[merged] == 1]
+    return starts
+
+def _sparse_table_query(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, func) -> np.ndarray:
+    """
+    Вычисляет минимум/максимум на отрезках [start, end] через разреженную таблицу.
+
+    Таблица строится один раз на столбец до уровня, покрывающего самое длинное окно,
+    и отвечает на запросы всех окон за O(1) на строку.
+    """
+    lengths = ends - starts + 1
+    levels = np.floor(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    result = np.empty(len(values), dtype=np.float64)
+
+    table = values
+    for level in range(int(levels.max()) + 1):
+        if level > 0:
+            half = 1 << (level - 1)
+            table = func(table[:-half], table[half:])
+        rows = np.nonzero(levels == level)[0]
+        if len(rows):
+            span = 1 << level
+            result[rows] = func(table[starts[rows]], table[ends[rows] - span + 1])
+
+    return result
+
+def _prepare_order(df: pd.DataFrame, group_column: Optional[str],
+                   time_column: Optional[str]) -> Tuple[Optional[np.ndarray], np.ndarray, Optional[np.ndarray], np.ndarray]:
+    """
+    Определяет порядок строк (по группе и времени), коды групп, метки времени и маску недопустимых строк.
+    """
+    n_rows = len(df)
+    codes = np.zeros(n_rows, dtype=np.int64)
+    invalid = np.zeros(n_rows, dtype=bool)
+    times = None
+
+    if group_column is not None:
+        codes = pd.factorize(df[group_column])[0].astype(np.int64)
+        invalid |= codes < 0
+
+    if time_column is not None:
+        parsed = pd.to_datetime(df[time_column])
+        nat = parsed.isna().to_numpy()
+        times = parsed.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if nat.any():
+            times[nat] = times[~nat].min() if (~nat).any() else 0
+        invalid |= nat
+
+    if group_column is None and time_column is None:
+        return None, codes, times, invalid
+
+    order = np.lexsort((times, codes)) if times is not None else np.argsort(codes, kind="stable")
+    return order, codes[order], (times[order] if times is not None else None), invalid[order]
+
+def build_rolling_features(df: pd.DataFrame, columns: List[str], windows: List[Union[int, str]],
+                           statistics: List[str], variants: Optional[List[str]] = None,
+                           ewm_spans: Optional[List[int]] = None, group_column: Optional[str] = None,
+                           time_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Рассчитывает банк скользящих признаков для нескольких столбцов, окон и статистик.
+
+    Среднее и сумма для всех окон берутся из общих накопленных сумм, минимум и максимум -
+    из одной разреженной таблицы на столбец. Дисперсия и стандартное отклонение считаются
+    оконной функцией pandas по тем же границам окон: разность накопленных квадратов теряет
+    точность на длинных рядах и рядах с трендом.
+    Семантика совпадает с pandas: окна по числу строк требуют полного окна без пропусков,
+    временные окна (например, "7D") и расширяющееся окно - хотя бы одно значение.
+
+    Args:
+        df: Исходный DataFrame
+        columns: Числовые столбцы
+        windows: Размеры окон (число строк или временной интервал)
+        statistics: Статистики (mean, std, var, sum, min, max)
+        variants: Варианты окон: rolling, expanding, ewm
+        ewm_spans: Периоды экспоненциального сглаживания (span)
+        group_column: Столбец группировки (необязательно)
+        time_column: Столбец времени для временных окон (необязательно)
+
+    Returns:
+        pd.DataFrame: Блок новых признаков с индексом исходного DataFrame
+    """
+    variants = variants or ["rolling"]
+    n_rows = len(df)
+
+    # Спецификации окон: (метка, начало окна, минимальное число наблюдений)
+    order, codes, times, invalid = _prepare_order(df, group_column, time_column)
+    positions = np.arange(n_rows)
+    boundary = np.ones(n_rows, dtype=bool)
+    boundary[1:] = codes[1:] != codes[:-1]
+    group_starts = np.maximum.accumulate(np.where(boundary, positions, 0)) if n_rows else positions
+
+    specs = []
+    if "rolling" in variants:
+        for window in windows:
+            if _is_time_window(window):
+                if times is None:
+                    raise ValueError(f"Для временного окна {window} необходимо указать столбец времени")
+                window_ns = pd.to_timedelta(window).value
+                starts = _window_starts_by_time(times, codes, window_ns, group_column is not None)
+                specs.append((f"rolling_{{stat}}_{window}", starts, 1))
+            else:
+                size = int(window)
+                specs.append((f"rolling_{{stat}}_{size}", np.maximum(positions - size + 1, group_starts), size))
+    if "expanding" in variants:
+        specs.append(("expanding_{stat}", group_starts, 1))
+
+    ewm_spans = list(ewm_spans or []) if "ewm" in variants else []
+    ewm_statistics = [stat for stat in statistics if stat in EWM_STATISTICS]
+
+    names = [f"{col}_{label.format(stat=stat)}" for col in columns for label, _, _ in specs for stat in statistics]
+    names += [f"{col}_ewm_{stat}_{span}" for col in columns for span in ewm_spans for stat in ewm_statistics]
+    name_index = {name: i for i, name in enumerate(names)}
+    out = np.full((n_rows, len(names)), np.nan)
+
+    if n_rows == 0 or not names:
+        return pd.DataFrame(out, index=df.index, columns=names)
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if order is not None:
+        values = values[order]
+    values[invalid] = np.nan
+    present = ~np.isnan(values)
+
+    # Общие накопленные суммы по всем столбцам (значения центрируются для точности)
+    center = np.nanmean(values, axis=0) if present.any() else np.zeros(len(columns))
+    center = np.where(np.isnan(center), 0.0, center)
+    centered = np.where(present, values - center, 0.0)
+    zero_row = np.zeros((1, len(columns)))
+    cum_count = np.vstack([zero_row, np.cumsum(present, axis=0)])
+    cum_sum = np.vstack([zero_row, np.cumsum(centered, axis=0)])
+    frame = pd.DataFrame(values, columns=columns)
+
+    ends = positions + 1
+    for label, starts, min_periods in specs:
+        count = cum_count[ends] - cum_count[starts]
+        enough = count >= min_periods
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = cum_sum[ends] - cum_sum[starts]
+            results = {
+                "sum": total + count * center,
+                "mean": total / count + center,
+            }
+        if VARIANCE_STATISTICS & set(statistics):
+            indexer = _IntervalIndexer(starts=starts.astype(np.int64), ends=ends.astype(np.int64))
+            variance = frame.rolling(indexer, min_periods=min_periods).var().to_numpy()
+            results["var"] = variance
+            results["std"] = np.sqrt(variance)
+
+        for stat in statistics:
+            if stat in SUM_STATISTICS or stat in VARIANCE_STATISTICS:
+                block = np.where(enough, results[stat], np.nan)
+            elif stat in EXTREME_STATISTICS:
+                func, fill = (np.fmin, np.inf) if stat == "min" else (np.fmax, -np.inf)
+                block = np.column_stack([
+                    _sparse_table_query(np.where(present[:, j], values[:, j], fill), starts, positions, func)
+                    for j in range(len(columns))
+                ])
+                block[~enough] = np.nan
+            else:
+                raise ValueError(f"Неизвестная статистика: {stat}")
+            indices = [name_index[f"{col}_{label.format(stat=stat)}"] for col in columns]
+            out[:, indices] = block
+
+    if ewm_spans and ewm_statistics:
+        for span in ewm_spans:
+            if group_column is not None:
+                ewm = frame.groupby(codes).ewm(span=span)
+            else:
+                ewm = frame.ewm(span=span)
+            for stat in ewm_statistics:
+                result = getattr(ewm, stat)()
+                if group_column is not None:
+                    result = result.reset_index(level=0, drop=True).sort_index()
+                indices = [name_index[f"{col}_ewm_{stat}_{span}"] for col in columns]
+                out[:, indices] = result.to_numpy()
+
+    out[invalid] = np.nan
+    if order is not None:
+        unsorted = np.empty_like(out)
+        unsorted[order] = out
+        out = unsorted
+
+    return pd.DataFrame(out, index=df.index, columns=names)
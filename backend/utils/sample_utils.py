@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from config.settings import SAMPLE_SIZE
+from utils.file_utils import get_file_path_by_id
+from utils.validation_utils import iter_dataset_chunks
+from utils.dataframe_cache_utils import dataframe_cache
+
+# Максимальное количество страт; при большем числе значений выборка строится равномерной
+MAX_STRATA = 50
+# Начальное значение генератора, чтобы выборка воспроизводилась
+SAMPLE_RANDOM_STATE = 0
+# Методы, которым нужны подряд идущие строки (на случайной выборке они теряют смысл)
+ORDER_DEPENDENT_METHODS = {"lagging", "rolling_statistics", "rolling_features"}
+
+def get_sample_path(dataset_id: str) -> Path:
+    """
+    Получает путь к сохраненной выборке набора данных.
+    """
+    return get_file_path_by_id(dataset_id, "csv").parent / f"{dataset_id}_sample.csv"
+
+def _keep_smallest_keys(keys: np.ndarray, strata: Optional[np.ndarray], size: int) -> np.ndarray:
+    """
+    Возвращает позиции строк с наименьшими ключами: всего или внутри каждой страты.
+    """
+    if strata is None:
+        if len(keys) <= size:
+            return np.arange(len(keys))
+        return np.argpartition(keys, size)[:size]
+
+    # Ранг ключа внутри страты через сортировку по (страта, ключ)
+    order = np.lexsort((keys, strata))
+    sorted_strata = strata[order]
+    boundary = np.ones(len(order), dtype=bool)
+    boundary[1:] = sorted_strata[1:] != sorted_strata[:-1]
+    starts = np.maximum.accumulate(np.where(boundary, np.arange(len(order)), 0))
+    rank = np.arange(len(order)) - starts
+    return order[rank < size]
+
+def reservoir_sample(chunks: Iterable[pd.DataFrame], size: int, strata_column: Optional[str] = None,
+                     random_state: int = SAMPLE_RANDOM_STATE) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Строит равномерную (или стратифицированную) выборку за один проход по частям данных.
+
+    Каждой строке назначается случайный ключ, и хранятся только строки с наименьшими
+    ключами (для стратификации - внутри каждой страты), поэтому объем памяти
+    не зависит от размера набора. Стратифицированная выборка распределяется
+    пропорционально размерам страт, в каждую страту попадает хотя бы одна строка.
+
+    Args:
+        chunks: Части набора данных в исходном порядке строк
+        size: Размер выборки
+        strata_column: Столбец для стратификации (необязательно)
+        random_state: Начальное значение генератора
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Выборка в исходном порядке строк и ее описание
+    """
+    rng = np.random.default_rng(random_state)
+    reservoir, keys, positions = None, np.empty(0), np.empty(0, dtype=np.int64)
+    strata_counts: Dict[str, int] = {}
+    total_rows = 0
+
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+        keys = np.concatenate([keys, rng.random(len(chunk))])
+        positions = np.concatenate([positions, np.arange(total_rows, total_rows + len(chunk))])
+        total_rows += len(chunk)
+
+        strata = None
+        if strata_column is not None:
+            for value, count in chunk[strata_column].astype(str).value_counts().items():
+                strata_counts[value] = strata_counts.get(value, 0) + int(count)
+            if len(strata_counts) > MAX_STRATA:
+                # Слишком много значений: переходим к равномерной выборке
+                strata_column, strata_counts = None, {}
+            else:
+                strata = pd.factorize(reservoir[strata_column].astype(str))[0]
+
+        keep = _keep_smallest_keys(keys, strata, size)
+        reservoir, keys, positions = reservoir.iloc[keep].reset_index(drop=True), keys[keep], positions[keep]
+
+    if reservoir is None:
+        return pd.DataFrame(), {"method": "uniform", "size": 0, "total_rows": 0}
+
+    info = {"method": "uniform", "total_rows": total_rows}
+    if strata_column is not None and total_rows:
+        # Квоты страт пропорциональны их размерам в полном наборе
+        labels = reservoir[strata_column].astype(str).to_numpy()
+        quotas = {value: min(count, max(1, int(round(size * count / total_rows))))
+                  for value, count in strata_counts.items()}
+        selected = np.concatenate([
+            np.nonzero(labels == value)[0][np.argsort(keys[labels == value])[:quota]]
+            for value, quota in quotas.items()
+        ])
+        reservoir, positions = reservoir.iloc[selected].reset_index(drop=True), positions[selected]
+        info.update({"method": "stratified", "strata_column": strata_column})
+
+    order = np.argsort(positions, kind="stable")
+    sample = reservoir.iloc[order].reset_index(drop=True)
+    info["size"] = len(sample)
+    return sample, info
+
+def iter_frame_chunks(df: pd.DataFrame, chunksize: int = 100000) -> Iterable[pd.DataFrame]:
+    """
+    Разбивает загруженный DataFrame на части для однопроходной обработки.
+    """
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def load_sample(dataset_id: str, nrows: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Загружает сохраненную выборку (None, если ее нет).
+
+    Если указан nrows, строки берутся равномерно по всей выборке, чтобы
+    подвыборка тоже покрывала весь набор, а не только его начало.
+    """
+    sample_path = get_sample_path(dataset_id)
+    sample = dataframe_cache.get("sample", dataset_id, sample_path)
+    if sample is None:
+        if not sample_path.exists():
+            return None
+        sample = dataframe_cache.put("sample", dataset_id, sample_path, pd.read_csv(sample_path, encoding='utf-8'))
+
+    if nrows is not None and len(sample) > nrows:
+        positions = np.unique(np.linspace(0, len(sample) - 1, nrows).round().astype(np.int64))
+        sample = sample.iloc[positions].reset_index(drop=True)
+    return sample
+
+def rebuild_stratified_sample(dataset_id: str, target_column: str) -> Optional[Dict[str, Any]]:
+    """
+    Перестраивает сохраненную выборку со стратификацией по целевой переменной за один проход
+    (синхронно, для выполнения в пуле потоков). Если набор уже загружен в память, файл не перечитывается.
+
+    Returns:
+        Optional[Dict[str, Any]]: Описание выборки для метаданных (None, если файл набора не найден)
+    """
+    for extension in ["csv", "xlsx", "xls"]:
+        data_path = get_file_path_by_id(dataset_id, extension)
+        if not data_path.exists():
+            continue
+        cached_df = dataframe_cache.get("dataset", dataset_id, data_path)
+        chunks = (iter_frame_chunks(cached_df) if cached_df is not None
+                  else iter_dataset_chunks(data_path, extension))
+        sample_df, sample_info = reservoir_sample(chunks, SAMPLE_SIZE, strata_column=target_column)
+        sample_df.to_csv(get_sample_path(dataset_id), index=False, encoding='utf-8')
+        return sample_info
+    return None
+
+def column_histogram(values: pd.Series, bins: int = 20) -> Dict[str, Any]:
+    """
+    Строит гистограмму столбца: интервалы для числовых данных, частоты значений для категориальных.
+    """
+    present = values.dropna()
+    result = {"missing_count": int(len(values) - len(present))}
+
+    if pd.api.types.is_numeric_dtype(values):
+        counts, edges = np.histogram(present.to_numpy(dtype=np.float64), bins=bins) if len(present) else ([], [])
+        result.update({"type": "numeric", "counts": list(counts), "edges": list(edges)})
+    else:
+        frequencies = present.astype(str).value_counts().head(bins)
+        result.update({"type": "categorical", "values": frequencies.index.tolist(), "counts": frequencies.tolist()})
+
+    return result
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+# Поддерживаемые методы масштабирования
+SCALING_METHODS = ("standard", "minmax", "robust")
+
+def _safe_scale(scale: np.ndarray) -> np.ndarray:
+    """
+    Заменяет нулевой (или неопределенный) масштаб единицей, как это делают масштабировщики sklearn.
+    """
+    return np.where((scale == 0) | np.isnan(scale), 1, scale).astype(scale.dtype)
+
+def _known(given: Optional[np.ndarray], compute) -> np.ndarray:
+    """
+    Возвращает заданную статистику, а для столбцов, где она неизвестна (NaN), - рассчитанную по блоку.
+    """
+    if given is None:
+        return compute()
+    unknown = np.isnan(given)
+    if not unknown.any():
+        return given
+    return np.where(unknown, compute(), given).astype(given.dtype)
+
+def fit_transform_block(block: np.ndarray, strategy: str,
+                        stats: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    Вычисляет статистики для всех столбцов и масштабирует массив на месте.
+
+    Статистики считаются векторизованно по всему блоку, а центрирование
+    переиспользуется для расчета стандартного отклонения.
+
+    Args:
+        block: Массив формы (строки, столбцы), изменяется на месте
+        strategy: standard, minmax или robust
+        stats: Заранее рассчитанные статистики (например, по полному набору данных);
+            статистики по блоку вычисляются только для столбцов, где заданы NaN
+
+    Returns:
+        Dict[str, np.ndarray]: Примененные статистики (в типе данных блока)
+    """
+    given = {key: np.asarray(values, dtype=block.dtype) for key, values in (stats or {}).items()}
+
+    with np.errstate(invalid="ignore"):
+        if strategy == "standard":
+            mean = _known(given.get("mean"), lambda: np.nanmean(block, axis=0))
+            block -= mean
+            # Стандартное отклонение генеральной совокупности (ddof=0), как в StandardScaler
+            std = _safe_scale(_known(given.get("std"), lambda: np.sqrt(np.nanmean(np.square(block), axis=0))))
+            block /= std
+            return {"mean": mean, "std": std}
+
+        if strategy == "minmax":
+            min_val = _known(given.get("min"), lambda: np.nanmin(block, axis=0))
+            max_val = _known(given.get("max"), lambda: np.nanmax(block, axis=0))
+            block -= min_val
+            block /= _safe_scale(max_val - min_val)
+            return {"min": min_val, "max": max_val}
+
+        if strategy == "robust":
+            # Квантили по блоку нужны, только если хотя бы одна статистика неизвестна
+            if not given or any(np.isnan(values).any() for values in given.values()):
+                q1, q2, q3 = np.nanquantile(block, [0.25, 0.5, 0.75], axis=0).astype(block.dtype)
+            median = _known(given.get("median"), lambda: q2)
+            iqr = _safe_scale(_known(given.get("iqr"), lambda: q3 - q1))
+            block -= median
+            block /= iqr
+            return {"median": median, "iqr": iqr}
+
+    raise ValueError(f"Неизвестный метод масштабирования: {strategy}")
+
+def scale_columns(df: pd.DataFrame, columns: List[str], strategy: str, dtype: str = "float64",
+                  stats: Optional[Dict[str, np.ndarray]] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Масштабирует столбцы DataFrame одним блоком и возвращает точно примененные параметры.
+
+    Args:
+        df: DataFrame для обработки
+        columns: Числовые столбцы
+        strategy: standard, minmax или robust
+        dtype: Тип результата (float64 или float32)
+        stats: Заранее рассчитанные статистики (необязательно)
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: DataFrame и параметры в формате scaling_params["standardization"]
+    """
+    block = df[columns].to_numpy(dtype=np.dtype(dtype), na_value=np.nan)
+    stats = fit_transform_block(block, strategy, stats)
+    df[columns] = block
+
+    params = {
+        col: {name: float(values[i]) for name, values in stats.items()}
+        for i, col in enumerate(columns)
+    }
+
+    return df, {
+        "method": strategy,
+        "columns": columns,
+        "dtype": np.dtype(dtype).name,
+        "params": params
+    }
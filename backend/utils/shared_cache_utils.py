@@ -0,0 +1,249 @@
+import os
+import time
+import fcntl
+import shutil
+import logging
+import pandas as pd
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.settings import SHARED_CACHE_DIR, SHARED_CACHE_BYTES
+from utils.process_utils import current_process, process_alive
+from utils.column_store_utils import write_column_store, estimate_store_nbytes
+from utils.column_store_reader_utils import read_manifest, open_column_store, store_nbytes
+
+# Имя поддиректории с арендами (по файлу на процесс, использующий запись)
+LEASES_DIR = "leases"
+# Незавершенная запись старше этого времени (секунды) считается брошенной упавшим процессом
+ABANDONED_AFTER = 600
+# Файл незавершенной записи с зарезервированным объемом (байты)
+RESERVATION_NAME = ".reserved"
+
+def _statvfs(path: Path) -> os.statvfs_result:
+    # Директория хранилища может быть еще не создана: берется ближайшая существующая
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return os.statvfs(path)
+
+def filesystem_size(path: Path) -> int:
+    """
+    Возвращает размер файловой системы (для tmpfs - ее лимит, например 64 МБ /dev/shm в Kubernetes).
+    """
+    stat = _statvfs(path)
+    return stat.f_blocks * stat.f_frsize
+
+def filesystem_free(path: Path) -> int:
+    """
+    Возвращает свободное место файловой системы в байтах.
+    """
+    stat = _statvfs(path)
+    return stat.f_bavail * stat.f_frsize
+
+class SharedDataFrameStore:
+    """
+    Хранилище столбцов горячих наборов данных в общей памяти (tmpfs, /dev/shm).
+
+    Каждая запись - хранилище столбцов (utils/column_store_utils.py), которое
+    любой процесс открывает через mmap без копирования, поэтому память под
+    набор данных не зависит от количества воркеров. Процесс, открывший запись,
+    создает файл аренды со своим pid (в файле - время запуска процесса); записи
+    с живыми арендами не вытесняются, аренды завершившихся (в том числе упавших)
+    процессов и процессов, pid которых занял новый процесс, удаляются при обходе.
+
+    Объем записи оценивается и резервируется до записи: запись, которая не
+    помещается в бюджет или в свободное место tmpfs, не начинается.
+    """
+
+    def __init__(self, root: Path = SHARED_CACHE_DIR, max_bytes: int = SHARED_CACHE_BYTES):
+        self.root = root
+        try:
+            size = filesystem_size(root)
+        except OSError:
+            size = max_bytes
+        self.max_bytes = min(max_bytes, size) if max_bytes else size
+
+    def _entry_dir(self, kind: str, entry_id: str) -> Path:
+        return self.root / f"{kind}-{entry_id}"
+
+    @contextmanager
+    def _locked(self):
+        """
+        Межпроцессная блокировка изменений хранилища (публикация, аренда, вытеснение).
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _live_leases(self, entry_dir: Path) -> List[int]:
+        """
+        Возвращает pid живых арендаторов записи, удаляя аренды завершившихся процессов.
+        """
+        alive = []
+        leases_dir = entry_dir / LEASES_DIR
+        if not leases_dir.exists():
+            return alive
+        for lease in leases_dir.iterdir():
+            try:
+                pid = int(lease.name)
+                start_time = int(lease.read_text() or 0) or None
+            except (OSError, ValueError):
+                continue
+            if process_alive(pid, start_time):
+                alive.append(pid)
+            else:
+                lease.unlink(missing_ok=True)
+        return alive
+
+    def _remove(self, entry_dir: Path):
+        # Файлы, уже отображенные в память другими процессами, остаются доступны им до закрытия
+        shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def _entries(self) -> Tuple[List[Tuple[float, Path, int]], int]:
+        """
+        Возвращает записи (время последнего использования, путь, размер) и объем,
+        зарезервированный незавершенными записями; брошенные записи удаляются.
+        """
+        entries, reserved = [], 0
+        for entry_dir in self.root.iterdir():
+            if not entry_dir.is_dir():
+                continue
+            try:
+                if entry_dir.name.startswith("tmp-"):
+                    if time.time() - entry_dir.stat().st_mtime > ABANDONED_AFTER:
+                        self._remove(entry_dir)
+                    else:
+                        reserved += int((entry_dir / RESERVATION_NAME).read_text())
+                    continue
+                entries.append((entry_dir.stat().st_mtime, entry_dir, store_nbytes(entry_dir)))
+            except (OSError, ValueError):
+                continue
+        return entries, reserved
+
+    def _make_room(self, nbytes: int) -> bool:
+        """
+        Вытесняет давно не использованные записи без живых аренд, пока запись не
+        поместится и в бюджет, и в свободное место файловой системы.
+        """
+        entries, reserved = self._entries()
+        used = sum(size for _, _, size in entries) + reserved
+
+        def fits() -> bool:
+            # Зарезервированный объем еще не записан, но уже не свободен
+            return used + nbytes <= self.max_bytes and nbytes + reserved <= filesystem_free(self.root)
+
+        # Если запись не поместится даже после вытеснения всех записей без аренд, ничего не вытесняется
+        evictable = [(mtime, entry_dir, size) for mtime, entry_dir, size in entries
+                     if not self._live_leases(entry_dir)]
+        freeable = sum(size for _, _, size in evictable)
+        if used - freeable + nbytes > self.max_bytes or \
+                nbytes + reserved > filesystem_free(self.root) + freeable:
+            return False
+        for _, entry_dir, size in sorted(evictable):
+            if fits():
+                break
+            self._remove(entry_dir)
+            used -= size
+        return fits()
+
+    def publish(self, kind: str, entry_id: str, df: pd.DataFrame, signature: Tuple[int, int]) -> bool:
+        """
+        Записывает DataFrame в общую память.
+
+        Размер записи оценивается до записи и резервируется под блокировкой, файлы
+        пишутся обычной записью: при нехватке места запись завершается OSError
+        (ENOSPC) и отменяется, а не вызывает SIGBUS.
+
+        Returns:
+            bool: True, если запись опубликована (или уже была опубликована)
+        """
+        entry_dir = self._entry_dir(kind, entry_id)
+        temp_dir = self.root / f"tmp-{kind}-{entry_id}-{os.getpid()}"
+        try:
+            nbytes = estimate_store_nbytes(df)
+            with self._locked():
+                if entry_dir.exists():
+                    self._remove(entry_dir)
+                if not self._make_room(nbytes):
+                    logging.info(f"Недостаточно общей памяти для {kind}/{entry_id} ({nbytes} байт)")
+                    return False
+                self._remove(temp_dir)
+                temp_dir.mkdir()
+                (temp_dir / RESERVATION_NAME).write_text(str(nbytes))
+            write_column_store(df, temp_dir, {"signature": list(signature)})
+            (temp_dir / RESERVATION_NAME).unlink()
+            with self._locked():
+                if entry_dir.exists():
+                    self._remove(entry_dir)
+                os.rename(temp_dir, entry_dir)
+            return True
+        except (ValueError, OSError) as e:
+            logging.info(f"Набор {kind}/{entry_id} не помещен в общую память: {str(e)}")
+            return False
+        finally:
+            if temp_dir.exists():
+                self._remove(temp_dir)
+
+    def attach(self, kind: str, entry_id: str, signature: Optional[Tuple[int, int]]) -> Optional[pd.DataFrame]:
+        """
+        Открывает запись без копирования и регистрирует аренду текущего процесса.
+
+        Запись с другой подписью источника (файл перезаписан) удаляется.
+        """
+        entry_dir = self._entry_dir(kind, entry_id)
+        if not entry_dir.exists():
+            return None
+        try:
+            with self._locked():
+                manifest = read_manifest(entry_dir)
+                if signature is None or tuple(manifest.get("signature", [])) != tuple(signature):
+                    self._remove(entry_dir)
+                    return None
+                leases_dir = entry_dir / LEASES_DIR
+                leases_dir.mkdir(exist_ok=True)
+                process = current_process()
+                (leases_dir / str(process["pid"])).write_text(str(process["pid_start"] or ""))
+                # Время изменения директории отражает последнее использование для LRU
+                os.utime(entry_dir)
+            return open_column_store(entry_dir, manifest=manifest, categorical=True)
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Не удалось открыть {kind}/{entry_id} из общей памяти: {str(e)}")
+            return None
+
+    def release(self, kind: str, entry_id: str):
+        """
+        Снимает аренду текущего процесса.
+        """
+        (self._entry_dir(kind, entry_id) / LEASES_DIR / str(os.getpid())).unlink(missing_ok=True)
+
+    def invalidate(self, kind: str, entry_id: str):
+        """
+        Удаляет запись из общей памяти.
+        """
+        with self._locked():
+            self._remove(self._entry_dir(kind, entry_id))
+
+    def release_all(self):
+        """
+        Снимает все аренды текущего процесса (при остановке воркера).
+        """
+        if not self.root.exists():
+            return
+        pid = str(os.getpid())
+        for lease in self.root.glob(f"*/{LEASES_DIR}/{pid}"):
+            lease.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.root.exists():
+            return {"entries": 0, "bytes": 0, "reserved_bytes": 0, "max_bytes": self.max_bytes}
+        entries, reserved = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size in entries),
+            "reserved_bytes": reserved,
+            "max_bytes": self.max_bytes
+        }
@@ -0,0 +1,191 @@
+import os
+import sys
+import hmac
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+from fastapi import Request, HTTPException
+
+from config.settings import ADMIN_TOKEN, PROFILES_DIR, PROFILE_RETENTION, PROFILE_MAX_AGE_HOURS
+
+# Начальный интервал между выборками стека (секунды)
+SAMPLE_INTERVAL = 0.005
+# Максимальный интервал, до которого увеличивается шаг при превышении накладных расходов
+MAX_SAMPLE_INTERVAL = 0.5
+# Допустимая доля времени, затрачиваемая на снятие стеков
+MAX_OVERHEAD = float(os.getenv("PROFILE_MAX_OVERHEAD", "0.02"))
+# Максимальная длительность профилирования (секунды), после нее выборки прекращаются
+MAX_PROFILE_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "600"))
+# Максимальная глубина сохраняемого стека
+MAX_STACK_DEPTH = 128
+
+# Заголовок и параметр запроса, включающие профилирование, и заголовок с токеном
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY = "profile"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+def is_admin(request: Request) -> bool:
+    """
+    Проверяет токен администратора в заголовке запроса.
+    """
+    token = request.headers.get(ADMIN_TOKEN_HEADER)
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+def require_admin(request: Request):
+    """
+    Требует токен администратора, иначе выбрасывает HTTPException 403.
+    """
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Требуется токен администратора")
+
+def profiling_requested(request: Request) -> bool:
+    """
+    Проверяет, запрошено ли профилирование (заголовок X-Profile или параметр profile)
+    администратором.
+    """
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    return flag in ("1", "true") and is_admin(request)
+
+def _code_label(code) -> str:
+    path = Path(code.co_filename)
+    return f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})".replace(";", ",")
+
+class SamplingProfiler:
+    """
+    Выборочный профилировщик одного потока.
+
+    Фоновый поток периодически снимает стек профилируемого потока через
+    sys._current_frames и накапливает количество одинаковых стеков (формат
+    folded stacks для построения flame graph). Если доля времени на снятие
+    стеков (по скользящему среднему стоимости одной выборки) превышает
+    MAX_OVERHEAD, интервал между выборками удваивается, а когда стоимость
+    снижается - возвращается к начальному.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, max_overhead: float = MAX_OVERHEAD,
+                 max_seconds: float = MAX_PROFILE_SECONDS):
+        self.interval = interval
+        self.initial_interval = interval
+        self.max_overhead = max_overhead
+        self.max_seconds = max_seconds
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._duration = 0.0
+        self._sampling_time = 0.0
+        self._average_cost: Optional[float] = None
+        # Подписи кадров кэшируются по объекту кода, чтобы выборка была дешевой
+        self._labels: Dict[Any, str] = {}
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._target)
+        if frame is None:
+            return
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _code_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        stack = ";".join(reversed(labels))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            elapsed = time.perf_counter() - self._started_at
+            if elapsed > self.max_seconds:
+                break
+            sample_start = time.perf_counter()
+            self._sample()
+            cost = time.perf_counter() - sample_start
+            self._sampling_time += cost
+            self._average_cost = cost if self._average_cost is None else 0.9 * self._average_cost + 0.1 * cost
+            budget = self.max_overhead * self.interval
+            if self._average_cost > budget:
+                self.interval = min(self.interval * 2, MAX_SAMPLE_INTERVAL)
+            elif self._average_cost < budget / 4 and self.interval > self.initial_interval:
+                self.interval = max(self.interval / 2, self.initial_interval)
+
+    def start(self):
+        """
+        Начинает профилирование текущего потока.
+        """
+        self._target = threading.get_ident()
+        self._started_at = time.perf_counter()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Останавливает профилирование.
+        """
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self._duration = time.perf_counter() - self._started_at
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "duration": round(self._duration, 6),
+            "final_interval": self.interval,
+            "overhead": round(self._sampling_time / self._duration, 4) if self._duration > 0 else 0.0
+        }
+
+    def folded(self) -> str:
+        """
+        Возвращает стеки в формате folded (строка "кадр;кадр;... количество").
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in
+                       sorted(self.stacks.items(), key=lambda item: -item[1]))
+
+def get_profile_path(profile_id: str) -> Path:
+    """
+    Получает путь к сохраненному профилю.
+    """
+    return PROFILES_DIR / f"{profile_id}.folded"
+
+def save_profile(profile_id: str, profiler: SamplingProfiler) -> Dict[str, Any]:
+    """
+    Сохраняет профиль и удаляет профили сверх лимита хранения.
+
+    Returns:
+        Dict[str, Any]: Сводка профиля с идентификатором
+    """
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(get_profile_path(profile_id), "w", encoding="utf-8") as f:
+        f.write(profiler.folded())
+    prune_profiles()
+    return {"profile_id": profile_id, **profiler.summary()}
+
+def prune_profiles():
+    """
+    Оставляет не более PROFILE_RETENTION профилей, не старше PROFILE_MAX_AGE_HOURS.
+    """
+    profiles = []
+    for path in PROFILES_DIR.glob("*.folded"):
+        try:
+            profiles.append((path.stat().st_mtime, path))
+        except OSError:
+            # Профиль уже удален другим воркером
+            continue
+    profiles.sort(reverse=True)
+
+    oldest_allowed = time.time() - PROFILE_MAX_AGE_HOURS * 3600
+    for i, (mtime, path) in enumerate(profiles):
+        if i >= PROFILE_RETENTION or mtime < oldest_allowed:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logging.warning(f"Не удалось удалить профиль {path}: {str(e)}")
@@ -0,0 +1,117 @@
+import math
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+from threadpoolctl import threadpool_limits, threadpool_info
+
+from config.settings import JOB_CPU_BUDGET
+from utils.cgroup_utils import cpu_quota
+from utils.job_scheduler_utils import running_jobs
+
+# Ограничение нативных пулов потоков общее для процесса: исходные значения
+# восстанавливаются, когда завершается последний шаг с ограничением
+_limits_lock = threading.Lock()
+_active_steps = 0
+_original_limits: Optional[threadpool_limits] = None
+# Исходное количество потоков по типам библиотек (blas, openmp)
+_original_threads: Dict[str, int] = {}
+# Потоки, выделенные шагу, который выполняется в текущем потоке
+_current_step = threading.local()
+
+def cpu_budget() -> float:
+    """
+    Возвращает бюджет процессора для задач пода (ядра).
+    """
+    return JOB_CPU_BUDGET if JOB_CPU_BUDGET > 0 else cpu_quota()
+
+def threads_per_job(concurrent_jobs: int) -> int:
+    """
+    Делит бюджет процессора поровну между одновременно выполняемыми задачами.
+    """
+    return max(1, math.floor(cpu_budget() / max(concurrent_jobs, 1)))
+
+def current_threads() -> int:
+    """
+    Возвращает количество потоков, выделенных текущему шагу (вне задачи - весь бюджет процессора).
+    """
+    return getattr(_current_step, "threads", None) or threads_per_job(1)
+
+def _apply_limit(threads: int) -> Dict[str, int]:
+    """
+    Ограничивает пулы потоков процесса; возвращает примененные значения по типам библиотек.
+
+    Ограничение только уменьшает исходное количество потоков: OpenBLAS выделяет
+    буферы при загрузке и аварийно завершается, если потоков становится больше.
+    """
+    global _active_steps, _original_limits
+    with _limits_lock:
+        if _active_steps == 0:
+            # Вне шагов текущие значения исходные; библиотеки, загруженные во время шагов, добавляются ниже
+            _original_threads.clear()
+        current: Dict[str, int] = {}
+        for info in threadpool_info():
+            api = info["user_api"]
+            current[api] = min(info["num_threads"], current.get(api, info["num_threads"]))
+        for api, num_threads in current.items():
+            _original_threads.setdefault(api, num_threads)
+        limits = {api: min(threads, original) for api, original in _original_threads.items()}
+        limiter = threadpool_limits(limits=limits)
+        if _active_steps == 0:
+            # Первый шаг запоминает исходные значения, следующие только меняют ограничение
+            _original_limits = limiter
+        _active_steps += 1
+        return limits
+
+def _release_limit():
+    global _active_steps, _original_limits
+    with _limits_lock:
+        _active_steps -= 1
+        if _active_steps == 0 and _original_limits is not None:
+            _original_limits.restore_original_limits()
+            _original_limits = None
+
+class ThreadBudget:
+    """
+    Распределение потоков нативных библиотек (BLAS, OpenMP) для шагов одной задачи.
+
+    Перед каждым шагом задача получает долю бюджета процессора пода по числу
+    выполняемых задач всех воркеров; доля применяется к пулам потоков, загруженным
+    в процесс (threadpoolctl), на время шага. Ограничение общее для процесса,
+    поэтому одновременные задачи воркера получают одинаковое (последнее) значение.
+    """
+
+    def __init__(self):
+        self.steps: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def step(self, method_id: str):
+        concurrent = running_jobs()
+        threads = threads_per_job(concurrent)
+        step = {"method_id": method_id, "threads": threads, "concurrent_jobs": concurrent}
+        self.steps.append(step)
+        applied = False
+        try:
+            step["limits"] = _apply_limit(threads)
+            applied = True
+        except Exception as e:
+            # Без ограничения шаг выполняется с настройками библиотек по умолчанию
+            logging.warning(f"Не удалось ограничить потоки для шага {method_id}: {str(e)}")
+        _current_step.threads = threads
+        try:
+            yield threads
+        finally:
+            _current_step.threads = None
+            if applied:
+                _release_limit()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Возвращает распределение потоков для метаданных задачи.
+        """
+        return {
+            "cpu_budget": round(cpu_budget(), 2),
+            "max_threads": max((step["threads"] for step in self.steps), default=None),
+            "steps": self.steps
+        }
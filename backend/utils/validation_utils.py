@@ -2,7 +2,9 @@ import pandas as pd
 from fastapi import HTTPException
 from pathlib import Path
 import logging
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Iterator, Dict, Any
+
+from utils.metrics_utils import observe_io
 
 def validate_dataframe(df: pd.DataFrame, max_rows: int = 1000000) -> Tuple[bool, Optional[str]]:
     """
@@ -37,9 +39,86 @@ def validate_dataframe(df: pd.DataFrame, max_rows: int = 1000000) -> Tuple[bool,
     
     return True, None
 
+# Разделители CSV в порядке проверки
+CSV_SEPARATORS = [',', ';', '\t', '|']
+# Количество строк, по которым определяется разделитель
+SEPARATOR_PROBE_ROWS = 100
+
+def detect_csv_separator(file_path: Path, encoding: str = 'utf-8') -> str:
+    """
+    Определяет разделитель CSV файла по первым строкам.
+    
+    Args:
+        file_path: Путь к файлу
+        encoding: Кодировка файла
+    
+    Returns:
+        str: Первый разделитель, дающий больше одного столбца
+    
+    Raises:
+        HTTPException: Если ни один разделитель не подошел
+    """
+    for sep in CSV_SEPARATORS:
+        try:
+            probe = pd.read_csv(file_path, sep=sep, encoding=encoding, nrows=SEPARATOR_PROBE_ROWS)
+            # Если есть только один столбец, возможно разделитель неверный
+            if len(probe.columns) > 1:
+                return sep
+        except Exception:
+            continue
+    
+    raise HTTPException(
+        status_code=400, 
+        detail="Не удалось правильно прочитать CSV файл. Проверьте формат и разделитель."
+    )
+
+def read_dataset_head(file_path: Path, extension: str, nrows: int, encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Читает только первые строки набора данных, не загружая файл целиком.
+    
+    Args:
+        file_path: Путь к файлу
+        extension: Расширение файла
+        nrows: Количество строк
+        encoding: Кодировка файла (по умолчанию utf-8)
+    
+    Returns:
+        pd.DataFrame: Первые строки набора данных
+    """
+    if extension.lower() == "csv":
+        sep = detect_csv_separator(file_path, encoding)
+        return pd.read_csv(file_path, sep=sep, encoding=encoding, nrows=nrows)
+    return pd.read_excel(file_path, engine='openpyxl', nrows=nrows)
+
+def iter_dataset_chunks(file_path: Path, extension: str, chunksize: int = 100000,
+                        encoding: str = 'utf-8') -> Iterator[pd.DataFrame]:
+    """
+    Последовательно читает набор данных частями (файлы Excel читаются целиком).
+    
+    Args:
+        file_path: Путь к файлу
+        extension: Расширение файла
+        chunksize: Количество строк в одной части
+        encoding: Кодировка файла (по умолчанию utf-8)
+    
+    Returns:
+        Iterator[pd.DataFrame]: Части набора данных в исходном порядке строк
+    """
+    if extension.lower() == "csv":
+        sep = detect_csv_separator(file_path, encoding)
+        yield from pd.read_csv(file_path, sep=sep, encoding=encoding, chunksize=chunksize)
+    else:
+        yield pd.read_excel(file_path, engine='openpyxl')
+
 async def load_and_validate_dataframe(file_path: Path, extension: str, encoding: str = 'utf-8') -> pd.DataFrame:
     """
-    Загружает и валидирует DataFrame из файла.
+    Загружает и валидирует DataFrame из файла (см. read_and_validate_dataframe).
+    """
+    return read_and_validate_dataframe(file_path, extension, encoding)
+
+def read_and_validate_dataframe(file_path: Path, extension: str, encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Загружает и валидирует DataFrame из файла (синхронно, для выполнения в пуле потоков).
     
     Args:
         file_path: Путь к файлу
@@ -55,27 +134,12 @@ async def load_and_validate_dataframe(file_path: Path, extension: str, encoding:
     try:
         # Загружаем данные
         if extension.lower() == "csv":
-            # Пробуем разные разделители
-            separators = [',', ';', '\t', '|']
-            df = None
-            exception = None
-            
-            for sep in separators:
-                try:
-                    df = pd.read_csv(file_path, sep=sep, encoding=encoding)
-                    # Если есть только один столбец, возможно разделитель неверный
-                    if len(df.columns) > 1:
-                        break
-                except Exception as e:
-                    exception = e
-            
-            if df is None or len(df.columns) <= 1:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Не удалось правильно прочитать CSV файл. Проверьте формат и разделитель."
-                )
+            # Разделитель определяется по первым строкам, затем файл читается один раз
+            sep = detect_csv_separator(file_path, encoding)
+            df = pd.read_csv(file_path, sep=sep, encoding=encoding)
         else:  # Excel
             df = pd.read_excel(file_path, engine='openpyxl')
+        observe_io("read", extension, file_path)
         
         # Валидируем DataFrame
         is_valid, error_message = validate_dataframe(df)
@@ -91,4 +155,114 @@ async def load_and_validate_dataframe(file_path: Path, extension: str, encoding:
         raise HTTPException(
             status_code=500, 
             detail=f"Ошибка при обработке файла: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+# Методы, добавляющие столбцы, имена которых известны только после выполнения
+COLUMN_ADDING_METHODS = {"categorical_encoding", "pca", "lagging", "rolling_statistics", "rolling_features",
+                         "date_components"}
+
+def _column_parameters(method_info: Dict[str, Any]) -> List[str]:
+    # Параметры выбора столбцов: списки без фиксированных вариантов
+    return [name for name, spec in method_info["parameters"].items()
+            if spec["type"] in ("select", "multiselect") and not spec.get("options")]
+
+def validate_method_parameters(methods: List[Dict[str, Any]], catalogue: List[Dict[str, Any]]) -> List[str]:
+    """
+    Проверяет шаги конфигурации по каталогу методов (не зависит от набора данных).
+    
+    Args:
+        methods: Шаги конфигурации (method_id и parameters)
+        catalogue: Каталог методов (get_preprocessing_methods)
+    
+    Returns:
+        List[str]: Сообщения об ошибках (пустой список, если шаги корректны)
+    """
+    known = {method["method_id"]: method for method in catalogue}
+    errors = []
+    for index, method in enumerate(methods, 1):
+        method_id = method["method_id"]
+        info = known.get(method_id)
+        if info is None:
+            errors.append(f"Шаг {index}: неизвестный метод {method_id}")
+            continue
+        for name, value in (method.get("parameters") or {}).items():
+            spec = info["parameters"].get(name)
+            if spec is None or value is None:
+                continue
+            if spec["type"] == "select" and spec.get("options") and value not in spec["options"]:
+                errors.append(f"Шаг {index} ({method_id}): недопустимое значение {name}={value}, "
+                              f"допустимые: {', '.join(map(str, spec['options']))}")
+            elif spec["type"] == "number":
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    errors.append(f"Шаг {index} ({method_id}): параметр {name} должен быть числом")
+                    continue
+                if "min" in spec and number < spec["min"]:
+                    errors.append(f"Шаг {index} ({method_id}): параметр {name} должен быть не меньше {spec['min']}")
+                elif "max" in spec and number > spec["max"]:
+                    errors.append(f"Шаг {index} ({method_id}): параметр {name} должен быть не больше {spec['max']}")
+    return errors
+
+def require_valid_parameters(methods: List[Dict[str, Any]], catalogue: List[Dict[str, Any]]):
+    """
+    Проверяет шаги конфигурации по каталогу методов (см. validate_method_parameters).
+
+    Raises:
+        HTTPException: 422 со списком ошибок, если шаги некорректны
+    """
+    errors = validate_method_parameters(methods, catalogue)
+    if errors:
+        raise HTTPException(status_code=422, detail="; ".join(errors))
+
+def validate_config_columns(methods: List[Dict[str, Any]], catalogue: List[Dict[str, Any]],
+                            dataset_metadata: Dict[str, Any]) -> List[str]:
+    """
+    Проверяет столбцы, указанные в шагах конфигурации, по схеме набора данных.
+    
+    Столбец должен быть в наборе и не должен быть заменен предыдущим шагом
+    (PCA, кодирование кроме label). Столбцы, которые могут быть созданы
+    предыдущими шагами (лаги, скользящие статистики и т.д.), не проверяются.
+    
+    Args:
+        methods: Шаги конфигурации
+        catalogue: Каталог методов (get_preprocessing_methods)
+        dataset_metadata: Метаданные набора данных (результат analyze_dataset)
+    
+    Returns:
+        List[str]: Сообщения об ошибках (пустой список, если столбцы найдены)
+    """
+    known = {method["method_id"]: method for method in catalogue}
+    types = {column["name"]: column.get("type") for column in dataset_metadata.get("columns", [])}
+    removed: Dict[str, int] = {}
+    new_columns = False
+    errors = []
+    for index, method in enumerate(methods, 1):
+        method_id = method["method_id"]
+        parameters = method.get("parameters") or {}
+        info = known.get(method_id)
+        if info is None:
+            continue
+        for name in _column_parameters(info):
+            value = parameters.get(name)
+            for column in (value if isinstance(value, list) else [value] if value else []):
+                if column in removed:
+                    errors.append(f"Шаг {index} ({method_id}): столбец {column} заменен шагом {removed[column]}")
+                elif column not in types and not new_columns:
+                    errors.append(f"Шаг {index} ({method_id}): столбец {column} отсутствует в наборе данных")
+        
+        replaces = method_id == "pca" or \
+            (method_id == "categorical_encoding" and parameters.get("strategy", "onehot") != "label")
+        if replaces:
+            targets = parameters.get("columns") or [
+                column for column, column_type in types.items()
+                if (column_type == "numeric") == (method_id == "pca")
+            ]
+            for column in targets:
+                if column in types:
+                    del types[column]
+                    removed[column] = index
+        if method_id in COLUMN_ADDING_METHODS and \
+                not (method_id == "categorical_encoding" and parameters.get("strategy") == "label"):
+            new_columns = True
+    return errors
@@ -18,5 +18,12 @@ export default {
     return apiClient.post(`/datasets/${datasetId}/set-target`, {
       target_column: targetColumn
     });
+  },
+
+  // Histogram of a column computed from the stored sample
+  getColumnHistogram(datasetId, column, bins = 20) {
+    return apiClient.get(`/datasets/${datasetId}/histogram`, {
+      params: { column, bins }
+    });
   }
 };
\ No newline at end of file
@@ -17,6 +17,23 @@ export default {
     return apiClient.get(`/preprocessing/status/${resultId}`);
   },
   
+  cancelPreprocessing(resultId) {
+    return apiClient.post(`/preprocessing/cancel/${resultId}`);
+  },
+  
+  // Пакетная предобработка: шаблон конфигурации и список наборов данных
+  executeBatch(template, datasetIds, maxConcurrency = null) {
+    return apiClient.post('/preprocessing/batch', {
+      template,
+      dataset_ids: datasetIds,
+      max_concurrency: maxConcurrency
+    });
+  },
+  
+  getBatchStatus(batchId) {
+    return apiClient.get(`/preprocessing/batch/${batchId}`);
+  },
+  
   getDataPreview(resultId, limit = 100, offset = 0) {
     return apiClient.get(`/preprocessing/data/${resultId}?limit=${limit}&offset=${offset}`);
   },